@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Micro-benchmark of MIDI CC dispatch
+
+Compares the old _handle_midi_cc elif chain, which compares the CC against
+each control's midi_cc attribute in turn, with CCRoutingTable.dispatch.
+Targets are no-ops, so only the dispatch cost is measured. Reports
+nanoseconds per CC for the first control in the chain, the last one, and
+an unrouted CC, which walks the whole chain.
+"""
+
+import os
+import sys
+import time
+
+# Add the parent directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.murnau.utils.cc_routing import CCRoutingTable
+
+# Control name and CC, in the order of the old elif chain
+CONTROLS = [
+    ("wave_type", 1),
+    ("attack_L", 73),
+    ("decay_L", 75),
+    ("sustain_L", 31),
+    ("release_L", 72),
+    ("attack_R", 78),
+    ("decay_R", 79),
+    ("sustain_R", 32),
+    ("release_R", 77),
+    ("cutoff_L", 74),
+    ("cutoff_R", 70),
+    ("resonance_L", 71),
+    ("resonance_R", 76),
+]
+
+
+class Control:
+    """Stand-in for a widget with a midi_cc attribute"""
+
+    def __init__(self, midi_cc):
+        self.midi_cc = midi_cc
+
+    def set_from_midi_cc(self, value):
+        pass
+
+
+class ChainUI:
+    """The pre-table dispatch: one attribute lookup and compare per branch"""
+
+    def __init__(self):
+        for name, cc in CONTROLS:
+            setattr(self, name, Control(cc))
+
+    def handle(self, cc, value):
+        if cc == self.wave_type.midi_cc:
+            self.wave_type.set_from_midi_cc(value)
+        elif cc == self.attack_L.midi_cc:
+            self.attack_L.set_from_midi_cc(value)
+        elif cc == self.decay_L.midi_cc:
+            self.decay_L.set_from_midi_cc(value)
+        elif cc == self.sustain_L.midi_cc:
+            self.sustain_L.set_from_midi_cc(value)
+        elif cc == self.release_L.midi_cc:
+            self.release_L.set_from_midi_cc(value)
+        elif cc == self.attack_R.midi_cc:
+            self.attack_R.set_from_midi_cc(value)
+        elif cc == self.decay_R.midi_cc:
+            self.decay_R.set_from_midi_cc(value)
+        elif cc == self.sustain_R.midi_cc:
+            self.sustain_R.set_from_midi_cc(value)
+        elif cc == self.release_R.midi_cc:
+            self.release_R.set_from_midi_cc(value)
+        elif cc == self.cutoff_L.midi_cc:
+            self.cutoff_L.set_from_midi_cc(value)
+        elif cc == self.cutoff_R.midi_cc:
+            self.cutoff_R.set_from_midi_cc(value)
+        elif cc == self.resonance_L.midi_cc:
+            self.resonance_L.set_from_midi_cc(value)
+        elif cc == self.resonance_R.midi_cc:
+            self.resonance_R.set_from_midi_cc(value)
+
+
+def run(dispatch, cc, count):
+    """Nanoseconds per dispatch of one CC"""
+    start = time.perf_counter()
+    for value in range(count):
+        dispatch(cc, value & 127)
+    return (time.perf_counter() - start) / count * 1e9
+
+
+def main():
+    """Run the benchmark"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+
+    chain = ChainUI()
+    table = CCRoutingTable(
+        {name: getattr(chain, name).set_from_midi_cc for name, _ in CONTROLS}
+    )
+    for name, cc in CONTROLS:
+        table.assign(name, cc)
+
+    print(f"{count} dispatches per case, ns per CC")
+    print(f"{'case':<16} {'elif chain':>12} {'table':>12}")
+    for label, cc in (("first (CC1)", 1), ("last (CC76)", 76), ("unrouted", 20)):
+        print(
+            f"{label:<16} {run(chain.handle, cc, count):>12.1f} "
+            f"{run(table.dispatch, cc, count):>12.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
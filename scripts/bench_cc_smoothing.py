@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""Simulated cutoff sweep: 7-bit CC flood vs 14-bit CC with smoothing
+
+A controller sweeps the cutoff (20-20000 Hz) once in the given number of
+seconds, sending one value per millisecond. The 7-bit path turns every CC
+message into a parameter send, as _apply_midi_cc did before smoothing. The
+14-bit path decodes MSB/LSB pairs, dispatches them at full resolution and
+sends from a ParamSmoother ticked at the control rate. Time is simulated,
+so the numbers are exact counts rather than timings.
+
+Reports parameter sends, distinct values sent and the largest step between
+consecutive values in Hz.
+"""
+
+import os
+import sys
+
+# Add the parent directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.murnau.utils.cc_routing import CCRoutingTable
+from src.murnau.utils.coalescer import DEFAULT_CONTROL_RATE
+from src.murnau.utils.hires_cc import HighResDecoder
+from src.murnau.utils.smoothing import ParamSmoother
+
+CUTOFF_MIN = 20.0
+CUTOFF_MAX = 20000.0
+
+# Controller messages per second
+MESSAGE_RATE = 1000
+
+
+def cc_to_cutoff(cc_value):
+    """LabeledKnob.cc_to_value for the cutoff range"""
+    return CUTOFF_MIN + cc_value / 127.0 * (CUTOFF_MAX - CUTOFF_MIN)
+
+
+def summarize(label, sent):
+    """Print one result row"""
+    steps = [abs(b - a) for a, b in zip(sent, sent[1:])]
+    print(f"{label:<22} {len(sent):>8} {len(set(sent)):>10} {max(steps or [0]):>12.1f}")
+
+
+def sweep_7bit(messages):
+    """Every 7-bit CC message is sent"""
+    sent = []
+    table = CCRoutingTable({"cutoff": lambda v: sent.append(cc_to_cutoff(v))})
+    table.set_route(74, ["cutoff"])
+    for i in range(messages):
+        table.dispatch(74, round(i / (messages - 1) * 127))
+    return sent
+
+
+def sweep_14bit(messages):
+    """MSB/LSB pairs through the decoder, sent from the smoother's ticks"""
+    sent = []
+    smoother = ParamSmoother(DEFAULT_CONTROL_RATE)
+    decoder = HighResDecoder()
+    table = CCRoutingTable(
+        {"cutoff": lambda v: smoother.set("cutoff", cc_to_cutoff(v), sent.append)}
+    )
+    table.set_route(16, ["cutoff"])
+
+    ticks_per_message = DEFAULT_CONTROL_RATE / MESSAGE_RATE
+    next_tick = 0.0
+    for i in range(messages):
+        value = round(i / (messages - 1) * 16383)
+        for cc, byte in ((16, value >> 7), (48, value & 0x7F)):
+            event = decoder.feed(cc, byte, pairs=table.hires_pairs)
+            if event is not None:
+                table.dispatch_fine(event[1], event[2])
+        next_tick += ticks_per_message
+        while next_tick >= 1.0:
+            smoother.tick()
+            next_tick -= 1.0
+    while smoother.tick():
+        pass
+    return sent
+
+
+def main():
+    """Run the simulation"""
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 1.0
+    messages = int(seconds * MESSAGE_RATE)
+
+    print(f"{seconds:g} s sweep, {messages} controller values")
+    print(f"{'path':<22} {'sends':>8} {'distinct':>10} {'max step Hz':>12}")
+    summarize("7-bit, every message", sweep_7bit(messages))
+    summarize("14-bit + smoother", sweep_14bit(messages))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Benchmark OSC fan-out to several synth instances
+
+Sends a knob-drag style stream of one address to 1, 8 and 64 local
+receivers, once with a python-osc SimpleUDPClient per receiver calling
+send_message, and once with FanoutOSCClient, which encodes each message
+once and writes it with a sendto() loop on a single socket. Reports
+logical updates per second, i.e. one update reaches every receiver.
+"""
+
+import os
+import socket
+import sys
+import time
+
+# Add the parent directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pythonosc import udp_client
+
+from src.murnau.utils.fanout import FanoutOSCClient
+
+SYNTH_NAME = "legato_synth_stereo"
+BATCH = 100
+
+
+def make_receivers(count):
+    """Open count non-blocking local UDP receivers"""
+    receivers = []
+    for _ in range(count):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+        sock.bind(("127.0.0.1", 0))
+        sock.setblocking(False)
+        receivers.append(sock)
+    return receivers
+
+
+def drain(receivers):
+    """Discard all datagrams waiting on the receivers"""
+    for sock in receivers:
+        while True:
+            try:
+                sock.recv(65536)
+            except BlockingIOError:
+                break
+
+
+def run(send, receivers, count):
+    """Send count updates in batches, draining the receivers in between
+
+    Returns:
+        float: Updates per second
+    """
+    elapsed = 0.0
+    value = 20.0
+    for _ in range(count // BATCH):
+        start = time.perf_counter()
+        for _ in range(BATCH):
+            send("/cutoff_L", value)
+            value += 1.0
+        elapsed += time.perf_counter() - start
+        drain(receivers)
+    return count / elapsed
+
+
+def bench(destinations, count):
+    """Compare both approaches for one receiver count"""
+    receivers = make_receivers(destinations)
+    ports = [sock.getsockname()[1] for sock in receivers]
+
+    clients = [udp_client.SimpleUDPClient("127.0.0.1", port) for port in ports]
+
+    def send_each(address, value):
+        for client in clients:
+            client.send_message(f"/{SYNTH_NAME}{address}", float(value))
+
+    fanout = FanoutOSCClient([("127.0.0.1", port) for port in ports], SYNTH_NAME)
+
+    baseline = run(send_each, receivers, count)
+    fast = run(fanout.send, receivers, count)
+    print(
+        f"{destinations:>6} {baseline:>16,.0f} {fast:>16,.0f} "
+        f"{fast / baseline:>8.1f}x"
+    )
+
+    fanout.close()
+    for sock in receivers:
+        sock.close()
+
+
+def main():
+    """Run the benchmark"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+
+    print(f"{count} updates of /{SYNTH_NAME}/cutoff_L, updates per second")
+    print(f"{'dests':>6} {'send_message':>16} {'fanout':>16} {'speedup':>9}")
+    for destinations in (1, 8, 64):
+        bench(destinations, count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Compare the MIDI ingestion modes: idle CPU and note-to-OSC latency
+
+A loopback backend stands in for the MIDI device. Its "device" thread
+delivers messages the way rtmidi does: it calls the port callback directly
+in callback mode, or queues them for iter_pending() in poll mode. The
+handler sends one OSC message per note through OSCClient to a local UDP
+receiver, and latency is measured from delivery by the device to arrival
+at the receiver.
+
+Idle CPU is the process CPU time spent while the port is open and no
+messages arrive, as a percentage of one core.
+"""
+
+import os
+import socket
+import sys
+import threading
+import time
+
+# Add the parent directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mido
+
+from src.murnau.utils.midi_input import CALLBACK, POLL, MidiInput
+from src.murnau.utils.osc_client import OSCClient
+
+SYNTH_NAME = "legato_synth_stereo"
+
+
+class LoopbackInput(mido.ports.BaseInput):
+    """Input port whose messages come from feed() instead of a device"""
+
+    def _open(self, callback=None):
+        self.callback = callback
+
+    def _receive(self, block=True):
+        return None
+
+    def feed(self, message):
+        if self.callback is not None:
+            self.callback(message)
+        else:
+            with self._lock:
+                self._messages.append(message)
+
+
+class LoopbackBackend:
+    """Minimal stand-in for a mido Backend"""
+
+    def open_input(self, name=None, **kwargs):
+        return LoopbackInput(name, **kwargs)
+
+
+def idle_cpu(mode, seconds):
+    """CPU percentage used by an open, idle input"""
+    midi_input = MidiInput(lambda message: None, mode, backend=LoopbackBackend())
+    midi_input.open("loopback")
+    time.sleep(0.1)
+
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    time.sleep(seconds)
+    cpu = time.process_time() - cpu
+    wall = time.perf_counter() - wall
+
+    midi_input.close()
+    return 100.0 * cpu / wall
+
+
+def latency(mode, notes, spacing):
+    """Note-to-OSC latencies in milliseconds, sorted"""
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver.bind(("127.0.0.1", 0))
+    receiver.settimeout(1.0)
+    client = OSCClient("127.0.0.1", receiver.getsockname()[1], SYNTH_NAME)
+
+    def handler(message):
+        # Like handle_midi_message: one OSC send per note
+        client.send("/freq", message.note)
+
+    midi_input = MidiInput(handler, mode, backend=LoopbackBackend())
+    midi_input.open("loopback")
+
+    fed = []
+
+    def device():
+        for i in range(notes):
+            time.sleep(spacing)
+            fed.append(time.perf_counter())
+            midi_input.port.feed(mido.Message("note_on", note=i % 128))
+
+    thread = threading.Thread(target=device)
+    thread.start()
+    arrived = []
+    for _ in range(notes):
+        receiver.recv(64)
+        arrived.append(time.perf_counter())
+    thread.join()
+
+    midi_input.close()
+    receiver.close()
+    return sorted((a - f) * 1e3 for f, a in zip(fed, arrived))
+
+
+def percentile(values, p):
+    return values[min(len(values) - 1, int(p * len(values)))]
+
+
+def main():
+    """Run the benchmark"""
+    notes = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+
+    print(f"{notes} notes, 2ms apart; latency in ms, idle CPU in % of a core")
+    print(f"{'mode':<10} {'idle cpu':>9} {'p50':>8} {'p95':>8} {'max':>8}")
+    for mode in (POLL, CALLBACK):
+        cpu = idle_cpu(mode, 2.0)
+        lat = latency(mode, notes, 0.002)
+        print(
+            f"{mode:<10} {cpu:>8.2f}% {percentile(lat, 0.5):>8.3f} "
+            f"{percentile(lat, 0.95):>8.3f} {lat[-1]:>8.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""MIDI ingestion to OSC send latency, as recorded by the app itself
+
+Runs the production instrumentation without the GUI: a loopback MIDI
+input stamps each message, the handler sends OSC under the message's
+origin like MurnauUI.handle_midi_message, and the OSCSenderThread puts the
+messages on a local UDP socket and records the latency per message type.
+The numbers are the same histograms the status bar shows, so a regression
+in the send path shows up here first.
+"""
+
+import os
+import socket
+import sys
+import threading
+import time
+
+# Add the parent directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import mido
+
+from src.murnau.utils.latency import origin
+from src.murnau.utils.midi_input import CALLBACK, MidiInput
+from src.murnau.utils.sender import OSCSenderThread
+from src.murnau.utils.transport import get_transport
+
+SYNTH_NAME = "legato_synth_stereo"
+
+
+class LoopbackInput(mido.ports.BaseInput):
+    """Input port whose messages come from feed() instead of a device"""
+
+    def _open(self, callback=None):
+        self.callback = callback
+
+    def _receive(self, block=True):
+        return None
+
+    def feed(self, message):
+        self.callback(message)
+
+
+class LoopbackBackend:
+    """Minimal stand-in for a mido Backend"""
+
+    def open_input(self, name=None, **kwargs):
+        return LoopbackInput(name, **kwargs)
+
+
+def main():
+    """Run the benchmark"""
+    messages = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver.bind(("127.0.0.1", 0))
+    transport = get_transport("127.0.0.1", receiver.getsockname()[1])
+    sender = OSCSenderThread(
+        lambda address, value: transport.send_message(
+            f"/{SYNTH_NAME}{address}", float(value)
+        )
+    )
+    sender.start()
+
+    def handler(message, stamp):
+        # Like handle_midi_message: sends happen under the message's origin
+        with origin(message.type, stamp):
+            if message.type == "control_change":
+                sender.submit("/cutoff_L", message.value)
+            else:
+                sender.submit("/freq", message.note)
+                sender.submit("/gate", 1.0 if message.type == "note_on" else 0.0)
+
+    midi_input = MidiInput(handler, CALLBACK, backend=LoopbackBackend(), stamped=True)
+    midi_input.open("loopback")
+
+    def drain():
+        receiver.settimeout(0.5)
+        try:
+            while True:
+                receiver.recv(128)
+        except socket.timeout:
+            pass
+
+    thread = threading.Thread(target=drain)
+    thread.start()
+    for i in range(messages):
+        time.sleep(0.0005)
+        kind = ("note_on", "control_change", "note_off")[i % 3]
+        if kind == "control_change":
+            message = mido.Message(kind, control=74, value=i % 128)
+        else:
+            message = mido.Message(kind, note=60 + i % 12)
+        midi_input.port.feed(message)
+    sender.flush()
+    midi_input.close()
+    sender.stop()
+    thread.join()
+    receiver.close()
+
+    print(f"{messages} MIDI messages, latency in ms from ingestion to sendto")
+    print(f"{'type':<16} {'count':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+    for kind, stats in sender.latency.summary().items():
+        print(
+            f"{kind:<16} {stats['count']:>7} {stats['p50'] * 1e3:>8.3f} "
+            f"{stats['p95'] * 1e3:>8.3f} {stats['p99'] * 1e3:>8.3f} "
+            f"{stats['max'] * 1e3:>8.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Measure note onset error of the melody playback modes
+
+Plays the same melody against a local UDP receiver three ways:
+
+- sleep: the play_note loop, timed with time.sleep per note
+- deadline: play_deadlines, sends at absolute deadlines
+- timetag: play_timetagged, bundles sent ahead with NTP timetags
+
+For sleep and deadline the onset is the arrival time of each gate change.
+For timetag it is the bundle's timetag, or its arrival if it came late.
+Errors are reported against the requested timeline.
+"""
+
+import os
+import socket
+import sys
+import threading
+import time
+
+# Add the parent directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pythonosc.osc_bundle import OscBundle
+from pythonosc.osc_message import OscMessage
+
+from src.murnau.synth.melody import melody_timeline, midi_to_freq, play_note
+from src.murnau.synth.timeline import play_deadlines, play_timetagged
+from src.murnau.utils.clock import SessionClock, onset_report
+from src.murnau.utils.transport import get_transport
+
+SYNTH_NAME = "legato_synth_stereo"
+
+
+class Receiver(threading.Thread):
+    """Records arrival time and bundle timestamp of every gate change"""
+
+    def __init__(self, clock):
+        super().__init__(daemon=True)
+        self.clock = clock
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.settimeout(0.2)
+        self.port = self.sock.getsockname()[1]
+        self.onsets = []
+        self.running = True
+
+    def run(self):
+        while self.running:
+            try:
+                data = self.sock.recv(65536)
+            except socket.timeout:
+                continue
+            arrival = self.clock.now()
+            if data.startswith(b"#bundle"):
+                bundle = OscBundle(data)
+                if any(msg.address.endswith("/gate") for msg in bundle):
+                    self.onsets.append((arrival, bundle.timestamp))
+            elif OscMessage(data).address.endswith("/gate"):
+                self.onsets.append((arrival, None))
+
+    def stop(self):
+        self.running = False
+        self.join()
+        self.sock.close()
+
+
+def run(label, play, melody):
+    """Play the melody once and report its onset error"""
+    clock = SessionClock()
+    receiver = Receiver(clock)
+    receiver.start()
+    client = get_transport("127.0.0.1", receiver.port)
+    events = melody_timeline(melody)
+
+    start = clock.now() + 0.1
+    play(client, events, clock, start, melody)
+    time.sleep(0.1)
+    receiver.stop()
+
+    requested = [start + t for t, _ in events]
+    actual = []
+    for arrival, timestamp in receiver.onsets:
+        if timestamp is None:
+            actual.append(arrival)
+        else:
+            actual.append(max(arrival, timestamp - clock.wall_origin))
+
+    if label == "sleep":
+        # The sleep loop has no absolute start, align its first onset
+        requested = [r - requested[0] + actual[0] for r in requested]
+
+    report = onset_report(requested, actual)
+    print(
+        f"{label:<10} {report['events']:>7} {report['mean_ms']:>10.3f} "
+        f"{report['p95_ms']:>10.3f} {report['max_ms']:>10.3f} "
+        f"{report['drift_ms']:>10.3f}"
+    )
+
+
+def play_sleep(client, events, clock, start, melody):
+    clock.sleep_until(start)
+    for note, duration in melody:
+        play_note(client, midi_to_freq(note), duration, SYNTH_NAME)
+
+
+def play_deadline(client, events, clock, start, melody):
+    play_deadlines(client, events, SYNTH_NAME, clock, start)
+
+
+def play_timetag(client, events, clock, start, melody):
+    play_timetagged(client, events, SYNTH_NAME, clock, start)
+
+
+def main():
+    """Run the benchmark"""
+    notes = int(sys.argv[1]) if len(sys.argv) > 1 else 60
+    melody = [(60 + (i % 12), 0.05) for i in range(notes)]
+
+    print(f"{notes} notes of 50ms, errors in ms")
+    print(
+        f"{'mode':<10} {'events':>7} {'mean':>10} {'p95':>10} {'max':>10} "
+        f"{'drift':>10}"
+    )
+    run("sleep", play_sleep, melody)
+    run("deadline", play_deadline, melody)
+    run("timetag", play_timetag, melody)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Benchmark per-message OSC sends against bundled patch loads
+
+Sends the UI's initial patch to a local UDP receiver, once as one datagram
+per parameter and once through send_batch, and reports datagrams per patch
+and wall time per patch load.
+"""
+
+import os
+import socket
+import sys
+import time
+
+# Add the parent directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pythonosc import udp_client
+
+from src.murnau.utils.osc_client import send_batch
+
+SYNTH_NAME = "legato_synth_stereo"
+
+# Same parameters MurnauUI.init_parameters pushes on startup
+PATCH = [
+    ("/gain", 1.0),
+    ("/wave_type", 2),
+    ("/attack_L", 0.005),
+    ("/decay_L", 0.1),
+    ("/sustain_L", 0.9),
+    ("/release_L", 0.5),
+    ("/attack_R", 0.005),
+    ("/decay_R", 0.1),
+    ("/sustain_R", 0.9),
+    ("/release_R", 0.5),
+    ("/cutoff_L", 2000),
+    ("/cutoff_R", 2000),
+    ("/resonance_L", 0.5),
+    ("/resonance_R", 0.5),
+    ("/coarse_tune", 0),
+    ("/fine_tune", 0),
+    ("/stability", 0),
+    ("/start_freq_offset", 0),
+    ("/end_freq_offset", 0),
+    ("/ramp_time", 0),
+]
+
+
+def drain(sock):
+    """Count and discard all datagrams waiting on a socket"""
+    count = 0
+    while True:
+        try:
+            sock.recv(65536)
+        except BlockingIOError:
+            return count
+        count += 1
+
+
+def send_individually(client, messages):
+    """Send each parameter as its own datagram (pre-batching behaviour)"""
+    for address, value in messages:
+        client.send_message(address, float(value))
+
+
+def run(label, send_patch, client, receiver, rounds):
+    """Time repeated patch loads and count datagrams on the wire"""
+    messages = [(f"/{SYNTH_NAME}{address}", value) for address, value in PATCH]
+    datagrams = 0
+    elapsed = 0.0
+
+    for _ in range(rounds):
+        start = time.perf_counter()
+        send_patch(client, messages)
+        elapsed += time.perf_counter() - start
+        # Let the kernel deliver loopback traffic before counting it
+        time.sleep(0.0005)
+        datagrams += drain(receiver)
+
+    print(
+        f"{label:<14} {datagrams / rounds:>10.1f} " f"{elapsed / rounds * 1e6:>14.1f}"
+    )
+
+
+def main():
+    """Run the benchmark"""
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+    receiver.bind(("127.0.0.1", 0))
+    receiver.setblocking(False)
+    port = receiver.getsockname()[1]
+
+    client = udp_client.SimpleUDPClient("127.0.0.1", port)
+
+    print(f"Patch of {len(PATCH)} parameters, {rounds} loads")
+    print(f"{'mode':<14} {'datagrams':>10} {'us per load':>14}")
+    run("per-message", send_individually, client, receiver, rounds)
+    run("bundled", send_batch, client, receiver, rounds)
+
+    receiver.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""Micro-benchmark of single-parameter OSC sends
+
+Compares python-osc's send_message, which rebuilds the whole message for
+every call, against OSCClient.send and its pre-encoded packet templates.
+Reports messages per second for a knob-drag style stream of one address.
+"""
+
+import os
+import socket
+import sys
+import time
+
+# Add the parent directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pythonosc import udp_client
+
+from src.murnau.utils.osc_client import OSCClient
+
+SYNTH_NAME = "legato_synth_stereo"
+BATCH = 1000
+
+
+def drain(sock):
+    """Discard all datagrams waiting on a socket"""
+    while True:
+        try:
+            sock.recv(65536)
+        except BlockingIOError:
+            return
+
+
+def run(label, send, receiver, count):
+    """Send count messages in batches, draining the receiver in between"""
+    elapsed = 0.0
+    value = 20.0
+    for _ in range(count // BATCH):
+        start = time.perf_counter()
+        for _ in range(BATCH):
+            send("/cutoff_L", value)
+            value += 1.0
+        elapsed += time.perf_counter() - start
+        drain(receiver)
+
+    print(f"{label:<14} {count / elapsed:>14,.0f}")
+    return count / elapsed
+
+
+def main():
+    """Run the benchmark"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+    receiver = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    receiver.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+    receiver.bind(("127.0.0.1", 0))
+    receiver.setblocking(False)
+    port = receiver.getsockname()[1]
+
+    simple = udp_client.SimpleUDPClient("127.0.0.1", port)
+    templated = OSCClient("127.0.0.1", port, SYNTH_NAME)
+
+    def send_message(address, value):
+        # The pre-template OSCClient.send path
+        simple.send_message(f"/{SYNTH_NAME}{address}", float(value))
+
+    print(f"{count} sends of /{SYNTH_NAME}/cutoff_L")
+    print(f"{'mode':<14} {'msgs per sec':>14}")
+    baseline = run("send_message", send_message, receiver, count)
+    fast = run("templated", templated.send, receiver, count)
+    print(f"speedup: {fast / baseline:.1f}x")
+
+    receiver.close()
+
+
+if __name__ == "__main__":
+    main()
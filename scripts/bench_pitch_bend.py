@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Benchmark pitch bend resampling
+
+Flicks the pitch wheel from rest up, down and back at several speeds,
+with wheel messages every 100 us, through PitchBendEngine at a range of
+control rates and glide times. Reports wheel messages in, /freq messages
+out and the largest step between consecutive /freq values in cents: the
+output stays bounded by the control rate and the steps shrink as the
+glide grows.
+"""
+
+import os
+import sys
+
+# Add the parent directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.murnau.utils.pitch_bend import PitchBendEngine
+
+MESSAGE_INTERVAL = 0.0001
+SWEEPS = (0.05, 0.2, 1.0)  # seconds per flick
+
+
+def wheel(phase):
+    """Wheel position of a flick from rest up, down and back at a phase 0-1"""
+    if phase < 0.25:
+        return round(phase * 4 * 8191)
+    if phase < 0.75:
+        return round(8191 - (phase - 0.25) * 2 * 16383)
+    return round(-8192 + (phase - 0.75) * 4 * 8192)
+
+
+def run(rate, glide, sweep, bend_range):
+    """Flick the wheel once and let the bend settle
+
+    Returns:
+        dict: Engine stats
+    """
+    engine = PitchBendEngine(lambda freq: None, rate, glide, bend_range)
+    engine.note(440.0)
+    messages = round(sweep / MESSAGE_INTERVAL)
+    per_tick = max(1, round(messages / (sweep * rate)))
+    for index in range(messages + 1):
+        engine.bend(wheel(index / messages))
+        if index % per_tick == per_tick - 1:
+            engine.tick()
+    while engine.tick():
+        pass
+    return engine.stats()
+
+
+def main():
+    """Run the benchmark"""
+    bend_range = float(sys.argv[1]) if len(sys.argv) > 1 else 2.0
+
+    print(f"Pitch wheel flicks over +/-{bend_range:g} semitones")
+    print(
+        f"{'flick s':>8} {'rate Hz':>8} {'glide ms':>9} {'wheel in':>9} "
+        f"{'/freq out':>10} {'max step c':>11}"
+    )
+    for sweep in SWEEPS:
+        for rate in (100, 200, 500):
+            for glide in (0.0, 0.015, 0.05):
+                stats = run(rate, glide, sweep, bend_range)
+                print(
+                    f"{sweep:>8g} {rate:>8} {glide * 1000:>9g} "
+                    f"{stats['received']:>9} {stats['emitted']:>10} "
+                    f"{stats['max_step_cents']:>11.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
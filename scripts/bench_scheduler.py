@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""Benchmark onset jitter of the event scheduler against time.sleep
+
+Runs a steady pulse of events, one every 10 ms by default, two ways:
+
+- sleep: a loop of relative time.sleep(period) calls, the way the
+  sequencers used to wait
+- scheduler: Scheduler events at absolute deadlines, slept then spun
+
+Each onset is compared with its ideal time on the pulse grid. Prints a
+histogram of the absolute onset errors per method and the onset report,
+whose drift shows how the sleep loop's errors add up over the run.
+"""
+
+import os
+import sys
+import time
+
+# Add the parent directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.murnau.synth.scheduler import Scheduler
+from src.murnau.utils.clock import SessionClock, onset_report
+
+# Upper edges of the histogram buckets, in seconds
+BUCKETS = (25e-6, 50e-6, 100e-6, 250e-6, 500e-6, 1e-3, 2e-3, 5e-3, 10e-3)
+
+HISTOGRAM_WIDTH = 40
+
+
+def run_sleep(count, period):
+    """Pulse with relative sleeps
+
+    Returns:
+        tuple: (requested onsets, actual onsets)
+    """
+    clock = SessionClock()
+    start = clock.now()
+    actual = []
+    for _ in range(count):
+        time.sleep(period)
+        actual.append(clock.now())
+    requested = [start + (i + 1) * period for i in range(count)]
+    return requested, actual
+
+
+def run_scheduler(count, period):
+    """Pulse with scheduler events
+
+    Returns:
+        tuple: (requested onsets, actual onsets)
+    """
+    scheduler = Scheduler()
+    clock = scheduler.clock
+    start = clock.now()
+    actual = []
+    requested = [start + (i + 1) * period for i in range(count)]
+    for t in requested:
+        scheduler.at(t, lambda: actual.append(clock.now()))
+    scheduler.run()
+    return requested, actual
+
+
+def histogram(requested, actual):
+    """Print the absolute onset errors bucketed by BUCKETS"""
+    counts = [0] * (len(BUCKETS) + 1)
+    for r, a in zip(requested, actual):
+        error = abs(a - r)
+        index = next((i for i, edge in enumerate(BUCKETS) if error < edge), -1)
+        counts[index] += 1
+    largest = max(counts)
+    labels = [f"< {edge * 1e6:g} us" for edge in BUCKETS]
+    labels.append(f">= {BUCKETS[-1] * 1e6:g} us")
+    for label, n in zip(labels, counts):
+        bar = "#" * round(n / largest * HISTOGRAM_WIDTH) if largest else ""
+        print(f"  {label:>13} {n:>6} {bar}")
+
+
+def main():
+    """Run the benchmark"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    period = float(sys.argv[2]) if len(sys.argv) > 2 else 0.01
+
+    print(f"{count} events every {period * 1e3:g} ms")
+    for label, run in (("sleep", run_sleep), ("scheduler", run_scheduler)):
+        requested, actual = run(count, period)
+        report = onset_report(requested, actual)
+        print(
+            f"\n{label}: mean {report['mean_ms']:.3f} ms, "
+            f"p95 {report['p95_ms']:.3f} ms, max {report['max_ms']:.3f} ms, "
+            f"drift {report['drift_ms']:.3f} ms"
+        )
+        histogram(requested, actual)
+
+
+if __name__ == "__main__":
+    main()
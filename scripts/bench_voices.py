@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Benchmark polyphonic voice allocation
+
+Plays a dense stream of overlapping six-note chords on pools of 4, 8 and
+16 voices with each allocation policy. Reports the allocator's own cost
+per note event, the event rate of PolySynth sending every voice's /freq
+and /gate to local UDP receivers standing in for synth instances, and how
+many notes each policy had to steal.
+"""
+
+import os
+import random
+import socket
+import sys
+import time
+
+# Add the parent directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.murnau.utils.osc_client import OSCClient
+from src.murnau.utils.voices import POLICIES, PolySynth, VoiceAllocator
+
+SYNTH_NAME = "legato_synth_stereo"
+CHORD_SIZE = 6
+BATCH = 100
+
+
+def make_receivers(count):
+    """Open count non-blocking local UDP receivers"""
+    receivers = []
+    for _ in range(count):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)
+        sock.bind(("127.0.0.1", 0))
+        sock.setblocking(False)
+        receivers.append(sock)
+    return receivers
+
+
+def drain(receivers):
+    """Discard all datagrams waiting on the receivers"""
+    for sock in receivers:
+        while True:
+            try:
+                sock.recv(65536)
+            except BlockingIOError:
+                break
+
+
+def chord_stream(count, seed=1234):
+    """Note events of overlapping chords, each released two chords later
+
+    Returns:
+        list: (is_note_on, note, velocity) tuples
+    """
+    rng = random.Random(seed)
+    events = []
+    held = []
+    while len(events) < count:
+        root = rng.randrange(36, 72)
+        chord = sorted(
+            {root + rng.choice((0, 3, 4, 7, 10, 14, 17, 21)) for _ in range(CHORD_SIZE)}
+        )
+        for note in chord:
+            events.append((True, note, rng.randrange(20, 128)))
+        held.append(chord)
+        if len(held) > 2:
+            for note in held.pop(0):
+                events.append((False, note, 0))
+    return events[:count]
+
+
+def bench_allocator(voices, policy, events):
+    """Allocator cost per event in nanoseconds, and the steals"""
+    allocator = VoiceAllocator(voices, policy)
+    note_on = allocator.note_on
+    note_off = allocator.note_off
+    start = time.perf_counter()
+    for is_on, note, velocity in events:
+        if is_on:
+            note_on(note, velocity)
+        else:
+            note_off(note)
+    elapsed = time.perf_counter() - start
+    return elapsed / len(events) * 1e9, allocator.steals
+
+
+def bench_send(voices, policy, events):
+    """PolySynth note events per second with sends to local receivers"""
+    receivers = make_receivers(voices)
+    clients = [
+        OSCClient("127.0.0.1", sock.getsockname()[1], SYNTH_NAME) for sock in receivers
+    ]
+    poly = PolySynth([client.send for client in clients], policy)
+
+    elapsed = 0.0
+    for offset in range(0, len(events), BATCH):
+        start = time.perf_counter()
+        for is_on, note, velocity in events[offset : offset + BATCH]:
+            if is_on:
+                poly.note_on(note, velocity)
+            else:
+                poly.note_off(note)
+        elapsed += time.perf_counter() - start
+        drain(receivers)
+
+    poly.all_notes_off()
+    for sock in receivers:
+        sock.close()
+    return len(events) / elapsed
+
+
+def main():
+    """Run the benchmark"""
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    events = chord_stream(count)
+
+    print(f"{count} note events of overlapping {CHORD_SIZE}-note chords")
+    print(
+        f"{'voices':>6} {'policy':>11} {'alloc ns/event':>15} "
+        f"{'events/s':>12} {'steals':>8}"
+    )
+    for voices in (4, 8, 16):
+        for policy in POLICIES:
+            ns, steals = bench_allocator(voices, policy, events)
+            rate = bench_send(voices, policy, events)
+            print(f"{voices:>6} {policy:>11} {ns:>15,.0f} {rate:>12,.0f} {steals:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""Compare the OSC output of two session logs
+
+Usage: osc_diff.py A B [TOLERANCE]
+
+Lists every address whose value sequence differs between the logs, e.g.
+a session recorded before and after a change to the send path, replayed
+from the same MIDI input. Exits with status 1 if the outputs differ.
+"""
+
+import os
+import sys
+
+# Add the parent directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.murnau.utils.session_log import SessionLog, diff_osc
+
+
+def main():
+    """Run the comparison"""
+    if len(sys.argv) < 3:
+        print(__doc__)
+        sys.exit(2)
+    tolerance = float(sys.argv[3]) if len(sys.argv) > 3 else 0.0
+
+    with SessionLog(sys.argv[1]) as a, SessionLog(sys.argv[2]) as b:
+        differences = diff_osc(a, b, tolerance)
+
+    if not differences:
+        print("OSC output matches")
+        return
+    print(f"{'address':<24} {'a':>8} {'b':>8} {'first':>8} {'max error':>12}")
+    for address, diff in differences.items():
+        first = "-" if diff["first"] is None else diff["first"]
+        print(
+            f"{address:<24} {diff['a']:>8} {diff['b']:>8} {first:>8} "
+            f"{diff['max_error']:>12.6g}"
+        )
+    sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Replay the OSC output of a session log against a synth
+
+Usage: replay_session.py LOG [SPEED] [IP] [PORT]
+
+Sends every OSC message recorded in LOG through the OSC sender thread, as
+the UI did, at SPEED times the recorded pace ("max" for as fast as
+possible, 1 by default). Prints the replay rate, the onset error of paced
+replays and the sender's queue counters, so a session recorded with
+MurnauUI.start_recording() doubles as a load test.
+"""
+
+import os
+import sys
+
+# Add the parent directory to Python path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.murnau.utils.sender import OSCSenderThread
+from src.murnau.utils.session_log import SessionLog, replay
+from src.murnau.utils.transport import get_transport
+
+SYNTH_NAME = "legato_synth_stereo"
+
+
+def main():
+    """Run the replay"""
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(2)
+    path = sys.argv[1]
+    speed = sys.argv[2] if len(sys.argv) > 2 else "1"
+    speed = None if speed == "max" else float(speed)
+    ip = sys.argv[3] if len(sys.argv) > 3 else "127.0.0.1"
+    port = int(sys.argv[4]) if len(sys.argv) > 4 else 5510
+
+    transport = get_transport(ip, port)
+    sender = OSCSenderThread(
+        lambda address, value: transport.send_message(
+            f"/{SYNTH_NAME}{address}", float(value)
+        )
+    )
+    sender.start()
+    with SessionLog(path) as log:
+        print(f"{path}: {len(log)} records, {len(log.addresses)} OSC addresses")
+        report = replay(log.osc(), sender.submit, speed)
+    sender.flush()
+    sender.stop()
+
+    print(
+        f"{report['events']} OSC messages in {report['seconds']:.3f}s, "
+        f"{report['rate']:.0f} msg/s"
+    )
+    if speed is not None:
+        print(
+            f"onset error: mean {report['mean_ms']:.3f}ms, "
+            f"p95 {report['p95_ms']:.3f}ms, max {report['max_ms']:.3f}ms"
+        )
+    for key, value in sender.stats().items():
+        print(f"  {key}: {value:g}")
+
+
+if __name__ == "__main__":
+    main()
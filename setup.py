@@ -56,6 +56,7 @@ setup(
     },
     package_data={
         "murnau": ["../assets/images/*.png"],
+        "murnau.dsp": ["*.dsp", "*.faust"],
     },
     include_package_data=True,
 )
\ No newline at end of file
@@ -0,0 +1,66 @@
+"""Parameter schema parsed from Faust DSP declarations"""
+
+import re
+from collections import namedtuple
+
+from . import get_dsp_path
+
+# A continuous or stepped control declared in the DSP source
+Control = namedtuple("Control", ["name", "address", "init", "min", "max", "step"])
+
+_NUMBER = r"\s*([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)\s*"
+
+# hslider/vslider/nentry("label[meta...]", init, min, max, step)
+_CONTROL_RE = re.compile(
+    r"\b(?:hslider|vslider|nentry)\(\s*\"([^\"\[]*)((?:\[[^\]]*\])*)\"\s*,"
+    + ",".join([_NUMBER] * 4)
+    + r"\)"
+)
+_OSC_META_RE = re.compile(r"\[\s*osc\s*:\s*([^\]\s]+)\s*\]")
+
+
+def parse_controls(source):
+    """Parse the control declarations of a Faust DSP program
+
+    Args:
+        source (str): Faust source code
+
+    Returns:
+        dict: Control tuples keyed by OSC address (relative to the synth name)
+    """
+    controls = {}
+    for match in _CONTROL_RE.finditer(source):
+        label, meta = match.group(1).strip(), match.group(2)
+        init, low, high, step = (float(value) for value in match.group(3, 4, 5, 6))
+
+        osc = _OSC_META_RE.search(meta)
+        address = osc.group(1) if osc else f"/{label}"
+        controls[address] = Control(label, address, init, low, high, step)
+    return controls
+
+
+def load_controls(name="legato_synth"):
+    """Load the control declarations of a bundled DSP file
+
+    Args:
+        name (str): Name of the DSP file, see DSP_FILES
+
+    Returns:
+        dict: Control tuples keyed by OSC address
+    """
+    with open(get_dsp_path(name)) as f:
+        return parse_controls(f.read())
+
+
+def step_table(controls):
+    """Extract the quantization step of each control
+
+    Args:
+        controls (dict): Control tuples keyed by OSC address
+
+    Returns:
+        dict: Step sizes keyed by OSC address, zero-step controls omitted
+    """
+    return {
+        address: control.step for address, control in controls.items() if control.step
+    }
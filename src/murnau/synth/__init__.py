@@ -1,6 +1,33 @@
 """Synthesizer control and utility modules"""
 
-from .melody import init_synth, midi_to_freq, play_note
+from ..utils.tuning import Tuning, note_freq, retune
+from .melody import (
+    init_synth,
+    init_synth_async,
+    midi_to_freq,
+    play_melody_async,
+    play_melody_scheduled,
+    play_midi_file,
+    play_note,
+    play_note_async,
+)
+from .midi_player import MidiFilePlayer
 from .ramp_test import test_ramp
+from .scheduler import Scheduler
 
-__all__ = ["midi_to_freq", "play_note", "init_synth", "test_ramp"]
+__all__ = [
+    "midi_to_freq",
+    "play_note",
+    "init_synth",
+    "play_note_async",
+    "init_synth_async",
+    "play_melody_async",
+    "play_melody_scheduled",
+    "play_midi_file",
+    "MidiFilePlayer",
+    "test_ramp",
+    "Scheduler",
+    "Tuning",
+    "note_freq",
+    "retune",
+]
@@ -1,21 +1,70 @@
 """Melody playback functionality for Murnau synthesizer"""
 
-import math
+import asyncio
 import time
 
-from pythonosc import udp_client
+from ..utils.async_osc_client import AsyncOSCClient
+from ..utils.cc_routing import load_cc_map
+from ..utils.clock import SessionClock, onset_report
+from ..utils.osc_client import OSCClient, send_batch
+from ..utils.transport import get_transport
+from ..utils.tuning import note_freq
+from .midi_player import MidiFilePlayer
+from .scheduler import Scheduler
+from .timeline import DEFAULT_LEAD, play_deadlines, play_timetagged
+
+# Patch sent by init_synth
+INIT_PARAMS = [
+    # Set waveform to sawtooth
+    ("/wave_type", 2),
+    # Set ADSR (moderate values)
+    ("/attack_L", 0.01),
+    ("/decay_L", 0.1),
+    ("/sustain_L", 0.7),
+    ("/release_L", 0.3),
+    ("/attack_R", 0.01),
+    ("/decay_R", 0.1),
+    ("/sustain_R", 0.7),
+    ("/release_R", 0.3),
+    # Set filter cutoff high
+    ("/cutoff_L", 5000),
+    ("/cutoff_R", 5000),
+    ("/resonance_L", 0.5),
+    ("/resonance_R", 0.5),
+    # Set gain
+    ("/gain", 0.7),
+]
+
+# (midi_note, duration) pairs played when no melody is given
+DEFAULT_MELODY = [
+    (60, 0.5),  # C4
+    (64, 0.5),  # E4
+    (67, 0.5),  # G4
+    (72, 1.0),  # C5
+    (67, 0.5),  # G4
+    (64, 0.5),  # E4
+    (60, 1.0),  # C4
+]
+
+# Gap between notes in seconds
+NOTE_GAP = 0.05
+
+# Time given to the initial patch to settle in seconds
+SETTLE_TIME = 0.5
 
 
 def midi_to_freq(midi_note):
-    """Convert MIDI note number to frequency
+    """Convert MIDI note number to frequency in the active tuning
 
     Args:
-        midi_note (int): MIDI note number (0-127)
+        midi_note (float): MIDI note number, fractional for pitches between
+            the keys
 
     Returns:
-        float: Frequency in Hz
+        float: Frequency in Hz, None if the tuning leaves the key unmapped,
+        see tuning.note_freq()
     """
-    return 440.0 * math.pow(2.0, (midi_note - 69.0) / 12.0)
+    return note_freq(midi_note)
 
 
 def play_note(client, freq, duration, synth_name="legato_synth_stereo"):
@@ -40,38 +89,22 @@ def play_note(client, freq, duration, synth_name="legato_synth_stereo"):
     client.send_message(f"/{synth_name}/gate", 0.0)
 
     # Small gap between notes
-    time.sleep(0.05)
+    time.sleep(NOTE_GAP)
 
 
 def init_synth(client, synth_name="legato_synth_stereo"):
     """Initialize synth parameters
 
+    The whole patch is sent as a single OSC bundle so the synth applies it
+    atomically.
+
     Args:
         client: OSC UDP client instance
         synth_name (str): Name of the synthesizer
     """
-    # Set waveform to sawtooth
-    client.send_message(f"/{synth_name}/wave_type", 2)
-
-    # Set ADSR (moderate values)
-    client.send_message(f"/{synth_name}/attack_L", 0.01)
-    client.send_message(f"/{synth_name}/decay_L", 0.1)
-    client.send_message(f"/{synth_name}/sustain_L", 0.7)
-    client.send_message(f"/{synth_name}/release_L", 0.3)
-
-    client.send_message(f"/{synth_name}/attack_R", 0.01)
-    client.send_message(f"/{synth_name}/decay_R", 0.1)
-    client.send_message(f"/{synth_name}/sustain_R", 0.7)
-    client.send_message(f"/{synth_name}/release_R", 0.3)
-
-    # Set filter cutoff high
-    client.send_message(f"/{synth_name}/cutoff_L", 5000)
-    client.send_message(f"/{synth_name}/cutoff_R", 5000)
-    client.send_message(f"/{synth_name}/resonance_L", 0.5)
-    client.send_message(f"/{synth_name}/resonance_R", 0.5)
-
-    # Set gain
-    client.send_message(f"/{synth_name}/gain", 0.7)
+    send_batch(
+        client, [(f"/{synth_name}{address}", value) for address, value in INIT_PARAMS]
+    )
 
 
 def play_melody(
@@ -90,33 +123,231 @@ def play_melody(
     """
     # Default melody if none provided
     if melody_data is None:
-        melody_data = [
-            (60, 0.5),  # C4
-            (64, 0.5),  # E4
-            (67, 0.5),  # G4
-            (72, 1.0),  # C5
-            (67, 0.5),  # G4
-            (64, 0.5),  # E4
-            (60, 1.0),  # C4
-        ]
-
-    # Create OSC client
-    client = udp_client.SimpleUDPClient(osc_ip, osc_port)
+        melody_data = DEFAULT_MELODY
+
+    # Shared transport to the synth
+    client = get_transport(osc_ip, osc_port)
 
     # Initialize synth
     print("Initializing synth parameters...")
     init_synth(client, synth_name)
-    time.sleep(0.5)  # Wait for parameters to settle
+
+    # Every note is due at an absolute time, so timing errors do not add up
+    # over the melody; the first one waits for the parameters to settle
+    scheduler = Scheduler()
+    t = scheduler.clock.now() + SETTLE_TIME
+    for note, duration in melody_data:
+        freq = midi_to_freq(note)
+        # Keys the tuning leaves unmapped are silent, they play as rests
+        if freq is not None:
+            scheduler.at(t, _start_note, client, note, freq, duration, synth_name)
+            scheduler.at(t + duration, client.send_message, f"/{synth_name}/gate", 0.0)
+        t += duration + NOTE_GAP
 
     print("Playing melody...")
+    scheduler.run()
+
+    print("Melody finished!")
+
+
+def _start_note(client, note, freq, duration, synth_name):
+    """Send a scheduled note's frequency and gate on"""
+    print(f"Playing note: {note} (freq: {freq:.2f}Hz) for {duration}s")
+    client.send_message(f"/{synth_name}/freq", freq)
+    client.send_message(f"/{synth_name}/gate", 1.0)
+
+
+def melody_timeline(melody_data, gap=NOTE_GAP):
+    """Expand a melody into timed OSC events
 
-    # Play the melody
+    Notes follow each other exactly as with play_note: gate on for the note
+    duration, then a gap before the next note. Notes the tuning leaves
+    unmapped are rests.
+
+    Args:
+        melody_data (list): List of (midi_note, duration) tuples
+        gap (float): Silence between notes in seconds
+
+    Returns:
+        list: (time, [(address, value), ...]) events, times from zero
+    """
+    events = []
+    t = 0.0
     for note, duration in melody_data:
         freq = midi_to_freq(note)
-        print(f"Playing note: {note} (freq: {freq:.2f}Hz) for {duration}s")
-        play_note(client, freq, duration, synth_name)
+        if freq is not None:
+            events.append((t, [("/freq", freq), ("/gate", 1.0)]))
+            events.append((t + duration, [("/gate", 0.0)]))
+        t += duration + gap
+    return events
 
-    print("Melody finished!")
+
+def play_melody_scheduled(
+    melody_data=None,
+    osc_ip="127.0.0.1",
+    osc_port=5510,
+    synth_name="legato_synth_stereo",
+    timetags=True,
+    lead=DEFAULT_LEAD,
+):
+    """Play a melody against an absolute timeline instead of sleeping per note
+
+    With timetags each note is sent ``lead`` seconds early in a bundle
+    timetagged with its onset. Receivers that ignore timetags should use
+    timetags=False, which sends each note at its deadline instead.
+
+    Args:
+        melody_data (list): List of (midi_note, duration) tuples
+        osc_ip (str): IP address for OSC communication
+        osc_port (int): Port for OSC communication
+        synth_name (str): Name of the synthesizer
+        timetags (bool): Send timetagged bundles ahead of time
+        lead (float): Seconds bundles are sent ahead of their onset
+
+    Returns:
+        dict: Onset error report, see onset_report()
+    """
+    if melody_data is None:
+        melody_data = DEFAULT_MELODY
+
+    client = get_transport(osc_ip, osc_port)
+
+    print("Initializing synth parameters...")
+    init_synth(client, synth_name)
+
+    events = melody_timeline(melody_data)
+    clock = SessionClock()
+    start = clock.now() + SETTLE_TIME
+
+    print("Playing melody (scheduled)...")
+    if timetags:
+        sent = play_timetagged(client, events, synth_name, clock, start, lead)
+    else:
+        sent = play_deadlines(client, events, synth_name, clock, start)
+
+    requested = [start + t for t, _ in events]
+    # A bundle that arrives after its timetag is applied on arrival
+    actual = [max(r, s) for r, s in zip(requested, sent)] if timetags else sent
+    report = onset_report(requested, actual)
+
+    print(
+        f"Melody finished! Onset error: mean {report['mean_ms']:.3f}ms, "
+        f"max {report['max_ms']:.3f}ms"
+    )
+    return report
+
+
+def play_midi_file(
+    path,
+    osc_ip="127.0.0.1",
+    osc_port=5510,
+    synth_name="legato_synth_stereo",
+    cc_map_path=None,
+    velocity_address=None,
+):
+    """Play a standard MIDI file, streamed, with its CC automation
+
+    Unlike play_melody this takes velocities, controller changes and the
+    file's tempo map into account, see midi_player.
+
+    Args:
+        path (str): Path to a .mid file
+        osc_ip (str): IP address for OSC communication
+        osc_port (int): Port for OSC communication
+        synth_name (str): Name of the synthesizer
+        cc_map_path (str): CC mapping file for the automation, see
+            utils.cc_routing; None for the UI's default CCs
+        velocity_address (str): Address note-on velocities are sent to,
+            None to ignore velocity
+
+    Returns:
+        dict: Onset error report, see onset_report()
+    """
+    client = OSCClient(osc_ip, osc_port, synth_name)
+    cc_map = None if cc_map_path is None else load_cc_map(cc_map_path)
+    player = MidiFilePlayer(client, cc_map, velocity_address=velocity_address)
+
+    print("Initializing synth parameters...")
+    init_synth(client.client, synth_name)
+
+    print(f"Playing {path}...")
+    report = player.play(path, start=player.clock.now() + SETTLE_TIME)
+
+    print(
+        f"MIDI file finished! {report['events']} events, onset error: "
+        f"mean {report['mean_ms']:.3f}ms, p95 {report['p95_ms']:.3f}ms, "
+        f"max {report['max_ms']:.3f}ms"
+    )
+    return report
+
+
+async def play_note_async(client, freq, duration):
+    """Play a note without blocking the event loop
+
+    Args:
+        client: Connected AsyncOSCClient
+        freq (float): Frequency in Hz
+        duration (float): Duration in seconds
+    """
+    client.send("/freq", freq)
+    client.send("/gate", 1.0)
+
+    await asyncio.sleep(duration)
+
+    client.send("/gate", 0.0)
+
+    # Small gap between notes
+    await asyncio.sleep(NOTE_GAP)
+
+
+async def init_synth_async(client):
+    """Initialize synth parameters and wait for them to settle
+
+    Args:
+        client: Connected AsyncOSCClient
+    """
+    client.send_batch(INIT_PARAMS)
+    await asyncio.sleep(SETTLE_TIME)
+
+
+async def play_melody_async(
+    melody_data=None,
+    osc_ip="127.0.0.1",
+    osc_port=5510,
+    synth_name="legato_synth_stereo",
+    client=None,
+):
+    """Play a melody as a coroutine
+
+    Many melodies can run concurrently on one event loop, e.g. one per
+    synth instance with asyncio.gather().
+
+    Args:
+        melody_data (list): List of (midi_note, duration) tuples
+        osc_ip (str): IP address for OSC communication
+        osc_port (int): Port for OSC communication
+        synth_name (str): Name of the synthesizer
+        client: Connected AsyncOSCClient to use instead of creating one
+    """
+    if melody_data is None:
+        melody_data = DEFAULT_MELODY
+
+    own_client = client is None
+    if own_client:
+        client = await AsyncOSCClient(osc_ip, osc_port, synth_name).connect()
+
+    try:
+        await init_synth_async(client)
+        for note, duration in melody_data:
+            freq = midi_to_freq(note)
+            if freq is None:
+                # Unmapped key, rest for the note's length
+                await asyncio.sleep(duration + NOTE_GAP)
+            else:
+                await play_note_async(client, freq, duration)
+    finally:
+        if own_client:
+            await client.close()
 
 
 def main():
@@ -0,0 +1,266 @@
+"""Streaming playback of standard MIDI files
+
+Tracks are read one message at a time and merged with heapq.merge, so
+playback never builds a merged copy or an event list of the file: memory
+stays constant beyond the tracks mido has parsed, however long the file
+plays. Ticks are converted to seconds through the tempo map as the merged
+stream passes each tempo change. Every time is computed from the start of
+the current tempo segment, not accumulated from deltas, so hours of
+playback do not collect rounding errors.
+
+Notes drive the monophonic synth like the UI's MIDI input does: the held
+notes decide the sounding one, /freq follows it and /gate opens when the
+first note starts and closes when the last one ends. Control changes are
+automation through a parameter map, CC bindings as in utils.cc_routing
+scaled to the ranges the DSP declares.
+
+Events are sent at absolute deadlines on a SessionClock, so a late wake-up
+delays one event instead of everything after it.
+"""
+
+import heapq
+
+import mido
+
+from ..dsp.schema import load_controls
+from ..utils.cc_routing import DEFAULT_CCS, binding_values
+from ..utils.clock import OnsetStats, SessionClock
+from ..utils.note_stack import LAST, NoteStack
+from ..utils.tuning import note_freq
+
+# Tempo of a MIDI file until its first tempo change, microseconds per beat
+DEFAULT_TEMPO = 500000
+
+# CC target per controller number, see cc_routing.DEFAULT_CCS
+DEFAULT_CC_MAP = {cc: target for target, cc in DEFAULT_CCS.items()}
+
+# Channel mode messages that release every note: all sound off, all notes off
+ALL_NOTES_OFF = (120, 123)
+
+# Longest single wait between stop() checks, in seconds
+STOP_CHECK_INTERVAL = 0.1
+
+# Time given to the first event after play() is called, in seconds
+START_DELAY = 0.1
+
+
+def _track_messages(track):
+    """Messages of one track with absolute ticks, one at a time"""
+    tick = 0
+    for message in track:
+        tick += message.time
+        yield tick, message
+
+
+def file_messages(midi_file):
+    """Stream the messages of all tracks in time order
+
+    Messages at the same tick keep track order. Tempo changes are applied
+    to the messages after them and are not yielded.
+
+    Args:
+        midi_file: mido.MidiFile, or anything with its tracks,
+            ticks_per_beat and type attributes
+
+    Yields:
+        tuple: (seconds from the start, mido message)
+
+    Raises:
+        ValueError: For type 2 files, whose tracks are independent songs
+    """
+    if midi_file.type == 2:
+        raise ValueError("Type 2 MIDI files are not supported")
+    ticks_per_beat = midi_file.ticks_per_beat
+
+    # Start of the current tempo segment
+    segment_tick = 0
+    segment_seconds = 0.0
+    seconds_per_tick = DEFAULT_TEMPO / (1e6 * ticks_per_beat)
+
+    merged = heapq.merge(
+        *(_track_messages(track) for track in midi_file.tracks),
+        key=lambda event: event[0],
+    )
+    for tick, message in merged:
+        seconds = segment_seconds + (tick - segment_tick) * seconds_per_tick
+        if message.type == "set_tempo":
+            segment_tick = tick
+            segment_seconds = seconds
+            seconds_per_tick = message.tempo / (1e6 * ticks_per_beat)
+        elif not message.is_meta:
+            yield seconds, message
+
+
+def parameter_map(cc_map=None, controls=None):
+    """Compile CC bindings to parameter values
+
+    Args:
+        cc_map (dict): CC number -> target name, Binding or list of them, as
+            read by utils.cc_routing.load_cc_map(); None for DEFAULT_CC_MAP
+        controls (dict): DSP controls keyed by OSC address, see
+            dsp.schema; None for the bundled synth's
+
+    Returns:
+        dict: CC number -> tuple of (address, 128 values) pairs, values
+            scaled to the control's range and quantized to its step
+
+    Raises:
+        ValueError: If a binding targets a control the DSP does not declare
+    """
+    if cc_map is None:
+        cc_map = DEFAULT_CC_MAP
+    if controls is None:
+        controls = load_controls("legato_synth")
+
+    return {
+        int(cc): binding_values(entries, controls) for cc, entries in cc_map.items()
+    }
+
+
+class MidiFilePlayer:
+    """Plays MIDI files to the synth at absolute deadlines"""
+
+    def __init__(self, client, cc_map=None, controls=None, velocity_address=None):
+        """Initialize the player
+
+        Args:
+            client: OSCClient, addresses are sent without the synth prefix
+            cc_map (dict): CC bindings for automation, see parameter_map()
+            controls (dict): DSP controls keyed by OSC address
+            velocity_address (str): Address note-on velocities are sent to,
+                scaled to 0-1, e.g. "/gain"; None to ignore velocity
+        """
+        self.client = client
+        self.parameters = parameter_map(cc_map, controls)
+        self.velocity_address = velocity_address
+        self.clock = SessionClock()
+        self._notes = NoteStack(LAST)
+        self._current = None
+        self._stopped = False
+
+    def reset(self):
+        """Forget held notes"""
+        self._notes.clear()
+        self._current = None
+
+    def translate(self, message):
+        """Turn one MIDI message into OSC messages
+
+        Args:
+            message: mido message
+
+        Returns:
+            list: (address, value) pairs, empty if the message changes nothing
+        """
+        kind = message.type
+        if kind == "note_on" and message.velocity > 0:
+            if note_freq(message.note) is None:
+                return []
+            self._notes.push(message.note)
+            return self._follow(message.velocity)
+        if kind == "note_off" or kind == "note_on":
+            self._notes.remove(message.note)
+            return self._follow()
+        if kind == "control_change":
+            if message.control in ALL_NOTES_OFF:
+                self._notes.clear()
+                return self._follow()
+            slots = self.parameters.get(message.control, ())
+            return [(address, values[message.value]) for address, values in slots]
+        return []
+
+    def _follow(self, velocity=None):
+        """OSC messages moving the voice to the sounding note"""
+        note = self._notes.current()
+        if note == self._current:
+            return []
+        messages = []
+        if note is None:
+            messages.append(("/gate", 0.0))
+        else:
+            messages.append(("/freq", note_freq(note)))
+            if self._current is None:
+                if velocity is not None and self.velocity_address is not None:
+                    messages.append((self.velocity_address, velocity / 127.0))
+                messages.append(("/gate", 1.0))
+        self._current = note
+        return messages
+
+    def events(self, midi_file):
+        """Stream a file as timed OSC batches
+
+        Messages at the same time are sent together as one bundle.
+
+        Args:
+            midi_file: mido.MidiFile or a path to one
+
+        Yields:
+            tuple: (seconds from the start, [(address, value), ...])
+        """
+        if isinstance(midi_file, str):
+            midi_file = mido.MidiFile(midi_file)
+        self.reset()
+        batch_time = None
+        batch = []
+        for seconds, message in file_messages(midi_file):
+            messages = self.translate(message)
+            if not messages:
+                continue
+            if batch and seconds != batch_time:
+                yield batch_time, batch
+                batch = []
+            batch_time = seconds
+            batch.extend(messages)
+        if batch:
+            yield batch_time, batch
+
+    def play(self, midi_file, start=None):
+        """Play a file, blocking until it ends or stop() is called
+
+        Args:
+            midi_file: mido.MidiFile or a path to one
+            start (float): Session time of the file's start, None for
+                START_DELAY from now
+
+        Returns:
+            dict: Onset error report, see clock.onset_report()
+        """
+        clock = self.clock
+        if start is None:
+            start = clock.now() + START_DELAY
+        self._stopped = False
+        stats = OnsetStats()
+        # Last gate sent; events() reads ahead, so the note state may not
+        # have been sent yet
+        gate = 0.0
+        for t, messages in self.events(midi_file):
+            deadline = start + t
+            if not self._wait(deadline):
+                break
+            self.client.send_batch(messages)
+            stats.add(deadline, clock.now())
+            for address, value in messages:
+                if address == "/gate":
+                    gate = value
+
+        if gate:
+            # Stopped, or the file ended with notes still held
+            self.client.send_batch([("/gate", 0.0)])
+        self.reset()
+        return stats.report()
+
+    def stop(self):
+        """Stop play() from another thread at its next check"""
+        self._stopped = True
+
+    def _wait(self, deadline):
+        """Wait for a deadline, False if stopped before it"""
+        clock = self.clock
+        while deadline - clock.now() > STOP_CHECK_INTERVAL:
+            # Short relative waits keep stop() responsive, the final wait
+            # is absolute so they add no drift
+            clock.sleep_until(clock.now() + STOP_CHECK_INTERVAL)
+            if self._stopped:
+                return False
+        clock.sleep_until(deadline)
+        return not self._stopped
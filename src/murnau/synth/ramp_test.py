@@ -1,8 +1,11 @@
 """Frequency ramp testing functionality for Murnau synthesizer"""
 
-import time
+from ..utils.osc_client import send_batch
+from ..utils.transport import get_transport
+from .scheduler import Scheduler
 
-from pythonosc import udp_client
+# Time each ramp's release is given before the next one starts, in seconds
+RELEASE_TIME = 0.5
 
 
 def test_ramp(
@@ -26,33 +29,53 @@ def test_ramp(
             (880, 440, 0.5, 0.5),  # Fast down
         ]
 
-    # Create OSC client
-    client = udp_client.SimpleUDPClient(osc_ip, osc_port)
+    # Shared transport to the synth
+    client = get_transport(osc_ip, osc_port)
 
     # Initialize synth with basic parameters
     print("Initializing synth...")
-    client.send_message(f"/{synth_name}/wave_type", 2)  # sawtooth
-    client.send_message(f"/{synth_name}/gain", 0.7)
-    client.send_message(f"/{synth_name}/cutoff_L", 5000)
-    client.send_message(f"/{synth_name}/cutoff_R", 5000)
-
+    send_batch(
+        client,
+        [
+            (f"/{synth_name}/wave_type", 2),  # sawtooth
+            (f"/{synth_name}/gain", 0.7),
+            (f"/{synth_name}/cutoff_L", 5000),
+            (f"/{synth_name}/cutoff_R", 5000),
+        ],
+    )
+
+    # Each ramp starts at an absolute time, so waits do not drift apart
+    scheduler = Scheduler()
+    t = scheduler.clock.now()
     for start_freq, end_freq, ramp_time, hold_time in tests:
-        print(f"\nTesting ramp from {start_freq}Hz to {end_freq}Hz over {ramp_time}s")
-
-        # Set ramp parameters
-        client.send_message(f"/{synth_name}/start_freq", start_freq)
-        client.send_message(f"/{synth_name}/end_freq", end_freq)
-        client.send_message(f"/{synth_name}/ramp_time", ramp_time)
-
-        # Start the sound
-        client.send_message(f"/{synth_name}/gate", 1.0)
-
-        # Wait for ramp and hold
-        time.sleep(ramp_time + hold_time)
-
-        # Stop the sound
-        client.send_message(f"/{synth_name}/gate", 0.0)
-        time.sleep(0.5)  # Wait for release
+        scheduler.at(
+            t, _start_ramp, client, synth_name, start_freq, end_freq, ramp_time
+        )
+        # Stop the sound after the ramp and hold
+        t += ramp_time + hold_time
+        scheduler.at(t, client.send_message, f"/{synth_name}/gate", 0.0)
+        t += RELEASE_TIME
+
+    # Run through the last release
+    scheduler.run(until=t)
+
+
+def _start_ramp(client, synth_name, start_freq, end_freq, ramp_time):
+    """Set a ramp's parameters and start the sound"""
+    print(f"\nTesting ramp from {start_freq}Hz to {end_freq}Hz over {ramp_time}s")
+
+    # Set ramp parameters in one bundle so they take effect together
+    send_batch(
+        client,
+        [
+            (f"/{synth_name}/start_freq", start_freq),
+            (f"/{synth_name}/end_freq", end_freq),
+            (f"/{synth_name}/ramp_time", ramp_time),
+        ],
+    )
+
+    # Start the sound
+    client.send_message(f"/{synth_name}/gate", 1.0)
 
 
 def main():
@@ -0,0 +1,159 @@
+"""Timed event scheduler on absolute deadlines
+
+Sequencers submit callbacks at session times and the scheduler runs them
+in time order from a priority queue. Every wait targets an absolute
+deadline on a SessionClock, sleeping most of the way and spinning the last
+stretch, so a late wake-up delays one event instead of shifting every
+event after it as chained relative sleeps do.
+
+A lead time dispatches every event that many seconds before its time, for
+callbacks that send ahead, e.g. OSC bundles timetagged with the event
+time. Events may be submitted from other threads or from callbacks while
+the scheduler runs: long waits are cut into CHECK_INTERVAL slices and the
+queue is looked at again after each one.
+"""
+
+import heapq
+import itertools
+import threading
+
+from ..utils.clock import SPIN_THRESHOLD, OnsetStats, SessionClock
+
+# Longest single wait before the queue is checked again, in seconds
+CHECK_INTERVAL = 0.05
+
+
+class ScheduledEvent:
+    """A callback due at a session time, see Scheduler.at()"""
+
+    __slots__ = ("time", "callback", "args", "cancelled")
+
+    def __init__(self, time, callback, args):
+        self.time = time
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def __repr__(self):
+        return f"ScheduledEvent({self.time:.6f}, {self.callback!r})"
+
+
+class Scheduler:
+    """Priority queue of timed callbacks run at absolute deadlines"""
+
+    def __init__(self, clock=None, lead=0.0, spin=SPIN_THRESHOLD):
+        """Initialize an empty scheduler
+
+        Args:
+            clock (SessionClock): Clock the event times refer to, None for
+                a new one
+            lead (float): Seconds each event is dispatched before its time
+            spin (float): Final part of each wait that is busy-waited
+        """
+        self.clock = SessionClock() if clock is None else clock
+        self.lead = lead
+        self.spin = spin
+
+        self._lock = threading.Lock()
+        self._queue = []  # (time, sequence, event) heap
+        self._sequence = itertools.count()  # keeps submission order on ties
+        self._stopped = False
+
+    def __len__(self):
+        with self._lock:
+            return sum(1 for _, _, event in self._queue if not event.cancelled)
+
+    def at(self, t, callback, *args):
+        """Submit a callback at a session time
+
+        Events at the same time run in submission order.
+
+        Args:
+            t (float): Session time the event is due
+            callback: Callable to run
+            *args: Arguments passed to the callback
+
+        Returns:
+            ScheduledEvent: Handle for cancel()
+        """
+        event = ScheduledEvent(t, callback, args)
+        with self._lock:
+            heapq.heappush(self._queue, (t, next(self._sequence), event))
+        return event
+
+    def after(self, delay, callback, *args):
+        """Submit a callback a delay from now
+
+        Args:
+            delay (float): Seconds from now
+            callback: Callable to run
+            *args: Arguments passed to the callback
+
+        Returns:
+            ScheduledEvent: Handle for cancel()
+        """
+        return self.at(self.clock.now() + delay, callback, *args)
+
+    def cancel(self, event):
+        """Drop a submitted event that has not run yet
+
+        Args:
+            event (ScheduledEvent): Handle returned by at() or after()
+        """
+        event.cancelled = True
+
+    def clear(self):
+        """Drop every pending event"""
+        with self._lock:
+            self._queue.clear()
+
+    def stop(self):
+        """Make run() return, from another thread or a callback"""
+        self._stopped = True
+
+    def run(self, until=None):
+        """Run due events in time order, blocking until done
+
+        Callback exceptions propagate and leave later events queued.
+
+        Args:
+            until (float): Session time to run to, events due later stay
+                queued; None to return as soon as the queue is empty
+
+        Returns:
+            dict: Onset error of the dispatched events against their
+                dispatch deadlines, see clock.onset_report()
+        """
+        clock = self.clock
+        stats = OnsetStats()
+        self._stopped = False
+        while not self._stopped:
+            now = clock.now()
+            event = None
+            deadline = None
+            with self._lock:
+                queue = self._queue
+                while queue and queue[0][2].cancelled:
+                    heapq.heappop(queue)
+                if queue:
+                    deadline = queue[0][0] - self.lead
+                    if until is not None and deadline > until:
+                        deadline = None
+                    elif deadline <= now:
+                        event = heapq.heappop(queue)[2]
+
+            if event is not None:
+                stats.add(deadline, clock.now())
+                event.callback(*event.args)
+                continue
+
+            target = until if deadline is None else deadline
+            if target is None or now >= target:
+                break
+            if target - now > CHECK_INTERVAL:
+                # Short sleeps keep new submissions and stop() noticed,
+                # the final wait is absolute so they add no drift
+                clock.sleep_until(now + CHECK_INTERVAL, 0.0)
+            else:
+                clock.sleep_until(target, self.spin)
+        return stats.report()
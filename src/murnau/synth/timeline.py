@@ -0,0 +1,68 @@
+"""Scheduled playback of timed OSC events
+
+A timeline is a list of (time, messages) pairs, with times in seconds
+relative to the start of playback and messages as (address, value) pairs
+without the synth prefix. It can be played in two ways:
+
+- play_timetagged() sends each event ahead of time as an OSC bundle whose
+  NTP timetag carries the onset, so timing no longer depends on this
+  process waking up on time.
+- play_deadlines() is the fallback for receivers that ignore timetags. It
+  sends each event immediately at its deadline, sleeping most of the wait
+  and spinning the last couple of milliseconds.
+"""
+
+from ..utils.osc_client import ntp_timetag, send_batch
+
+# How far ahead of its onset a timetagged event is sent, in seconds
+DEFAULT_LEAD = 0.05
+
+
+def play_timetagged(client, events, synth_name, clock, start, lead=DEFAULT_LEAD):
+    """Send events as timetagged bundles shortly before they are due
+
+    Args:
+        client: Transport or python-osc UDP client instance
+        events (list): Timeline of (time, messages) pairs
+        synth_name (str): Name of the synthesizer
+        clock (SessionClock): Session clock
+        start (float): Session time of timeline time zero
+        lead (float): Seconds each bundle is sent ahead of its onset
+
+    Returns:
+        list: Session times at which each event was sent
+    """
+    prefix = f"/{synth_name}"
+    sent = []
+    for t, messages in events:
+        onset = start + t
+        clock.sleep_until(onset - lead)
+        send_batch(
+            client,
+            [(prefix + address, value) for address, value in messages],
+            timetag=ntp_timetag(clock.to_unix(onset)),
+        )
+        sent.append(clock.now())
+    return sent
+
+
+def play_deadlines(client, events, synth_name, clock, start):
+    """Send events as immediate bundles at their deadlines
+
+    Args:
+        client: Transport or python-osc UDP client instance
+        events (list): Timeline of (time, messages) pairs
+        synth_name (str): Name of the synthesizer
+        clock (SessionClock): Session clock
+        start (float): Session time of timeline time zero
+
+    Returns:
+        list: Session times at which each event was sent
+    """
+    prefix = f"/{synth_name}"
+    sent = []
+    for t, messages in events:
+        clock.sleep_until(start + t)
+        send_batch(client, [(prefix + address, value) for address, value in messages])
+        sent.append(clock.now())
+    return sent
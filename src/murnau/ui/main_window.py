@@ -3,9 +3,10 @@
 import sys
 import threading
 import time
+from functools import partial
 
 import mido
-from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtCore import Qt, QTimer, pyqtSignal
 from PyQt6.QtGui import QDoubleValidator, QFont, QIcon, QPixmap
 from PyQt6.QtWidgets import (
     QCheckBox,
@@ -21,14 +22,50 @@ from PyQt6.QtWidgets import (
     QVBoxLayout,
     QWidget,
 )
-from pythonosc import udp_client
 
+from ..dsp.schema import load_controls, step_table
+from ..utils.cc_routing import (
+    CC_COUNT,
+    DEFAULT_CCS,
+    CCRoutingTable,
+    MidiMapStore,
+    load_cc_map,
+)
+from ..utils.coalescer import DEFAULT_CONTROL_RATE, CoalescingSender
+from ..utils.deadband import DeadbandFilter
+from ..utils.deltas import DEFAULT_FRAME_RATE, DeltaQueue
+from ..utils.expression import LOWER_MASTER, ExpressionRouter
+from ..utils.hires_cc import RPN, HighResDecoder
+from ..utils.latency import Deferred, origin
+from ..utils.listener import OSCListener
+from ..utils.midi_input import CALLBACK, MidiInput
+from ..utils.note_stack import LAST, NoteStack
+from ..utils.osc_client import OSCClient, OscDatagram
+from ..utils.param_cache import ParameterCache
+from ..utils.pitch_bend import BEND_RANGE_RPN, PitchBendEngine, rpn_bend_range
+from ..utils.sender import OSCSenderThread
+from ..utils.session_log import SessionRecorder
+from ..utils.smoothing import ParamSmoother
+from ..utils.transport import get_transport
+from ..utils.tuning import Tuning, note_freq, retune
+from ..utils.voices import LRU, PolySynth
 from .widgets import LabeledKnob, PianoKeys, WaveformSelector
 
+# Port selector entry that opens every MIDI input, merged into one stream
+ALL_MIDI_PORTS = "All MIDI inputs"
+
 
 class MurnauUI(QMainWindow):
     """Main window for Murnau synthesizer control interface"""
 
+    # Emitted from the MIDI thread when MIDI learn catches a CC: target, cc,
+    # port the CC came from
+    ccLearned = pyqtSignal(str, int, str)
+
+    # Emitted from the reconnect worker once the patch is synced: number of
+    # parameters resent
+    patchSynced = pyqtSignal(int)
+
     def __init__(self):
         super().__init__()
 
@@ -37,29 +74,110 @@ class MurnauUI(QMainWindow):
         self.osc_port = 5510
         self.synth_name = "legato_synth_stereo"
 
-        # Create OSC client
-        self.osc_client = udp_client.SimpleUDPClient(self.osc_ip, self.osc_port)
+        # Shared transport to the synth, see utils.transport
+        self.osc_client = get_transport(self.osc_ip, self.osc_port)
+
+        # Prefixes and encodes messages to the synth, cached per address
+        self.osc = OSCClient(
+            self.osc_ip, self.osc_port, self.synth_name, transport=self.osc_client
+        )
+
+        # Latest value of every synth parameter, brought back on reconnect
+        self.patch = {}
+
+        # Only the sender thread writes to the transport; other threads enqueue
+        self.osc_sender = OSCSenderThread(self._send_message, self._send_datagram)
+        self.osc_sender.start()
+
+        # Parameter values read back from the synth, the listener is started
+        # by the first reconnect_osc(); queries go through the sender thread
+        self.param_cache = ParameterCache(
+            self.osc_client,
+            self.synth_name,
+            submit=self.osc_sender.submit_datagram,
+        )
+        self.osc_listener = OSCListener(self.param_cache.handle_reply)
+        self.sync_thread = None
+        self.patchSynced.connect(self._on_patch_synced)
+
+        # Parameter updates are coalesced to the control rate
+        self.param_sender = CoalescingSender(self.send_osc, DEFAULT_CONTROL_RATE)
+
+        # Values are quantized to the DSP's declared steps and sent only on change
+        self.param_filter = DeadbandFilter(
+            self.param_sender.submit, step_table(load_controls("legato_synth"))
+        )
 
         # MIDI settings
+        self.midi_mode = CALLBACK  # or POLL for backends without callbacks
         self.midi_input = None
-        self.midi_thread = None
         self.midi_running = False
+        self.midi_device = None
+
+        # MIDI channels passed per port, ports not listed pass every channel
+        self.midi_channels = {}
+
+        # 14-bit CC pairs of routed controllers and NRPN are decoded to full
+        # resolution, and CC driven parameters glide to their targets at the
+        # control rate
+        self.cc_decoder = HighResDecoder()
+        self.cc_smoother = ParamSmoother(DEFAULT_CONTROL_RATE)
+
+        # The pitch wheel bends /freq of the sounding note at the control rate
+        self.pitch_bend = PitchBendEngine(
+            partial(self.send_osc, "/freq"), DEFAULT_CONTROL_RATE
+        )
+
+        # Decoders of the ports merged besides midi_device, see start_midi()
+        self._port_decoders = {}
+
+        # Per-device CC maps, compiled routing tables are kept per device
+        self.midi_map_store = MidiMapStore()
+        self._device_routes = {}
+
+        # MIDI learn: the next CC is bound to the control clicked last
+        self.midi_learn = False
+        self._learn_target = None
+        self.ccLearned.connect(self._on_cc_learned)
 
-        # Active notes for MIDI tracking
-        self.active_notes = {}  # note_num -> frequency
+        # Held MIDI notes, frequencies come from the active tuning
+        self.active_notes = NoteStack(LAST)
         self.current_note = None
         self.LEGATO_THRESHOLD = 0.03  # 30ms threshold for legato transitions
         self.last_gate_off_time = 0
 
+        # Pool of synth instances playing MIDI notes polyphonically, None
+        # for the single monophonic synth, see set_polyphony()
+        self.poly = None
+        self.expression = None  # routes notes and expression to self.poly
+
+        # Display changes posted by the MIDI thread, applied once per frame
+        self.ui_deltas = DeltaQueue()
+
+        # Session log of MIDI input and OSC output, see start_recording()
+        self.recorder = None
+
         # Initialize UI
         self.init_ui()
 
+        # Route MIDI CCs to the controls
+        self._init_cc_routing()
+
         # Initialize MIDI
         self.init_midi()
 
         # Initialize parameters
         self.init_parameters()
 
+        # Flush coalesced parameter updates at the control rate
+        self._start_control_timer()
+
+        # Apply MIDI-driven display changes at the frame rate
+        self._start_frame_timer()
+
+        # Show MIDI to OSC latency in the status bar
+        self._start_latency_readout()
+
         # Show the window
         self.show()
 
@@ -107,11 +225,19 @@ class MurnauUI(QMainWindow):
         midi_layout.addWidget(self.midi_port_combo)
         midi_layout.addWidget(self.midi_toggle)
 
+        # MIDI learn: click a knob, then move a hardware control
+        self.learn_toggle = QPushButton("MIDI Learn")
+        self.learn_toggle.setCheckable(True)
+        self.learn_toggle.setFont(QFont("Futura", 10))
+        self.learn_toggle.setStyleSheet(self._get_button_style())
+        self.learn_toggle.toggled.connect(self.set_midi_learn)
+        midi_layout.addWidget(self.learn_toggle)
+
         midi_group.setLayout(midi_layout)
         left_column.addWidget(midi_group)
 
         # Waveform selector below MIDI
-        self.waveform_selector = WaveformSelector(midi_cc=1)
+        self.waveform_selector = WaveformSelector(midi_cc=DEFAULT_CCS["wave_type"])
         self.waveform_selector.waveformChanged.connect(self.on_waveform_change)
         left_column.addWidget(self.waveform_selector)
 
@@ -154,7 +280,9 @@ class MurnauUI(QMainWindow):
         gain_group = QGroupBox("Output")
         gain_layout = QHBoxLayout()
 
-        self.gain_slider = LabeledKnob("Gain", 0.0, 1.0, 1.0, midi_cc=7)
+        self.gain_slider = LabeledKnob(
+            "Gain", 0.0, 1.0, 1.0, midi_cc=DEFAULT_CCS["gain"]
+        )
         self.gain_slider.valueChanged.connect(self.on_gain_change)
         gain_layout.addWidget(self.gain_slider)
 
@@ -199,7 +327,9 @@ class MurnauUI(QMainWindow):
         coarse_layout = QHBoxLayout()
         coarse_label = QLabel("Coarse Tune")
         coarse_label.setStyleSheet("color: #E0E0E0;")
-        self.coarse_tune = LabeledKnob("Coarse", -24, 24, 0, midi_cc=2, is_integer=True)
+        self.coarse_tune = LabeledKnob(
+            "Coarse", -24, 24, 0, midi_cc=DEFAULT_CCS["coarse_tune"], is_integer=True
+        )
         self.coarse_tune.valueChanged.connect(self.on_coarse_tune_change)
         coarse_layout.addWidget(coarse_label)
         coarse_layout.addWidget(self.coarse_tune)
@@ -209,7 +339,9 @@ class MurnauUI(QMainWindow):
         fine_layout = QHBoxLayout()
         fine_label = QLabel("Fine Tune")
         fine_label.setStyleSheet("color: #E0E0E0;")
-        self.fine_tune = LabeledKnob("Fine", -100, 100, 0, midi_cc=3)
+        self.fine_tune = LabeledKnob(
+            "Fine", -100, 100, 0, midi_cc=DEFAULT_CCS["fine_tune"]
+        )
         self.fine_tune.valueChanged.connect(self.on_fine_tune_change)
         fine_layout.addWidget(fine_label)
         fine_layout.addWidget(self.fine_tune)
@@ -219,7 +351,9 @@ class MurnauUI(QMainWindow):
         stability_layout = QHBoxLayout()
         stability_label = QLabel("Stability")
         stability_label.setStyleSheet("color: #E0E0E0;")
-        self.stability = LabeledKnob("Stability", 0, 20, 0, midi_cc=4)
+        self.stability = LabeledKnob(
+            "Stability", 0, 20, 0, midi_cc=DEFAULT_CCS["stability"]
+        )
         self.stability.valueChanged.connect(self.on_stability_change)
         stability_layout.addWidget(stability_label)
         stability_layout.addWidget(self.stability)
@@ -278,12 +412,16 @@ class MurnauUI(QMainWindow):
         left_filter_label = QLabel("Left Channel")
         left_filter_label.setStyleSheet("color: #E0E0E0;")
         self.cutoff_knob_L = LabeledKnob(
-            "Cutoff", 20, 20000, 2000, is_log=True, midi_cc=74
+            "Cutoff", 20, 20000, 2000, is_log=True, midi_cc=DEFAULT_CCS["cutoff_L"]
+        )
+        self.cutoff_knob_L.valueChanged.connect(
+            lambda v: self.queue_osc("/cutoff_L", v)
+        )
+        self.resonance_knob_L = LabeledKnob(
+            "Resonance", 0.1, 4, 0.5, midi_cc=DEFAULT_CCS["resonance_L"]
         )
-        self.cutoff_knob_L.valueChanged.connect(lambda v: self.send_osc("/cutoff_L", v))
-        self.resonance_knob_L = LabeledKnob("Resonance", 0.1, 4, 0.5, midi_cc=71)
         self.resonance_knob_L.valueChanged.connect(
-            lambda v: self.send_osc("/resonance_L", v)
+            lambda v: self.queue_osc("/resonance_L", v)
         )
         left_filter_layout.addWidget(left_filter_label)
         left_filter_layout.addWidget(self.cutoff_knob_L)
@@ -295,12 +433,16 @@ class MurnauUI(QMainWindow):
         right_filter_label = QLabel("Right Channel")
         right_filter_label.setStyleSheet("color: #E0E0E0;")
         self.cutoff_knob_R = LabeledKnob(
-            "Cutoff", 20, 20000, 2000, is_log=True, midi_cc=75
+            "Cutoff", 20, 20000, 2000, is_log=True, midi_cc=DEFAULT_CCS["cutoff_R"]
+        )
+        self.cutoff_knob_R.valueChanged.connect(
+            lambda v: self.queue_osc("/cutoff_R", v)
+        )
+        self.resonance_knob_R = LabeledKnob(
+            "Resonance", 0.1, 4, 0.5, midi_cc=DEFAULT_CCS["resonance_R"]
         )
-        self.cutoff_knob_R.valueChanged.connect(lambda v: self.send_osc("/cutoff_R", v))
-        self.resonance_knob_R = LabeledKnob("Resonance", 0.1, 4, 0.5, midi_cc=76)
         self.resonance_knob_R.valueChanged.connect(
-            lambda v: self.send_osc("/resonance_R", v)
+            lambda v: self.queue_osc("/resonance_R", v)
         )
         right_filter_layout.addWidget(right_filter_label)
         right_filter_layout.addWidget(self.cutoff_knob_R)
@@ -314,22 +456,30 @@ class MurnauUI(QMainWindow):
         left_adsr_layout = QHBoxLayout()
         left_adsr_layout.setSpacing(10)
 
-        self.attack_slider_L = LabeledKnob("Attack", 0.001, 5.0, 0.005, midi_cc=73)
+        self.attack_slider_L = LabeledKnob(
+            "Attack", 0.001, 5.0, 0.005, midi_cc=DEFAULT_CCS["attack_L"]
+        )
         self.attack_slider_L.valueChanged.connect(self.on_attack_L_change)
         self.attack_slider_L.setFixedSize(70, 100)
         left_adsr_layout.addWidget(self.attack_slider_L)
 
-        self.decay_slider_L = LabeledKnob("Decay", 0.001, 3.0, 0.1, midi_cc=75)
+        self.decay_slider_L = LabeledKnob(
+            "Decay", 0.001, 3.0, 0.1, midi_cc=DEFAULT_CCS["decay_L"]
+        )
         self.decay_slider_L.valueChanged.connect(self.on_decay_L_change)
         self.decay_slider_L.setFixedSize(70, 100)
         left_adsr_layout.addWidget(self.decay_slider_L)
 
-        self.sustain_slider_L = LabeledKnob("Sustain", 0.0, 1.0, 0.9, midi_cc=31)
+        self.sustain_slider_L = LabeledKnob(
+            "Sustain", 0.0, 1.0, 0.9, midi_cc=DEFAULT_CCS["sustain_L"]
+        )
         self.sustain_slider_L.valueChanged.connect(self.on_sustain_L_change)
         self.sustain_slider_L.setFixedSize(70, 100)
         left_adsr_layout.addWidget(self.sustain_slider_L)
 
-        self.release_slider_L = LabeledKnob("Release", 0.1, 5.0, 0.5, midi_cc=72)
+        self.release_slider_L = LabeledKnob(
+            "Release", 0.1, 5.0, 0.5, midi_cc=DEFAULT_CCS["release_L"]
+        )
         self.release_slider_L.valueChanged.connect(self.on_release_L_change)
         self.release_slider_L.setFixedSize(70, 100)
         left_adsr_layout.addWidget(self.release_slider_L)
@@ -342,22 +492,30 @@ class MurnauUI(QMainWindow):
         right_adsr_layout = QHBoxLayout()
         right_adsr_layout.setSpacing(10)
 
-        self.attack_slider_R = LabeledKnob("Attack", 0.001, 5.0, 0.005, midi_cc=74)
+        self.attack_slider_R = LabeledKnob(
+            "Attack", 0.001, 5.0, 0.005, midi_cc=DEFAULT_CCS["attack_R"]
+        )
         self.attack_slider_R.valueChanged.connect(self.on_attack_R_change)
         self.attack_slider_R.setFixedSize(70, 100)
         right_adsr_layout.addWidget(self.attack_slider_R)
 
-        self.decay_slider_R = LabeledKnob("Decay", 0.001, 3.0, 0.1, midi_cc=76)
+        self.decay_slider_R = LabeledKnob(
+            "Decay", 0.001, 3.0, 0.1, midi_cc=DEFAULT_CCS["decay_R"]
+        )
         self.decay_slider_R.valueChanged.connect(self.on_decay_R_change)
         self.decay_slider_R.setFixedSize(70, 100)
         right_adsr_layout.addWidget(self.decay_slider_R)
 
-        self.sustain_slider_R = LabeledKnob("Sustain", 0.0, 1.0, 0.9, midi_cc=32)
+        self.sustain_slider_R = LabeledKnob(
+            "Sustain", 0.0, 1.0, 0.9, midi_cc=DEFAULT_CCS["sustain_R"]
+        )
         self.sustain_slider_R.valueChanged.connect(self.on_sustain_R_change)
         self.sustain_slider_R.setFixedSize(70, 100)
         right_adsr_layout.addWidget(self.sustain_slider_R)
 
-        self.release_slider_R = LabeledKnob("Release", 0.1, 5.0, 0.5, midi_cc=77)
+        self.release_slider_R = LabeledKnob(
+            "Release", 0.1, 5.0, 0.5, midi_cc=DEFAULT_CCS["release_R"]
+        )
         self.release_slider_R.valueChanged.connect(self.on_release_R_change)
         self.release_slider_R.setFixedSize(70, 100)
         right_adsr_layout.addWidget(self.release_slider_R)
@@ -427,45 +585,131 @@ class MurnauUI(QMainWindow):
         self.wave_animation_timer.timeout.connect(self.waveform_selector.animate_wave)
         self.wave_animation_timer.start(50)  # Update every 50ms for smooth animation
 
+    def _start_control_timer(self):
+        """Start the control-rate tick that advances CC glides and flushes
+        coalesced parameters"""
+        self.control_timer = QTimer()
+        self.control_timer.timeout.connect(self.cc_smoother.tick)
+        self.control_timer.timeout.connect(self.param_sender.flush)
+        self.control_timer.timeout.connect(self.pitch_bend.tick)
+        self.control_timer.timeout.connect(self._flush_expression)
+        self.control_timer.start(max(1, round(self.param_sender.interval * 1000)))
+
+    def _start_latency_readout(self):
+        """Add the status bar latency readout and refresh it every second"""
+        self.latency_label = QLabel()
+        self.latency_label.setFont(QFont("Futura", 9))
+        self.statusBar().addPermanentWidget(self.latency_label)
+        self.latency_timer = QTimer()
+        self.latency_timer.timeout.connect(self._show_latency)
+        self.latency_timer.start(1000)
+
+    def _show_latency(self):
+        """Refresh the status bar latency readout and merged port rates"""
+        parts = []
+        status = self.osc_sender.latency.format_status()
+        if status:
+            parts.append(f"MIDI→OSC {status}")
+        ports = self.midi_stats()
+        if len(ports) > 1:
+            parts.append(
+                ", ".join(
+                    f"{name} {stats['rate']:.0f}/s" for name, stats in ports.items()
+                )
+            )
+        self.latency_label.setText(" | ".join(parts))
+
+    def midi_latency(self, reset=False):
+        """Get MIDI ingestion to OSC send latencies per MIDI message type
+
+        Args:
+            reset (bool): Start new histograms after reading
+
+        Returns:
+            dict: Per message type, count, p50, p95, p99 and max in seconds
+        """
+        summary = self.osc_sender.latency.summary()
+        if reset:
+            self.osc_sender.latency.reset()
+        return summary
+
+    def midi_stats(self):
+        """Get per-port MIDI input counters
+
+        Returns:
+            dict: Per open port, messages received, messages dropped by the
+                channel filter and events per second, empty without MIDI
+        """
+        midi_input = self.midi_input
+        if midi_input is None:
+            return {}
+        return midi_input.stats()
+
+    def _start_frame_timer(self):
+        """Start the per-frame tick that applies posted display changes"""
+        self.frame_timer = QTimer()
+        self.frame_timer.timeout.connect(self.apply_ui_deltas)
+        self.frame_timer.start(round(1000 / DEFAULT_FRAME_RATE))
+
+    def apply_ui_deltas(self):
+        """Apply display changes posted by the MIDI thread, on the GUI thread
+
+        Integer targets are MIDI note numbers with their velocity (0 for
+        note off), other targets are widgets with a show_value() method.
+
+        Returns:
+            int: Number of changes applied
+        """
+        deltas = self.ui_deltas.take()
+        for target, value in deltas:
+            if isinstance(target, int):
+                if value:
+                    self.piano.handle_midi_note_on(target, value)
+                else:
+                    self.piano.handle_midi_note_off(target)
+            else:
+                target.show_value(value)
+        return len(deltas)
+
     def init_parameters(self):
         """Initialize synth parameters via OSC"""
-        # Send initial parameter values
-        self.on_gain_change(1.0)
-        self.on_waveform_change(2)  # sawtooth
-
-        # Initialize left channel ADSR
-        self.on_attack_L_change(0.005)
-        self.on_decay_L_change(0.1)
-        self.on_sustain_L_change(0.9)
-        self.on_release_L_change(0.5)
-
-        # Initialize right channel ADSR
-        self.on_attack_R_change(0.005)
-        self.on_decay_R_change(0.1)
-        self.on_sustain_R_change(0.9)
-        self.on_release_R_change(0.5)
-
-        # Initialize both L/R filter controls
-        self.on_cutoff_L_change(2000)
-        self.on_cutoff_R_change(2000)
-        self.on_resonance_L_change(0.5)
-        self.on_resonance_R_change(0.5)
-
-        # Initialize pitch controls
-        self.on_coarse_tune_change(0)
-        self.on_fine_tune_change(0)
-        self.on_stability_change(0)
-
-        # Initialize ramp controls
-        self.send_osc("/start_freq_offset", 0)
-        self.send_osc("/end_freq_offset", 0)
-        self.send_osc("/ramp_time", 0)
+        patch = [
+            ("/gain", 1.0),
+            ("/wave_type", 2),  # sawtooth
+            # Left channel ADSR
+            ("/attack_L", 0.005),
+            ("/decay_L", 0.1),
+            ("/sustain_L", 0.9),
+            ("/release_L", 0.5),
+            # Right channel ADSR
+            ("/attack_R", 0.005),
+            ("/decay_R", 0.1),
+            ("/sustain_R", 0.9),
+            ("/release_R", 0.5),
+            # Both L/R filter controls
+            ("/cutoff_L", 2000),
+            ("/cutoff_R", 2000),
+            ("/resonance_L", 0.5),
+            ("/resonance_R", 0.5),
+            # Pitch controls
+            ("/coarse_tune", 0),
+            ("/fine_tune", 0),
+            ("/stability", 0),
+            # Ramp controls
+            ("/start_freq_offset", 0),
+            ("/end_freq_offset", 0),
+            ("/ramp_time", 0),
+        ]
+        self.patch.update(patch)
+
+        # Send the whole initial patch as one bundle so it lands atomically
+        self.send_osc_batch(patch)
 
     def on_start_freq_change(self):
         """Handle start frequency offset change"""
         try:
             value = float(self.start_freq.text())
-            self.send_osc("/start_freq_offset", value)
+            self.queue_osc("/start_freq_offset", value)
         except ValueError:
             pass
 
@@ -473,7 +717,7 @@ class MurnauUI(QMainWindow):
         """Handle end frequency offset change"""
         try:
             value = float(self.end_freq.text())
-            self.send_osc("/end_freq_offset", value)
+            self.queue_osc("/end_freq_offset", value)
         except ValueError:
             pass
 
@@ -481,7 +725,7 @@ class MurnauUI(QMainWindow):
         """Handle ramp time change"""
         try:
             value = float(self.ramp_time.text())
-            self.send_osc("/ramp_time", value)
+            self.queue_osc("/ramp_time", value)
         except ValueError:
             pass
 
@@ -497,6 +741,9 @@ class MurnauUI(QMainWindow):
             ports = mido.get_input_names()
             if ports:
                 self.midi_port_combo.addItems(ports)
+                if len(ports) > 1:
+                    self.midi_port_combo.addItem(ALL_MIDI_PORTS)
+                    ports.append(ALL_MIDI_PORTS)
 
                 # Restore previous selection if available
                 if current_port in ports:
@@ -519,35 +766,59 @@ class MurnauUI(QMainWindow):
         else:
             self.stop_midi()
 
-    def start_midi(self):
-        """Start MIDI processing"""
+    def start_midi(self, port_names=None):
+        """Start MIDI processing
+
+        Several ports are merged into one stream. The first port's CC map is
+        the one shown and edited on the controls; every port's CCs go
+        through its own device map, see use_device_map().
+
+        Args:
+            port_names (list): Ports to open, None for the selected port or
+                every port for ALL_MIDI_PORTS
+        """
         if self.midi_running:
             return
 
-        # Get selected port
-        port_name = self.midi_port_combo.currentText()
-        if (
-            not port_name
-            or port_name.startswith("No MIDI")
-            or port_name.startswith("Error")
+        # Get selected ports
+        if port_names is None:
+            port_name = self.midi_port_combo.currentText()
+            if port_name == ALL_MIDI_PORTS:
+                combo = self.midi_port_combo
+                port_names = [combo.itemText(i) for i in range(combo.count())]
+                port_names.remove(ALL_MIDI_PORTS)
+            else:
+                port_names = [port_name]
+        if not port_names or any(
+            not name or name.startswith("No MIDI") or name.startswith("Error")
+            for name in port_names
         ):
             self.midi_toggle.setText("Error: No valid MIDI port selected")
             self.midi_toggle.setStyleSheet("color: #FF5555; background: transparent;")
             return
 
         try:
-            # Open MIDI input
-            self.midi_input = mido.open_input(port_name)
+            # Open MIDI inputs, messages are handled as they arrive
+            midi_input = MidiInput(self.handle_midi_message, self.midi_mode, named=True)
+            try:
+                for name in port_names:
+                    midi_input.open(name, self.midi_channels.get(name))
+            except Exception:
+                midi_input.close()
+                raise
+
+            # Every merged port decodes and routes its CCs on its own
+            self._port_decoders = {name: HighResDecoder() for name in port_names[1:]}
+            for name in port_names[1:]:
+                self._device_routes_for(name)
+            self.use_device_map(port_names[0])
+            self.midi_input = midi_input
             self.midi_running = True
 
-            # Start MIDI processing thread
-            self.midi_thread = threading.Thread(target=self.process_midi, daemon=True)
-            self.midi_thread.start()
-
             # Update UI
             self.midi_toggle.setText("Disconnect MIDI")
             self.midi_toggle.setStyleSheet("color: #8AFF7A; background: transparent;")
-            midi_msg = f"MIDI: Connected to {port_name}"
+            midi_msg = f"MIDI: Connected to {', '.join(port_names)}"
             osc_msg = f"OSC: {self.synth_name} on {self.osc_ip}:{self.osc_port}"
             self.statusBar().showMessage(f"{midi_msg} | {osc_msg}")
 
@@ -573,198 +844,615 @@ class MurnauUI(QMainWindow):
             f"OSC: {self.synth_name} on {self.osc_ip}:{self.osc_port}"
         )
 
-    def process_midi(self):
-        """Process MIDI messages in a background thread"""
-        while self.midi_running and self.midi_input:
-            try:
-                # Get pending messages
-                for message in self.midi_input.iter_pending():
-                    # Process in the main thread
-                    self.handle_midi_message(message)
-
-                # Brief sleep to prevent CPU overload
-                time.sleep(0.001)
-            except Exception as e:
-                print(f"MIDI processing error: {e}")
-                break
-
-    def handle_midi_message(self, message):
-        """Handle incoming MIDI message"""
+    def handle_midi_message(self, message, stamp=None, port=None):
+        """Handle incoming MIDI message, called on the MIDI input thread
+
+        OSC messages sent while handling carry the ingestion stamp, their
+        latency is recorded by the sender, see midi_latency().
+
+        Args:
+            message: mido message
+            stamp (float): time.perf_counter() at ingestion, now if not given
+            port (str): Port the message came from, None for midi_device
+        """
+        if stamp is None:
+            stamp = time.perf_counter()
+        recorder = self.recorder
+        if recorder is not None:
+            recorder.record_midi(message, stamp, port)
+        tag = message.type
+        if tag == "note_on" and message.velocity == 0:
+            tag = "note_off"
+
         try:
-            # Note on
-            if message.type == "note_on" and message.velocity > 0:
-                # Convert MIDI note to frequency
-                freq = 440.0 * (2.0 ** ((message.note - 69) / 12.0))
-
-                # Add to active notes
-                self.active_notes[message.note] = freq
-
-                # Determine if we should use legato mode
-                now = time.time()
-                use_legato = self.current_note is not None and (
-                    now - self.last_gate_off_time < self.LEGATO_THRESHOLD
-                )
+            with origin(tag, stamp):
+                expression = self.expression
+                if expression is not None and expression.handle(message):
+                    # Every note gets a voice of its own
+                    if tag == "note_on":
+                        self.ui_deltas.post(message.note, message.velocity)
+                    elif tag == "note_off":
+                        self.ui_deltas.post(message.note, 0)
+
+                # Note on
+                elif message.type == "note_on" and message.velocity > 0:
+                    # Keys the tuning leaves unmapped are silent
+                    if note_freq(message.note) is None:
+                        return
+
+                    # Add to active notes, the priority decides if it sounds
+                    self.active_notes.push(message.note)
+                    next_note = self.active_notes.current()
+
+                    if next_note != self.current_note:
+                        # Determine if we should use legato mode
+                        now = time.monotonic()
+                        use_legato = self.current_note is not None and (
+                            now - self.last_gate_off_time < self.LEGATO_THRESHOLD
+                        )
+
+                        # Set frequency first, bent by the wheel
+                        self.pitch_bend.note(note_freq(next_note))
+
+                        # If not in legato mode or no current note, send gate on
+                        if not use_legato or self.current_note is None:
+                            self.send_osc("/gate", 1.0)
 
-                # Set frequency first
-                self.send_osc("/freq", freq)
-
-                # If not in legato mode or no current note, send gate on
-                if not use_legato or self.current_note is None:
-                    self.send_osc("/gate", 1.0)
-
-                self.current_note = message.note
-
-                # Update piano UI
-                if self.piano.handle_midi_note_on(message.note, message.velocity):
-                    # UI was updated successfully
-                    pass
-
-            # Note off
-            elif message.type == "note_off" or (
-                message.type == "note_on" and message.velocity == 0
-            ):
-                # Remove from active notes
-                if message.note in self.active_notes:
-                    del self.active_notes[message.note]
-
-                # Only react if this is the current sounding note
-                if message.note == self.current_note:
-                    # Check if we have other active notes
-                    if self.active_notes:
-                        # Find the highest note (usually most recently pressed)
-                        next_note = max(self.active_notes.keys())
-                        next_freq = self.active_notes[next_note]
-
-                        # Set the new frequency
-                        self.send_osc("/freq", next_freq)
                         self.current_note = next_note
-                    else:
-                        # No more active notes, turn off gate
-                        self.send_osc("/gate", 0.0)
-                        self.last_gate_off_time = time.time()
-                        self.current_note = None
-
-                # Update piano UI
-                self.piano.handle_midi_note_off(message.note)
 
-            # Control changes for parameters
-            elif message.type == "control_change":
-                self._handle_midi_cc(message.control, message.value)
+                    # Update piano UI on the next frame
+                    self.ui_deltas.post(message.note, message.velocity)
+
+                # Note off
+                elif message.type == "note_off" or (
+                    message.type == "note_on" and message.velocity == 0
+                ):
+                    # Remove from active notes
+                    self.active_notes.remove(message.note)
+                    next_note = self.active_notes.current()
+
+                    # Only react if the sounding note changed
+                    if next_note != self.current_note:
+                        if next_note is not None:
+                            # Fall back to the held note picked by the priority
+                            self.pitch_bend.note(note_freq(next_note))
+                            self.current_note = next_note
+                        else:
+                            # No more active notes, turn off gate and stop
+                            # bending a note that no longer sounds
+                            self.pitch_bend.note(None)
+                            self.send_osc("/gate", 0.0)
+                            self.last_gate_off_time = time.monotonic()
+                            self.current_note = None
+
+                    # Update piano UI on the next frame
+                    self.ui_deltas.post(message.note, 0)
+
+                # Control changes for parameters
+                elif message.type == "pitchwheel":
+                    # Sent from the control tick, see utils.pitch_bend
+                    self.pitch_bend.bend(message.pitch)
+
+                elif message.type == "control_change":
+                    self._handle_midi_cc(
+                        message.control, message.value, message.channel, port
+                    )
 
         except Exception as e:
             print(f"Error handling MIDI message: {e}")
 
-    def _handle_midi_cc(self, cc, value):
-        """Handle MIDI control change message"""
-        # Map CC values to parameters
-        if cc == self.waveform_selector.midi_cc:
-            self.waveform_selector.set_from_midi_cc(value)
-        elif cc == self.attack_slider_L.midi_cc:
-            self.attack_slider_L.set_from_midi_cc(value)
-        elif cc == self.decay_slider_L.midi_cc:
-            self.decay_slider_L.set_from_midi_cc(value)
-        elif cc == self.sustain_slider_L.midi_cc:
-            self.sustain_slider_L.set_from_midi_cc(value)
-        elif cc == self.release_slider_L.midi_cc:
-            self.release_slider_L.set_from_midi_cc(value)
-        elif cc == self.attack_slider_R.midi_cc:
-            self.attack_slider_R.set_from_midi_cc(value)
-        elif cc == self.decay_slider_R.midi_cc:
-            self.decay_slider_R.set_from_midi_cc(value)
-        elif cc == self.sustain_slider_R.midi_cc:
-            self.sustain_slider_R.set_from_midi_cc(value)
-        elif cc == self.release_slider_R.midi_cc:
-            self.release_slider_R.set_from_midi_cc(value)
-        elif cc == self.cutoff_knob_L.midi_cc:
-            self.cutoff_knob_L.set_from_midi_cc(value)
-        elif cc == self.cutoff_knob_R.midi_cc:
-            self.cutoff_knob_R.set_from_midi_cc(value)
-        elif cc == self.resonance_knob_L.midi_cc:
-            self.resonance_knob_L.set_from_midi_cc(value)
-        elif cc == self.resonance_knob_R.midi_cc:
-            self.resonance_knob_R.set_from_midi_cc(value)
+    def _handle_midi_cc(self, cc, value, channel=0, port=None):
+        """Handle MIDI control change message
+
+        NRPN parameters below 128 drive the controls routed from the CC
+        with the same number. Controllers 32-63 are an LSB only for a routed
+        MSB, see CCRoutingTable.hires_pairs. CCs of a merged port go through
+        that port's decoder and device map.
+        """
+        if port is None or port == self.midi_device:
+            decoder, routes = self.cc_decoder, self.cc_routes
+        else:
+            decoder = self._port_decoders.get(port, self.cc_decoder)
+            routes = self._device_routes.get(port, self.cc_routes)
+        # MIDI learn takes every controller as it is, LSBs included
+        pairs = () if self._learn_target is not None else routes.hires_pairs
+        event = decoder.feed(cc, value, channel, pairs)
+        if event is None:
+            return
+        kind, number, fine = event
+        if kind == RPN:
+            if number == BEND_RANGE_RPN:
+                self.pitch_bend.bend_range = rpn_bend_range(fine)
+            return
+        if number >= CC_COUNT:
+            return
+
+        target = self._learn_target
+        if target is not None:
+            # The CC is consumed by MIDI learn, the binding is made on the GUI
+            self._learn_target = None
+            self.ccLearned.emit(target, number, port or "")
+            return
+        routes.dispatch_fine(number, fine)
+
+    def _cc_targets(self):
+        """Controls that MIDI CCs can drive
+
+        Returns:
+            dict: (widget, handler) per target name
+        """
+        return {
+            "wave_type": (self.waveform_selector, self.on_waveform_change),
+            "gain": (self.gain_slider, self.on_gain_change),
+            "coarse_tune": (self.coarse_tune, self.on_coarse_tune_change),
+            "fine_tune": (self.fine_tune, self.on_fine_tune_change),
+            "stability": (self.stability, self.on_stability_change),
+            "cutoff_L": (self.cutoff_knob_L, self.on_cutoff_L_change),
+            "resonance_L": (self.resonance_knob_L, self.on_resonance_L_change),
+            "cutoff_R": (self.cutoff_knob_R, self.on_cutoff_R_change),
+            "resonance_R": (self.resonance_knob_R, self.on_resonance_R_change),
+            "attack_L": (self.attack_slider_L, self.on_attack_L_change),
+            "decay_L": (self.decay_slider_L, self.on_decay_L_change),
+            "sustain_L": (self.sustain_slider_L, self.on_sustain_L_change),
+            "release_L": (self.release_slider_L, self.on_release_L_change),
+            "attack_R": (self.attack_slider_R, self.on_attack_R_change),
+            "decay_R": (self.decay_slider_R, self.on_decay_R_change),
+            "sustain_R": (self.sustain_slider_R, self.on_sustain_R_change),
+            "release_R": (self.release_slider_R, self.on_release_R_change),
+        }
+
+    def _init_cc_routing(self):
+        """Build the CC routing table from the CCs the widgets were created with"""
+        self._cc_widgets = {}
+        targets = {}
+        for name, (widget, handler) in self._cc_targets().items():
+            self._cc_widgets[name] = widget
+            targets[name] = partial(self._apply_midi_cc, widget, handler)
+            if isinstance(widget, LabeledKnob):
+                widget.knob.sliderPressed.connect(
+                    partial(self.select_learn_target, name)
+                )
+        self._cc_functions = targets
+        self.cc_routes = CCRoutingTable(targets)
+
+        for name, widget in self._cc_widgets.items():
+            if widget.midi_cc is not None:
+                self.cc_routes.assign(name, widget.midi_cc)
+        self._default_cc_map = self.cc_routes.bindings()
+        self._report_cc_collisions()
+
+    def use_device_map(self, device):
+        """Switch the CC routes to a MIDI device's map
+
+        The device's map file is read and compiled the first time the device
+        is used; later switches only swap the compiled table. Devices without
+        a map file start from the default routes.
+
+        Args:
+            device (str): MIDI port name
+        """
+        self.midi_device = device
+        self.cc_routes = self._device_routes_for(device)
+        self.cc_decoder.reset()
+        self._update_cc_labels()
+        self._report_cc_collisions()
+
+    def _device_routes_for(self, device):
+        """Get a device's compiled CC routes, loading its map the first time
+
+        Args:
+            device (str): MIDI port name
+
+        Returns:
+            CCRoutingTable: Routes of the device
+        """
+        routes = self._device_routes.get(device)
+        if routes is None:
+            routes = CCRoutingTable(self._cc_functions)
+            try:
+                mapping = self.midi_map_store.load(device)
+            except (OSError, ValueError) as e:
+                print(f"Error loading MIDI map for {device}: {e}")
+                mapping = None
+            routes.load(self._default_cc_map if mapping is None else mapping)
+            self._device_routes[device] = routes
+        return routes
+
+    def set_midi_learn(self, enabled):
+        """Turn MIDI learn mode on or off
+
+        Args:
+            enabled (bool): Whether clicking a knob arms it for learning
+        """
+        self.midi_learn = enabled
+        self._learn_target = None
+        if enabled:
+            self.statusBar().showMessage("MIDI learn: click a knob")
+        else:
+            self.statusBar().showMessage("MIDI learn off")
+
+    def select_learn_target(self, name):
+        """Arm a control for MIDI learn, the next CC received is bound to it
+
+        Args:
+            name (str): CC target name, see _cc_targets()
+        """
+        if not self.midi_learn:
+            return
+        self._learn_target = name
+        self.statusBar().showMessage(f"MIDI learn: move a controller for {name}")
+
+    def _on_cc_learned(self, name, cc, port=""):
+        """Bind a learned CC and save the device's map, on the GUI thread
+
+        The CC is bound in the map of the port it came from, empty for
+        midi_device.
+        """
+        device = port or self.midi_device
+        routes = self._device_routes.get(device, self.cc_routes)
+        dropped = routes.learn(name, cc)
+        self._update_cc_labels()
+
+        message = f"MIDI learn: CC{cc} -> {name}"
+        if device != self.midi_device:
+            message += f" on {device}"
+        if dropped:
+            message += f" (replaces {', '.join(dropped)})"
+        if device is not None:
+            try:
+                self.midi_map_store.save(device, routes.bindings())
+            except OSError as e:
+                message += f" (not saved: {e})"
+        self.statusBar().showMessage(message)
+
+    def load_cc_map(self, path):
+        """Replace the CC routes with a mapping file, see utils.cc_routing
+
+        Args:
+            path (str): Path to a JSON mapping file
+        """
+        self.cc_routes.load(load_cc_map(path))
+        self._update_cc_labels()
+        self._report_cc_collisions()
+
+    def _update_cc_labels(self):
+        """Show each control's first routed CC on its label"""
+        for name, widget in self._cc_widgets.items():
+            ccs = self.cc_routes.ccs_for(name)
+            widget.set_midi_cc(ccs[0] if ccs else None)
+
+    def _report_cc_collisions(self):
+        """Print CCs that drive several controls by accident"""
+        for cc, names in self.cc_routes.collisions().items():
+            print(f"MIDI CC{cc} is assigned to several controls: {', '.join(names)}")
+
+    def _apply_midi_cc(self, widget, handler, cc_value):
+        """Send a CC-driven parameter and post the widget change for the GUI
+
+        Runs on the MIDI thread: the OSC path is thread-safe, the widget is
+        only updated later by apply_ui_deltas(). Knob parameters are handed
+        to the smoother and sent from the control tick.
+        """
+        value = widget.cc_to_value(cc_value)
+        if isinstance(widget, LabeledKnob):
+            # Continuous controls glide, the smoother emits on the control tick
+            self.cc_smoother.set(widget, value, Deferred(handler))
+        else:
+            handler(value)
+        self.ui_deltas.post(widget, value)
 
     def on_gain_change(self, value):
         """Handle gain change"""
-        self.send_osc("/gain", value)
+        self.queue_osc("/gain", value)
 
     def on_waveform_change(self, index):
         """Handle waveform change"""
-        self.send_osc("/wave_type", index)
+        self.queue_osc("/wave_type", index)
 
     def on_attack_L_change(self, value):
         """Handle left channel attack change"""
-        self.send_osc("/attack_L", value)
+        self.queue_osc("/attack_L", value)
 
     def on_decay_L_change(self, value):
         """Handle left channel decay change"""
-        self.send_osc("/decay_L", value)
+        self.queue_osc("/decay_L", value)
 
     def on_sustain_L_change(self, value):
         """Handle left channel sustain change"""
-        self.send_osc("/sustain_L", value)
+        self.queue_osc("/sustain_L", value)
 
     def on_release_L_change(self, value):
         """Handle left channel release change"""
-        self.send_osc("/release_L", value)
+        self.queue_osc("/release_L", value)
 
     def on_attack_R_change(self, value):
         """Handle right channel attack change"""
-        self.send_osc("/attack_R", value)
+        self.queue_osc("/attack_R", value)
 
     def on_decay_R_change(self, value):
         """Handle right channel decay change"""
-        self.send_osc("/decay_R", value)
+        self.queue_osc("/decay_R", value)
 
     def on_sustain_R_change(self, value):
         """Handle right channel sustain change"""
-        self.send_osc("/sustain_R", value)
+        self.queue_osc("/sustain_R", value)
 
     def on_release_R_change(self, value):
         """Handle right channel release change"""
-        self.send_osc("/release_R", value)
+        self.queue_osc("/release_R", value)
 
     def on_cutoff_L_change(self, value):
         """Handle left channel filter cutoff change"""
-        self.send_osc("/cutoff_L", value)
+        self.queue_osc("/cutoff_L", value)
 
     def on_cutoff_R_change(self, value):
         """Handle right channel filter cutoff change"""
-        self.send_osc("/cutoff_R", value)
+        self.queue_osc("/cutoff_R", value)
 
     def on_resonance_L_change(self, value):
         """Handle left channel filter resonance change"""
-        self.send_osc("/resonance_L", value)
+        self.queue_osc("/resonance_L", value)
 
     def on_resonance_R_change(self, value):
         """Handle right channel filter resonance change"""
-        self.send_osc("/resonance_R", value)
+        self.queue_osc("/resonance_R", value)
 
     def on_coarse_tune_change(self, value):
         """Handle coarse tune change"""
-        self.send_osc("/coarse_tune", value)
+        self.queue_osc("/coarse_tune", value)
 
     def on_fine_tune_change(self, value):
         """Handle fine tune change"""
-        self.send_osc("/fine_tune", value)
+        self.queue_osc("/fine_tune", value)
 
     def on_stability_change(self, value):
         """Handle stability change"""
-        self.send_osc("/stability", value)
+        self.queue_osc("/stability", value)
 
     def send_osc(self, address, value):
-        """Send OSC message"""
-        # Add synth name to the address path
-        full_address = f"/{self.synth_name}{address}"
-        self.osc_client.send_message(full_address, float(value))
+        """Queue an OSC message for the sender thread"""
+        recorder = self.recorder
+        if recorder is not None:
+            recorder.record_osc(address, value)
+        self.osc_sender.submit(address, value)
+
+    def _send_message(self, address, value):
+        """Put an OSC message on the wire, called on the sender thread
+
+        Only the sender thread sends, which serializes the client's cached
+        packets as OSCClient.send() requires.
+
+        Returns:
+            bool: False if the transport dropped the message
+        """
+        return self.osc.send(address, float(value))
+
+    def _send_datagram(self, data):
+        """Put an encoded OSC packet on the wire, called on the sender thread
+
+        Bundles are never dropped, as on the sender's ring.
+
+        Returns:
+            bool: False if the transport still had to drop the packet
+        """
+        return self.osc.client.send(OscDatagram(data), critical=True)
+
+    def queue_osc(self, address, value):
+        """Send a parameter update through the dead-band filter and coalescer"""
+        self.patch[address] = value
+        self.param_filter.submit(address, value)
+
+    def send_osc_batch(self, messages):
+        """Send several OSC messages as bundles
+
+        Args:
+            messages: Iterable of (address, value) pairs without synth prefix
+
+        Returns:
+            int: Number of datagrams queued
+        """
+        recorder = self.recorder
+        if recorder is not None:
+            messages = list(messages)
+            for address, value in messages:
+                recorder.record_osc(address, value)
+        bundles = self.osc.bundles(messages)
+        for bundle in bundles:
+            self.osc_sender.submit_datagram(bundle)
+        return len(bundles)
+
+    def reconnect_osc(self, ip=None, port=None):
+        """Switch to a synth, or back to a restarted one, keeping the patch
+
+        The synth's values are read back through the OSC listener and only
+        the parameters that differ from the patch are resent, see
+        ParameterCache.sync(). Without replies, e.g. when the listener port
+        is taken, every parameter is resent. The read-back waits for
+        replies, so it runs on a worker thread and patchSynced is emitted
+        when it is done.
+
+        Args:
+            ip (str): New IP address, None to keep the current one
+            port (int): New OSC port, None to keep the current one
+
+        Returns:
+            threading.Thread: The worker syncing the patch
+        """
+        # Updates already queued still go to the old destination
+        self.param_sender.flush()
+        self.osc_sender.flush()
+
+        if not self.osc_listener.running:
+            try:
+                self.osc_listener.start()
+            except OSError as e:
+                print(f"OSC listener unavailable: {e}")
+
+        self.osc.reconnect(ip, port)
+        self.osc_ip, self.osc_port = self.osc.ip, self.osc.port
+        self.osc_client = self.osc.client
+        self.param_cache.reconnect(self.osc_client)
+        self.statusBar().showMessage(
+            f"OSC: {self.synth_name} on {self.osc_ip}:{self.osc_port}, syncing"
+        )
+
+        self.sync_thread = threading.Thread(
+            target=self._sync_patch,
+            args=(list(self.patch.items()),),
+            name="murnau-param-sync",
+            daemon=True,
+        )
+        self.sync_thread.start()
+        return self.sync_thread
+
+    def _sync_patch(self, state):
+        """Resend the parameters the synth lacks, called on the sync worker
+
+        Args:
+            state: (address, value) pairs without synth prefix
+        """
+        resent = self.param_cache.sync(state) if state else []
+        recorder = self.recorder
+        if recorder is not None:
+            for address, value in resent:
+                recorder.record_osc(address, value)
+        self.patchSynced.emit(len(resent))
+
+    def _on_patch_synced(self, count):
+        """Report a finished reconnect in the status bar"""
+        self.statusBar().showMessage(
+            f"OSC: {self.synth_name} on {self.osc_ip}:{self.osc_port}, "
+            f"{count} parameter(s) resent"
+        )
+
+    def start_recording(self, path):
+        """Log every MIDI message handled and OSC message sent to a file
+
+        Replay the log with utils.session_log.replay() and compare runs
+        with diff_osc().
+
+        Args:
+            path (str): Path of the session log, replaced if it exists
+        """
+        self.stop_recording()
+        self.recorder = SessionRecorder(path)
+        self.statusBar().showMessage(f"Recording session to {path}")
+
+    def stop_recording(self):
+        """Close the session log
+
+        Returns:
+            int: Records written, 0 if nothing was being recorded
+        """
+        recorder, self.recorder = self.recorder, None
+        if recorder is None:
+            return 0
+        recorder.close()
+        self.statusBar().showMessage(
+            f"Session recorded: {recorder.records} records to {recorder.path}"
+        )
+        return recorder.records
+
+    def load_tuning(self, scl_path, kbm_path=None, reference=None):
+        """Retune MIDI notes and the on-screen keys to a Scala scale
+
+        Args:
+            scl_path (str): Path to a .scl file
+            kbm_path (str): Path to a .kbm file, None for the default mapping
+            reference (float): Reference frequency replacing the mapping's
+        """
+        tuning = Tuning.from_files(scl_path, kbm_path, reference)
+        retune(tuning)
+        self.piano.update()
+        self.statusBar().showMessage(f"Tuning: {tuning.scale.description}")
+
+    def set_note_priority(self, priority):
+        """Choose which held note sounds, for MIDI and the on-screen keys
+
+        Args:
+            priority (str): LAST, HIGH or LOW, see utils.note_stack
+        """
+        self.active_notes.priority = priority
+        self.piano.held_keys.priority = priority
+
+    def set_polyphony(self, destinations, policy=LRU, expression_map=None, mpe=False):
+        """Play MIDI notes on a pool of synth instances, one voice each
+
+        Notes from the on-screen keys and parameter changes still go to the
+        main synth. Polyphonic aftertouch and MPE expression go to the voice
+        playing their note, see utils.expression.
+
+        Args:
+            destinations: (ip, port, synth_name) per instance, None or empty
+                to go back to the monophonic synth
+            policy (str): Voice allocation policy, see utils.voices
+            expression_map (dict): Bindings per expression dimension, None
+                for the defaults
+            mpe (bool): Start with an MPE lower zone on every channel
+                instead of waiting for the controller's configuration
+        """
+        previous = self.expression
+        if destinations:
+            # Voices queue on the sender thread like every other message
+            clients = [
+                OSCClient(ip, port, synth_name) for ip, port, synth_name in destinations
+            ]
+            poly = PolySynth(
+                [partial(self._send_voice, client) for client in clients],
+                policy,
+                [partial(self._send_voice_batch, client) for client in clients],
+            )
+            zones = {LOWER_MASTER: 15} if mpe else None
+            self.expression = ExpressionRouter(poly, expression_map, zones=zones)
+            self.poly = poly
+        else:
+            self.expression = None
+            self.poly = None
+        if previous is not None:
+            # Under the router's lock, serialized with the MIDI thread
+            previous.all_notes_off()
+
+    def _send_voice(self, client, address, value):
+        """Queue a message for one voice's synth instance
+
+        Args:
+            client (OSCClient): Client of the voice's instance
+            address (str): OSC address without synth prefix
+            value: Value to send
+        """
+        recorder = self.recorder
+        if recorder is not None:
+            recorder.record_osc(f"/{client.synth_name}{address}", value)
+        self.osc_sender.submit(address, value, send=client.send)
+
+    def _send_voice_batch(self, client, messages):
+        """Queue parameter values for one voice's synth instance as bundles
+
+        Args:
+            client (OSCClient): Client of the voice's instance
+            messages: List of (address, value) pairs without synth prefix
+        """
+        recorder = self.recorder
+        if recorder is not None:
+            for address, value in messages:
+                recorder.record_osc(f"/{client.synth_name}{address}", value)
+        for bundle in client.bundles(messages):
+            self.osc_sender.submit_datagram(bundle, send=client.client.sendto)
+
+    def _flush_expression(self):
+        """Send per-voice expression held back in this control period"""
+        expression = self.expression
+        if expression is not None:
+            expression.flush()
 
     def on_note_on(self, frequency):
         """Handle note on from UI"""
-        self.send_osc("/freq", frequency)
+        self.pitch_bend.note(frequency)
         self.send_osc("/gate", 1.0)
 
     def on_note_off(self):
         """Handle note off from UI"""
+        self.pitch_bend.note(None)
         self.send_osc("/gate", 0.0)
 
     def closeEvent(self, event):
@@ -772,8 +1460,22 @@ class MurnauUI(QMainWindow):
         # Stop MIDI processing
         self.stop_midi()
 
+        # Push out any parameter updates still held by the coalescer
+        self.frame_timer.stop()
+        self.latency_timer.stop()
+        self.control_timer.stop()
+        self.param_sender.flush()
+
         # Turn off any sound
         self.send_osc("/gate", 0.0)
+        self.stop_recording()
+
+        # Let a running reconnect finish its sync, then deliver everything
+        # still queued and stop the sender thread
+        if self.sync_thread is not None:
+            self.sync_thread.join()
+        self.osc_sender.stop()
+        self.osc_listener.stop()
 
         # Accept the event
         event.accept()
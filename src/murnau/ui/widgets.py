@@ -15,6 +15,10 @@ from PyQt6.QtWidgets import (
     QWidget,
 )
 
+from ..utils.cc_routing import DEFAULT_CCS
+from ..utils.note_stack import NoteStack
+from ..utils.tuning import current
+
 
 class CustomDial(QDial):
     """Custom styled knob with value label"""
@@ -87,8 +91,7 @@ class LabeledKnob(QWidget):
         self.knob.setMaximum(1000)
         self.knob.setNotchesVisible(True)
         self.knob.setWrapping(False)
-        self.knob.setStyleSheet(
-            """
+        self.knob.setStyleSheet("""
             QDial {
                 background-color: #2A2A2A;
                 border: 1px solid #3A3A3A;
@@ -107,8 +110,7 @@ class LabeledKnob(QWidget):
                 height: 14px;
                 border-radius: 7px;
             }
-        """
-        )
+        """)
 
         # Set default position based on input value
         default_pos = self.value_to_knob(default)
@@ -167,12 +169,33 @@ class LabeledKnob(QWidget):
         position = self.value_to_knob(value)
         self.knob.setValue(position)
 
+    def set_midi_cc(self, cc):
+        """Change the CC shown for this knob, None for no CC"""
+        self.midi_cc = cc
+        if cc is None:
+            self.name_label.setText(self.name)
+        else:
+            self.name_label.setText(f"{self.name}\n(CC{cc})")
+
+    def show_value(self, value):
+        """Move the knob and its text to a value without emitting valueChanged"""
+        self.knob.blockSignals(True)
+        self.knob.setValue(self.value_to_knob(value))
+        self.knob.blockSignals(False)
+        if self.is_integer:
+            self.knob.set_value_text(f"{int(value)}")
+        else:
+            self.knob.set_value_text(f"{value:.2f}")
+
+    def cc_to_value(self, cc_value):
+        """Convert a MIDI CC value (0-127) to a parameter value, thread-safe"""
+        normalized = cc_value / 127.0
+        return self.min_val + normalized * (self.max_val - self.min_val)
+
     def set_from_midi_cc(self, cc_value):
         """Set from MIDI CC value (0-127)"""
         if self.midi_cc is not None:
-            # Convert from 0-127 range to knob range
-            normalized = cc_value / 127.0
-            value = self.min_val + normalized * (self.max_val - self.min_val)
+            value = self.cc_to_value(cc_value)
             self.set_value(value)
             return value
         return None
@@ -191,13 +214,11 @@ class WaveformSelector(QWidget):
             self.setMinimumHeight(100)
             self.setFrameShape(QFrame.Shape.Box)
             self.setFrameShadow(QFrame.Shadow.Sunken)
-            self.setStyleSheet(
-                """
+            self.setStyleSheet("""
                 background-color: #0F0F0F;
                 border: 1px solid #3A3A3A;
                 border-radius: 4px;
-            """
-            )
+            """)
             self.wave_type = 2  # Default sawtooth
             self.offset = 0  # For animation
 
@@ -291,7 +312,7 @@ class WaveformSelector(QWidget):
                         points[i - 1][0], points[i - 1][1], points[i][0], points[i][1]
                     )
 
-    def __init__(self, parent=None, midi_cc=1):
+    def __init__(self, parent=None, midi_cc=DEFAULT_CCS["wave_type"]):
         super().__init__(parent)
         self.midi_cc = midi_cc
 
@@ -329,8 +350,7 @@ class WaveformSelector(QWidget):
             if i == 2:  # Sawtooth
                 button.setChecked(True)
 
-            button.setStyleSheet(
-                """
+            button.setStyleSheet("""
                 QPushButton {
                     background-color: #2A2A2A;
                     color: #D4BF8A;
@@ -345,8 +365,7 @@ class WaveformSelector(QWidget):
                 QPushButton:hover {
                     background-color: #3A3A3A;
                 }
-            """
-            )
+            """)
 
             button.clicked.connect(self.button_clicked)
 
@@ -395,36 +414,44 @@ class WaveformSelector(QWidget):
     def _animate_wave_change(self):
         """Animate waveform change"""
         # Add a flash effect to the wave visualization frame
-        self.wave_viz.setStyleSheet(
-            """
+        self.wave_viz.setStyleSheet("""
             background-color: #252525;
             border: 1px solid #D4BF8A;
             border-radius: 4px;
-        """
-        )
+        """)
         self._animation_timer.start(300)
 
     def _reset_wave_viz_style(self):
         """Reset wave viz style after animation"""
-        self.wave_viz.setStyleSheet(
-            """
+        self.wave_viz.setStyleSheet("""
             background-color: #0F0F0F;
             border: 1px solid #3A3A3A;
             border-radius: 4px;
-        """
-        )
+        """)
+
+    def set_midi_cc(self, cc):
+        """Change the CC shown for this selector, None for no CC"""
+        self.midi_cc = cc
+        if cc is None:
+            self.name_label.setText("Waveform")
+        else:
+            self.name_label.setText(f"Waveform (CC{cc})")
+
+    def cc_to_value(self, cc_value):
+        """Convert a MIDI CC value (0-127) to a waveform index, thread-safe"""
+        # Map 0-127 to 0-3 range for waveforms
+        return min(3, int(cc_value / 32))
 
     def set_from_midi_cc(self, cc_value):
         """Set waveform from MIDI CC value (0-127)"""
         if self.midi_cc is not None:
-            # Map 0-127 to 0-3 range for waveforms
-            wave = min(3, int(cc_value / 32))
+            wave = self.cc_to_value(cc_value)
             self.set_waveform(wave)
             return wave
         return None
 
-    def set_waveform(self, index):
-        """Set waveform from outside"""
+    def show_value(self, index):
+        """Show a waveform without emitting waveformChanged"""
         if 0 <= index <= 3:
             self.current_index = index
 
@@ -437,6 +464,11 @@ class WaveformSelector(QWidget):
 
             # Animation and update
             self._animate_wave_change()
+
+    def set_waveform(self, index):
+        """Set waveform from outside"""
+        if 0 <= index <= 3:
+            self.show_value(index)
             self.waveformChanged.emit(index)
 
     def animate_wave(self):
@@ -460,22 +492,9 @@ class PianoKeys(QWidget):
         self.setMinimumHeight(120)
         self.setMinimumWidth(500)
 
-        # Expanded keyboard range
-        self.notes = [
-            261.63,
-            277.18,
-            293.66,
-            311.13,
-            329.63,
-            349.23,
-            369.99,
-            392.00,
-            415.30,
-            440.00,
-            466.16,
-            493.88,
-            523.25,
-        ]
+        # Expanded keyboard range, frequencies come from the active tuning
+        self.first_note = 60  # MIDI note of the leftmost key, C4
+        self.key_count = 13
         self.note_names = [
             "C4",
             "C#4",
@@ -509,6 +528,10 @@ class PianoKeys(QWidget):
         self.active_keys = set()  # Track multiple active keys for polyphonic display
         self.last_midi_note = None
 
+        # Keys held with mouse or keyboard, and MIDI notes shown, in one model
+        self.held_keys = NoteStack()
+        self.midi_keys = NoteStack()
+
         # Key shadows for expressionist effect
         self.key_shadows = []
         for i in range(len(self.notes)):
@@ -517,6 +540,11 @@ class PianoKeys(QWidget):
         # Set focus policy to enable key press events
         self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
 
+    @property
+    def notes(self):
+        """Frequency of each key in the active tuning, None if unmapped"""
+        return current().freqs[self.first_note : self.first_note + self.key_count]
+
     def paintEvent(self, event):
         """Draw piano keys with expressionist perspective distortion"""
         qp = QPainter(self)
@@ -648,9 +676,57 @@ class PianoKeys(QWidget):
     def mouseReleaseEvent(self, event):
         """Handle mouse release to stop note"""
         self.active_keys.clear()
+        self.held_keys.clear()
         self.noteOff.emit()
         self.update()
 
+    def press_key(self, note_idx):
+        """Hold a key, sounding it if the priority picks it
+
+        Args:
+            note_idx (int): Index into self.notes
+
+        Returns:
+            bool: True if the key was not held before
+        """
+        sounding = self.held_keys.current()
+        if not self.held_keys.push(note_idx):
+            return False
+        self.active_keys.add(note_idx)
+        playing = self.held_keys.current()
+        if playing != sounding:
+            self._emit_note_on(playing)
+        return True
+
+    def release_key(self, note_idx):
+        """Release a held key, falling back to the next one by priority
+
+        Args:
+            note_idx (int): Index into self.notes
+
+        Returns:
+            bool: True if the key was held
+        """
+        sounding = self.held_keys.current()
+        if not self.held_keys.remove(note_idx):
+            return False
+        self.active_keys.discard(note_idx)
+        playing = self.held_keys.current()
+
+        # Only emit noteOff if all keys are released
+        if playing is None:
+            self.noteOff.emit()
+        # Otherwise, play the held key picked by the priority
+        elif playing != sounding:
+            self._emit_note_on(playing)
+        return True
+
+    def _emit_note_on(self, note_idx):
+        """Emit noteOn for a key, keys the tuning leaves unmapped are silent"""
+        freq = self.notes[note_idx]
+        if freq is not None:
+            self.noteOn.emit(freq)
+
     def _handle_mouse_position(self, x, y, trigger_note=True):
         """Process mouse position and determine which key is activated"""
         width = self.width()
@@ -681,9 +757,8 @@ class PianoKeys(QWidget):
                         and x < black_key_x + black_key_width
                         and y < black_key_height
                     ):
-                        if i not in self.active_keys and trigger_note:
-                            self.active_keys.add(i)
-                            self.noteOn.emit(self.notes[i])
+                        if trigger_note:
+                            self.press_key(i)
                         self.update()
                         return
 
@@ -693,9 +768,8 @@ class PianoKeys(QWidget):
             if not self.is_black_key[i]:
                 key_x = int(white_key_index * white_key_width)
                 if x >= key_x and x < key_x + white_key_width:
-                    if i not in self.active_keys and trigger_note:
-                        self.active_keys.add(i)
-                        self.noteOn.emit(self.notes[i])
+                    if trigger_note:
+                        self.press_key(i)
                     self.update()
                     return
                 white_key_index += 1
@@ -724,9 +798,7 @@ class PianoKeys(QWidget):
 
         if event.key() in key_mapping:
             note_idx = key_mapping[event.key()]
-            if note_idx not in self.active_keys:
-                self.active_keys.add(note_idx)
-                self.noteOn.emit(self.notes[note_idx])
+            if self.press_key(note_idx):
                 self.update()
 
     def keyReleaseEvent(self, event):
@@ -753,40 +825,30 @@ class PianoKeys(QWidget):
 
         if event.key() in key_mapping:
             note_idx = key_mapping[event.key()]
-            if note_idx in self.active_keys:
-                self.active_keys.remove(note_idx)
-
-                # Only emit noteOff if all keys are released
-                if not self.active_keys:
-                    self.noteOff.emit()
-                # Otherwise, play the last pressed note
-                else:
-                    self.noteOn.emit(self.notes[max(self.active_keys)])
-
+            if self.release_key(note_idx):
                 self.update()
 
     def handle_midi_note_on(self, note, velocity):
         """Handle MIDI note on event"""
         # Convert MIDI note number to our note array
-        note_idx = note - 60  # MIDI note 60 = C4
+        note_idx = note - self.first_note
 
         if 0 <= note_idx < len(self.notes):
             self.active_keys.add(note_idx)
-            self.last_midi_note = note_idx
+            self.midi_keys.push(note_idx)
+            self.last_midi_note = self.midi_keys.current()
             self.update()
             return True
         return False
 
     def handle_midi_note_off(self, note):
         """Handle MIDI note off event"""
-        note_idx = note - 60  # MIDI note 60 = C4
+        note_idx = note - self.first_note
 
         if note_idx in self.active_keys:
             self.active_keys.remove(note_idx)
-            if note_idx == self.last_midi_note:
-                self.last_midi_note = (
-                    None if not self.active_keys else max(self.active_keys)
-                )
+            self.midi_keys.remove(note_idx)
+            self.last_midi_note = self.midi_keys.current()
             self.update()
             return True
         return False
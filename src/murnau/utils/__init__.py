@@ -1,5 +1,28 @@
 """Utility modules for Murnau"""
 
-from .osc_client import OSCClient
+from .async_osc_client import AsyncOSCClient
+from .cc_routing import CCRoutingTable
+from .coalescer import CoalescingSender
+from .deltas import DeltaQueue
+from .fanout import FanoutOSCClient
+from .listener import OSCListener
+from .osc_client import OSCClient, build_bundles, send_batch
+from .param_cache import ParameterCache
+from .sender import OSCSenderThread
+from .transport import TransportRegistry, get_transport
 
-__all__ = ["OSCClient"]
+__all__ = [
+    "AsyncOSCClient",
+    "CCRoutingTable",
+    "CoalescingSender",
+    "DeltaQueue",
+    "FanoutOSCClient",
+    "OSCClient",
+    "OSCListener",
+    "OSCSenderThread",
+    "ParameterCache",
+    "TransportRegistry",
+    "build_bundles",
+    "get_transport",
+    "send_batch",
+]
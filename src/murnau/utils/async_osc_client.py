@@ -0,0 +1,145 @@
+"""asyncio OSC client for Murnau synthesizer
+
+Sends are non-blocking writes on an asyncio datagram transport, so any
+number of sequences can drive synths concurrently from one event loop.
+"""
+
+import asyncio
+from numbers import Real
+
+from pythonosc.osc_message_builder import OscMessageBuilder
+
+from .osc_client import _pack_float_into, build_bundles, message_template
+
+
+class _OSCProtocol(asyncio.DatagramProtocol):
+    """Datagram protocol for an outgoing-only OSC endpoint"""
+
+    def __init__(self):
+        self.closed = None
+
+    def connection_made(self, transport):
+        self.closed = asyncio.get_running_loop().create_future()
+
+    def error_received(self, exc):
+        # e.g. ICMP port unreachable while the synth is not running yet
+        print(f"OSC send error: {exc}")
+
+    def connection_lost(self, exc):
+        if not self.closed.done():
+            self.closed.set_result(None)
+
+
+class AsyncOSCClient:
+    """OSC client built on an asyncio datagram transport
+
+    Has the same send/send_raw/send_batch/set_synth_name surface as
+    OSCClient. Create it inside a running loop with ``await connect()`` or
+    ``async with AsyncOSCClient(...) as client``.
+    """
+
+    def __init__(self, ip="127.0.0.1", port=5510, synth_name="legato_synth_stereo"):
+        """Initialize the client
+
+        Args:
+            ip (str): IP address for OSC communication
+            port (int): Port for OSC communication
+            synth_name (str): Name of the synthesizer
+        """
+        self.ip = ip
+        self.port = port
+        self.synth_name = synth_name
+        self.transport = None
+        self._protocol = None
+
+        # Pre-encoded packets per address, only the float argument changes
+        self._templates = {}
+
+    async def connect(self):
+        """Open the datagram endpoint on the running event loop
+
+        Returns:
+            AsyncOSCClient: self, for chaining
+        """
+        if self.transport is None:
+            loop = asyncio.get_running_loop()
+            self.transport, self._protocol = await loop.create_datagram_endpoint(
+                _OSCProtocol, remote_addr=(self.ip, self.port)
+            )
+        return self
+
+    async def close(self):
+        """Close the datagram endpoint"""
+        if self.transport is not None:
+            self.transport.close()
+            await self._protocol.closed
+            self.transport = None
+            self._protocol = None
+
+    async def __aenter__(self):
+        return await self.connect()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    def send(self, address, value):
+        """Send an OSC message
+
+        Numbers are sent as 32-bit floats and other values keep their OSC
+        type, like OSCClient.send(). The transport copies the packet if it
+        has to buffer it, so the cached template can be reused right away.
+
+        Args:
+            address (str): OSC address (will be prefixed with synth name)
+            value: Value to send
+        """
+        if not isinstance(value, Real):
+            self.send_raw(f"/{self.synth_name}{address}", value)
+            return
+
+        try:
+            packet, offset = self._templates[address]
+        except KeyError:
+            packet, offset = message_template(f"/{self.synth_name}{address}")
+            self._templates[address] = (packet, offset)
+
+        _pack_float_into(packet, offset, value)
+        self.transport.sendto(packet)
+
+    def send_raw(self, address, value):
+        """Send an OSC message without synth name prefix
+
+        Args:
+            address (str): Full OSC address
+            value: Value to send
+        """
+        builder = OscMessageBuilder(address=address)
+        builder.add_arg(value)
+        self.transport.sendto(builder.build().dgram)
+
+    def send_batch(self, messages):
+        """Send several parameters at once as OSC bundles
+
+        Args:
+            messages: Iterable of (address, value) pairs, addresses are
+                prefixed with the synth name
+
+        Returns:
+            int: Number of datagrams sent
+        """
+        prefix = f"/{self.synth_name}"
+        bundles = build_bundles(
+            [(prefix + address, value) for address, value in messages]
+        )
+        for bundle in bundles:
+            self.transport.sendto(bundle)
+        return len(bundles)
+
+    def set_synth_name(self, name):
+        """Change the synthesizer name
+
+        Args:
+            name (str): New synthesizer name
+        """
+        self.synth_name = name
+        self._templates.clear()
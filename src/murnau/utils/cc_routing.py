@@ -0,0 +1,544 @@
+"""MIDI CC routing table
+
+Maps each of the 128 controller numbers to the targets it drives. Routes
+are kept as bindings (target name plus scaling curve); after every change
+they are compiled into a 128-slot tuple of (callable, lookup table) pairs
+that is swapped in as a whole. Dispatch is one index, one lookup per target
+and the call, and a MIDI thread dispatching during a remap sees either the
+old or the new table.
+
+A CC can drive several targets on purpose (set_route(), mapping files).
+When assign() puts a target on a CC that already drives something else,
+the CC is reported by collisions() until it is resolved.
+
+Mapping files are JSON objects from CC number to a list of bindings. A
+binding is a target name, or an object that adds a scaling curve and an
+output range in 0-1 (high below low inverts the control):
+
+    {"74": ["cutoff_L", "cutoff_R"],
+     "73": [{"target": "attack_L", "curve": "exp", "low": 0.0, "high": 0.5}]}
+"""
+
+import json
+import math
+import os
+import re
+import threading
+from typing import NamedTuple
+
+from .hires_cc import LSB_OFFSET
+
+# Number of MIDI controller numbers
+CC_COUNT = 128
+
+# Highest 7-bit controller value
+CC_MAX = 127
+
+# Highest 14-bit controller value, see dispatch_fine()
+FINE_MAX = 16383
+
+# Controller number each synth control starts on, shared by the UI's
+# controls and the MIDI file player
+DEFAULT_CCS = {
+    "wave_type": 1,
+    "coarse_tune": 2,
+    "fine_tune": 3,
+    "stability": 4,
+    "gain": 7,
+    "sustain_L": 31,
+    "sustain_R": 32,
+    "cutoff_R": 70,
+    "resonance_L": 71,
+    "release_L": 72,
+    "attack_L": 73,
+    "cutoff_L": 74,
+    "decay_L": 75,
+    "resonance_R": 76,
+    "release_R": 77,
+    "attack_R": 78,
+    "decay_R": 79,
+}
+
+# Scaling curves over the normalized 0-1 controller range
+CURVES = {
+    "linear": lambda x: x,
+    "exp": lambda x: x * x,  # finer steps at the low end
+    "log": math.sqrt,  # finer steps at the high end
+}
+
+# Directory of the per-device map files
+DEFAULT_MAP_DIR = os.path.join(
+    os.path.expanduser("~"), ".config", "murnau", "midi_maps"
+)
+
+
+class Binding(NamedTuple):
+    """Route from a CC to a target through a curve and output range"""
+
+    target: str
+    curve: str = "linear"
+    low: float = 0.0
+    high: float = 1.0
+
+
+_EMPTY = ()
+
+# Lookup table of the plain linear binding, passes the CC value through
+_IDENTITY = tuple(range(CC_COUNT))
+
+
+def make_binding(entry):
+    """Build a Binding from a target name, mapping file object or Binding
+
+    Args:
+        entry: Target name, dict with "target" and optional "curve", "low"
+            and "high", or a Binding
+
+    Returns:
+        Binding: Validated binding
+
+    Raises:
+        ValueError: If the entry is malformed or names an unknown curve
+    """
+    if isinstance(entry, Binding):
+        result = entry
+    elif isinstance(entry, str):
+        result = Binding(entry)
+    elif isinstance(entry, dict) and isinstance(entry.get("target"), str):
+        result = Binding(
+            entry["target"],
+            entry.get("curve", "linear"),
+            float(entry.get("low", 0.0)),
+            float(entry.get("high", 1.0)),
+        )
+    else:
+        raise ValueError(f"Invalid CC binding: {entry!r}")
+
+    if result.curve not in CURVES:
+        raise ValueError(f"Unknown CC curve: {result.curve}")
+    return result
+
+
+def compile_curve(curve="linear", low=0.0, high=1.0):
+    """Precompute a binding's output for every controller value
+
+    Outputs stay in CC units (0-127, as floats for shaped bindings), so
+    targets see the same range whatever the curve.
+
+    Args:
+        curve (str): Name of a curve in CURVES
+        low (float): Output at controller value 0, normalized
+        high (float): Output at controller value 127, normalized
+
+    Returns:
+        tuple: 128 output values indexed by controller value
+    """
+    if curve == "linear" and low == 0.0 and high == 1.0:
+        return _IDENTITY
+    shape = CURVES[curve]
+    return tuple(
+        CC_MAX * (low + (high - low) * shape(value / CC_MAX))
+        for value in range(CC_COUNT)
+    )
+
+
+def binding_values(entries, controls):
+    """Compile the bindings of one source to parameter values
+
+    Args:
+        entries: Target name, Binding or list of them
+        controls (dict): DSP controls keyed by OSC address
+
+    Returns:
+        tuple: (address, 128 values) pairs, values scaled to the control's
+            range and quantized to its step
+
+    Raises:
+        ValueError: If a binding targets a control the DSP does not declare
+    """
+    if isinstance(entries, (str, dict, Binding)):
+        entries = [entries]
+    slots = []
+    for entry in entries:
+        binding = make_binding(entry)
+        address = f"/{binding.target}"
+        control = controls.get(address)
+        if control is None:
+            raise ValueError(f"Unknown CC automation target: {binding.target}")
+        curve = compile_curve(binding.curve, binding.low, binding.high)
+        values = []
+        for cc_value in curve:
+            offset = cc_value / CC_MAX * (control.max - control.min)
+            if control.step:
+                offset = round(offset / control.step) * control.step
+            values.append(control.min + offset)
+        slots.append((address, tuple(values)))
+    return tuple(slots)
+
+
+def load_cc_map(path):
+    """Read a CC mapping file
+
+    Args:
+        path (str): Path to a JSON mapping file
+
+    Returns:
+        dict: List of Bindings per CC number
+
+    Raises:
+        ValueError: If the file is not a valid mapping
+    """
+    with open(path, "r") as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError(f"CC map must be a JSON object: {path}")
+
+    mapping = {}
+    for key, entries in data.items():
+        try:
+            cc = int(key)
+        except ValueError:
+            raise ValueError(f"Invalid CC number in {path}: {key!r}") from None
+        if isinstance(entries, (str, dict)):
+            entries = [entries]
+        mapping[cc] = [make_binding(entry) for entry in entries]
+    return mapping
+
+
+def save_cc_map(path, mapping):
+    """Write a CC mapping file
+
+    Args:
+        path (str): Path of the JSON file to write
+        mapping (dict): Bindings per CC number, see CCRoutingTable.bindings()
+    """
+    data = {}
+    for cc, bindings in sorted(mapping.items()):
+        entries = []
+        for entry in bindings:
+            b = make_binding(entry)
+            if b == Binding(b.target):
+                entries.append(b.target)
+            else:
+                entries.append(b._asdict())
+        data[str(cc)] = entries
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    # Write next to the target and rename, so a crash never leaves half a map
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+class MidiMapStore:
+    """Directory of CC mapping files, one per MIDI device"""
+
+    def __init__(self, directory=DEFAULT_MAP_DIR):
+        """Initialize the store
+
+        Args:
+            directory (str): Directory holding the map files
+        """
+        self.directory = directory
+
+    def path_for(self, device):
+        """Get the map file path of a device
+
+        Args:
+            device (str): MIDI port name
+
+        Returns:
+            str: Path of the device's JSON map file
+        """
+        name = re.sub(r"[^A-Za-z0-9._-]+", "_", device).strip("_") or "default"
+        return os.path.join(self.directory, f"{name}.json")
+
+    def load(self, device):
+        """Read the map of a device
+
+        Args:
+            device (str): MIDI port name
+
+        Returns:
+            dict: Bindings per CC number, None if the device has no map file
+        """
+        path = self.path_for(device)
+        if not os.path.exists(path):
+            return None
+        return load_cc_map(path)
+
+    def save(self, device, mapping):
+        """Write the map of a device
+
+        Args:
+            device (str): MIDI port name
+            mapping (dict): Bindings per CC number
+        """
+        save_cc_map(self.path_for(device), mapping)
+
+
+class CCRoutingTable:
+    """Constant-time dispatch of MIDI CC values to named targets"""
+
+    def __init__(self, targets):
+        """Initialize an empty table
+
+        Args:
+            targets (dict): Callable taking the CC value (0-127) per target name
+        """
+        self.targets = dict(targets)
+        self._lock = threading.Lock()
+        self._routes = {}  # cc -> list of Bindings
+        self._groups = set()  # CCs deliberately driving several targets
+        self._slots = (_EMPTY,) * CC_COUNT
+
+        # Routed MSB controllers whose LSB controller drives nothing itself,
+        # the pairs to decode as 14-bit, see hires_cc.HighResDecoder.feed()
+        self.hires_pairs = frozenset()
+
+    def dispatch(self, cc, value):
+        """Send a CC value to every target routed from the CC
+
+        Args:
+            cc (int): Controller number
+            value (int): Controller value
+
+        Returns:
+            int: Number of targets called
+        """
+        slot = self._slots[cc]
+        for target, table in slot:
+            target(table[value])
+        return len(slot)
+
+    def dispatch_fine(self, cc, value):
+        """Send a 14-bit value to every target routed from the CC
+
+        The compiled curves are interpolated between their 128 points, so
+        targets receive a fractional CC value (0-127). A 7-bit value
+        expanded with hires_cc.expand_7bit() gives the same result as
+        dispatch().
+
+        Args:
+            cc (int): Controller number
+            value (int): 14-bit controller value (0-16383)
+
+        Returns:
+            int: Number of targets called
+        """
+        slot = self._slots[cc]
+        if slot:
+            position = value * CC_MAX / FINE_MAX
+            index = min(int(position), CC_MAX - 1)
+            fraction = position - index
+            for target, table in slot:
+                low = table[index]
+                target(low + (table[index + 1] - low) * fraction)
+        return len(slot)
+
+    def routes(self):
+        """Get the current routes
+
+        Returns:
+            dict: List of target names per CC, only for routed CCs
+        """
+        with self._lock:
+            return {
+                cc: [b.target for b in bindings]
+                for cc, bindings in sorted(self._routes.items())
+            }
+
+    def bindings(self):
+        """Get the current routes with their curves
+
+        Returns:
+            dict: List of Bindings per CC, only for routed CCs
+        """
+        with self._lock:
+            return {cc: list(bindings) for cc, bindings in sorted(self._routes.items())}
+
+    def ccs_for(self, name):
+        """Get the CCs that drive a target
+
+        Args:
+            name (str): Target name
+
+        Returns:
+            list: Controller numbers in ascending order
+        """
+        with self._lock:
+            return sorted(
+                cc
+                for cc, bindings in self._routes.items()
+                if any(b.target == name for b in bindings)
+            )
+
+    def set_route(self, cc, entries):
+        """Route a CC to exactly these targets, replacing its current ones
+
+        Several targets make a deliberate one-to-many route, which is not
+        reported as a collision.
+
+        Args:
+            cc (int): Controller number
+            entries: Target names or bindings, empty to clear the CC
+        """
+        bindings = self._unique([make_binding(entry) for entry in entries])
+        self._check(cc, bindings)
+        with self._lock:
+            self._set(cc, bindings)
+            self._rebuild()
+
+    def assign(self, name, cc):
+        """Move a target to a CC, keeping whatever else the CC drives
+
+        Args:
+            name (str): Target name
+            cc (int): Controller number
+
+        Returns:
+            list: Other targets now sharing the CC, empty if there are none
+        """
+        binding = make_binding(name)
+        self._check(cc, [binding])
+        with self._lock:
+            self._remove(name)
+            bindings = self._routes.setdefault(cc, [])
+            others = [b.target for b in bindings]
+            bindings.append(binding)
+            if others:
+                # Whatever the CC drove before was not meant to include this
+                self._groups.discard(cc)
+            self._rebuild()
+        return others
+
+    def learn(self, name, cc):
+        """Make a CC drive only this target, as MIDI learn does
+
+        The target leaves its previous CCs, and whatever the CC drove
+        before is unbound. A curve the target had is kept.
+
+        Args:
+            name (str): Target name
+            cc (int): Controller number
+
+        Returns:
+            list: Targets the CC no longer drives
+        """
+        self._check(cc, [make_binding(name)])
+        with self._lock:
+            previous = [
+                b for bs in self._routes.values() for b in bs if b.target == name
+            ]
+            binding = previous[0] if previous else Binding(name)
+            self._remove(name)
+            dropped = [b.target for b in self._routes.get(cc, [])]
+            self._set(cc, [binding])
+            self._rebuild()
+        return dropped
+
+    def unassign(self, name):
+        """Remove a target from every CC
+
+        Args:
+            name (str): Target name
+        """
+        with self._lock:
+            self._remove(name)
+            self._rebuild()
+
+    def load(self, mapping):
+        """Replace all routes with a mapping, see load_cc_map()
+
+        Args:
+            mapping (dict): Target names or bindings per CC number
+        """
+        compiled = {}
+        for cc, entries in mapping.items():
+            bindings = self._unique([make_binding(entry) for entry in entries])
+            self._check(cc, bindings)
+            compiled[cc] = bindings
+        with self._lock:
+            self._routes = {}
+            self._groups = set()
+            for cc, bindings in compiled.items():
+                self._set(cc, bindings)
+            self._rebuild()
+
+    def collisions(self):
+        """Find CCs that ended up driving several targets by accident
+
+        Returns:
+            dict: Target names per colliding CC
+        """
+        with self._lock:
+            return {
+                cc: [b.target for b in bindings]
+                for cc, bindings in sorted(self._routes.items())
+                if len(bindings) > 1 and cc not in self._groups
+            }
+
+    def _check(self, cc, bindings):
+        """Validate a CC number and the targets of some bindings"""
+        if not 0 <= cc < CC_COUNT:
+            raise ValueError(f"CC number out of range: {cc}")
+        unknown = [b.target for b in bindings if b.target not in self.targets]
+        if unknown:
+            raise ValueError(f"Unknown CC target(s): {', '.join(unknown)}")
+
+    @staticmethod
+    def _unique(bindings):
+        """Keep the first binding of each target"""
+        seen = set()
+        result = []
+        for b in bindings:
+            if b.target not in seen:
+                seen.add(b.target)
+                result.append(b)
+        return result
+
+    def _set(self, cc, bindings):
+        """Replace a CC's bindings as a deliberate route, must hold the lock"""
+        if bindings:
+            self._routes[cc] = list(bindings)
+        else:
+            self._routes.pop(cc, None)
+        if len(bindings) > 1:
+            self._groups.add(cc)
+        else:
+            self._groups.discard(cc)
+
+    def _remove(self, name):
+        """Drop a target from its CCs, must hold the lock"""
+        for cc in list(self._routes):
+            bindings = [b for b in self._routes[cc] if b.target != name]
+            if len(bindings) == len(self._routes[cc]):
+                continue
+            if len(bindings) < 2:
+                self._groups.discard(cc)
+            if bindings:
+                self._routes[cc] = bindings
+            else:
+                del self._routes[cc]
+
+    def _rebuild(self):
+        """Compile the routes into the dispatch slots, must hold the lock"""
+        tables = {}
+        slots = [_EMPTY] * CC_COUNT
+        for cc, bindings in self._routes.items():
+            slot = []
+            for b in bindings:
+                shape = (b.curve, b.low, b.high)
+                if shape not in tables:
+                    tables[shape] = compile_curve(*shape)
+                slot.append((self.targets[b.target], tables[shape]))
+            slots[cc] = tuple(slot)
+        self._slots = tuple(slots)
+        self.hires_pairs = frozenset(
+            cc
+            for cc in self._routes
+            if cc < LSB_OFFSET and cc + LSB_OFFSET not in self._routes
+        )
@@ -0,0 +1,138 @@
+"""Session clock and onset error statistics
+
+A SessionClock gives playback a monotonic time base that starts at zero
+and maps onto NTP time for timetagged bundles. Code that paces itself on
+the clock compares the achieved onsets with the requested ones through
+onset_report(), or OnsetStats when the playback is too long to keep every
+onset.
+"""
+
+import math
+import time
+
+from .latency import LatencyHistogram
+
+# Final part of a wait that is busy-waited instead of slept, in seconds
+SPIN_THRESHOLD = 0.002
+
+
+class SessionClock:
+    """Monotonic session clock with a fixed mapping to NTP time
+
+    Session time starts at zero on creation and follows time.monotonic(),
+    so wall clock adjustments during playback do not move the timeline.
+    """
+
+    def __init__(self):
+        self.origin = time.monotonic()
+        self.wall_origin = time.time()
+
+    def now(self):
+        """Get the current session time
+
+        Returns:
+            float: Seconds since the clock was created
+        """
+        return time.monotonic() - self.origin
+
+    def to_unix(self, t):
+        """Convert a session time to a Unix timestamp
+
+        Args:
+            t (float): Session time in seconds
+
+        Returns:
+            float: Seconds since the Unix epoch
+        """
+        return self.wall_origin + t
+
+    def sleep_until(self, t, spin=SPIN_THRESHOLD):
+        """Block until a session time is reached
+
+        Args:
+            t (float): Session time to wait for
+            spin (float): Seconds before t at which sleeping turns into spinning
+        """
+        remaining = t - self.now()
+        if remaining > spin:
+            time.sleep(remaining - spin)
+        while self.now() < t:
+            pass
+
+
+def onset_report(requested, actual):
+    """Summarize achieved onset times against the requested timeline
+
+    Args:
+        requested (list): Requested onset times in seconds
+        actual (list): Achieved onset times in seconds
+
+    Returns:
+        dict: Event count, mean/p95/max absolute error and drift (last minus
+        first error), all in milliseconds
+    """
+    errors = [a - r for r, a in zip(requested, actual)]
+    if not errors:
+        return {
+            "events": 0,
+            "mean_ms": 0.0,
+            "p95_ms": 0.0,
+            "max_ms": 0.0,
+            "drift_ms": 0.0,
+        }
+
+    magnitudes = sorted(abs(e) for e in errors)
+    p95 = magnitudes[min(len(magnitudes) - 1, math.ceil(0.95 * len(magnitudes)) - 1)]
+    return {
+        "events": len(errors),
+        "mean_ms": sum(magnitudes) / len(magnitudes) * 1e3,
+        "p95_ms": p95 * 1e3,
+        "max_ms": magnitudes[-1] * 1e3,
+        "drift_ms": (errors[-1] - errors[0]) * 1e3,
+    }
+
+
+class OnsetStats:
+    """Onset errors accumulated in constant memory
+
+    The streaming counterpart of onset_report() for playback too long to
+    keep every onset: the p95 comes from a log-bucketed histogram, see
+    utils.latency, so it is accurate to about 9%.
+    """
+
+    def __init__(self):
+        self._magnitudes = LatencyHistogram()
+        self._total = 0.0
+        self.first = None
+        self.last = None
+
+    def add(self, requested, actual):
+        """Record one onset
+
+        Args:
+            requested (float): Requested onset time in seconds
+            actual (float): Achieved onset time in seconds
+        """
+        error = actual - requested
+        if self.first is None:
+            self.first = error
+        self.last = error
+        self._total += abs(error)
+        self._magnitudes.record(abs(error))
+
+    def report(self):
+        """Summarize the recorded onsets
+
+        Returns:
+            dict: Same fields as onset_report()
+        """
+        count = self._magnitudes.count
+        if not count:
+            return onset_report([], [])
+        return {
+            "events": count,
+            "mean_ms": self._total / count * 1e3,
+            "p95_ms": self._magnitudes.percentile(95) * 1e3,
+            "max_ms": self._magnitudes.max * 1e3,
+            "drift_ms": (self.last - self.first) * 1e3,
+        }
@@ -0,0 +1,114 @@
+"""Coalescing, rate-limited parameter sender for Murnau synthesizer"""
+
+import threading
+
+# Control-rate tick for parameter updates, in Hz
+DEFAULT_CONTROL_RATE = 200.0
+
+# Note messages are latency critical and never held back
+BYPASS_ADDRESSES = ("/gate", "/freq")
+
+
+class CoalescingSender:
+    """Rate limiter that keeps only the latest value per OSC address
+
+    The first update to an address within a control period is sent right
+    away. Further updates in the same period overwrite each other and only
+    the latest goes out on the next flush() tick, so a knob drag or a CC
+    flood costs at most one message per address per tick.
+    """
+
+    def __init__(
+        self, send, rate=DEFAULT_CONTROL_RATE, bypass=BYPASS_ADDRESSES, merge=None
+    ):
+        """Initialize the sender
+
+        Args:
+            send: Callable taking (address, value) that puts a message on the wire
+            rate (float): Control rate in Hz at which flush() is expected
+            bypass: Addresses sent immediately without coalescing
+            merge: Callable taking the held and a new value of an address and
+                returning the value to hold, None to hold the latest only
+        """
+        self._send = send
+        self.rate = rate
+        self.bypass = frozenset(bypass)
+        self._merge = merge
+
+        self._lock = threading.Lock()
+        self._pending = {}  # address -> latest held value
+        self._window = set()  # addresses already sent in this period
+
+        self.sent = 0
+        self.coalesced = 0
+        self.bypassed = 0
+
+    @property
+    def interval(self):
+        """Control period in seconds"""
+        return 1.0 / self.rate
+
+    def submit(self, address, value):
+        """Queue a parameter update
+
+        Args:
+            address (str): OSC address
+            value: Value to send
+        """
+        if address in self.bypass:
+            with self._lock:
+                self.bypassed += 1
+            self._send(address, value)
+            return
+
+        with self._lock:
+            if address in self._window:
+                if address in self._pending:
+                    self.coalesced += 1
+                    if self._merge is not None:
+                        value = self._merge(self._pending[address], value)
+                self._pending[address] = value
+                return
+            self._window.add(address)
+            self.sent += 1
+
+        self._send(address, value)
+
+    def discard(self, address):
+        """Drop the value held for an address
+
+        Args:
+            address (str): OSC address
+        """
+        with self._lock:
+            self._pending.pop(address, None)
+
+    def flush(self):
+        """Send held values, to be called once per control period
+
+        Returns:
+            int: Number of messages sent
+        """
+        with self._lock:
+            pending = self._pending
+            self._pending = {}
+            # Addresses flushed now stay rate limited until the next tick
+            self._window = set(pending)
+            self.sent += len(pending)
+
+        for address, value in pending.items():
+            self._send(address, value)
+        return len(pending)
+
+    def stats(self):
+        """Get sender counters
+
+        Returns:
+            dict: Sent, coalesced and bypassed message counts
+        """
+        with self._lock:
+            return {
+                "sent": self.sent,
+                "coalesced": self.coalesced,
+                "bypassed": self.bypassed,
+            }
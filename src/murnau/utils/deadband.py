@@ -0,0 +1,100 @@
+"""Dead-band filter that drops sends which do not change a quantized value"""
+
+import math
+import threading
+
+
+def step_decimals(step):
+    """Number of decimal places needed to represent multiples of a step
+
+    Args:
+        step (float): Quantization step
+
+    Returns:
+        int: Decimal places, e.g. 2 for a step of 0.01
+    """
+    decimals = 0
+    while decimals < 12 and not math.isclose(
+        round(step, decimals), step, rel_tol=1e-9, abs_tol=0.0
+    ):
+        decimals += 1
+    return decimals
+
+
+class DeadbandFilter:
+    """Quantize parameter values to their DSP step and skip repeated values
+
+    Each address with a known step is rounded to a multiple of that step.
+    If the quantized value equals the last one passed on for the address,
+    the update is dropped. Addresses without a step pass through untouched.
+    """
+
+    def __init__(self, send, steps):
+        """Initialize the filter
+
+        Args:
+            send: Callable taking (address, value) for updates that pass
+            steps (dict): Quantization step per OSC address, see step_table()
+        """
+        self._send = send
+        self._steps = {
+            address: (step, step_decimals(step)) for address, step in steps.items()
+        }
+
+        self._lock = threading.Lock()
+        self._last = {}  # address -> last quantized value passed on
+
+        self.passed = 0
+        self.suppressed = 0
+
+    def quantize(self, address, value):
+        """Round a value to the declared step of its address
+
+        Args:
+            address (str): OSC address
+            value: Value to quantize
+
+        Returns:
+            The quantized value, or the value unchanged if the address has no step
+        """
+        entry = self._steps.get(address)
+        if entry is None:
+            return value
+        step, decimals = entry
+        return round(round(float(value) / step) * step, decimals)
+
+    def submit(self, address, value):
+        """Pass an update on unless its quantized value is unchanged
+
+        Args:
+            address (str): OSC address
+            value: Value to send
+
+        Returns:
+            bool: True if the update was passed on
+        """
+        value = self.quantize(address, value)
+        with self._lock:
+            if address in self._steps:
+                if self._last.get(address) == value:
+                    self.suppressed += 1
+                    return False
+                self._last[address] = value
+            self.passed += 1
+
+        self._send(address, value)
+        return True
+
+    def reset(self):
+        """Forget the last values, so every address is sent again"""
+        with self._lock:
+            self._last.clear()
+
+    def stats(self):
+        """Get filter counters
+
+        Returns:
+            dict: Passed and suppressed update counts
+        """
+        with self._lock:
+            return {"passed": self.passed, "suppressed": self.suppressed}
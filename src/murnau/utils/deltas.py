@@ -0,0 +1,68 @@
+"""Latest-value mailbox for display updates posted from worker threads
+
+Qt widgets may only be touched on the GUI thread. Worker threads (MIDI
+input) post small (target, value) deltas here instead, and the GUI thread
+takes them all once per frame. A target posted several times within a frame
+keeps only its latest value, so a 1000 event/s CC stream turns into one
+widget update, and one repaint, per frame.
+"""
+
+import threading
+
+# Rate at which the GUI thread applies posted deltas, in Hz
+DEFAULT_FRAME_RATE = 60.0
+
+
+class DeltaQueue:
+    """Thread-safe map of pending display changes, drained once per frame"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = {}  # target -> latest value
+
+        self.posted = 0
+        self.coalesced = 0
+        self.frames = 0
+
+    def __len__(self):
+        return len(self._pending)
+
+    def post(self, target, value):
+        """Record the latest value for a target, from any thread
+
+        Args:
+            target: Hashable key naming what to update
+            value: New value for the target
+        """
+        with self._lock:
+            if target in self._pending:
+                self.coalesced += 1
+            self._pending[target] = value
+            self.posted += 1
+
+    def take(self):
+        """Take every pending delta, to be called on the GUI thread
+
+        Returns:
+            list: (target, value) pairs in first-posted order
+        """
+        with self._lock:
+            if not self._pending:
+                return []
+            pending = self._pending
+            self._pending = {}
+            self.frames += 1
+        return list(pending.items())
+
+    def stats(self):
+        """Get queue counters
+
+        Returns:
+            dict: Posted and coalesced deltas and frames that applied any
+        """
+        with self._lock:
+            return {
+                "posted": self.posted,
+                "coalesced": self.coalesced,
+                "frames": self.frames,
+            }
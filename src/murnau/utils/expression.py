@@ -0,0 +1,283 @@
+"""Per-note expression: polyphonic aftertouch and MPE
+
+Each note of a PolySynth plays on its own synth instance, so expression
+that belongs to one note goes to that instance only. Two sources carry it:
+
+- Polyphonic aftertouch names the note it presses.
+- MPE (MIDI Polyphonic Expression) gives every sounding note a member
+  channel of its own, and channel pressure and CC 74 (timbre) on that
+  channel belong to the note. The lower zone has master channel 1 and
+  members counting up from 2, the upper zone master channel 16 and members
+  counting down from 15 (0-based 0 and 15 here). A zone is set up by the
+  MPE configuration message, RPN 6 on its master channel with the member
+  count as data entry MSB, or up front.
+
+Outside MPE, channel pressure presses every sounding note alike. Values
+go through the same bindings as CC automation (target, curve, output
+range), compiled to lookup tables scaled to the DSP's control ranges.
+
+Pressure streams are dense, often several hundred messages per second
+per finger, so updates are coalesced per voice by a CoalescingSender keyed
+by voice: the first update of a voice in a control period is sent at once
+and later ones are held, the latest value per address going out on the
+next flush() tick. Every voice gets at most one packet per period, all its
+addresses in one bundle, so the packet rate is bounded by voices times
+control rate however many fingers press.
+"""
+
+import threading
+
+from ..dsp.schema import load_controls
+from .cc_routing import Binding, binding_values
+from .coalescer import DEFAULT_CONTROL_RATE, CoalescingSender
+from .hires_cc import (
+    DATA_ENTRY_LSB,
+    DATA_ENTRY_MSB,
+    RPN,
+    RPN_LSB,
+    RPN_MSB,
+    HighResDecoder,
+)
+
+# Expression dimensions
+PRESSURE = "pressure"
+TIMBRE = "timbre"
+
+# Bindings per dimension: pressure swells the level, timbre opens the filter
+DEFAULT_EXPRESSION_MAP = {
+    PRESSURE: Binding("gain", "log", 0.3, 1.0),
+    TIMBRE: [Binding("cutoff_L", "exp"), Binding("cutoff_R", "exp")],
+}
+
+# Controller carrying MPE timbre on member channels
+TIMBRE_CC = 74
+
+# Master channels of the MPE lower and upper zones, 0-based
+LOWER_MASTER = 0
+UPPER_MASTER = 15
+
+# RPN of the MPE configuration message
+MCM_RPN = 6
+
+# Controllers of the MPE configuration message
+_MCM_CCS = frozenset((RPN_MSB, RPN_LSB, DATA_ENTRY_MSB, DATA_ENTRY_LSB))
+
+
+def _merge_values(held, values):
+    """Fold a voice's new values into the ones held for it"""
+    held.update(values)
+    return held
+
+
+class ExpressionRouter:
+    """Plays notes on a PolySynth and sends their expression to their voices
+
+    handle() is called from the MIDI input thread and flush() from the
+    control-rate tick. Both run under one lock, so held values of a voice
+    cannot go out after the voice has started a new note.
+    """
+
+    def __init__(self, poly, expression_map=None, controls=None, zones=None):
+        """Initialize the router
+
+        Args:
+            poly (PolySynth): Voice pool playing the notes
+            expression_map (dict): PRESSURE and TIMBRE -> target name,
+                Binding or list of them; None for DEFAULT_EXPRESSION_MAP
+            controls (dict): DSP controls keyed by OSC address, None for
+                the bundled synth's
+            zones (dict): MPE master channel -> member channel count, None
+                to wait for an MPE configuration message
+
+        Raises:
+            ValueError: If a binding targets a control the DSP does not
+                declare, or a zone is invalid
+        """
+        if expression_map is None:
+            expression_map = DEFAULT_EXPRESSION_MAP
+        if controls is None:
+            controls = load_controls("legato_synth")
+        self._poly = poly
+        self._lock = threading.Lock()
+        self._slots = {
+            dimension: binding_values(expression_map.get(dimension, ()), controls)
+            for dimension in (PRESSURE, TIMBRE)
+        }
+
+        self._zones = {LOWER_MASTER: 0, UPPER_MASTER: 0}
+        self._members = frozenset()
+        self._channel_notes = {}  # member channel -> note sounding on it
+        self._decoder = HighResDecoder(pairs=())
+        for master, members in (zones or {}).items():
+            self.configure_zone(master, members)
+
+        # Keyed by voice index, held values are {address: latest value}
+        self._coalescer = CoalescingSender(
+            self._send_voice, bypass=(), merge=_merge_values
+        )
+
+    @property
+    def zones(self):
+        """Member channel count per MPE master channel"""
+        return dict(self._zones)
+
+    def configure_zone(self, master, members):
+        """Set up or disable an MPE zone
+
+        A zone overlapping the other one shrinks it, as the MPE
+        specification requires.
+
+        Args:
+            master (int): LOWER_MASTER or UPPER_MASTER
+            members (int): Number of member channels 0-15, 0 disables the
+                zone
+
+        Raises:
+            ValueError: If master is not a zone master channel or members
+                is out of range
+        """
+        with self._lock:
+            self._configure_zone(master, members)
+
+    def _configure_zone(self, master, members):
+        """Set up or disable an MPE zone, under the lock"""
+        if master not in self._zones:
+            raise ValueError(f"Not an MPE master channel: {master}")
+        if not 0 <= members <= 15:
+            raise ValueError(f"Invalid MPE member channel count: {members}")
+        other = UPPER_MASTER if master == LOWER_MASTER else LOWER_MASTER
+        self._zones[master] = members
+        self._zones[other] = max(0, min(self._zones[other], 14 - members))
+
+        lower = self._zones[LOWER_MASTER]
+        upper = self._zones[UPPER_MASTER]
+        members = set(range(1, lower + 1))
+        members.update(range(15 - upper, 15))
+        if lower == 15:
+            # A full lower zone takes channel 16 as its last member
+            members.add(UPPER_MASTER)
+        self._members = frozenset(members)
+        self._channel_notes.clear()
+
+    def handle(self, message):
+        """Handle one MIDI message
+
+        Args:
+            message: mido message
+
+        Returns:
+            bool: True if the message was a note or per-note expression and
+                has been handled, False if it is not the router's
+        """
+        with self._lock:
+            return self._handle(message)
+
+    def _handle(self, message):
+        """Handle one MIDI message, under the lock"""
+        kind = message.type
+        channel = getattr(message, "channel", 0)
+        if kind == "note_on" and message.velocity > 0:
+            index = self._poly.note_on(message.note, message.velocity)
+            if index is not None:
+                self._discard(index)
+                if channel in self._members:
+                    self._channel_notes[channel] = message.note
+            return True
+        if kind == "note_off" or kind == "note_on":
+            self._discard(self._poly.note_off(message.note))
+            if self._channel_notes.get(channel) == message.note:
+                del self._channel_notes[channel]
+            return True
+        if kind == "polytouch":
+            self._express_note(message.note, PRESSURE, message.value)
+            return True
+        if kind == "aftertouch":
+            if channel in self._members:
+                self._express_channel(channel, PRESSURE, message.value)
+            else:
+                # Channel-wide pressure presses every sounding note
+                for voice in self._poly.allocator.voices:
+                    if voice.note is not None:
+                        self._express(voice.index, PRESSURE, message.value)
+            return True
+        if kind == "control_change":
+            if channel in self._members:
+                if message.control == TIMBRE_CC:
+                    self._express_channel(channel, TIMBRE, message.value)
+                    return True
+            elif channel in self._zones and message.control in _MCM_CCS:
+                event = self._decoder.feed(message.control, message.value, channel)
+                if event is not None and event[:2] == (RPN, MCM_RPN):
+                    self._configure_zone(channel, min(event[2] >> 7, 15))
+                    return True
+        return False
+
+    def all_notes_off(self):
+        """Release every voice of the pool
+
+        Runs under the lock, so it cannot interleave with handle() taking
+        voices on the MIDI thread.
+        """
+        with self._lock:
+            for voice in self._poly.allocator.voices:
+                self._coalescer.discard(voice.index)
+            self._poly.all_notes_off()
+            self._channel_notes.clear()
+
+    def _express_channel(self, channel, dimension, value):
+        """Send a value to the note sounding on a member channel"""
+        note = self._channel_notes.get(channel)
+        if note is not None:
+            self._express_note(note, dimension, value)
+
+    def _express_note(self, note, dimension, value):
+        """Send a value to the voice playing a note"""
+        voice = self._poly.allocator.voice_for(note)
+        if voice is not None:
+            self._express(voice.index, dimension, value)
+
+    def _express(self, index, dimension, value):
+        """Send or hold a value for one voice"""
+        slots = self._slots[dimension]
+        if slots:
+            self._coalescer.submit(
+                index, {address: values[value] for address, values in slots}
+            )
+
+    def _discard(self, index):
+        """Drop values held for a voice that starts or ends a note"""
+        if index is not None:
+            self._coalescer.discard(index)
+
+    def _send_voice(self, index, values):
+        """Send one voice's values as one packet"""
+        self._poly.send(index, list(values.items()))
+
+    def flush(self):
+        """Send held values, to be called once per control period
+
+        Returns:
+            int: Number of packets sent
+        """
+        with self._lock:
+            return self._coalescer.flush()
+
+    def packet_budget(self, rate=DEFAULT_CONTROL_RATE):
+        """Most expression packets per second at a control rate
+
+        Args:
+            rate (float): flush() ticks per second
+
+        Returns:
+            float: Packets per second
+        """
+        return len(self._poly.allocator) * rate
+
+    def stats(self):
+        """Get router counters
+
+        Returns:
+            dict: Packets sent and updates folded into a held packet
+        """
+        stats = self._coalescer.stats()
+        return {"packets": stats["sent"], "coalesced": stats["coalesced"]}
@@ -0,0 +1,169 @@
+"""Fan-out OSC client that sends every message to several synth instances"""
+
+import threading
+from numbers import Real
+
+from pythonosc.osc_message_builder import OscMessageBuilder
+
+from .osc_client import _pack_float_into, build_bundles, message_template
+from .sender import NEVER_DROP
+from .transport import registry as default_registry
+
+
+class FanoutOSCClient:
+    """OSC client that encodes each message once and sends it to N destinations
+
+    Python's socket module has no sendmmsg(), so a send is a tight sendto()
+    loop over a snapshot of the destinations' shared transports, which all
+    write through the registry's one socket per address family.
+    Destinations can be added and removed at runtime; only the snapshot is
+    replaced.
+    """
+
+    def __init__(
+        self, destinations=(), synth_name="legato_synth_stereo", registry=None
+    ):
+        """Initialize the client
+
+        Args:
+            destinations: Iterable of (ip, port) pairs to start with
+            synth_name (str): Name of the synthesizer
+            registry (TransportRegistry): Source of the destination transports,
+                the process registry when not given
+        """
+        self.synth_name = synth_name
+        self._registry = registry or default_registry
+        self._lock = threading.Lock()
+        self._destinations = {}  # (ip, port) -> Transport
+        self._targets = ()  # immutable snapshot iterated by the send path
+
+        # Pre-encoded packets per address, only the float argument changes
+        self._templates = {}
+
+        for ip, port in destinations:
+            self.add_destination(ip, port)
+
+    @property
+    def destinations(self):
+        """Current destinations as a list of (ip, port) pairs"""
+        with self._lock:
+            return list(self._destinations)
+
+    def add_destination(self, ip, port):
+        """Start sending to another synth instance
+
+        Args:
+            ip (str): IP address of the instance
+            port (int): OSC port of the instance
+        """
+        transport = self._registry.get(ip, port)
+        with self._lock:
+            self._destinations[(ip, port)] = transport
+            self._targets = tuple(self._destinations.values())
+
+    def remove_destination(self, ip, port):
+        """Stop sending to a synth instance
+
+        Args:
+            ip (str): IP address of the instance
+            port (int): OSC port of the instance
+        """
+        with self._lock:
+            if self._destinations.pop((ip, port), None) is not None:
+                self._targets = tuple(self._destinations.values())
+
+    def send(self, address, value):
+        """Send an OSC message to every destination
+
+        Numbers are packed as floats into a cached packet per address,
+        other values keep their OSC type like send_raw(), see
+        OSCClient.send().
+
+        Args:
+            address (str): OSC address (will be prefixed with synth name)
+            value: Value to send
+
+        Returns:
+            int: Number of destinations the message was written to
+        """
+        if not isinstance(value, Real):
+            return self.send_raw(f"/{self.synth_name}{address}", value)
+
+        try:
+            packet, offset = self._templates[address]
+        except KeyError:
+            packet, offset = message_template(f"/{self.synth_name}{address}")
+            self._templates[address] = (packet, offset)
+
+        _pack_float_into(packet, offset, value)
+        return self._send_all(packet, address in NEVER_DROP)
+
+    def send_raw(self, address, value):
+        """Send an OSC message without synth name prefix to every destination
+
+        Args:
+            address (str): Full OSC address
+            value: Value to send
+
+        Returns:
+            int: Number of destinations the message was written to
+        """
+        builder = OscMessageBuilder(address=address)
+        builder.add_arg(value)
+        return self._send_all(builder.build().dgram)
+
+    def send_batch(self, messages):
+        """Send several parameters as OSC bundles to every destination
+
+        Args:
+            messages: Iterable of (address, value) pairs, addresses are
+                prefixed with the synth name
+
+        Returns:
+            int: Number of datagrams sent per destination
+        """
+        prefix = f"/{self.synth_name}"
+        bundles = build_bundles(
+            [(prefix + address, value) for address, value in messages]
+        )
+        for bundle in bundles:
+            self._send_all(bundle)
+        return len(bundles)
+
+    def set_synth_name(self, name):
+        """Change the synthesizer name
+
+        Args:
+            name (str): New synthesizer name
+        """
+        self.synth_name = name
+        self._templates.clear()
+
+    def close(self):
+        """Forget every destination, the shared sockets stay open"""
+        with self._lock:
+            self._destinations.clear()
+            self._targets = ()
+
+    def _send_all(self, packet, critical=None):
+        """Write one encoded packet to every destination
+
+        A failing destination does not keep the packet from the others, its
+        transport counts the drop or error.
+
+        Args:
+            packet: Encoded OSC message or bundle
+            critical (bool): Wait for buffer space instead of dropping, None
+                to decide from the packet, see Transport.sendto()
+
+        Returns:
+            int: Number of destinations written to
+        """
+        written = 0
+        for transport in self._targets:
+            try:
+                if transport.sendto(packet, critical):
+                    written += 1
+            except OSError:
+                pass
+        return written
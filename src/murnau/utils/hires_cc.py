@@ -0,0 +1,160 @@
+"""Decoder for 14-bit MIDI controllers and (N)RPN
+
+MIDI 1.0 carries 14-bit controller values in two messages: controllers
+0-31 send the most significant 7 bits and controllers 32-63 the least
+significant 7 bits of the same control. NRPN and RPN select a parameter
+number with CC 99/98 (NRPN) or CC 101/100 (RPN) and then send its value
+with data entry CC 6 (MSB) and CC 38 (LSB); CC 96/97 step it by one.
+
+Many controllers use CC 32-63 as plain 7-bit controls, so no pair is
+assumed: the decoder pairs only the MSB controllers it is given, e.g. the
+routed ones, see cc_routing.CCRoutingTable.hires_pairs.
+
+HighResDecoder keeps that per-channel state and turns each CC into a
+full-resolution event. Every event value is on the 14-bit scale (0-16383),
+plain 7-bit controllers included, so receivers handle one range only.
+"""
+
+import threading
+
+# Event kinds
+CC = "cc"
+NRPN = "nrpn"
+RPN = "rpn"
+
+# Largest 14-bit value
+MAX_14BIT = 16383
+
+# First LSB controller, LSB of controller n is n + LSB_OFFSET
+LSB_OFFSET = 32
+
+# Controllers that may have a paired LSB per the MIDI spec
+HIRES_PAIRS = frozenset(range(LSB_OFFSET))
+
+# (N)RPN controllers
+DATA_ENTRY_MSB = 6
+DATA_ENTRY_LSB = 38
+DATA_INCREMENT = 96
+DATA_DECREMENT = 97
+NRPN_LSB = 98
+NRPN_MSB = 99
+RPN_LSB = 100
+RPN_MSB = 101
+
+# RPN number that deselects the current parameter
+RPN_NULL = MAX_14BIT
+
+
+def expand_7bit(value):
+    """Scale a 7-bit value onto the 14-bit range, 0 and 127 map to the ends
+
+    Args:
+        value (int): 7-bit value
+
+    Returns:
+        int: 14-bit value
+    """
+    return (value << 7) | value
+
+
+class HighResDecoder:
+    """Stateful decoder from raw CC messages to 14-bit CC and (N)RPN events"""
+
+    def __init__(self, pairs=()):
+        """Initialize the decoder
+
+        Args:
+            pairs: MSB controllers (0-31) whose controller + 32 is their LSB,
+                HIRES_PAIRS for all; the LSB controllers of the others are
+                passed on as plain CCs
+        """
+        self.pairs = frozenset(pairs)
+        self._lock = threading.Lock()
+        self._msb = {}  # (channel, controller) -> MSB
+        self._hires = set()  # (channel, controller) pairs that sent an LSB
+        self._param = {}  # channel -> (kind, number) selected by (N)RPN
+        self._select = {}  # (channel, controller) -> selection byte
+        self._data = {}  # (channel, kind, number) -> last 14-bit value
+
+    def feed(self, cc, value, channel=0, pairs=None):
+        """Decode one control change message
+
+        Args:
+            cc (int): Controller number
+            value (int): 7-bit controller value
+            channel (int): MIDI channel
+            pairs: MSB controllers paired for this message, None for the
+                decoder's own pairs
+
+        Returns:
+            tuple: (kind, number, value) with a 14-bit value, or None when
+                the message only updated decoder state
+        """
+        if pairs is None:
+            pairs = self.pairs
+        with self._lock:
+            if cc in (NRPN_MSB, NRPN_LSB, RPN_MSB, RPN_LSB):
+                self._select_param(channel, cc, value)
+                return None
+
+            param = self._param.get(channel)
+            if param is not None:
+                if cc == DATA_ENTRY_MSB:
+                    return self._data_entry(channel, param, value << 7)
+                if cc == DATA_ENTRY_LSB:
+                    key = (channel,) + param
+                    current = self._data.get(key, 0)
+                    return self._data_entry(channel, param, (current & ~0x7F) | value)
+                if cc in (DATA_INCREMENT, DATA_DECREMENT):
+                    current = self._data.get((channel,) + param, 0)
+                    step = 1 if cc == DATA_INCREMENT else -1
+                    return self._data_entry(
+                        channel, param, min(MAX_14BIT, max(0, current + step))
+                    )
+
+            if cc in pairs:
+                # A new MSB resets the LSB, as the spec requires
+                self._msb[(channel, cc)] = value
+                if (channel, cc) in self._hires:
+                    return (CC, cc, value << 7)
+                return (CC, cc, expand_7bit(value))
+
+            msb_cc = cc - LSB_OFFSET
+            if msb_cc in pairs:
+                msb = self._msb.get((channel, msb_cc))
+                if msb is None:
+                    # An LSB without its MSB carries no usable value yet
+                    return None
+                self._hires.add((channel, msb_cc))
+                return (CC, msb_cc, (msb << 7) | value)
+
+            return (CC, cc, expand_7bit(value))
+
+    def reset(self):
+        """Forget all controller and parameter state, e.g. on a device switch"""
+        with self._lock:
+            self._msb.clear()
+            self._hires.clear()
+            self._param.clear()
+            self._select.clear()
+            self._data.clear()
+
+    def _select_param(self, channel, cc, value):
+        """Record a parameter selection byte, must hold the lock"""
+        self._select[(channel, cc)] = value
+        if cc in (NRPN_MSB, NRPN_LSB):
+            kind, msb_cc, lsb_cc = NRPN, NRPN_MSB, NRPN_LSB
+        else:
+            kind, msb_cc, lsb_cc = RPN, RPN_MSB, RPN_LSB
+        number = (self._select.get((channel, msb_cc), 0) << 7) | self._select.get(
+            (channel, lsb_cc), 0
+        )
+        if kind == RPN and number == RPN_NULL:
+            self._param.pop(channel, None)
+        else:
+            self._param[channel] = (kind, number)
+
+    def _data_entry(self, channel, param, value):
+        """Store and report a new parameter value, must hold the lock"""
+        self._data[(channel,) + param] = value
+        return param + (value,)
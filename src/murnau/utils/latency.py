@@ -0,0 +1,197 @@
+"""MIDI-to-OSC latency histograms
+
+Every MIDI message is stamped with time.perf_counter() when it is
+ingested. While the message is handled, the stamp is the current origin of
+the handling thread, and send paths pick it up with current_origin() and
+carry it next to the OSC message. When the message has been put on the
+wire, the sender records now - stamp in the histogram of the MIDI message
+type.
+
+Histograms are written by a single thread, the OSC sender, and need no
+lock. Readers take unlocked snapshots that may miss a record in flight.
+"""
+
+import math
+import threading
+from contextlib import contextmanager
+
+# Buckets per doubling of latency, about 9% resolution
+BUCKETS_PER_OCTAVE = 8
+
+# Smallest latency resolved, in seconds; shorter ones share the first bucket
+MIN_LATENCY = 1e-6
+
+# Number of buckets, covers MIN_LATENCY up to about 16 seconds
+BUCKET_COUNT = 24 * BUCKETS_PER_OCTAVE
+
+# Percentiles reported by summary()
+PERCENTILES = (50, 95, 99)
+
+_origin = threading.local()
+
+
+@contextmanager
+def origin(tag, stamp):
+    """Make a MIDI message the origin of sends on this thread
+
+    Args:
+        tag (str): MIDI message type
+        stamp (float): time.perf_counter() at ingestion
+    """
+    previous = getattr(_origin, "value", None)
+    _origin.value = (tag, stamp)
+    try:
+        yield
+    finally:
+        _origin.value = previous
+
+
+def current_origin():
+    """Get the MIDI message being handled on this thread
+
+    Returns:
+        tuple: (tag, stamp), or None outside of MIDI handling
+    """
+    return getattr(_origin, "value", None)
+
+
+class LatencyHistogram:
+    """Log-bucketed latency histogram with a single writer"""
+
+    def __init__(self):
+        self._counts = [0] * BUCKET_COUNT
+        self.count = 0
+        self.max = 0.0
+
+    def record(self, seconds):
+        """Add one latency, from the writer thread only
+
+        Args:
+            seconds (float): Latency in seconds
+        """
+        if seconds > MIN_LATENCY:
+            index = int(math.log2(seconds / MIN_LATENCY) * BUCKETS_PER_OCTAVE)
+            self._counts[min(index, BUCKET_COUNT - 1)] += 1
+        else:
+            self._counts[0] += 1
+        self.count += 1
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, percent):
+        """Estimate a percentile from a snapshot of the buckets
+
+        Args:
+            percent (float): Percentile, 0-100
+
+        Returns:
+            float: Upper bound of the bucket holding the percentile in
+                seconds, capped at the maximum, 0.0 without records
+        """
+        counts = list(self._counts)
+        total = sum(counts)
+        if not total:
+            return 0.0
+        rank = math.ceil(total * percent / 100.0)
+        seen = 0
+        for index, count in enumerate(counts):
+            seen += count
+            if seen >= rank:
+                if index == BUCKET_COUNT - 1:
+                    # The last bucket also holds everything longer
+                    return self.max
+                upper = MIN_LATENCY * 2.0 ** ((index + 1) / BUCKETS_PER_OCTAVE)
+                return min(upper, self.max)
+        return self.max
+
+    def summary(self):
+        """Get the count, percentiles and maximum
+
+        Returns:
+            dict: count, p50, p95, p99 and max, latencies in seconds
+        """
+        result = {"count": self.count}
+        for percent in PERCENTILES:
+            result[f"p{percent}"] = self.percentile(percent)
+        result["max"] = self.max
+        return result
+
+
+class LatencyMonitor:
+    """Latency histograms per MIDI message type"""
+
+    def __init__(self):
+        self._histograms = {}
+
+    def record(self, tag, seconds):
+        """Add one latency, from the writer thread only
+
+        Args:
+            tag (str): MIDI message type
+            seconds (float): Latency in seconds
+        """
+        histogram = self._histograms.get(tag)
+        if histogram is None:
+            # A new dict is published whole, readers never see it half built
+            histogram = LatencyHistogram()
+            histograms = dict(self._histograms)
+            histograms[tag] = histogram
+            self._histograms = histograms
+        histogram.record(seconds)
+
+    def summary(self):
+        """Get the latency statistics of every message type
+
+        Returns:
+            dict: Per message type, count, p50, p95, p99 and max in seconds
+        """
+        return {
+            tag: histogram.summary()
+            for tag, histogram in sorted(self._histograms.items())
+        }
+
+    def reset(self):
+        """Forget all records"""
+        self._histograms = {}
+
+    def format_status(self):
+        """Short readout for the status bar
+
+        Returns:
+            str: p50/p99/max per message type in milliseconds, empty
+                without records
+        """
+        parts = []
+        for tag, stats in self.summary().items():
+            parts.append(
+                f"{tag} p50 {stats['p50'] * 1e3:.2f} p99 {stats['p99'] * 1e3:.2f} "
+                f"max {stats['max'] * 1e3:.2f} ms"
+            )
+        return " | ".join(parts)
+
+
+class Deferred:
+    """Callable that runs a function later under the origin current now
+
+    Only the first call carries the origin, so a ramp of emissions is
+    measured to its first step.
+    """
+
+    __slots__ = ("func", "source")
+
+    def __init__(self, func):
+        """Capture the calling thread's origin
+
+        Args:
+            func: Callable to wrap
+        """
+        self.func = func
+        self.source = current_origin()
+
+    def __call__(self, *args):
+        source = self.source
+        if source is None:
+            return self.func(*args)
+        self.source = None
+        with origin(*source):
+            return self.func(*args)
@@ -0,0 +1,104 @@
+"""Background receiver for OSC messages sent back by the synth
+
+Faust's OSC architecture answers queries on its output port (5511 by
+default), addressed to the host that asked. OSCListener binds that port
+and hands every decoded message to a callback on its own thread.
+"""
+
+import socket
+import threading
+
+from pythonosc.osc_packet import OscPacket, ParseError
+
+# Faust's default OSC output port
+DEFAULT_LISTEN_PORT = 5511
+
+# How often the receive loop checks for stop(), in seconds
+POLL_INTERVAL = 0.1
+
+
+class OSCListener:
+    """Thread that receives OSC datagrams and dispatches their messages"""
+
+    def __init__(self, handler, ip="0.0.0.0", port=DEFAULT_LISTEN_PORT):
+        """Initialize the listener
+
+        Args:
+            handler: Callable taking (address, args), called on the listener
+                thread for every message, including those inside bundles
+            ip (str): Local address to bind
+            port (int): Local port to bind, 0 for any free port
+        """
+        self._handler = handler
+        self.ip = ip
+        self.port = port
+        self._sock = None
+        self._thread = None
+        self._running = False
+
+        self.received = 0
+        self.malformed = 0
+
+    @property
+    def running(self):
+        """Whether the listener thread is alive"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Bind the socket and start the listener thread
+
+        Raises:
+            OSError: If the port cannot be bound
+        """
+        if self.running:
+            return
+        family, socktype, _, _, sockaddr = socket.getaddrinfo(
+            self.ip, self.port, type=socket.SOCK_DGRAM
+        )[0]
+        self._sock = socket.socket(family, socktype)
+        self._sock.settimeout(POLL_INTERVAL)
+        self._sock.bind(sockaddr)
+        self.port = self._sock.getsockname()[1]
+
+        self._running = True
+        self._thread = threading.Thread(
+            target=self._run, name="osc-listener", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        """Stop the listener thread and close the socket
+
+        Args:
+            timeout (float): Seconds to wait for the thread to finish
+        """
+        if not self.running:
+            return
+        self._running = False
+        self._thread.join(timeout)
+        self._thread = None
+        self._sock.close()
+        self._sock = None
+
+    def _run(self):
+        """Listener thread main loop"""
+        while self._running:
+            try:
+                data = self._sock.recv(65536)
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+
+            try:
+                messages = OscPacket(data).messages
+            except ParseError:
+                self.malformed += 1
+                continue
+
+            for timed in messages:
+                self.received += 1
+                try:
+                    self._handler(timed.message.address, timed.message.params)
+                except Exception as e:
+                    print(f"OSC listener error: {e}")
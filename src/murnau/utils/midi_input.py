@@ -0,0 +1,276 @@
+"""Event-driven MIDI input
+
+In callback mode the mido backend hands every message to the handler as
+soon as it is parsed, on the backend's own thread (rtmidi's input thread),
+so nothing wakes up while the port is idle. Poll mode keeps the old
+iter_pending() loop for backends without callback support.
+
+Several ports can be open at once and are merged into one event stream.
+Callback ports deliver under a single merge lock and are stamped inside
+it, so the handler sees one message at a time in stamp order. Poll mode
+drains every port from one thread, one wait for all ports instead of a
+polling thread per port. Each port can filter MIDI channels and keeps its
+own counters and event rate, see stats().
+"""
+
+import threading
+import time
+from functools import partial
+
+import mido
+
+# Ingestion modes
+CALLBACK = "callback"  # backend thread calls the handler on arrival
+POLL = "poll"  # our thread drains iter_pending() every poll interval
+MODES = (CALLBACK, POLL)
+
+# Sleep between polls in poll mode, in seconds
+POLL_INTERVAL = 0.001
+
+# Number of MIDI channels
+CHANNEL_COUNT = 16
+
+# Mask passing every channel
+ALL_CHANNELS = (1 << CHANNEL_COUNT) - 1
+
+# Window over which per-port event rates are measured, in seconds
+RATE_WINDOW = 1.0
+
+
+def channel_mask(channels):
+    """Build a channel filter mask
+
+    Args:
+        channels: Iterable of channels 0-15, None for every channel
+
+    Returns:
+        int: Bit n set if channel n passes
+
+    Raises:
+        ValueError: If a channel is out of range
+    """
+    if channels is None:
+        return ALL_CHANNELS
+    mask = 0
+    for channel in channels:
+        if not 0 <= channel < CHANNEL_COUNT:
+            raise ValueError(f"Invalid MIDI channel: {channel}")
+        mask |= 1 << channel
+    return mask
+
+
+class _InputPort:
+    """One open port of a MidiInput and its counters"""
+
+    def __init__(self, name, mask):
+        self.name = name
+        self.mask = mask
+        self.port = None
+        self.received = 0
+        self.filtered = 0
+
+        # Events counted in the current rate window, rate of the last one
+        self.window_start = time.perf_counter()
+        self.window_count = 0
+        self.rate = 0.0
+
+    def count(self, stamp):
+        """Count one received message for the event rate"""
+        self.received += 1
+        self.window_count += 1
+        elapsed = stamp - self.window_start
+        if elapsed >= RATE_WINDOW:
+            self.rate = self.window_count / elapsed
+            self.window_start = stamp
+            self.window_count = 0
+
+    def stats(self, now):
+        """Counters and the event rate, idle ports decay to 0"""
+        elapsed = now - self.window_start
+        rate = self.rate
+        if elapsed >= RATE_WINDOW:
+            # The window is over but no message has closed it yet
+            rate = self.window_count / elapsed
+        return {
+            "received": self.received,
+            "filtered": self.filtered,
+            "rate": rate,
+        }
+
+
+class MidiInput:
+    """MIDI input ports merged into one stream handed to a handler"""
+
+    def __init__(
+        self,
+        handler,
+        mode=CALLBACK,
+        poll_interval=POLL_INTERVAL,
+        backend=None,
+        stamped=False,
+        named=False,
+    ):
+        """Initialize the input
+
+        Args:
+            handler: Callable taking a mido message, called off the GUI thread
+            mode (str): CALLBACK or POLL
+            poll_interval (float): Sleep between polls in POLL mode, in seconds
+            backend: mido Backend, or any object with an open_input() like
+                mido's, None for mido's default backend
+            stamped (bool): Also pass the handler the time.perf_counter()
+                at which the message reached us
+            named (bool): Also pass the handler the stamp and then the name
+                of the port the message came from
+        """
+        if mode not in MODES:
+            raise ValueError(f"Unknown MIDI input mode: {mode}")
+        self._handler = handler
+        self.mode = mode
+        self.poll_interval = poll_interval
+        self.backend = backend
+        self.stamped = stamped
+        self.named = named
+        self._ports = {}  # port name -> _InputPort, in opening order
+        self._merge_lock = threading.Lock()
+        self._thread = None
+        self._running = False
+
+        self.received = 0
+        self.errors = 0
+
+    @property
+    def is_open(self):
+        """Whether a port is open"""
+        return bool(self._ports)
+
+    @property
+    def port(self):
+        """First open mido port, None if no port is open"""
+        for state in self._ports.values():
+            return state.port
+        return None
+
+    @property
+    def port_names(self):
+        """Names of the open ports, in opening order"""
+        return list(self._ports)
+
+    def open(self, port_name, channels=None):
+        """Open a port and start delivering its messages
+
+        Can be called once per port to merge several ports.
+
+        Args:
+            port_name (str): mido input port name
+            channels: Iterable of MIDI channels 0-15 to pass, None for all;
+                messages without a channel always pass
+
+        Raises:
+            ValueError: If the port is already open or a channel is invalid
+            Exception: Whatever the mido backend raises for the port
+        """
+        if port_name in self._ports:
+            raise ValueError(f"MIDI port already open: {port_name}")
+        state = _InputPort(port_name, channel_mask(channels))
+        open_input = (
+            mido.open_input if self.backend is None else self.backend.open_input
+        )
+        if self.mode == CALLBACK:
+            state.port = open_input(port_name, callback=partial(self._arrive, state))
+            self._ports[port_name] = state
+            return
+
+        state.port = open_input(port_name)
+        with self._merge_lock:
+            self._ports[port_name] = state
+        if self._thread is None:
+            self._running = True
+            self._thread = threading.Thread(
+                target=self._poll, name="midi-poll", daemon=True
+            )
+            self._thread.start()
+
+    def set_channels(self, port_name, channels):
+        """Change the channel filter of an open port
+
+        Args:
+            port_name (str): Open port name
+            channels: Iterable of MIDI channels 0-15 to pass, None for all
+        """
+        self._ports[port_name].mask = channel_mask(channels)
+
+    def close(self, timeout=1.0):
+        """Stop delivery and close every port
+
+        Args:
+            timeout (float): Seconds to wait for the poll thread to finish
+        """
+        self._running = False
+        ports, self._ports = self._ports, {}
+        if self._thread is not None and self._thread is not threading.current_thread():
+            # Ports are closed once the poll thread no longer drains them
+            self._thread.join(timeout)
+        self._thread = None
+        for state in ports.values():
+            state.port.close()
+
+    def stats(self):
+        """Get per-port counters
+
+        Returns:
+            dict: Per port name, messages received, messages dropped by the
+                channel filter, and events per second over the last
+                RATE_WINDOW
+        """
+        now = time.perf_counter()
+        return {name: state.stats(now) for name, state in list(self._ports.items())}
+
+    def _arrive(self, state, message):
+        """Merge one message from a callback port into the stream"""
+        with self._merge_lock:
+            # Stamped under the lock, so delivery order is stamp order
+            self._accept(state, message, time.perf_counter())
+
+    def _accept(self, state, message, stamp):
+        """Filter and deliver one message, under the merge lock"""
+        state.count(stamp)
+        channel = getattr(message, "channel", None)
+        if channel is not None and not state.mask >> channel & 1:
+            state.filtered += 1
+            return
+        self._dispatch(message, stamp, state.name)
+
+    def _dispatch(self, message, stamp=None, port_name=None):
+        """Hand one message to the handler, reporting instead of raising"""
+        if stamp is None:
+            stamp = time.perf_counter()
+        self.received += 1
+        try:
+            if self.named:
+                self._handler(message, stamp, port_name)
+            elif self.stamped:
+                self._handler(message, stamp)
+            else:
+                self._handler(message)
+        except Exception as e:
+            self.errors += 1
+            print(f"MIDI processing error: {e}")
+
+    def _poll(self):
+        """Poll mode main loop, one thread for all ports"""
+        while self._running:
+            ports = list(self._ports.values())
+            if not ports:
+                break
+            try:
+                with self._merge_lock:
+                    for state in ports:
+                        for message in state.port.iter_pending():
+                            self._accept(state, message, time.perf_counter())
+            except Exception as e:
+                print(f"MIDI processing error: {e}")
+                break
+
+            # Brief sleep to prevent CPU overload
+            time.sleep(self.poll_interval)
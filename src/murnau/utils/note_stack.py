@@ -0,0 +1,115 @@
+"""Held-note stack deciding which note a monophonic voice plays
+
+Notes are kept in press order in an OrderedDict and, as bits, in one int.
+Pressing, releasing and asking for the sounding note are constant time for
+every priority: the last note is the end of the dict, the highest and
+lowest notes are the top and bottom set bits of the mask. Notes are small
+non-negative ints, MIDI note numbers or key indices.
+"""
+
+from collections import OrderedDict
+
+# Note priorities
+LAST = "last"  # most recently pressed note sounds
+HIGH = "high"  # highest held note sounds
+LOW = "low"  # lowest held note sounds
+PRIORITIES = (LAST, HIGH, LOW)
+
+
+class NoteStack:
+    """Held notes with a selectable priority, not thread-safe"""
+
+    def __init__(self, priority=LAST):
+        """Initialize an empty stack
+
+        Args:
+            priority (str): LAST, HIGH or LOW
+        """
+        self._notes = OrderedDict()  # note -> value, oldest press first
+        self._mask = 0  # bit n set while note n is held
+        self.priority = priority
+
+    @property
+    def priority(self):
+        """Rule picking the sounding note"""
+        return self._priority
+
+    @priority.setter
+    def priority(self, priority):
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown note priority: {priority}")
+        self._priority = priority
+
+    def __len__(self):
+        return len(self._notes)
+
+    def __contains__(self, note):
+        return note in self._notes
+
+    def __iter__(self):
+        """Held notes in press order"""
+        return iter(self._notes)
+
+    def push(self, note, value=None):
+        """Press a note, a held note pressed again becomes the latest
+
+        Args:
+            note (int): Note number, 0 or above
+            value: Data kept with the note, e.g. its frequency
+
+        Returns:
+            bool: True if the note was not held before
+        """
+        notes = self._notes
+        if note in notes:
+            notes[note] = value
+            notes.move_to_end(note)
+            return False
+        notes[note] = value
+        self._mask |= 1 << note
+        return True
+
+    def remove(self, note):
+        """Release a note
+
+        Args:
+            note (int): Note number
+
+        Returns:
+            bool: True if the note was held
+        """
+        if self._notes.pop(note, self) is self:
+            return False
+        self._mask &= ~(1 << note)
+        return True
+
+    def current(self):
+        """Get the note that should sound
+
+        Returns:
+            int: Note picked by the priority, None if nothing is held
+        """
+        if not self._notes:
+            return None
+        if self._priority == LAST:
+            return next(reversed(self._notes))
+        if self._priority == HIGH:
+            return self._mask.bit_length() - 1
+        return (self._mask & -self._mask).bit_length() - 1
+
+    def value(self, note, default=None):
+        """Get the data kept with a held note
+
+        Args:
+            note (int): Note number
+            default: Returned when the note is not held
+
+        Returns:
+            Value given to push(), or default
+        """
+        return self._notes.get(note, default)
+
+    def clear(self):
+        """Release every note"""
+        self._notes.clear()
+        self._mask = 0
@@ -1,33 +1,220 @@
 """OSC client utility for Murnau synthesizer"""
 
-from pythonosc import udp_client
+import struct
+from numbers import Real
+
+from .sender import NEVER_DROP
+from .transport import get_transport
+
+# Largest UDP payload that fits a 1500-byte Ethernet frame (IPv4 + UDP headers)
+MAX_DATAGRAM_SIZE = 1472
+
+# OSC timetag meaning "apply on arrival"
+IMMEDIATELY = 1
+
+# Seconds from the NTP epoch (1900) to the Unix epoch (1970)
+NTP_EPOCH_OFFSET = 2208988800
+
+# "#bundle\0" tag plus the 8-byte "immediately" timetag
+BUNDLE_HEADER = b"#bundle\x00" + struct.pack(">Q", IMMEDIATELY)
+BUNDLE_HEADER_SIZE = len(BUNDLE_HEADER)
+
+_FLOAT_TYPE_TAG = b",f\x00\x00"
+
+_pack_float_into = struct.Struct(">f").pack_into
+
+
+class OscDatagram:
+    """Pre-encoded OSC packet accepted by python-osc's ``UDPClient.send``"""
+
+    __slots__ = ("dgram",)
+
+    def __init__(self, dgram):
+        self.dgram = dgram
+
+    @property
+    def size(self):
+        """Size of the datagram in bytes"""
+        return len(self.dgram)
+
+
+def encode_address(address):
+    """Encode an OSC address as a null-terminated, 4-byte aligned string
+
+    Args:
+        address (str): OSC address
+
+    Returns:
+        bytes: Padded address
+    """
+    raw = address.encode("utf-8")
+    return raw + b"\x00" * (4 - len(raw) % 4)
+
+
+def message_template(address):
+    """Build a reusable single-float message buffer for an address
+
+    Args:
+        address (str): Full OSC address
+
+    Returns:
+        tuple: (bytearray packet, offset of the 4-byte float argument)
+    """
+    prefix = encode_address(address) + _FLOAT_TYPE_TAG
+    return bytearray(prefix + b"\x00\x00\x00\x00"), len(prefix)
+
+
+def encode_message(address, value):
+    """Encode an OSC message carrying a single float argument
+
+    Args:
+        address (str): OSC address
+        value: Value to send, converted to a 32-bit float
+
+    Returns:
+        bytes: Encoded message
+    """
+    return encode_address(address) + _FLOAT_TYPE_TAG + struct.pack(">f", value)
+
+
+def ntp_timetag(unix_time):
+    """Convert a Unix timestamp to a 64-bit NTP timetag
+
+    Args:
+        unix_time (float): Seconds since the Unix epoch
+
+    Returns:
+        int: 32.32 fixed-point seconds since the NTP epoch
+    """
+    seconds = unix_time + NTP_EPOCH_OFFSET
+    whole = int(seconds)
+    return (whole << 32) | int((seconds - whole) * (1 << 32))
+
+
+def build_bundles(messages, max_size=MAX_DATAGRAM_SIZE, timetag=IMMEDIATELY):
+    """Pack OSC messages into the fewest bundles that fit in one datagram each
+
+    Args:
+        messages: Iterable of (address, value) pairs, values are sent as floats
+        max_size (int): Maximum datagram size in bytes
+        timetag (int): NTP timetag of every bundle, see ntp_timetag()
+
+    Returns:
+        list: Encoded bundles as bytes, preserving message order
+    """
+    header = (
+        BUNDLE_HEADER
+        if timetag == IMMEDIATELY
+        else b"#bundle\x00" + struct.pack(">Q", timetag)
+    )
+    bundles = []
+    parts = None
+    size = 0
+
+    for address, value in messages:
+        msg = encode_message(address, value)
+
+        # Each bundle element is prefixed with its 4-byte size
+        element_size = 4 + len(msg)
+        if parts is None or size + element_size > max_size:
+            if parts is not None:
+                bundles.append(b"".join(parts))
+            parts = [header]
+            size = BUNDLE_HEADER_SIZE
+
+        parts.append(struct.pack(">i", len(msg)))
+        parts.append(msg)
+        size += element_size
+
+    if parts is not None:
+        bundles.append(b"".join(parts))
+
+    return bundles
+
+
+def send_batch(client, messages, max_size=MAX_DATAGRAM_SIZE, timetag=IMMEDIATELY):
+    """Send a batch of OSC messages as bundles through a python-osc client
+
+    Args:
+        client: Transport or python-osc UDP client instance
+        messages: Iterable of (address, value) pairs with full OSC addresses
+        max_size (int): Maximum datagram size in bytes
+        timetag (int): NTP timetag of every bundle, see ntp_timetag()
+
+    Returns:
+        int: Number of datagrams sent
+    """
+    bundles = build_bundles(messages, max_size, timetag)
+    for bundle in bundles:
+        client.send(OscDatagram(bundle))
+    return len(bundles)
 
 
 class OSCClient:
-    """Wrapper for OSC UDP client with convenience methods"""
+    """Wrapper for OSC UDP client with convenience methods
 
-    def __init__(self, ip="127.0.0.1", port=5510, synth_name="legato_synth_stereo"):
+    Sends go through the shared transport for the destination, see
+    murnau.utils.transport.
+    """
+
+    def __init__(
+        self,
+        ip="127.0.0.1",
+        port=5510,
+        synth_name="legato_synth_stereo",
+        transport=None,
+    ):
         """Initialize OSC client
 
         Args:
             ip (str): IP address for OSC communication
             port (int): Port for OSC communication
             synth_name (str): Name of the synthesizer
+            transport (Transport): Transport to send through, None for the
+                shared one of ip and port
         """
         self.ip = ip
         self.port = port
         self.synth_name = synth_name
-        self.client = udp_client.SimpleUDPClient(ip, port)
+        self.client = get_transport(ip, port) if transport is None else transport
+
+        # Pre-encoded packets per address, only the float argument changes
+        self._templates = {}
 
     def send(self, address, value):
         """Send an OSC message
 
+        Numbers, including ints and bools, are sent as 32-bit floats, which
+        is what the Faust synth expects. The packet for each address is
+        encoded once and cached, so a send only packs the value into the
+        cached buffer and writes it out. The buffer is shared, so concurrent
+        sends to the same address must be serialized by the caller. Other
+        values, e.g. strings, are encoded by python-osc with their own type.
+
+        Note messages (sender.NEVER_DROP) wait for a full send buffer
+        instead of being dropped, see Transport.sendto().
+
         Args:
             address (str): OSC address (will be prefixed with synth name)
             value: Value to send
+
+        Returns:
+            bool: False if the transport dropped the message
         """
-        full_address = f"/{self.synth_name}{address}"
-        self.client.send_message(full_address, float(value))
+        critical = address in NEVER_DROP
+        if not isinstance(value, Real):
+            return self.client.send_message(
+                f"/{self.synth_name}{address}", value, critical=critical
+            )
+
+        try:
+            packet, offset = self._templates[address]
+        except KeyError:
+            packet, offset = message_template(f"/{self.synth_name}{address}")
+            self._templates[address] = (packet, offset)
+
+        _pack_float_into(packet, offset, value)
+        return self.client.sendto(packet, critical)
 
     def send_raw(self, address, value):
         """Send an OSC message without synth name prefix
@@ -38,6 +225,41 @@ class OSCClient:
         """
         self.client.send_message(address, value)
 
+    def send_batch(self, messages):
+        """Send several parameters at once as OSC bundles
+
+        The synth applies a bundle atomically, so a whole patch lands in the
+        same audio block instead of trickling in one datagram at a time.
+
+        Args:
+            messages: Iterable of (address, value) pairs, addresses are
+                prefixed with the synth name
+
+        Returns:
+            int: Number of datagrams sent
+        """
+        bundles = self.bundles(messages)
+        for bundle in bundles:
+            self.client.send(OscDatagram(bundle))
+        return len(bundles)
+
+    def bundles(self, messages, timetag=IMMEDIATELY):
+        """Encode several parameters as OSC bundles without sending them
+
+        Args:
+            messages: Iterable of (address, value) pairs, addresses are
+                prefixed with the synth name
+            timetag (int): NTP timetag of every bundle, see ntp_timetag()
+
+        Returns:
+            list: Encoded bundles as bytes, see build_bundles()
+        """
+        prefix = f"/{self.synth_name}"
+        return build_bundles(
+            [(prefix + address, value) for address, value in messages],
+            timetag=timetag,
+        )
+
     def set_synth_name(self, name):
         """Change the synthesizer name
 
@@ -45,17 +267,37 @@ class OSCClient:
             name (str): New synthesizer name
         """
         self.synth_name = name
+        self._templates.clear()
 
-    def reconnect(self, ip=None, port=None):
+    def reconnect(self, ip=None, port=None, state=(), cache=None):
         """Reconnect to a different IP/port
 
+        The parameter state is brought to the new destination. With a
+        ParameterCache the synth's values are read back first and only the
+        parameters that differ are sent, see ParameterCache.sync().
+
         Args:
             ip (str): New IP address (optional)
             port (int): New port (optional)
+            state: (address, value) pairs without synth prefix the synth
+                should have
+            cache (ParameterCache): Read-back mirror moved to the new
+                destination, None to send the whole state
+
+        Returns:
+            list: (address, value) pairs that were sent
         """
         if ip is not None:
             self.ip = ip
         if port is not None:
             self.port = port
 
-        self.client = udp_client.SimpleUDPClient(self.ip, self.port)
+        self.client = get_transport(self.ip, self.port)
+
+        state = list(state)
+        if cache is not None:
+            cache.reconnect(self.client)
+            return cache.sync(state) if state else []
+        if state:
+            self.send_batch(state)
+        return state
@@ -0,0 +1,270 @@
+"""Mirror of the synth's parameter values read back over OSC
+
+Faust answers a "get" message sent to a parameter address with the
+parameter's current value, minimum and maximum on its output port:
+
+    -> /legato_synth_stereo/gain "get"
+    <- /legato_synth_stereo/gain 0.7 0.0 1.0
+
+ParameterCache sends those queries without waiting, records the replies
+delivered by an OSCListener and trusts each value for a limited time. After
+a reconnect or synth restart, sync() compares the wanted patch with the
+read-back values and sends only the parameters that differ.
+"""
+
+import math
+import threading
+import time
+
+from pythonosc.osc_message_builder import OscMessageBuilder
+
+from .osc_client import build_bundles, send_batch
+
+# Seconds a read-back value is trusted
+DEFAULT_TTL = 2.0
+
+# Seconds sync() waits for query replies
+DEFAULT_TIMEOUT = 0.5
+
+# Relative and absolute tolerance when comparing values; the synth stores
+# parameters as 32-bit floats
+DEFAULT_TOLERANCE = 1e-5
+
+
+class ParameterCache:
+    """TTL'd mirror of synth parameter values"""
+
+    def __init__(
+        self, client, synth_name, ttl=DEFAULT_TTL, clock=time.monotonic, submit=None
+    ):
+        """Initialize the cache
+
+        Args:
+            client: Transport or python-osc UDP client used for queries and
+                for the bundles sent by sync()
+            synth_name (str): Name of the synthesizer
+            ttl (float): Seconds a value is trusted after it was read back
+            clock: Callable returning monotonic seconds
+            submit: Callable taking an encoded OSC packet, e.g.
+                OSCSenderThread.submit_datagram, used instead of client when
+                another thread owns the socket
+        """
+        self._client = client
+        self._submit = submit
+        self.synth_name = synth_name
+        self.ttl = ttl
+        self._clock = clock
+
+        self._cond = threading.Condition()
+        self._values = {}  # address without synth prefix -> (value, stamp)
+
+        self.queries = 0
+        self.replies = 0
+
+    def handle_reply(self, address, args):
+        """Record a value sent back by the synth, OSCListener handler
+
+        Messages for other synths or without arguments are ignored.
+
+        Args:
+            address (str): Full OSC address of the reply
+            args (list): Reply arguments, the first is the current value
+        """
+        prefix = f"/{self.synth_name}"
+        if not args or not address.startswith(prefix + "/"):
+            return
+        try:
+            value = float(args[0])
+        except (TypeError, ValueError):
+            return
+        with self._cond:
+            self._values[address[len(prefix) :]] = (value, self._clock())
+            self.replies += 1
+            self._cond.notify_all()
+
+    def set(self, address, value):
+        """Record a value known to be on the synth, e.g. right after sending it
+
+        Args:
+            address (str): OSC address without synth prefix
+            value: Parameter value
+        """
+        with self._cond:
+            self._values[address] = (float(value), self._clock())
+
+    def get(self, address, default=None):
+        """Get a parameter value if it is still fresh
+
+        Args:
+            address (str): OSC address without synth prefix
+            default: Returned when the value is unknown or expired
+
+        Returns:
+            float: Cached value, or default
+        """
+        with self._cond:
+            entry = self._values.get(address)
+            if entry is None or self._clock() - entry[1] > self.ttl:
+                return default
+            return entry[0]
+
+    def snapshot(self):
+        """Get every fresh value
+
+        Returns:
+            dict: Value per address without synth prefix
+        """
+        now = self._clock()
+        with self._cond:
+            return {
+                address: value
+                for address, (value, stamp) in self._values.items()
+                if now - stamp <= self.ttl
+            }
+
+    def invalidate(self, address=None):
+        """Forget one value, or all of them after a synth restart
+
+        Args:
+            address (str): OSC address without synth prefix, None for all
+        """
+        with self._cond:
+            if address is None:
+                self._values.clear()
+            else:
+                self._values.pop(address, None)
+
+    def set_synth_name(self, name):
+        """Switch to another synth, dropping the values of the old one
+
+        Args:
+            name (str): New synthesizer name
+        """
+        with self._cond:
+            self.synth_name = name
+            self._values.clear()
+
+    def reconnect(self, client):
+        """Switch to another destination, dropping the values of the old one
+
+        Args:
+            client: Transport or python-osc UDP client of the new destination
+        """
+        with self._cond:
+            self._client = client
+            self._values.clear()
+
+    def query(self, addresses):
+        """Ask the synth for its current values without waiting for replies
+
+        Args:
+            addresses: Iterable of OSC addresses without synth prefix
+
+        Returns:
+            int: Number of queries sent
+        """
+        prefix = f"/{self.synth_name}"
+        count = 0
+        for address in addresses:
+            if self._submit is None:
+                self._client.send_message(prefix + address, "get")
+            else:
+                builder = OscMessageBuilder(prefix + address)
+                builder.add_arg("get")
+                self._submit(builder.build().dgram)
+            count += 1
+        self.queries += count
+        return count
+
+    def wait(self, addresses, timeout=DEFAULT_TIMEOUT):
+        """Wait until every address has a fresh value
+
+        Args:
+            addresses: Iterable of OSC addresses without synth prefix
+            timeout (float): Seconds to wait
+
+        Returns:
+            bool: True if all values arrived in time
+        """
+        addresses = list(addresses)
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            while True:
+                now = self._clock()
+                missing = [
+                    a
+                    for a in addresses
+                    if a not in self._values or now - self._values[a][1] > self.ttl
+                ]
+                if not missing:
+                    return True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+
+    def refresh(self, addresses, timeout=DEFAULT_TIMEOUT):
+        """Query addresses and wait for their replies
+
+        Only addresses without a fresh value are queried.
+
+        Args:
+            addresses: Iterable of OSC addresses without synth prefix
+            timeout (float): Seconds to wait for replies
+
+        Returns:
+            dict: Fresh values of the requested addresses that are known
+        """
+        addresses = list(addresses)
+        self.query([a for a in addresses if self.get(a) is None])
+        self.wait(addresses, timeout)
+        values = self.snapshot()
+        return {a: values[a] for a in addresses if a in values}
+
+    def diff(self, desired, tolerance=DEFAULT_TOLERANCE):
+        """Find the parameters whose synth value differs from the wanted one
+
+        Unknown and expired values count as different.
+
+        Args:
+            desired: Iterable of (address, value) pairs without synth prefix
+            tolerance (float): Relative and absolute comparison tolerance
+
+        Returns:
+            list: (address, value) pairs that need to be sent
+        """
+        current = self.snapshot()
+        changed = []
+        for address, value in desired:
+            known = current.get(address)
+            if known is None or not math.isclose(
+                known, float(value), rel_tol=tolerance, abs_tol=tolerance
+            ):
+                changed.append((address, value))
+        return changed
+
+    def sync(self, desired, timeout=DEFAULT_TIMEOUT, tolerance=DEFAULT_TOLERANCE):
+        """Bring the synth to a patch, sending only what differs
+
+        Args:
+            desired: Iterable of (address, value) pairs without synth prefix
+            timeout (float): Seconds to wait for query replies
+            tolerance (float): Relative and absolute comparison tolerance
+
+        Returns:
+            list: (address, value) pairs that were sent
+        """
+        desired = list(desired)
+        self.refresh([address for address, _ in desired], timeout)
+        changed = self.diff(desired, tolerance)
+        if changed:
+            prefix = f"/{self.synth_name}"
+            messages = [(prefix + address, value) for address, value in changed]
+            if self._submit is None:
+                send_batch(self._client, messages)
+            else:
+                for bundle in build_bundles(messages):
+                    self._submit(bundle)
+            for address, value in changed:
+                self.set(address, value)
+        return changed
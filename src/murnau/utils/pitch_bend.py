@@ -0,0 +1,203 @@
+"""Pitch bend resampled to the control rate
+
+The synth has no bend input, so a bend is a new /freq: the sounding note's
+frequency times the bend ratio. Sending one /freq per wheel message would
+flood the synth during a fast sweep, so the engine keeps the wheel
+position as a target and, on every control tick, moves the applied bend a
+fixed fraction of the way along a linear ramp to it, like
+utils.smoothing. At most one /freq goes out per tick however fast the
+wheel moves, and a jump between wheel messages becomes a glide.
+
+The bend range comes from RPN 0 (pitch bend sensitivity), semitones in
+the data entry MSB and cents in the LSB.
+"""
+
+import math
+import threading
+
+from .coalescer import DEFAULT_CONTROL_RATE
+from .smoothing import DEFAULT_GLIDE
+
+# Bend range in semitones until RPN 0 sets it, the General MIDI default
+DEFAULT_BEND_RANGE = 2.0
+
+# RPN of pitch bend sensitivity
+BEND_RANGE_RPN = 0
+
+# Largest pitch wheel deflection as mido reports it, -8192 to 8191
+PITCH_MAX = 8192
+
+
+def rpn_bend_range(value):
+    """Convert an RPN 0 value to a bend range
+
+    Args:
+        value (int): 14-bit RPN value, semitones << 7 | cents
+
+    Returns:
+        float: Bend range in semitones
+    """
+    return (value >> 7) + (value & 0x7F) / 100.0
+
+
+class PitchBendEngine:
+    """Applies the pitch wheel to the sounding note's frequency
+
+    bend() and note() may be called from any thread, tick() from the
+    control-rate timer. Every /freq goes out through emit with the engine's
+    lock held, so a tick cannot send a frequency bent for the previous note
+    after note() has sent the new one.
+    """
+
+    def __init__(
+        self,
+        emit,
+        rate=DEFAULT_CONTROL_RATE,
+        glide=DEFAULT_GLIDE,
+        bend_range=DEFAULT_BEND_RANGE,
+        fine_tune=0.0,
+    ):
+        """Initialize the engine with the wheel centred
+
+        Args:
+            emit: Callable taking the bent frequency, called from tick()
+                and note() with the lock held; it must not call the engine
+            rate (float): Control rate in Hz at which tick() is expected
+            glide (float): Seconds a ramp to a new wheel position takes
+            bend_range (float): Semitones of a full wheel deflection
+            fine_tune (float): Offset in cents folded into the frequency;
+                keep 0 for synths that apply their own /fine_tune, as the
+                bundled one does
+        """
+        self._emit = emit
+        self.rate = rate
+        self.ticks = max(1, round(glide * rate))
+
+        self._lock = threading.Lock()
+        self._bend_range = bend_range
+        self._fine_tune = fine_tune
+        self._base = None  # frequency of the sounding note
+        self._bend = 0.0  # applied wheel position, -1 to 1
+        self._target = 0.0
+        self._step = 0.0
+        self._left = 0  # ticks left on the ramp
+        self._dirty = False  # emit on the next tick even without a ramp
+        self._last = None  # last emitted frequency
+
+        self.received = 0
+        self.emitted = 0
+        self.max_step = 0.0  # largest change between emits, in cents
+
+    @property
+    def interval(self):
+        """Control period in seconds"""
+        return 1.0 / self.rate
+
+    @property
+    def bend_range(self):
+        """Semitones of a full wheel deflection"""
+        return self._bend_range
+
+    @bend_range.setter
+    def bend_range(self, semitones):
+        with self._lock:
+            self._bend_range = semitones
+            self._dirty = True
+
+    @property
+    def fine_tune(self):
+        """Offset in cents folded into the frequency"""
+        return self._fine_tune
+
+    @fine_tune.setter
+    def fine_tune(self, cents):
+        with self._lock:
+            self._fine_tune = cents
+            self._dirty = True
+
+    def bend(self, pitch):
+        """Set the wheel position the applied bend ramps to
+
+        Args:
+            pitch (int): Pitch wheel value, -8192 to 8191
+        """
+        target = max(-1.0, min(1.0, pitch / PITCH_MAX))
+        with self._lock:
+            self.received += 1
+            self._target = target
+            self._step = (target - self._bend) / self.ticks
+            self._left = self.ticks
+
+    def note(self, freq):
+        """Set the sounding note's frequency and emit it with the current bend
+
+        Call it with None when the last note is released, so wheel moves
+        while the gate is closed send nothing.
+
+        Args:
+            freq (float): Unbent frequency in Hz, None when no note sounds
+
+        Returns:
+            float: Frequency emitted for the note, None if freq is None
+        """
+        with self._lock:
+            self._base = freq
+            if freq is None:
+                self._last = None
+                return None
+            self._last = self._frequency()
+            self._emit(self._last)
+            return self._last
+
+    def _frequency(self):
+        """Bent frequency of the sounding note, must hold the lock"""
+        semitones = self._bend * self._bend_range + self._fine_tune / 100.0
+        return self._base * 2.0 ** (semitones / 12.0)
+
+    def tick(self):
+        """Advance the bend one step and emit, once per control period
+
+        Returns:
+            int: 1 if a frequency was emitted, else 0
+        """
+        with self._lock:
+            if self._left > 0:
+                self._left -= 1
+                if self._left == 0:
+                    self._bend = self._target
+                else:
+                    self._bend += self._step
+            elif not self._dirty:
+                return 0
+            self._dirty = False
+            if self._base is None:
+                return 0
+            freq = self._frequency()
+            if self._last is not None:
+                cents = abs(1200.0 * math.log2(freq / self._last))
+                self.max_step = max(self.max_step, cents)
+            self._last = freq
+            self.emitted += 1
+            self._emit(freq)
+        return 1
+
+    def reset(self):
+        """Centre the wheel at once, e.g. on a device switch"""
+        with self._lock:
+            self._bend = self._target = 0.0
+            self._left = 0
+            self._dirty = True
+
+    def stats(self):
+        """Get engine counters
+
+        Returns:
+            dict: Wheel messages received, frequencies emitted by tick()
+                and the largest step between emits in cents
+        """
+        with self._lock:
+            return {
+                "received": self.received,
+                "emitted": self.emitted,
+                "max_step_cents": self.max_step,
+            }
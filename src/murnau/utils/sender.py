@@ -0,0 +1,380 @@
+"""Dedicated OSC sender thread fed by a bounded ring queue
+
+Producers (the Qt main thread, the MIDI thread) only write event records
+into a preallocated ring. A single sender thread owns the socket and puts
+the events on the wire in order.
+
+CPython has no atomic compare-and-swap, so the ring guards its indices
+with one short critical section instead of being strictly lock-free.
+Producers never block on the socket, only on that lock.
+"""
+
+import threading
+import time
+
+from .latency import LatencyMonitor, current_origin
+
+# Default ring capacity in events
+DEFAULT_CAPACITY = 4096
+
+# Note messages are never dropped; producers wait for a free slot instead
+NEVER_DROP = ("/gate", "/freq")
+
+# Longest a critical event waits for a free slot before it is dropped
+CRITICAL_TIMEOUT = 1.0
+
+# Event kinds
+MESSAGE = 0  # (address, value) pair
+DATAGRAM = 1  # pre-encoded OSC packet
+_STOP = 2  # sentinel that ends the sender thread
+
+
+class SendEvent:
+    """Preallocated ring slot describing one pending send"""
+
+    __slots__ = ("kind", "address", "value", "stamp", "origin", "target")
+
+    def __init__(self):
+        self.kind = MESSAGE
+        self.address = None
+        self.value = None
+        self.stamp = 0.0
+        self.origin = None
+        self.target = None  # send callable of another destination
+
+
+class RingQueue:
+    """Bounded FIFO of preallocated SendEvent slots
+
+    Droppable events may only fill the ring up to capacity - reserve, so
+    the reserve is always available to events that must not be dropped.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, reserve=None):
+        """Initialize the queue
+
+        Args:
+            capacity (int): Number of slots
+            reserve (int): Slots kept free for critical events, capacity // 8
+                when not given
+        """
+        if capacity < 2:
+            raise ValueError("Ring capacity must be at least 2")
+        self.capacity = capacity
+        self.reserve = max(1, capacity // 8) if reserve is None else reserve
+        self._slots = [SendEvent() for _ in range(capacity)]
+        self._head = 0  # index of the oldest event
+        self._count = 0
+
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+
+        self.enqueued = 0
+        self.dropped = 0
+        self.max_depth = 0
+
+    def __len__(self):
+        return self._count
+
+    def put(
+        self,
+        kind,
+        address,
+        value,
+        critical=False,
+        origin=None,
+        timeout=CRITICAL_TIMEOUT,
+        target=None,
+    ):
+        """Write an event into the next free slot
+
+        Args:
+            kind (int): MESSAGE or DATAGRAM
+            address (str): OSC address, None for datagrams
+            value: Message value or datagram bytes
+            critical (bool): Wait for a free slot instead of dropping
+            origin (tuple): (tag, stamp) of the MIDI message that caused
+                the event, see utils.latency
+            timeout (float): Seconds a critical event waits for a free slot
+                before it is dropped
+            target: Callable delivering the event instead of the sender's
+                own send functions, None for those
+
+        Returns:
+            bool: True if the event was queued, False if it was dropped
+        """
+        with self._lock:
+            if not critical and self._count >= self.capacity - self.reserve:
+                self.dropped += 1
+                return False
+            if self._count >= self.capacity:
+                deadline = time.monotonic() + timeout
+                while self._count >= self.capacity:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.dropped += 1
+                        return False
+                    self._not_full.wait(remaining)
+
+            slot = self._slots[(self._head + self._count) % self.capacity]
+            slot.kind = kind
+            slot.address = address
+            slot.value = value
+            slot.stamp = time.perf_counter()
+            slot.origin = origin
+            slot.target = target
+
+            self._count += 1
+            self.enqueued += 1
+            if self._count > self.max_depth:
+                self.max_depth = self._count
+            self._not_empty.notify()
+        return True
+
+    def get(self, timeout=None):
+        """Take the oldest event out of the ring
+
+        Args:
+            timeout (float): Seconds to wait for an event, None to wait forever
+
+        Returns:
+            tuple: (kind, address, value, stamp, origin, target), or None on
+                timeout
+        """
+        with self._lock:
+            if not self._count:
+                self._not_empty.wait(timeout)
+                if not self._count:
+                    return None
+
+            slot = self._slots[self._head]
+            event = (
+                slot.kind,
+                slot.address,
+                slot.value,
+                slot.stamp,
+                slot.origin,
+                slot.target,
+            )
+            slot.value = None  # don't keep datagrams alive in idle slots
+            slot.origin = None
+            slot.target = None
+
+            self._head = (self._head + 1) % self.capacity
+            self._count -= 1
+            self._not_full.notify()
+        return event
+
+
+class OSCSenderThread:
+    """Single thread that owns the OSC socket and drains a RingQueue"""
+
+    def __init__(
+        self, send, send_datagram=None, capacity=DEFAULT_CAPACITY, never_drop=NEVER_DROP
+    ):
+        """Initialize the sender
+
+        Args:
+            send: Callable taking (address, value), called on the sender thread
+            send_datagram: Callable taking encoded packet bytes
+            capacity (int): Ring capacity in events
+            never_drop: Addresses that wait for space instead of being dropped
+        """
+        self._send = send
+        self._send_datagram = send_datagram
+        self.never_drop = frozenset(never_drop)
+        self.queue = RingQueue(capacity)
+        self._thread = None
+
+        # Completion tracking, updated by whichever thread delivers events
+        self._done = threading.Condition()
+        self.processed = 0
+        self.sent = 0
+        self.errors = 0
+        self._latency_total = 0.0
+        self.latency_max = 0.0
+
+        # MIDI ingestion to wire latency per MIDI message type
+        self.latency = LatencyMonitor()
+
+    @property
+    def running(self):
+        """Whether the sender thread is alive"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start the sender thread"""
+        if self.running:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="osc-sender", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout=1.0):
+        """Send everything already queued, then stop the thread
+
+        Args:
+            timeout (float): Seconds to wait for the thread to finish
+        """
+        if not self.running:
+            return
+        self._put(_STOP, None, None, critical=True)
+        self._thread.join(timeout)
+        self._thread = None
+
+    def submit(self, address, value, send=None):
+        """Queue an OSC message
+
+        A message queued while a MIDI message is handled on the calling
+        thread carries that message's ingestion stamp, see utils.latency.
+
+        Args:
+            address (str): OSC address without synth prefix
+            value: Value to send
+            send: Callable taking (address, value) for another destination,
+                e.g. a voice's OSCClient.send; None for the sender's own
+
+        Returns:
+            bool: False if the update was dropped because the ring is full
+        """
+        return self._put(
+            MESSAGE,
+            address,
+            value,
+            critical=address in self.never_drop,
+            origin=current_origin(),
+            target=send,
+        )
+
+    def submit_datagram(self, data, send=None):
+        """Queue a pre-encoded OSC packet, never dropped
+
+        Args:
+            data (bytes): Encoded OSC message or bundle
+            send: Callable taking the packet for another destination, e.g.
+                a voice's Transport.sendto; None for the sender's own
+        """
+        return self._put(DATAGRAM, None, data, critical=True, target=send)
+
+    def flush(self, timeout=1.0):
+        """Wait until every event queued so far has been delivered
+
+        Without a running thread the queue is drained on the calling thread.
+
+        Args:
+            timeout (float): Seconds to wait
+
+        Returns:
+            bool: True if the queue was drained in time
+        """
+        if not self.running:
+            self._drain()
+            return True
+
+        target = self.queue.enqueued
+        deadline = time.monotonic() + timeout
+        with self._done:
+            while self.processed < target:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._done.wait(remaining)
+        return True
+
+    def stats(self):
+        """Get queue and delivery counters
+
+        Returns:
+            dict: Queue depth, drops, failed or dropped sends ("errors") and
+            enqueue-to-wire latency in microseconds
+        """
+        with self._done:
+            delivered = self.sent + self.errors
+            avg = self._latency_total / delivered if delivered else 0.0
+            return {
+                "depth": len(self.queue),
+                "max_depth": self.queue.max_depth,
+                "enqueued": self.queue.enqueued,
+                "dropped": self.queue.dropped,
+                "sent": self.sent,
+                "errors": self.errors,
+                "latency_avg_us": avg * 1e6,
+                "latency_max_us": self.latency_max * 1e6,
+            }
+
+    def _put(self, kind, address, value, critical=False, origin=None, target=None):
+        """Queue an event without waiting on a thread that cannot make room
+
+        The sender thread submitting from a send callback, or a producer
+        while no thread runs, would wait for itself. A full ring is drained
+        on the calling thread first, in order, so a critical event is not
+        lost.
+        """
+        if self.running and threading.current_thread() is not self._thread:
+            return self.queue.put(kind, address, value, critical, origin, target=target)
+        if critical and len(self.queue) >= self.queue.capacity:
+            self._drain()
+        return self.queue.put(
+            kind, address, value, critical, origin, timeout=0, target=target
+        )
+
+    def _drain(self):
+        """Deliver every queued event on the calling thread"""
+        while self._deliver(self.queue.get(timeout=0)):
+            pass
+
+    def _run(self):
+        """Sender thread main loop"""
+        while self._deliver(self.queue.get()):
+            pass
+
+    def _deliver(self, event):
+        """Put one event on the wire
+
+        Returns:
+            bool: False when there is nothing more to deliver
+        """
+        if event is None:
+            return False
+        kind, address, value, stamp, origin, target = event
+
+        ok = True
+        if kind == MESSAGE:
+            ok = self._call(target or self._send, address, value)
+        elif kind == DATAGRAM:
+            ok = self._call(target or self._send_datagram, value)
+
+        now = time.perf_counter()
+        latency = now - stamp
+        if origin is not None and ok:
+            # Only this thread records, see utils.latency
+            self.latency.record(origin[0], now - origin[1])
+        with self._done:
+            self.processed += 1
+            if kind != _STOP:
+                if ok:
+                    self.sent += 1
+                else:
+                    self.errors += 1
+                self._latency_total += latency
+                if latency > self.latency_max:
+                    self.latency_max = latency
+            self._done.notify_all()
+        return kind != _STOP
+
+    @staticmethod
+    def _call(func, *args):
+        """Call a send function, reporting instead of raising errors
+
+        Returns:
+            bool: False if the function raised or returned False, e.g. a
+            transport drop; None counts as sent
+        """
+        try:
+            result = func(*args)
+        except Exception as e:
+            print(f"OSC send error: {e}")
+            return False
+        return result is None or bool(result)
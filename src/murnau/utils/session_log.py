@@ -0,0 +1,339 @@
+"""Binary session logs of MIDI input and OSC output
+
+A session log captures a performance: every MIDI message the UI handles
+and every OSC message it sends. Replaying the MIDI part drives the
+pipeline exactly as the performance did, and the OSC parts of two runs can
+be diffed to catch regressions.
+
+The log is append-only and made of fixed-size little-endian records after
+a header of the same size, so it can be memory-mapped and indexed
+directly:
+
+    time   float64  seconds since the recording started
+    kind   uint8    RECORD_MIDI or RECORD_OSC
+    port   uint8    MIDI input port id, 0 for OSC
+    ident  uint16   MIDI status << 8 | first data byte, or OSC address id
+    value  float32  second MIDI data byte, or the OSC value
+
+OSC values go out as 32-bit floats, so the value field keeps them exactly.
+Address and port names are interned in a sidecar text file, one name per
+line in order of first use, as "osc <address>" or "port <name>". Messages
+longer than three bytes (SysEx) are not logged.
+"""
+
+import mmap
+import struct
+import threading
+import time
+from collections import namedtuple
+
+import mido
+from mido.messages.specs import SPEC_BY_STATUS
+
+from .clock import OnsetStats, SessionClock
+
+# Magic bytes at the start of a session log
+MAGIC = b"MURNAU"
+
+# Format version in the header
+VERSION = 1
+
+# Header: magic, version, Unix time of the recording start
+HEADER = struct.Struct("<6sHd")
+
+# One record: time, kind, port, ident, value
+RECORD = struct.Struct("<dBBHf")
+RECORD_SIZE = RECORD.size
+
+# Record kinds
+RECORD_MIDI = 1
+RECORD_OSC = 2
+
+# Suffix of the file holding interned address and port names
+NAMES_SUFFIX = ".names"
+
+Record = namedtuple("Record", ["time", "kind", "port", "ident", "value"])
+Record.__doc__ = "One raw session log record"
+
+
+class SessionRecorder:
+    """Appends MIDI input and OSC output records to a session log
+
+    Thread-safe: MIDI and OSC records come from different threads. Writes
+    are buffered, call flush() or close() to make them visible to readers.
+    """
+
+    def __init__(self, path, clock=time.perf_counter):
+        """Create the log, replacing any log at the path
+
+        Args:
+            path (str): Path of the log file
+            clock: Time source of the stamps passed to the record methods
+        """
+        self.path = path
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._osc_ids = {}
+        self._port_ids = {}
+        self.records = 0
+        self.skipped = 0
+
+        self._file = open(path, "wb")
+        self._names = open(path + NAMES_SUFFIX, "w", encoding="utf-8")
+        self._file.write(HEADER.pack(MAGIC, VERSION, time.time()))
+        self.origin = clock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def closed(self):
+        """Whether the log has been closed"""
+        return self._file.closed
+
+    def record_midi(self, message, stamp=None, port=None):
+        """Log a MIDI message
+
+        Args:
+            message: mido message
+            stamp (float): Clock time at ingestion, now if not given
+            port (str): Input port name, None for an unnamed port
+        """
+        data = message.bytes()
+        if len(data) > 3:
+            self.skipped += 1
+            return
+        ident = data[0] << 8 | (data[1] if len(data) > 1 else 0)
+        value = data[2] if len(data) > 2 else 0
+        if stamp is None:
+            stamp = self._clock()
+        with self._lock:
+            if not self._file.closed:
+                port_id = self._intern(self._port_ids, "port", port)
+                self._write(stamp, RECORD_MIDI, port_id, ident, value)
+
+    def record_osc(self, address, value, stamp=None):
+        """Log an OSC message
+
+        Args:
+            address (str): OSC address
+            value (float): Value sent
+            stamp (float): Clock time of the send, now if not given
+        """
+        if stamp is None:
+            stamp = self._clock()
+        with self._lock:
+            if not self._file.closed:
+                address_id = self._intern(self._osc_ids, "osc", address)
+                self._write(stamp, RECORD_OSC, 0, address_id, value)
+
+    def _intern(self, ids, namespace, name):
+        """Get a name's id, adding it to the names file on first use"""
+        name_id = ids.get(name)
+        if name_id is None:
+            name_id = len(ids)
+            ids[name] = name_id
+            self._names.write(f"{namespace} {'' if name is None else name}\n")
+        return name_id
+
+    def _write(self, stamp, kind, port, ident, value):
+        """Append one record, under the lock"""
+        self._file.write(RECORD.pack(stamp - self.origin, kind, port, ident, value))
+        self.records += 1
+
+    def flush(self):
+        """Write buffered records to the file"""
+        with self._lock:
+            if not self._file.closed:
+                self._file.flush()
+                self._names.flush()
+
+    def close(self):
+        """Flush and close the log"""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+                self._names.close()
+
+
+class SessionLog:
+    """Memory-mapped, read-only view of a session log"""
+
+    def __init__(self, path):
+        """Open a log
+
+        Records appended after opening are not seen; a record cut short by
+        a crash is ignored.
+
+        Args:
+            path (str): Path of the log file
+
+        Raises:
+            ValueError: If the file is not a session log
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < HEADER.size:
+            self._map.close()
+            raise ValueError(f"Not a session log: {path}")
+        magic, version, self.start_time = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError(f"Not a session log: {path}")
+        self._count = (len(self._map) - HEADER.size) // RECORD_SIZE
+
+        self.addresses = []
+        self.ports = []
+        with open(path + NAMES_SUFFIX, "r", encoding="utf-8") as f:
+            for line in f:
+                namespace, _, name = line.rstrip("\n").partition(" ")
+                if namespace == "osc":
+                    self.addresses.append(name)
+                else:
+                    self.ports.append(name or None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Unmap the file"""
+        self._map.close()
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("Session log record index out of range")
+        return Record._make(
+            RECORD.unpack_from(self._map, HEADER.size + index * RECORD_SIZE)
+        )
+
+    def __iter__(self):
+        unpack_from = RECORD.unpack_from
+        end = HEADER.size + self._count * RECORD_SIZE
+        for offset in range(HEADER.size, end, RECORD_SIZE):
+            yield Record._make(unpack_from(self._map, offset))
+
+    def midi(self):
+        """Stream the MIDI records
+
+        Yields:
+            tuple: (time, mido message, port name)
+        """
+        for record in self:
+            if record.kind == RECORD_MIDI:
+                status = record.ident >> 8
+                data = (status, record.ident & 0x7F, int(record.value))
+                message = mido.Message.from_bytes(
+                    data[: SPEC_BY_STATUS[status]["length"]]
+                )
+                yield record.time, message, self.ports[record.port]
+
+    def osc(self):
+        """Stream the OSC records
+
+        Yields:
+            tuple: (time, address, value)
+        """
+        for record in self:
+            if record.kind == RECORD_OSC:
+                yield record.time, self.addresses[record.ident], record.value
+
+
+def replay(events, handler, speed=1.0, clock=None):
+    """Feed logged events back at their recorded pace or as fast as possible
+
+    Args:
+        events: Iterable of (time, *args) as from SessionLog.midi() or
+            SessionLog.osc()
+        handler: Callable taking the args of each event
+        speed (float): Playback speed, 1.0 for real time, None for as fast
+            as possible
+        clock (SessionClock): Clock to pace against, None for a new one
+
+    Returns:
+        dict: events, seconds taken and events per second; paced replays
+            also report the onset error like clock.onset_report()
+    """
+    if clock is None:
+        clock = SessionClock()
+    stats = OnsetStats()
+    count = 0
+    start = clock.now()
+    for t, *args in events:
+        if speed is not None:
+            deadline = start + t / speed
+            clock.sleep_until(deadline)
+            stats.add(deadline, clock.now())
+        handler(*args)
+        count += 1
+    seconds = clock.now() - start
+
+    report = stats.report() if speed is not None else {}
+    report.update(
+        {
+            "events": count,
+            "seconds": seconds,
+            "rate": count / seconds if seconds > 0 else 0.0,
+        }
+    )
+    return report
+
+
+def diff_osc(a, b, tolerance=0.0):
+    """Compare the OSC output of two session logs
+
+    Each address's value sequence is compared on its own, so interleaving
+    between addresses may differ between runs.
+
+    Args:
+        a (SessionLog): First log
+        b (SessionLog): Second log
+        tolerance (float): Largest value difference counted as equal
+
+    Returns:
+        dict: Per address that differs, message counts "a" and "b", "first"
+            index of the first differing value (None if only the counts
+            differ) and "max_error" over the common part; empty if the
+            outputs match
+    """
+    values_a = _values_by_address(a)
+    values_b = _values_by_address(b)
+    differences = {}
+    for address in sorted(set(values_a) | set(values_b)):
+        left = values_a.get(address, [])
+        right = values_b.get(address, [])
+        first = None
+        max_error = 0.0
+        for index, (x, y) in enumerate(zip(left, right)):
+            error = abs(x - y)
+            if error > tolerance:
+                if first is None:
+                    first = index
+                max_error = max(max_error, error)
+        if first is not None or len(left) != len(right):
+            differences[address] = {
+                "a": len(left),
+                "b": len(right),
+                "first": first,
+                "max_error": max_error,
+            }
+    return differences
+
+
+def _values_by_address(log):
+    """OSC values of a log grouped by address"""
+    values = {}
+    for _, address, value in log.osc():
+        values.setdefault(address, []).append(value)
+    return values
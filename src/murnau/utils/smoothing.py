@@ -0,0 +1,121 @@
+"""Control-rate parameter smoother
+
+Controller messages arrive at irregular times and in steps. The smoother
+keeps a target per parameter and, on every control tick, moves the emitted
+value a fixed fraction of the way along a linear ramp to it. Each
+parameter therefore emits at most once per tick however many messages
+arrive, and a jump becomes a short glide instead of a zipper step.
+Parameters that reached their target stop emitting.
+"""
+
+import threading
+
+from .coalescer import DEFAULT_CONTROL_RATE
+
+# Seconds a ramp to a new target takes
+DEFAULT_GLIDE = 0.015
+
+
+class ParamSmoother:
+    """Per-parameter linear ramps advanced at a fixed control rate"""
+
+    def __init__(self, rate=DEFAULT_CONTROL_RATE, glide=DEFAULT_GLIDE):
+        """Initialize the smoother
+
+        Args:
+            rate (float): Control rate in Hz at which tick() is expected
+            glide (float): Seconds a ramp to a new target takes
+        """
+        self.rate = rate
+        self.ticks = max(1, round(glide * rate))
+
+        self._lock = threading.Lock()
+        self._current = {}  # key -> last emitted value
+        self._ramps = {}  # key -> [emit, target, step, ticks left]
+
+        self.received = 0
+        self.emitted = 0
+
+    @property
+    def interval(self):
+        """Control period in seconds"""
+        return 1.0 / self.rate
+
+    def __len__(self):
+        return len(self._ramps)
+
+    def set(self, key, value, emit):
+        """Set a parameter's target, from any thread
+
+        A parameter that has not emitted yet goes straight to its latest
+        target on the next tick.
+
+        Args:
+            key: Hashable parameter key
+            value (float): Target value
+            emit: Callable taking the smoothed value, called from tick()
+        """
+        with self._lock:
+            self.received += 1
+            current = self._current.get(key)
+            if current is None:
+                self._ramps[key] = [emit, value, 0.0, 1]
+            else:
+                self._ramps[key] = [
+                    emit,
+                    value,
+                    (value - current) / self.ticks,
+                    self.ticks,
+                ]
+
+    def tick(self):
+        """Advance every ramp one step and emit, once per control period
+
+        Returns:
+            int: Number of values emitted
+        """
+        emits = []
+        with self._lock:
+            for key, ramp in list(self._ramps.items()):
+                emit, target, step, left = ramp
+                left -= 1
+                if left <= 0:
+                    value = target
+                    del self._ramps[key]
+                else:
+                    value = self._current[key] + step
+                    ramp[3] = left
+                self._current[key] = value
+                emits.append((emit, value))
+            self.emitted += len(emits)
+
+        for emit, value in emits:
+            emit(value)
+        return len(emits)
+
+    def reset(self, key=None):
+        """Forget a parameter, or all of them, so the next target is a jump
+
+        Args:
+            key: Parameter key, None for all
+        """
+        with self._lock:
+            if key is None:
+                self._current.clear()
+                self._ramps.clear()
+            else:
+                self._current.pop(key, None)
+                self._ramps.pop(key, None)
+
+    def stats(self):
+        """Get smoother counters
+
+        Returns:
+            dict: Targets received, values emitted and active ramps
+        """
+        with self._lock:
+            return {
+                "received": self.received,
+                "emitted": self.emitted,
+                "active": len(self._ramps),
+            }
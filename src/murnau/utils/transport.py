@@ -0,0 +1,283 @@
+"""Shared, pooled UDP transports for OSC destinations
+
+Every part of Murnau that talks to a synth (the UI, the melody and ramp
+scripts, OSCClient, FanoutOSCClient) gets its endpoint from a
+TransportRegistry instead of opening its own socket. The registry keeps one
+Transport per (ip, port) destination and one socket per address family, and
+applies the socket options in one place. Sending on a shared UDP socket from
+several threads is safe, each sendto() is a single datagram.
+
+Note messages (sender.NEVER_DROP) are critical: on a full send buffer they
+wait for room instead of being dropped. Callers that know the address pass
+critical themselves; otherwise the transport reads the addresses from the
+packet, so gates sent as plain messages or inside bundles are kept too.
+
+Each Transport counts datagrams, bytes, drops, stalls and errors, so the
+same numbers are available for every code path through
+TransportRegistry.stats().
+"""
+
+import socket
+import threading
+import time
+
+from pythonosc.osc_message_builder import OscMessageBuilder
+
+from .sender import NEVER_DROP
+
+# Send buffer requested for pooled sockets, in bytes
+DEFAULT_SNDBUF = 1 << 18
+
+# Longest a critical packet waits for a full send buffer before it is dropped
+CRITICAL_TIMEOUT = 0.5
+
+# Pause between writes of a critical packet while the send buffer is full
+RETRY_INTERVAL = 0.0005
+
+# Address endings of critical messages, synth names prefix NEVER_DROP
+_CRITICAL_ENDINGS = tuple(address.encode() for address in NEVER_DROP)
+
+_BUNDLE_TAG = b"#bundle\x00"
+
+
+def is_critical(data):
+    """Check whether an encoded OSC packet carries a note message
+
+    Args:
+        data: Encoded OSC message or bundle
+
+    Returns:
+        bool: True if a message address ends with one of sender.NEVER_DROP
+    """
+    if not data.startswith(_BUNDLE_TAG):
+        return bytes(data).partition(b"\x00")[0].endswith(_CRITICAL_ENDINGS)
+
+    # Bundle elements follow the tag and timetag, each after its size
+    offset = 16
+    while offset + 4 <= len(data):
+        size = int.from_bytes(data[offset : offset + 4], "big")
+        offset += 4
+        if is_critical(data[offset : offset + size]):
+            return True
+        offset += size
+    return False
+
+
+class Transport:
+    """Send endpoint for one OSC destination on a pooled socket
+
+    Also accepts python-osc's client calls (send_message, send), so it can
+    stand in wherever a SimpleUDPClient was used.
+
+    Counters are updated without a lock; concurrent senders can lose an
+    increment, which is acceptable for monitoring.
+    """
+
+    def __init__(self, sock, sockaddr, ip, port):
+        """Initialize the transport
+
+        Args:
+            sock: Pooled UDP socket owned by the registry
+            sockaddr: Resolved destination address
+            ip (str): Destination IP address as requested
+            port (int): Destination port
+        """
+        self.ip = ip
+        self.port = port
+        self.sockaddr = sockaddr
+        self._sock = sock
+
+        self.datagrams = 0
+        self.bytes = 0
+        self.dropped = 0
+        self.stalls = 0  # critical packets that waited for buffer space
+        self.errors = 0
+
+    def sendto(self, data, critical=None):
+        """Write one encoded OSC packet to the destination
+
+        A full send buffer on a non-blocking socket drops the packet instead
+        of stalling the caller. A critical packet, e.g. a gate, retries
+        until the buffer has room and is only dropped after
+        CRITICAL_TIMEOUT. Other socket errors are counted and raised.
+
+        Args:
+            data: Encoded OSC message or bundle
+            critical (bool): Wait for buffer space instead of dropping, None
+                to decide from the packet, see is_critical()
+
+        Returns:
+            bool: False if the packet was dropped
+        """
+        deadline = None
+        while True:
+            try:
+                self._sock.sendto(data, self.sockaddr)
+                break
+            except BlockingIOError:
+                if critical is None:
+                    critical = is_critical(data)
+                if not critical:
+                    self.dropped += 1
+                    return False
+                if deadline is None:
+                    self.stalls += 1
+                    deadline = time.monotonic() + CRITICAL_TIMEOUT
+                elif time.monotonic() >= deadline:
+                    self.dropped += 1
+                    return False
+                time.sleep(RETRY_INTERVAL)
+            except OSError:
+                self.errors += 1
+                raise
+        self.datagrams += 1
+        self.bytes += len(data)
+        return True
+
+    def send(self, content, critical=None):
+        """Send a python-osc message, bundle or OscDatagram
+
+        Args:
+            content: Object with a ``dgram`` attribute holding the packet
+            critical (bool): Wait for buffer space instead of dropping, None
+                to decide from the packet
+
+        Returns:
+            bool: False if the packet was dropped
+        """
+        return self.sendto(content.dgram, critical)
+
+    def send_message(self, address, value, critical=None):
+        """Build and send an OSC message like SimpleUDPClient.send_message
+
+        Args:
+            address (str): Full OSC address
+            value: Argument, or list of arguments, typed by python-osc
+            critical (bool): Wait for buffer space instead of dropping, None
+                for note messages only
+
+        Returns:
+            bool: False if the packet was dropped
+        """
+        builder = OscMessageBuilder(address=address)
+        values = value if isinstance(value, (list, tuple)) else [value]
+        for arg in values:
+            builder.add_arg(arg)
+        if critical is None:
+            critical = address.endswith(NEVER_DROP)
+        return self.sendto(builder.build().dgram, critical)
+
+    def stats(self):
+        """Get the transport counters
+
+        Returns:
+            dict: Datagrams and bytes sent, drops, stalls and errors
+        """
+        return {
+            "datagrams": self.datagrams,
+            "bytes": self.bytes,
+            "dropped": self.dropped,
+            "stalls": self.stalls,
+            "errors": self.errors,
+        }
+
+
+class TransportRegistry:
+    """Hands out one shared Transport per destination"""
+
+    def __init__(self, sndbuf=DEFAULT_SNDBUF, blocking=False):
+        """Initialize the registry
+
+        Args:
+            sndbuf (int): SO_SNDBUF requested for pooled sockets, None to keep
+                the system default
+            blocking (bool): Whether pooled sockets block when the send buffer
+                is full
+        """
+        self.sndbuf = sndbuf
+        self.blocking = blocking
+        self._lock = threading.Lock()
+        self._sockets = {}  # address family -> socket
+        self._transports = {}  # (ip, port) -> Transport
+
+    def get(self, ip, port):
+        """Get the shared transport for a destination, creating it if needed
+
+        Args:
+            ip (str): Destination IP address or host name
+            port (int): Destination port
+
+        Returns:
+            Transport: Transport shared by every caller of this destination
+        """
+        key = (ip, port)
+        transport = self._transports.get(key)
+        if transport is not None:
+            return transport
+
+        family, socktype, _, _, sockaddr = socket.getaddrinfo(
+            ip, port, type=socket.SOCK_DGRAM
+        )[0]
+        with self._lock:
+            transport = self._transports.get(key)
+            if transport is None:
+                transport = Transport(
+                    self._socket(family, socktype), sockaddr, ip, port
+                )
+                self._transports[key] = transport
+        return transport
+
+    def destinations(self):
+        """List the destinations that have a transport
+
+        Returns:
+            list: (ip, port) pairs
+        """
+        with self._lock:
+            return list(self._transports)
+
+    def stats(self):
+        """Get the counters of every transport
+
+        Returns:
+            dict: Per-destination counters keyed by "ip:port"
+        """
+        with self._lock:
+            transports = list(self._transports.values())
+        return {f"{t.ip}:{t.port}": t.stats() for t in transports}
+
+    def close(self):
+        """Close the pooled sockets and forget all transports"""
+        with self._lock:
+            for sock in self._sockets.values():
+                sock.close()
+            self._sockets.clear()
+            self._transports.clear()
+
+    def _socket(self, family, socktype):
+        """Get the pooled socket for an address family, must hold the lock"""
+        sock = self._sockets.get(family)
+        if sock is None:
+            sock = socket.socket(family, socktype)
+            if self.sndbuf:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, self.sndbuf)
+            sock.setblocking(self.blocking)
+            self._sockets[family] = sock
+        return sock
+
+
+# Registry shared by the whole process
+registry = TransportRegistry()
+
+
+def get_transport(ip, port):
+    """Get the shared transport for a destination from the process registry
+
+    Args:
+        ip (str): Destination IP address or host name
+        port (int): Destination port
+
+    Returns:
+        Transport: Shared transport
+    """
+    return registry.get(ip, port)
@@ -0,0 +1,293 @@
+"""Tuning tables, including Scala .scl/.kbm microtunings
+
+A Tuning holds the frequency of every MIDI note, computed once when the
+tuning is built. The active tuning is a module-level reference replaced as
+a whole by retune(), so a note lookup on any thread is a single index into
+a tuple that never changes under it.
+
+Scala scales (.scl) list their degrees in cents ("701.955") or as ratios
+("3/2", "2"); the last degree is the period, usually the octave. Keyboard
+mappings (.kbm) place the scale on the keys and set the reference pitch.
+Without a mapping, degree 0 sits on middle C and A4 (note 69) is tuned to
+the reference frequency. See https://www.huygens-fokker.org/scala/
+"""
+
+import math
+from collections import namedtuple
+
+# Number of MIDI notes
+NOTE_COUNT = 128
+
+# Concert pitch of A4
+DEFAULT_REFERENCE = 440.0
+
+Scale = namedtuple("Scale", ["description", "cents"])
+Scale.__doc__ = "Scale degrees 1..n in cents, the last one is the period"
+
+Keymap = namedtuple(
+    "Keymap",
+    [
+        "size",
+        "first_note",
+        "last_note",
+        "middle_note",
+        "reference_note",
+        "reference_freq",
+        "octave_degree",
+        "mapping",
+    ],
+)
+Keymap.__doc__ = "Scala keyboard mapping, size 0 maps one degree per key"
+
+# Linear mapping of every note with degree 0 on middle C and A4 as the
+# reference
+DEFAULT_KEYMAP = Keymap(0, None, None, 60, 69, DEFAULT_REFERENCE, 0, ())
+
+
+def _pitch_to_cents(text):
+    """Convert a Scala pitch, cents or a ratio, to cents"""
+    if "." in text:
+        return float(text)
+    numerator, _, denominator = text.partition("/")
+    ratio = int(numerator) / int(denominator or 1)
+    if ratio <= 0:
+        raise ValueError(f"Invalid Scala ratio: {text}")
+    return 1200.0 * math.log2(ratio)
+
+
+def _data_lines(path):
+    """Lines of a Scala file without comments"""
+    with open(path, "r", encoding="latin-1") as f:
+        return [line.strip() for line in f if not line.startswith("!")]
+
+
+def parse_scl(path):
+    """Read a Scala scale file
+
+    Args:
+        path (str): Path to a .scl file
+
+    Returns:
+        Scale: Description and degree cents
+
+    Raises:
+        ValueError: If the file is not a valid scale
+    """
+    lines = _data_lines(path)
+    if len(lines) < 2:
+        raise ValueError(f"Incomplete Scala scale: {path}")
+    try:
+        count = int(lines[1].split()[0])
+        # Text after the pitch on a line is a comment
+        cents = [_pitch_to_cents(line.split()[0]) for line in lines[2 : 2 + count]]
+    except (IndexError, ValueError, ZeroDivisionError):
+        raise ValueError(f"Invalid Scala scale: {path}") from None
+    if count < 1 or len(cents) != count:
+        raise ValueError(f"Scala scale has {len(cents)} of {count} degrees: {path}")
+    return Scale(lines[0], tuple(cents))
+
+
+def parse_kbm(path):
+    """Read a Scala keyboard mapping file
+
+    Args:
+        path (str): Path to a .kbm file
+
+    Returns:
+        Keymap: Key range, reference and degree per key of the pattern
+
+    Raises:
+        ValueError: If the file is not a valid mapping
+    """
+    lines = [line for line in _data_lines(path) if line]
+    try:
+        fields = [line.split()[0] for line in lines]
+        size = int(fields[0])
+        first, last, middle, reference_note = (int(v) for v in fields[1:5])
+        reference_freq = float(fields[5])
+        octave_degree = int(fields[6])
+        mapping = tuple(
+            None if value.lower() == "x" else int(value)
+            for value in fields[7 : 7 + size]
+        )
+    except (IndexError, ValueError):
+        raise ValueError(f"Invalid Scala keyboard mapping: {path}") from None
+    # Missing trailing entries are unmapped keys
+    mapping += (None,) * (size - len(mapping))
+    return Keymap(
+        size,
+        first,
+        last,
+        middle,
+        reference_note,
+        reference_freq,
+        octave_degree,
+        mapping,
+    )
+
+
+class Tuning:
+    """Frequencies of all MIDI notes for one scale and keyboard mapping"""
+
+    def __init__(self, scale, keymap=DEFAULT_KEYMAP):
+        """Build the note table
+
+        Args:
+            scale (Scale): Scale degrees in cents
+            keymap (Keymap): Keyboard mapping and reference pitch
+
+        Raises:
+            ValueError: If the reference note is not mapped
+        """
+        self.scale = scale
+        self.keymap = keymap
+
+        reference = self._cents(keymap.reference_note)
+        if reference is None:
+            raise ValueError(f"Reference note {keymap.reference_note} is unmapped")
+        self._reference_cents = reference
+
+        # Frequency per MIDI note, None for keys the mapping leaves silent
+        self.freqs = tuple(self.freq(note) for note in range(NOTE_COUNT))
+
+    @classmethod
+    def equal(cls, reference=DEFAULT_REFERENCE, divisions=12):
+        """Equal temperament
+
+        Args:
+            reference (float): Frequency of A4 in Hz
+            divisions (int): Equal steps per octave
+
+        Returns:
+            Tuning: Equal-tempered tuning
+        """
+        step = 1200.0 / divisions
+        scale = Scale(
+            f"{divisions}-tone equal temperament",
+            tuple(step * degree for degree in range(1, divisions + 1)),
+        )
+        return cls(scale, DEFAULT_KEYMAP._replace(reference_freq=reference))
+
+    @classmethod
+    def from_files(cls, scl_path, kbm_path=None, reference=None):
+        """Load a Scala scale and optional keyboard mapping
+
+        Args:
+            scl_path (str): Path to a .scl file
+            kbm_path (str): Path to a .kbm file, None for the default mapping
+            reference (float): Reference frequency replacing the mapping's
+
+        Returns:
+            Tuning: Tuning for the files
+        """
+        keymap = DEFAULT_KEYMAP if kbm_path is None else parse_kbm(kbm_path)
+        if reference is not None:
+            keymap = keymap._replace(reference_freq=reference)
+        return cls(parse_scl(scl_path), keymap)
+
+    def with_reference(self, reference):
+        """Get the same tuning at another reference pitch
+
+        Args:
+            reference (float): Frequency of the reference note in Hz
+
+        Returns:
+            Tuning: Retuned copy
+        """
+        return Tuning(self.scale, self.keymap._replace(reference_freq=reference))
+
+    def freq(self, note):
+        """Compute the frequency of any note, including ones outside 0-127
+
+        Use the freqs table for MIDI notes on the hot path. A fractional
+        note lies between its two neighbouring keys, evenly in pitch.
+
+        Args:
+            note (float): Note number
+
+        Returns:
+            float: Frequency in Hz, None if the key is unmapped
+        """
+        whole = math.floor(note)
+        if note != whole:
+            low, high = self.freq(whole), self.freq(whole + 1)
+            if low is None or high is None:
+                return None
+            return low * (high / low) ** (note - whole)
+
+        cents = self._cents(whole)
+        if cents is None:
+            return None
+        offset = cents - self._reference_cents
+        if offset == 0:
+            return float(self.keymap.reference_freq)
+        return self.keymap.reference_freq * 2.0 ** (offset / 1200.0)
+
+    def _degree_cents(self, degree):
+        """Cents of a scale degree, degrees past the period repeat it"""
+        degrees = self.scale.cents
+        periods, index = divmod(degree, len(degrees))
+        return periods * degrees[-1] + (degrees[index - 1] if index else 0.0)
+
+    def _cents(self, note):
+        """Cents of a note above degree 0, None if the key is unmapped"""
+        keymap = self.keymap
+        if keymap.first_note is not None and not (
+            keymap.first_note <= note <= keymap.last_note
+        ):
+            return None
+
+        offset = note - keymap.middle_note
+        if keymap.size == 0:
+            return self._degree_cents(offset)
+
+        repeats, index = divmod(offset, keymap.size)
+        degree = keymap.mapping[index]
+        if degree is None:
+            return None
+        octave = keymap.octave_degree or len(self.scale.cents)
+        return repeats * self._degree_cents(octave) + self._degree_cents(degree)
+
+
+# Active tuning, replaced as a whole by retune()
+_current = Tuning.equal()
+
+
+def current():
+    """Get the active tuning
+
+    Returns:
+        Tuning: Tuning used by note_freq()
+    """
+    return _current
+
+
+def retune(tuning):
+    """Make a tuning the active one
+
+    Args:
+        tuning (Tuning): New tuning
+
+    Returns:
+        Tuning: Previously active tuning
+    """
+    global _current
+    previous = _current
+    _current = tuning
+    return previous
+
+
+def note_freq(note):
+    """Get a note's frequency in the active tuning
+
+    Args:
+        note (float): MIDI note number, fractional notes and notes outside
+            0-127 are computed
+
+    Returns:
+        float: Frequency in Hz, None if the key is unmapped
+    """
+    tuning = _current
+    if isinstance(note, int) and 0 <= note < NOTE_COUNT:
+        return tuning.freqs[note]
+    return tuning.freq(note)
@@ -0,0 +1,285 @@
+"""Polyphonic voice allocation across several synth instances
+
+legato_synth_stereo plays one note at a time, so polyphony comes from a
+pool of instances with one voice each. VoiceAllocator decides which voice
+plays a note and PolySynth sends every voice's /freq and /gate to its own
+instance.
+
+Every decision is constant time. Free voices wait in an OrderedDict in
+release order and busy voices in one in note-on order, so the least
+recently used voice is always at the front. For quietest-voice stealing,
+busy voices are also bucketed by velocity, and the lowest non-empty bucket
+is the lowest set bit of a mask, as in utils.note_stack.
+"""
+
+from collections import OrderedDict
+
+from .osc_client import OSCClient
+from .tuning import note_freq
+
+# Voice allocation policies, they differ in the voice taken for a new note
+ROUND_ROBIN = "round_robin"  # the next voice in turn, stolen if busy
+LRU = "lru"  # the longest released free voice, else the oldest note
+QUIETEST = "quietest"  # a free voice, else the oldest of the softest notes
+POLICIES = (ROUND_ROBIN, LRU, QUIETEST)
+
+# Velocity of note_on() calls that give none
+DEFAULT_VELOCITY = 100
+
+
+class Voice:
+    """One synth instance and the note it is playing"""
+
+    __slots__ = ("index", "note", "velocity")
+
+    def __init__(self, index):
+        self.index = index
+        self.note = None  # None while the voice is free
+        self.velocity = 0
+
+    def __repr__(self):
+        return f"Voice({self.index}, note={self.note})"
+
+
+class VoiceAllocator:
+    """Assigns notes to a fixed pool of voices, not thread-safe"""
+
+    def __init__(self, count, policy=LRU):
+        """Initialize with every voice free
+
+        Args:
+            count (int): Number of voices, 1 or more
+            policy (str): ROUND_ROBIN, LRU or QUIETEST
+        """
+        if count < 1:
+            raise ValueError("A voice pool needs at least one voice")
+        self.voices = [Voice(index) for index in range(count)]
+        self.policy = policy
+
+        self._free = OrderedDict((voice, None) for voice in self.voices)
+        self._busy = OrderedDict()  # oldest note first
+        self._by_note = {}  # note -> voice playing it
+
+        # Busy voices per velocity, oldest first, and bit v set while
+        # velocity v has a voice
+        self._by_velocity = [OrderedDict() for _ in range(128)]
+        self._velocity_mask = 0
+
+        self._next = 0  # round-robin position
+        self.steals = 0
+
+    @property
+    def policy(self):
+        """Rule picking the voice for a new note"""
+        return self._policy
+
+    @policy.setter
+    def policy(self, policy):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown voice allocation policy: {policy}")
+        self._policy = policy
+
+    def __len__(self):
+        return len(self.voices)
+
+    @property
+    def active(self):
+        """Number of voices playing a note"""
+        return len(self._busy)
+
+    def voice_for(self, note):
+        """Get the voice playing a note
+
+        Args:
+            note (int): MIDI note number
+
+        Returns:
+            Voice: Voice playing the note, None if it is not playing
+        """
+        return self._by_note.get(note)
+
+    def note_on(self, note, velocity=DEFAULT_VELOCITY):
+        """Assign a note to a voice
+
+        A note that is already playing is retriggered on its own voice.
+
+        Args:
+            note (int): MIDI note number
+            velocity (int): Note velocity 1-127
+
+        Returns:
+            tuple: (voice, note the voice was playing before or None)
+        """
+        voice = self._by_note.get(note)
+        if voice is not None:
+            self._vacate(voice)
+            self._occupy(voice, note, velocity)
+            return voice, note
+
+        if self._policy == ROUND_ROBIN:
+            voice = self.voices[self._next]
+            self._next = (self._next + 1) % len(self.voices)
+            if voice.note is None:
+                del self._free[voice]
+        elif self._free:
+            voice = self._free.popitem(last=False)[0]
+        elif self._policy == LRU:
+            voice = next(iter(self._busy))
+        else:
+            mask = self._velocity_mask
+            quietest = (mask & -mask).bit_length() - 1
+            voice = next(iter(self._by_velocity[quietest]))
+
+        previous = voice.note
+        if previous is not None:
+            self._vacate(voice)
+            self.steals += 1
+        self._occupy(voice, note, velocity)
+        return voice, previous
+
+    def note_off(self, note):
+        """Free the voice playing a note
+
+        Args:
+            note (int): MIDI note number
+
+        Returns:
+            Voice: Voice that played the note, None if it was not playing
+        """
+        voice = self._by_note.get(note)
+        if voice is None:
+            return None
+        self._vacate(voice)
+        self._free[voice] = None
+        return voice
+
+    def release_all(self):
+        """Free every voice
+
+        Returns:
+            list: Voices that were playing
+        """
+        playing = list(self._busy)
+        for voice in playing:
+            self._vacate(voice)
+            self._free[voice] = None
+        return playing
+
+    def _occupy(self, voice, note, velocity):
+        """Make a taken voice play a note"""
+        velocity = min(max(int(velocity), 0), 127)
+        voice.note = note
+        voice.velocity = velocity
+        self._by_note[note] = voice
+        self._busy[voice] = None
+        self._by_velocity[velocity][voice] = None
+        self._velocity_mask |= 1 << velocity
+
+    def _vacate(self, voice):
+        """Take a busy voice off its note"""
+        del self._by_note[voice.note]
+        del self._busy[voice]
+        bucket = self._by_velocity[voice.velocity]
+        del bucket[voice]
+        if not bucket:
+            self._velocity_mask &= ~(1 << voice.velocity)
+        voice.note = None
+
+
+class PolySynth:
+    """Plays notes polyphonically on a pool of monophonic synth instances
+
+    Not thread-safe, call it from one thread, e.g. the MIDI input's.
+    """
+
+    def __init__(self, senders, policy=LRU, batch_senders=None):
+        """Initialize the pool
+
+        Args:
+            senders: One callable taking (address, value) per instance, e.g.
+                OSCClient.send
+            policy (str): Voice allocation policy, see POLICIES
+            batch_senders: One callable taking a list of (address, value)
+                pairs per instance, e.g. OSCClient.send_batch; None to send
+                batches one message at a time
+        """
+        self._senders = list(senders)
+        self._batch_senders = None if batch_senders is None else list(batch_senders)
+        self.allocator = VoiceAllocator(len(self._senders), policy)
+
+    @classmethod
+    def from_destinations(cls, destinations, policy=LRU):
+        """Create a pool sending to synth instances over OSC
+
+        Args:
+            destinations: Iterable of (ip, port, synth_name) per instance
+            policy (str): Voice allocation policy, see POLICIES
+
+        Returns:
+            PolySynth: Pool with one voice per destination
+        """
+        clients = [
+            OSCClient(ip, port, synth_name) for ip, port, synth_name in destinations
+        ]
+        return cls(
+            [client.send for client in clients],
+            policy,
+            [client.send_batch for client in clients],
+        )
+
+    def note_on(self, note, velocity=DEFAULT_VELOCITY):
+        """Start a note on the voice the policy picks
+
+        Args:
+            note (int): MIDI note number
+            velocity (int): Note velocity 1-127
+
+        Returns:
+            int: Index of the voice, None if the tuning leaves the key silent
+        """
+        freq = note_freq(note)
+        if freq is None:
+            return None
+        voice, previous = self.allocator.note_on(note, velocity)
+        send = self._senders[voice.index]
+        if previous is not None:
+            # Close the gate of the note taken over so the new one retriggers
+            send("/gate", 0.0)
+        send("/freq", freq)
+        send("/gate", 1.0)
+        return voice.index
+
+    def note_off(self, note):
+        """Release a note
+
+        Args:
+            note (int): MIDI note number
+
+        Returns:
+            int: Index of the voice that played it, None if none did
+        """
+        voice = self.allocator.note_off(note)
+        if voice is None:
+            return None
+        self._senders[voice.index]("/gate", 0.0)
+        return voice.index
+
+    def send(self, index, messages):
+        """Send parameter values to one voice's instance
+
+        Args:
+            index (int): Voice index
+            messages: List of (address, value) pairs, sent as one bundle
+                when the pool has batch senders
+        """
+        if self._batch_senders is not None:
+            self._batch_senders[index](messages)
+        else:
+            send = self._senders[index]
+            for address, value in messages:
+                send(address, value)
+
+    def all_notes_off(self):
+        """Release every playing voice"""
+        for voice in self.allocator.release_all():
+            self._senders[voice.index]("/gate", 0.0)
@@ -0,0 +1,47 @@
+"""Test doubles shared by several test modules"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.murnau.utils.clock import SPIN_THRESHOLD, SessionClock
+
+
+class ManualClock(SessionClock):
+    """Session clock that only moves when it is waited on
+
+    sleep_until() jumps straight to the deadline instead of waiting, so
+    scheduled playback runs at once and deterministically.
+    """
+
+    def __init__(self, late=0.0, wall_origin=0.0):
+        """Initialize the clock at session time zero
+
+        Args:
+            late (float): Seconds every wait overshoots its deadline by, to
+                simulate late wake-ups
+            wall_origin (float): Unix time of session time zero
+        """
+        self.t = 0.0
+        self.origin = 0.0
+        self.wall_origin = wall_origin
+        self.late = late
+        self.waits = []  # deadlines passed to sleep_until()
+
+    def now(self):
+        """Get the current session time
+
+        Returns:
+            float: Seconds since the clock was created
+        """
+        return self.t
+
+    def sleep_until(self, t, spin=SPIN_THRESHOLD):
+        """Jump to a session time, plus the lateness
+
+        Args:
+            t (float): Session time to wait for
+            spin (float): Unused, the clock never sleeps
+        """
+        self.waits.append(t)
+        self.t = max(self.t, t + self.late)
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+
+import asyncio
+import os
+import socket
+import sys
+
+import pytest
+from pythonosc.osc_bundle import OscBundle
+from pythonosc.osc_message import OscMessage
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.murnau.utils.async_osc_client import AsyncOSCClient
+
+
+@pytest.fixture
+def receiver():
+    """Local UDP socket standing in for the synth"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.settimeout(1.0)
+    yield sock
+    sock.close()
+
+
+def receive_messages(sock, count):
+    """Receive and decode count single-message datagrams"""
+    messages = []
+    for _ in range(count):
+        msg = OscMessage(sock.recv(65536))
+        messages.append((msg.address, msg.params[0]))
+    return messages
+
+
+class TestAsyncOSCClient:
+    """Test the asyncio OSC client"""
+
+    def test_initialization(self):
+        """Settings are stored and nothing is opened before connect()"""
+        client = AsyncOSCClient("192.168.1.1", 6000, "my_synth")
+
+        assert client.ip == "192.168.1.1"
+        assert client.port == 6000
+        assert client.synth_name == "my_synth"
+        assert client.transport is None
+
+    def test_send_prefixes_synth_name(self, receiver):
+        """send() adds the synth name like OSCClient.send"""
+        port = receiver.getsockname()[1]
+
+        async def run():
+            async with AsyncOSCClient("127.0.0.1", port, "test_synth") as client:
+                client.send("/freq", 440.0)
+                client.send("/freq", 220.0)
+
+        asyncio.run(run())
+
+        assert receive_messages(receiver, 2) == [
+            ("/test_synth/freq", 440.0),
+            ("/test_synth/freq", 220.0),
+        ]
+
+    def test_send_types_match_osc_client(self, receiver):
+        """Numbers go out as floats and strings keep their type"""
+        port = receiver.getsockname()[1]
+
+        async def run():
+            async with AsyncOSCClient("127.0.0.1", port, "test_synth") as client:
+                client.send("/gate", 1)
+                client.send("/preset", "warm")
+
+        asyncio.run(run())
+
+        gate, preset = receive_messages(receiver, 2)
+        assert gate == ("/test_synth/gate", 1.0)
+        assert isinstance(gate[1], float)
+        assert preset == ("/test_synth/preset", "warm")
+
+    def test_send_raw(self, receiver):
+        """send_raw() uses the address as given and keeps the value type"""
+        port = receiver.getsockname()[1]
+
+        async def run():
+            async with AsyncOSCClient("127.0.0.1", port) as client:
+                client.send_raw("/custom/address", 3)
+
+        asyncio.run(run())
+
+        assert receive_messages(receiver, 1) == [("/custom/address", 3)]
+
+    def test_send_batch(self, receiver):
+        """send_batch() sends one bundle with prefixed addresses"""
+        port = receiver.getsockname()[1]
+
+        async def run():
+            async with AsyncOSCClient("127.0.0.1", port, "s") as client:
+                return client.send_batch([("/gain", 0.5), ("/cutoff_L", 1000)])
+
+        assert asyncio.run(run()) == 1
+
+        bundle = OscBundle(receiver.recv(65536))
+        assert [(msg.address, msg.params[0]) for msg in bundle] == [
+            ("/s/gain", 0.5),
+            ("/s/cutoff_L", 1000.0),
+        ]
+
+    def test_set_synth_name(self, receiver):
+        """Changing the synth name changes the prefix of cached addresses"""
+        port = receiver.getsockname()[1]
+
+        async def run():
+            async with AsyncOSCClient("127.0.0.1", port, "one") as client:
+                client.send("/gate", 1.0)
+                client.set_synth_name("two")
+                client.send("/gate", 0.0)
+
+        asyncio.run(run())
+
+        assert receive_messages(receiver, 2) == [
+            ("/one/gate", 1.0),
+            ("/two/gate", 0.0),
+        ]
+
+    def test_close_is_idempotent(self):
+        """Closing twice or without connecting is harmless"""
+
+        async def run():
+            client = AsyncOSCClient("127.0.0.1", 9)
+            await client.close()
+            await client.connect()
+            await client.close()
+            await client.close()
+            return client.transport
+
+        assert asyncio.run(run()) is None
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+
+import json
+import os
+import sys
+from unittest.mock import Mock
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.murnau.dsp.schema import Control
+from src.murnau.utils.cc_routing import (
+    CC_COUNT,
+    Binding,
+    CCRoutingTable,
+    MidiMapStore,
+    binding_values,
+    compile_curve,
+    load_cc_map,
+    save_cc_map,
+)
+
+
+def make_table(*names):
+    return CCRoutingTable({name: Mock(name=name) for name in names})
+
+
+class TestCCRoutingTable:
+    """Test the 128-slot CC routing table"""
+
+    def test_dispatch_calls_routed_target(self):
+        table = make_table("cutoff_L", "gain")
+        table.assign("cutoff_L", 74)
+
+        assert table.dispatch(74, 100) == 1
+        table.targets["cutoff_L"].assert_called_once_with(100)
+        table.targets["gain"].assert_not_called()
+
+    def test_unrouted_cc_is_ignored(self):
+        table = make_table("gain")
+
+        assert all(table.dispatch(cc, 64) == 0 for cc in range(CC_COUNT))
+
+    def test_one_to_many_route(self):
+        """set_route() drives several targets without a collision"""
+        table = make_table("cutoff_L", "cutoff_R")
+        table.set_route(74, ["cutoff_L", "cutoff_R"])
+
+        assert table.dispatch(74, 10) == 2
+        table.targets["cutoff_L"].assert_called_once_with(10)
+        table.targets["cutoff_R"].assert_called_once_with(10)
+        assert table.collisions() == {}
+
+    def test_assign_onto_used_cc_is_a_collision(self):
+        """Both targets still fire, and the CC is reported"""
+        table = make_table("cutoff_L", "attack_R")
+        table.assign("cutoff_L", 74)
+
+        assert table.assign("attack_R", 74) == ["cutoff_L"]
+        assert table.collisions() == {74: ["cutoff_L", "attack_R"]}
+        assert table.dispatch(74, 1) == 2
+
+    def test_reassign_moves_target(self):
+        """A target lives on one CC after assign(), resolving the collision"""
+        table = make_table("cutoff_L", "attack_R")
+        table.assign("cutoff_L", 74)
+        table.assign("attack_R", 74)
+
+        table.assign("attack_R", 78)
+
+        assert table.collisions() == {}
+        assert table.routes() == {74: ["cutoff_L"], 78: ["attack_R"]}
+        assert table.ccs_for("attack_R") == [78]
+
+    def test_unassign(self):
+        table = make_table("gain")
+        table.assign("gain", 7)
+        table.unassign("gain")
+
+        assert table.routes() == {}
+        assert table.dispatch(7, 1) == 0
+
+    def test_invalid_routes_rejected(self):
+        table = make_table("gain")
+
+        with pytest.raises(ValueError, match="out of range"):
+            table.assign("gain", 128)
+        with pytest.raises(ValueError, match="Unknown CC target"):
+            table.set_route(7, ["volume"])
+
+    def test_rebuild_swaps_slots(self):
+        """A remap replaces the slot table instead of editing it in place"""
+        table = make_table("gain")
+        slots = table._slots
+        table.assign("gain", 7)
+
+        assert table._slots is not slots
+        assert slots[7] == ()
+
+    def test_learn_replaces_cc_and_old_binding(self):
+        table = make_table("cutoff_L", "gain")
+        table.set_route(74, [Binding("cutoff_L", "exp")])
+        table.assign("gain", 7)
+
+        dropped = table.learn("cutoff_L", 7)
+
+        assert dropped == ["gain"]
+        assert table.bindings() == {7: [Binding("cutoff_L", "exp")]}
+        assert table.collisions() == {}
+
+    def test_shaped_binding_uses_compiled_curve(self):
+        table = make_table("cutoff_L")
+        table.set_route(74, [Binding("cutoff_L", "exp", 0.0, 0.5)])
+
+        table.dispatch(74, 127)
+        table.dispatch(74, 0)
+
+        calls = table.targets["cutoff_L"].call_args_list
+        assert calls[0].args[0] == pytest.approx(63.5)
+        assert calls[1].args[0] == 0.0
+
+    def test_dispatch_fine_interpolates(self):
+        table = make_table("cutoff_L", "gain")
+        table.set_route(74, ["cutoff_L"])
+        table.set_route(7, [Binding("gain", "linear", 1.0, 0.0)])
+
+        table.dispatch_fine(74, (64 << 7) | 64)
+        table.dispatch_fine(74, 8192)
+        table.dispatch_fine(7, 16383)
+
+        calls = table.targets["cutoff_L"].call_args_list
+        assert calls[0].args[0] == 64
+        assert 63.5 < calls[1].args[0] < 64
+        assert table.targets["gain"].call_args.args[0] == pytest.approx(0.0)
+
+    def test_hires_pairs_follow_routes(self):
+        """Routed MSBs pair with their LSB unless the LSB is routed itself"""
+        table = make_table("cutoff_L", "gain", "sustain_R")
+        table.set_route(16, ["cutoff_L"])
+        table.set_route(7, ["gain"])
+        table.set_route(74, ["cutoff_L", "gain"])
+        assert table.hires_pairs == {7, 16}
+
+        table.set_route(39, ["sustain_R"])
+        assert table.hires_pairs == {16}
+
+
+class TestCompileCurve:
+    """Test precomputed scaling curves"""
+
+    def test_linear_passes_value_through(self):
+        assert compile_curve() == tuple(range(CC_COUNT))
+
+    def test_curves(self):
+        exp = compile_curve("exp")
+        log = compile_curve("log")
+        inverted = compile_curve("linear", 1.0, 0.0)
+
+        assert len(exp) == CC_COUNT
+        assert exp[64] < 64 < log[64]
+        assert exp[127] == pytest.approx(127.0)
+        assert inverted[0] == 127.0 and inverted[127] == 0.0
+
+
+class TestBindingValues:
+    """Test bindings compiled to DSP parameter values"""
+
+    CONTROLS = {
+        "/gain": Control("gain", "/gain", 1.0, 0.0, 1.0, 0.0),
+        "/wave_type": Control("wave", "/wave_type", 0.0, 0.0, 3.0, 1.0),
+    }
+
+    def test_scaled_and_quantized(self):
+        ((address, values),) = binding_values("wave_type", self.CONTROLS)
+
+        assert address == "/wave_type"
+        assert set(values) == {0.0, 1.0, 2.0, 3.0}
+
+    def test_several_bindings(self):
+        slots = binding_values(
+            [Binding("gain", "linear", 1.0, 0.0), "wave_type"], self.CONTROLS
+        )
+
+        assert [address for address, _ in slots] == ["/gain", "/wave_type"]
+        assert slots[0][1][0] == 1.0 and slots[0][1][127] == 0.0
+
+    def test_unknown_target_rejected(self):
+        with pytest.raises(ValueError, match="Unknown CC automation target"):
+            binding_values(Binding("cutoff_L"), self.CONTROLS)
+
+
+class TestLoadCCMap:
+    """Test CC mapping files"""
+
+    def test_load_file(self, tmp_path):
+        path = tmp_path / "map.json"
+        path.write_text(json.dumps({"74": ["cutoff_L", "cutoff_R"], "7": "gain"}))
+
+        mapping = load_cc_map(str(path))
+        table = make_table("cutoff_L", "cutoff_R", "gain")
+        table.load(mapping)
+
+        assert mapping == {
+            74: [Binding("cutoff_L"), Binding("cutoff_R")],
+            7: [Binding("gain")],
+        }
+        assert table.routes() == {7: ["gain"], 74: ["cutoff_L", "cutoff_R"]}
+        assert table.collisions() == {}
+
+    def test_invalid_file(self, tmp_path):
+        path = tmp_path / "map.json"
+        path.write_text(json.dumps({"cutoff": "gain"}))
+
+        with pytest.raises(ValueError, match="Invalid CC number"):
+            load_cc_map(str(path))
+
+    def test_unknown_curve(self, tmp_path):
+        path = tmp_path / "map.json"
+        path.write_text(json.dumps({"7": {"target": "gain", "curve": "cubic"}}))
+
+        with pytest.raises(ValueError, match="Unknown CC curve"):
+            load_cc_map(str(path))
+
+    def test_save_round_trip(self, tmp_path):
+        path = tmp_path / "maps" / "map.json"
+        mapping = {7: [Binding("gain")], 74: [Binding("cutoff_L", "log", 0.2, 0.8)]}
+
+        save_cc_map(str(path), mapping)
+
+        data = json.loads(path.read_text())
+        assert data["7"] == ["gain"]
+        assert data["74"][0]["curve"] == "log"
+        assert load_cc_map(str(path)) == mapping
+
+
+class TestMidiMapStore:
+    """Test per-device map files"""
+
+    def test_device_without_map(self, tmp_path):
+        store = MidiMapStore(str(tmp_path))
+        assert store.load("nanoKONTROL2 MIDI 1") is None
+
+    def test_save_and_load_device(self, tmp_path):
+        store = MidiMapStore(str(tmp_path))
+        store.save("nanoKONTROL2:MIDI 1 20:0", {16: [Binding("gain")]})
+
+        assert store.path_for("nanoKONTROL2:MIDI 1 20:0") == os.path.join(
+            str(tmp_path), "nanoKONTROL2_MIDI_1_20_0.json"
+        )
+        assert store.load("nanoKONTROL2:MIDI 1 20:0") == {16: [Binding("gain")]}
+        assert store.load("Other Device") is None
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.murnau.utils.clock import OnsetStats, SessionClock, onset_report
+
+
+class TestSessionClock:
+    """Test the monotonic session clock"""
+
+    def test_now_starts_near_zero(self):
+        """Session time counts from creation"""
+        clock = SessionClock()
+
+        assert 0.0 <= clock.now() < 0.1
+
+    def test_to_unix(self):
+        """Session times map onto the wall clock at creation"""
+        clock = SessionClock()
+
+        assert clock.to_unix(2.0) == clock.wall_origin + 2.0
+
+    def test_sleep_until_reaches_deadline(self):
+        """sleep_until() never returns early"""
+        clock = SessionClock()
+        deadline = clock.now() + 0.01
+
+        clock.sleep_until(deadline)
+
+        assert clock.now() >= deadline
+
+    @patch("src.murnau.utils.clock.time.sleep")
+    def test_sleep_until_past_deadline(self, mock_sleep):
+        """Past deadlines return at once without sleeping"""
+        clock = SessionClock()
+
+        clock.sleep_until(clock.now() - 1.0)
+
+        mock_sleep.assert_not_called()
+
+
+class TestOnsetReport:
+    """Test onset error summaries"""
+
+    def test_report(self):
+        """Errors are summarized in milliseconds"""
+        report = onset_report([0.0, 1.0, 2.0, 3.0], [0.001, 1.0, 2.003, 2.998])
+
+        assert report["events"] == 4
+        assert report["mean_ms"] == pytest.approx(1.5)
+        assert report["max_ms"] == pytest.approx(3.0)
+        assert report["p95_ms"] == pytest.approx(3.0)
+        assert report["drift_ms"] == pytest.approx(-3.0)
+
+    def test_empty_report(self):
+        """No events means no error"""
+        assert onset_report([], [])["events"] == 0
+
+
+class TestOnsetStats:
+    """Test the constant-memory onset report"""
+
+    def test_matches_onset_report(self):
+        requested = [0.0, 1.0, 2.0, 3.0]
+        actual = [0.001, 1.002, 2.001, 3.004]
+        stats = OnsetStats()
+        for r, a in zip(requested, actual):
+            stats.add(r, a)
+
+        report = stats.report()
+        expected = onset_report(requested, actual)
+
+        for key in ("events", "mean_ms", "max_ms", "drift_ms"):
+            assert report[key] == pytest.approx(expected[key])
+        assert report["p95_ms"] == pytest.approx(expected["p95_ms"], rel=0.1)
+
+    def test_empty(self):
+        assert OnsetStats().report()["events"] == 0
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+from unittest.mock import Mock, call
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.murnau.utils.coalescer import CoalescingSender
+
+
+class TestCoalescingSender:
+    """Test the coalescing parameter sender"""
+
+    def test_first_update_is_sent_immediately(self):
+        """The first value for an address in a period goes straight out"""
+        send = Mock()
+        sender = CoalescingSender(send)
+
+        sender.submit("/cutoff_L", 1000)
+
+        send.assert_called_once_with("/cutoff_L", 1000)
+        assert sender.sent == 1
+
+    def test_intermediate_values_are_dropped(self):
+        """Only the latest held value is sent on flush"""
+        send = Mock()
+        sender = CoalescingSender(send)
+
+        for value in range(10):
+            sender.submit("/cutoff_L", value)
+        sent = sender.flush()
+
+        assert sent == 1
+        assert send.call_args_list == [call("/cutoff_L", 0), call("/cutoff_L", 9)]
+        assert sender.sent == 2
+        assert sender.coalesced == 8
+
+    def test_addresses_are_independent(self):
+        """Each address has its own rate limit window"""
+        send = Mock()
+        sender = CoalescingSender(send)
+
+        sender.submit("/cutoff_L", 1)
+        sender.submit("/cutoff_R", 2)
+
+        assert send.call_count == 2
+
+    def test_flushed_address_stays_limited_until_next_tick(self):
+        """An address flushed on a tick cannot send again in that period"""
+        send = Mock()
+        sender = CoalescingSender(send)
+
+        sender.submit("/gain", 0.1)
+        sender.submit("/gain", 0.2)
+        sender.flush()
+        sender.submit("/gain", 0.3)
+
+        assert send.call_count == 2
+        sender.flush()
+        send.assert_called_with("/gain", 0.3)
+
+        # A quiet period re-opens the window for an immediate send
+        sender.flush()
+        sender.submit("/gain", 0.4)
+        send.assert_called_with("/gain", 0.4)
+
+    def test_flush_with_nothing_pending(self):
+        """Empty flushes send nothing"""
+        send = Mock()
+        sender = CoalescingSender(send)
+
+        assert sender.flush() == 0
+        send.assert_not_called()
+
+    def test_bypass_addresses(self):
+        """Gate and freq are never coalesced"""
+        send = Mock()
+        sender = CoalescingSender(send)
+
+        for _ in range(3):
+            sender.submit("/gate", 1.0)
+            sender.submit("/freq", 440.0)
+
+        assert send.call_count == 6
+        assert sender.bypassed == 6
+        assert sender.coalesced == 0
+
+    def test_custom_rate_and_bypass(self):
+        """Rate and bypass set are configurable"""
+        send = Mock()
+        sender = CoalescingSender(send, rate=100.0, bypass=("/wave_type",))
+
+        assert sender.interval == 0.01
+        sender.submit("/wave_type", 1)
+        sender.submit("/wave_type", 2)
+        assert send.call_count == 2
+
+    def test_merge_folds_held_values(self):
+        """A merge function combines updates instead of keeping the latest"""
+        send = Mock()
+        sender = CoalescingSender(send, merge=lambda held, value: held + value)
+
+        for value in ([1], [2], [3]):
+            sender.submit("/voice", value)
+        sender.flush()
+
+        assert send.call_args_list == [call("/voice", [1]), call("/voice", [2, 3])]
+
+    def test_discard_drops_held_value(self):
+        """A discarded address sends nothing on the next tick"""
+        send = Mock()
+        sender = CoalescingSender(send)
+        sender.submit("/gain", 0.1)
+        sender.submit("/gain", 0.2)
+
+        sender.discard("/gain")
+
+        assert sender.flush() == 0
+        send.assert_called_once_with("/gain", 0.1)
+
+    def test_stats(self):
+        """Counters are exposed together"""
+        sender = CoalescingSender(Mock())
+        sender.submit("/gain", 0.1)
+        sender.submit("/gain", 0.2)
+        sender.submit("/gain", 0.3)
+        sender.submit("/gate", 1.0)
+
+        assert sender.stats() == {"sent": 1, "coalesced": 1, "bypassed": 1}
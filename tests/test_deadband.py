@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+from unittest.mock import Mock, call
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.murnau.utils.deadband import DeadbandFilter, step_decimals
+
+STEPS = {"/cutoff_L": 1.0, "/sustain_L": 0.01, "/attack_L": 0.001}
+
+
+class TestDeadbandFilter:
+    """Test dead-band suppression of redundant parameter sends"""
+
+    def test_values_are_quantized_to_step(self):
+        """Values are rounded to the declared step"""
+        send = Mock()
+        band = DeadbandFilter(send, STEPS)
+
+        band.submit("/cutoff_L", 1000.4)
+        band.submit("/sustain_L", 0.456)
+        band.submit("/attack_L", 0.0123)
+
+        assert send.call_args_list == [
+            call("/cutoff_L", 1000.0),
+            call("/sustain_L", 0.46),
+            call("/attack_L", 0.012),
+        ]
+
+    def test_unchanged_quantized_value_is_suppressed(self):
+        """Slow movements inside one step send only once"""
+        send = Mock()
+        band = DeadbandFilter(send, STEPS)
+
+        for value in (1000.0, 1000.2, 1000.4, 999.8, 1000.6):
+            band.submit("/cutoff_L", value)
+
+        assert send.call_args_list == [
+            call("/cutoff_L", 1000.0),
+            call("/cutoff_L", 1001.0),
+        ]
+        assert band.stats() == {"passed": 2, "suppressed": 3}
+
+    def test_submit_reports_whether_sent(self):
+        """submit() returns False for suppressed updates"""
+        band = DeadbandFilter(Mock(), STEPS)
+
+        assert band.submit("/sustain_L", 0.5) is True
+        assert band.submit("/sustain_L", 0.501) is False
+
+    def test_quantized_values_have_no_float_noise(self):
+        """Multiples of decimal steps come out as clean decimals"""
+        band = DeadbandFilter(Mock(), STEPS)
+
+        assert band.quantize("/sustain_L", 0.3) == 0.3
+        assert band.quantize("/sustain_L", 0.7000001) == 0.7
+
+    def test_unknown_addresses_pass_through(self):
+        """Addresses without a step are neither quantized nor suppressed"""
+        send = Mock()
+        band = DeadbandFilter(send, STEPS)
+
+        band.submit("/freq", 440.123)
+        band.submit("/freq", 440.123)
+
+        assert send.call_args_list == [call("/freq", 440.123)] * 2
+
+    def test_reset(self):
+        """After a reset the same value is sent again"""
+        send = Mock()
+        band = DeadbandFilter(send, STEPS)
+
+        band.submit("/cutoff_L", 500)
+        band.reset()
+        band.submit("/cutoff_L", 500)
+
+        assert send.call_count == 2
+
+    def test_step_decimals(self):
+        """Decimal places follow the step size"""
+        assert step_decimals(1) == 0
+        assert step_decimals(0.1) == 1
+        assert step_decimals(0.01) == 2
+        assert step_decimals(0.001) == 3
+        assert step_decimals(0.25) == 2
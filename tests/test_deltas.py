@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import threading
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.murnau.utils.deltas import DeltaQueue
+
+
+class TestDeltaQueue:
+    """Test the per-frame display delta mailbox"""
+
+    def test_take_returns_latest_value_per_target(self):
+        """Repeated posts to a target keep only the last value"""
+        deltas = DeltaQueue()
+        deltas.post("cutoff", 0.1)
+        deltas.post(60, 100)
+        deltas.post("cutoff", 0.2)
+
+        assert deltas.take() == [("cutoff", 0.2), (60, 100)]
+        assert deltas.stats() == {"posted": 3, "coalesced": 1, "frames": 1}
+
+    def test_take_empties_queue(self):
+        """A frame with nothing posted applies nothing"""
+        deltas = DeltaQueue()
+        deltas.post("gain", 1.0)
+        deltas.take()
+
+        assert len(deltas) == 0
+        assert deltas.take() == []
+        assert deltas.frames == 1
+
+    def test_concurrent_posts(self):
+        """Posts from several threads are all counted and coalesced"""
+        deltas = DeltaQueue()
+
+        def producer(target):
+            for value in range(1000):
+                deltas.post(target, value)
+
+        threads = [threading.Thread(target=producer, args=(t,)) for t in "abcd"]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(deltas.take()) == [(t, 999) for t in "abcd"]
+        assert deltas.posted == 4000
+        assert deltas.coalesced == 3996
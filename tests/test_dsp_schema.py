@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.murnau.dsp.schema import load_controls, parse_controls, step_table
+
+
+class TestParseControls:
+    """Test parsing Faust control declarations"""
+
+    def test_parse_hslider_with_osc_address(self):
+        """Sliders are keyed by their OSC metadata address"""
+        source = 'gain = hslider("gain[osc:/gain]", 1.0, 0, 1, 0.01);'
+
+        controls = parse_controls(source)
+
+        control = controls["/gain"]
+        assert control.name == "gain"
+        assert (control.init, control.min, control.max, control.step) == (
+            1.0,
+            0.0,
+            1.0,
+            0.01,
+        )
+
+    def test_parse_nentry_and_negative_ranges(self):
+        """Number entries and negative bounds are understood"""
+        source = """
+            wave = nentry("wave_type[osc:/wave_type]", 2, 0, 3, 1) : int;
+            tune = hslider("coarse_tune[osc:/coarse]", 0, -24, 24, 1);
+        """
+
+        controls = parse_controls(source)
+
+        assert controls["/wave_type"].step == 1.0
+        assert controls["/coarse"].min == -24.0
+        assert controls["/coarse"].name == "coarse_tune"
+
+    def test_address_defaults_to_label(self):
+        """Controls without osc metadata use their label as address"""
+        controls = parse_controls('v = vslider("volume[style:knob]", 0, 0, 1, 0.1);')
+
+        assert list(controls) == ["/volume"]
+
+    def test_buttons_are_ignored(self):
+        """Buttons have no range and are not part of the step table"""
+        controls = parse_controls('gate = button("gate[osc:/gate]");')
+
+        assert controls == {}
+
+    def test_step_table_skips_continuous_controls(self):
+        """Zero-step controls are left out of the step table"""
+        controls = parse_controls(
+            'a = hslider("a", 0, 0, 1, 0); b = hslider("b", 0, 0, 1, 0.5);'
+        )
+
+        assert step_table(controls) == {"/b": 0.5}
+
+
+class TestLegatoSynthSchema:
+    """Test the schema of the bundled legato synth"""
+
+    def test_declared_steps(self):
+        """Steps match the legato_synth.dsp declarations"""
+        steps = step_table(load_controls("legato_synth"))
+
+        assert steps["/cutoff_L"] == 1
+        assert steps["/sustain_L"] == 0.01
+        assert steps["/coarse_tune"] == 1
+        assert steps["/attack_R"] == 0.001
+        assert steps["/wave_type"] == 1
+        assert "/gate" not in steps
+
+    def test_all_ui_parameters_are_declared(self):
+        """Every parameter the UI sends has a declared control"""
+        controls = load_controls("legato_synth")
+
+        for address in (
+            "/gain",
+            "/attack_L",
+            "/release_R",
+            "/resonance_L",
+            "/fine_tune",
+            "/stability",
+            "/start_freq_offset",
+            "/end_freq_offset",
+            "/ramp_time",
+            "/freq",
+        ):
+            assert address in controls
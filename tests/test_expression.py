@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import threading
+import time
+from unittest.mock import ANY, Mock, call
+
+import mido
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.murnau.utils.cc_routing import Binding
+from src.murnau.utils.expression import (
+    LOWER_MASTER,
+    PRESSURE,
+    TIMBRE,
+    UPPER_MASTER,
+    ExpressionRouter,
+)
+from src.murnau.utils.voices import PolySynth
+
+# Simple maps keep the expected values readable
+PRESSURE_MAP = {PRESSURE: "sustain_L", TIMBRE: Binding("gain", "linear", 0.0, 0.5)}
+
+
+def make_router(voices=4, zones=None, expression_map=PRESSURE_MAP):
+    """Router over a pool whose instances are batch sender mocks"""
+    batches = [Mock() for _ in range(voices)]
+    poly = PolySynth([Mock() for _ in range(voices)], batch_senders=batches)
+    return ExpressionRouter(poly, expression_map, zones=zones), batches
+
+
+def note_on(note, channel=0):
+    return mido.Message("note_on", note=note, velocity=100, channel=channel)
+
+
+class TestPolyAftertouch:
+    """Test pressure routed by note outside MPE"""
+
+    def test_pressure_goes_to_owning_voice(self):
+        router, batches = make_router()
+        router.handle(note_on(60))
+        router.handle(note_on(64))
+
+        assert router.handle(mido.Message("polytouch", note=64, value=127))
+
+        batches[0].assert_not_called()
+        batches[1].assert_called_once_with([("/sustain_L", 1.0)])
+
+    def test_curves_scale_to_control_range(self):
+        router, batches = make_router()
+        router.handle(note_on(60))
+
+        router.handle(mido.Message("polytouch", note=60, value=0))
+        router.flush()
+        router.flush()
+        router.handle(mido.Message("control_change", control=74, value=127))
+
+        # CC 74 outside MPE is left to the CC routing
+        assert batches[0].call_args.args[0] == [("/sustain_L", 0.0)]
+
+    def test_unplayed_note_ignored(self):
+        router, batches = make_router()
+
+        assert router.handle(mido.Message("polytouch", note=60, value=50))
+        assert all(not batch.called for batch in batches)
+
+    def test_channel_pressure_presses_every_note(self):
+        router, batches = make_router()
+        router.handle(note_on(60))
+        router.handle(note_on(64))
+
+        router.handle(mido.Message("aftertouch", value=127))
+
+        for batch in batches[:2]:
+            batch.assert_called_once_with([("/sustain_L", 1.0)])
+        batches[2].assert_not_called()
+
+    def test_default_map(self):
+        batch = Mock()
+        router = ExpressionRouter(PolySynth([Mock()], batch_senders=[batch]))
+        router.handle(note_on(60))
+
+        router.handle(mido.Message("polytouch", note=60, value=0))
+
+        # Pressure keeps some level at rest
+        ((address, value),) = batch.call_args.args[0]
+        assert address == "/gain"
+        assert value == pytest.approx(0.3)
+
+
+class TestMpe:
+    """Test MPE zones and member channel expression"""
+
+    def test_member_channels_address_their_note(self):
+        router, batches = make_router(zones={LOWER_MASTER: 15})
+        router.handle(note_on(60, channel=1))
+        router.handle(note_on(60 + 4, channel=2))
+
+        router.handle(mido.Message("aftertouch", value=127, channel=2))
+        router.handle(mido.Message("control_change", control=74, value=127, channel=1))
+
+        batches[0].assert_called_once_with([("/gain", 0.5)])
+        batches[1].assert_called_once_with([("/sustain_L", 1.0)])
+
+    def test_master_channel_left_to_cc_routing(self):
+        router, _ = make_router(zones={LOWER_MASTER: 15})
+
+        assert not router.handle(mido.Message("control_change", control=74, value=1))
+        assert not router.handle(mido.Message("pitchwheel", pitch=100, channel=1))
+
+    def test_note_off_forgets_channel(self):
+        router, batches = make_router(zones={LOWER_MASTER: 15})
+        router.handle(note_on(60, channel=1))
+        router.handle(mido.Message("note_off", note=60, channel=1))
+
+        router.handle(mido.Message("aftertouch", value=127, channel=1))
+
+        batches[0].assert_not_called()
+
+    def test_configuration_message(self):
+        router, _ = make_router()
+        for control, value in ((101, 0), (100, 6), (6, 7)):
+            handled = router.handle(
+                mido.Message("control_change", control=control, value=value)
+            )
+
+        assert handled
+        assert router.zones == {LOWER_MASTER: 7, UPPER_MASTER: 0}
+
+        # Other RPNs on the master channel, e.g. bend range, are not the router's
+        router.handle(mido.Message("control_change", control=100, value=0))
+        assert not router.handle(mido.Message("control_change", control=6, value=2))
+
+    def test_overlapping_zone_shrinks_the_other(self):
+        router, batches = make_router(zones={LOWER_MASTER: 15})
+
+        router.configure_zone(UPPER_MASTER, 4)
+
+        assert router.zones == {LOWER_MASTER: 10, UPPER_MASTER: 4}
+        router.handle(note_on(60, channel=11))
+        router.handle(mido.Message("aftertouch", value=127, channel=11))
+        batches[0].assert_called_once_with([("/sustain_L", 1.0)])
+
+    def test_invalid_zone(self):
+        router, _ = make_router()
+        with pytest.raises(ValueError, match="Not an MPE master channel"):
+            router.configure_zone(3, 4)
+        with pytest.raises(ValueError, match="member channel count"):
+            router.configure_zone(LOWER_MASTER, 16)
+
+
+class TestCoalescing:
+    """Test the per-voice packet budget"""
+
+    def test_updates_within_a_period_are_held(self):
+        router, batches = make_router(zones={LOWER_MASTER: 15})
+        router.handle(note_on(60, channel=1))
+
+        for value in (10, 20, 127):
+            router.handle(mido.Message("aftertouch", value=value, channel=1))
+        router.handle(mido.Message("control_change", control=74, value=127, channel=1))
+        assert batches[0].call_count == 1
+
+        assert router.flush() == 1
+        # Both dimensions in one packet, the latest pressure only
+        assert batches[0].call_args.args[0] == [("/sustain_L", 1.0), ("/gain", 0.5)]
+        # The latest pressure and the timbre were folded into the held packet
+        assert router.stats() == {"packets": 2, "coalesced": 2}
+        assert router.flush() == 0
+
+    def test_new_note_drops_held_values(self):
+        router, batches = make_router(voices=1)
+        router.handle(note_on(60))
+        router.handle(mido.Message("polytouch", note=60, value=0))
+        router.handle(mido.Message("polytouch", note=60, value=127))
+
+        # The next note steals the voice, the held pressure was not its own
+        router.handle(note_on(64))
+
+        assert router.flush() == 0
+        assert batches[0].call_count == 1
+
+    def test_notes_wait_for_a_running_flush(self):
+        """A note cannot take a voice while its held values go out"""
+        gate = Mock()
+        during_flush = []
+
+        def send(address, value):
+            if address == "/sustain_L" and value == 1.0:
+                steal.start()
+                time.sleep(0.05)
+                during_flush.append(gate.call_count)
+            gate(address, value)
+
+        router = ExpressionRouter(PolySynth([send]), PRESSURE_MAP)
+        steal = threading.Thread(target=router.handle, args=(note_on(64),))
+        router.handle(note_on(60))
+        router.handle(mido.Message("polytouch", note=60, value=0))
+        router.handle(mido.Message("polytouch", note=60, value=127))
+        router.flush()
+        steal.join()
+
+        # The steal only started after the held pressure was sent
+        assert during_flush == [3]
+        assert gate.call_args_list[-3:] == [
+            call("/gate", 0.0),
+            call("/freq", ANY),
+            call("/gate", 1.0),
+        ]
+
+    def test_all_notes_off_drops_held_values(self):
+        router, batches = make_router(voices=2)
+        router.handle(note_on(60))
+        router.handle(mido.Message("polytouch", note=60, value=0))
+        router.handle(mido.Message("polytouch", note=60, value=127))
+
+        router.all_notes_off()
+
+        assert router.flush() == 0
+        assert batches[0].call_count == 1
+
+    def test_ten_finger_stream_stays_in_budget(self):
+        """Dense MPE pressure and timbre from ten fingers over one second"""
+        fingers = 10
+        rate = 200
+        router, batches = make_router(voices=fingers, zones={LOWER_MASTER: 15})
+        for finger in range(fingers):
+            router.handle(note_on(48 + finger, channel=finger + 1))
+
+        # Every finger sends pressure and timbre at 1 kHz
+        messages = []
+        for step in range(1000):
+            for finger in range(fingers):
+                channel = finger + 1
+                value = (step + finger) % 128
+                messages.append(
+                    mido.Message("aftertouch", value=value, channel=channel)
+                )
+                messages.append(
+                    mido.Message(
+                        "control_change", control=74, value=value, channel=channel
+                    )
+                )
+
+        start = time.perf_counter()
+        per_tick = len(messages) // rate
+        for offset in range(0, len(messages), per_tick):
+            for message in messages[offset : offset + per_tick]:
+                router.handle(message)
+            router.flush()
+        elapsed = time.perf_counter() - start
+
+        packets = sum(batch.call_count for batch in batches)
+        # One packet per voice per period, and the closing flush
+        assert packets <= router.packet_budget(rate) + fingers
+        assert router.stats()["coalesced"] > len(messages) * 0.75
+        # Every voice ends on its finger's last values
+        last = (999 + fingers - 1) % 128
+        address, value = batches[-1].call_args.args[0][0]
+        assert address == "/sustain_L"
+        assert value == pytest.approx(last / 127, abs=0.005)
+        # Far above the 20,000 messages per second of the stream
+        assert len(messages) / elapsed > 40000
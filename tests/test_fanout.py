@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+
+import os
+import socket
+import sys
+from unittest.mock import Mock
+
+import pytest
+from pythonosc.osc_bundle import OscBundle
+from pythonosc.osc_message import OscMessage
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.murnau.utils.fanout import FanoutOSCClient
+from src.murnau.utils.transport import TransportRegistry
+
+
+@pytest.fixture
+def receivers():
+    """Three local UDP sockets standing in for synth instances"""
+    socks = []
+    for _ in range(3):
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.bind(("127.0.0.1", 0))
+        sock.settimeout(1.0)
+        socks.append(sock)
+    yield socks
+    for sock in socks:
+        sock.close()
+
+
+def port_of(sock):
+    return sock.getsockname()[1]
+
+
+def receive_message(sock):
+    """Receive and decode one single-message datagram"""
+    msg = OscMessage(sock.recv(65536))
+    return msg.address, msg.params[0]
+
+
+def assert_nothing_received(sock):
+    sock.settimeout(0.05)
+    with pytest.raises(socket.timeout):
+        sock.recv(65536)
+
+
+class TestFanoutOSCClient:
+    """Test the multi-destination OSC client"""
+
+    def test_send_reaches_every_destination(self, receivers):
+        """One send() is delivered to all destinations with the synth prefix"""
+        client = FanoutOSCClient(
+            [("127.0.0.1", port_of(s)) for s in receivers], "test_synth"
+        )
+
+        assert client.send("/freq", 440.0) == 3
+        for sock in receivers:
+            assert receive_message(sock) == ("/test_synth/freq", 440.0)
+        client.close()
+
+    def test_destinations_share_pooled_socket(self, receivers):
+        """Destinations of the same address family share one pooled socket"""
+        registry = TransportRegistry()
+        client = FanoutOSCClient(
+            [("127.0.0.1", port_of(s)) for s in receivers], registry=registry
+        )
+
+        assert len({id(t._sock) for t in client._targets}) == 1
+        client.send("/gate", 1.0)
+        assert [s["datagrams"] for s in registry.stats().values()] == [1, 1, 1]
+        registry.close()
+
+    def test_add_destination_at_runtime(self, receivers):
+        """A destination added later receives the following sends"""
+        first, second = receivers[:2]
+        client = FanoutOSCClient([("127.0.0.1", port_of(first))], "s")
+        client.send("/gain", 0.25)
+
+        client.add_destination("127.0.0.1", port_of(second))
+        client.send("/gain", 0.5)
+
+        assert receive_message(first) == ("/s/gain", 0.25)
+        assert receive_message(first) == ("/s/gain", 0.5)
+        assert receive_message(second) == ("/s/gain", 0.5)
+        assert_nothing_received(second)
+        client.close()
+
+    def test_remove_destination_at_runtime(self, receivers):
+        """A removed destination no longer receives anything"""
+        first, second = receivers[:2]
+        client = FanoutOSCClient(
+            [("127.0.0.1", port_of(first)), ("127.0.0.1", port_of(second))], "s"
+        )
+
+        client.remove_destination("127.0.0.1", port_of(second))
+        assert client.destinations == [("127.0.0.1", port_of(first))]
+        assert client.send("/gate", 1.0) == 1
+
+        assert receive_message(first) == ("/s/gate", 1.0)
+        assert_nothing_received(second)
+        client.close()
+
+    def test_remove_unknown_destination_is_ignored(self):
+        """Removing a destination that was never added does nothing"""
+        client = FanoutOSCClient()
+        client.remove_destination("127.0.0.1", 9)
+        assert client.destinations == []
+        assert client.send("/gate", 0.0) == 0
+        client.close()
+
+    def test_failing_destination_does_not_block_others(self):
+        """An OSError on one destination still sends to the rest"""
+        client = FanoutOSCClient()
+        bad = Mock()
+        bad.sendto.side_effect = OSError("unreachable")
+        good = Mock()
+        client._targets = (bad, good)
+
+        assert client.send("/freq", 1.0) == 1
+        good.sendto.assert_called_once()
+
+    def test_send_types_match_osc_client(self, receivers):
+        """Ints go out as floats, strings keep their OSC type"""
+        client = FanoutOSCClient([("127.0.0.1", port_of(receivers[0]))], "s")
+
+        client.send("/wave_type", 2)
+        client.send("/preset", "warm")
+
+        wave_type = receive_message(receivers[0])
+        assert wave_type == ("/s/wave_type", 2.0)
+        assert isinstance(wave_type[1], float)
+        assert receive_message(receivers[0]) == ("/s/preset", "warm")
+        client.close()
+
+    def test_send_raw(self, receivers):
+        """send_raw() uses the address as given and keeps the value type"""
+        client = FanoutOSCClient([("127.0.0.1", port_of(s)) for s in receivers[:2]])
+
+        client.send_raw("/custom/address", 3)
+
+        for sock in receivers[:2]:
+            assert receive_message(sock) == ("/custom/address", 3)
+        client.close()
+
+    def test_send_batch(self, receivers):
+        """send_batch() sends the same bundle to every destination"""
+        client = FanoutOSCClient(
+            [("127.0.0.1", port_of(s)) for s in receivers[:2]], "s"
+        )
+
+        assert client.send_batch([("/gain", 0.5), ("/cutoff_L", 1000.0)]) == 1
+
+        for sock in receivers[:2]:
+            bundle = OscBundle(sock.recv(65536))
+            assert [(m.address, m.params[0]) for m in bundle] == [
+                ("/s/gain", 0.5),
+                ("/s/cutoff_L", 1000.0),
+            ]
+        client.close()
+
+    def test_set_synth_name_clears_templates(self, receivers):
+        """Sends after set_synth_name() use the new prefix"""
+        client = FanoutOSCClient([("127.0.0.1", port_of(receivers[0]))], "old")
+        client.send("/gate", 1.0)
+        client.set_synth_name("new")
+        client.send("/gate", 0.0)
+
+        assert receive_message(receivers[0]) == ("/old/gate", 1.0)
+        assert receive_message(receivers[0]) == ("/new/gate", 0.0)
+        client.close()
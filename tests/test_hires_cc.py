@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.murnau.utils.hires_cc import (
+    CC,
+    HIRES_PAIRS,
+    MAX_14BIT,
+    NRPN,
+    RPN,
+    HighResDecoder,
+    expand_7bit,
+)
+
+
+class TestHighResDecoder:
+    """Test 14-bit CC and (N)RPN decoding"""
+
+    def test_plain_cc_is_expanded(self):
+        decoder = HighResDecoder()
+
+        assert decoder.feed(74, 0) == (CC, 74, 0)
+        assert decoder.feed(74, 127) == (CC, 74, MAX_14BIT)
+        assert decoder.feed(7, 64) == (CC, 7, expand_7bit(64))
+
+    def test_msb_lsb_pair(self):
+        decoder = HighResDecoder(HIRES_PAIRS)
+
+        assert decoder.feed(16, 64) == (CC, 16, expand_7bit(64))
+        assert decoder.feed(48, 5) == (CC, 16, (64 << 7) | 5)
+        # Once the pair is known to be 14-bit, a new MSB resets the LSB
+        assert decoder.feed(16, 65) == (CC, 16, 65 << 7)
+
+    def test_lsb_without_msb_is_dropped(self):
+        decoder = HighResDecoder(HIRES_PAIRS)
+        assert decoder.feed(48, 5) is None
+
+    def test_unpaired_lsb_controller_is_plain(self):
+        decoder = HighResDecoder()
+
+        decoder.feed(16, 64)
+        assert decoder.feed(48, 5) == (CC, 48, expand_7bit(5))
+
+    def test_pairs_per_message(self):
+        """Pairs given to feed() override the decoder's own"""
+        decoder = HighResDecoder()
+
+        decoder.feed(0, 1, pairs={16})
+        assert decoder.feed(32, 5, pairs={16}) == (CC, 32, expand_7bit(5))
+        decoder.feed(16, 64, pairs={16})
+        assert decoder.feed(48, 5, pairs={16}) == (CC, 16, (64 << 7) | 5)
+
+    def test_channels_are_independent(self):
+        decoder = HighResDecoder(HIRES_PAIRS)
+
+        decoder.feed(16, 64, channel=0)
+        assert decoder.feed(48, 5, channel=1) is None
+
+    def test_nrpn_data_entry(self):
+        decoder = HighResDecoder()
+
+        assert decoder.feed(99, 0) is None
+        assert decoder.feed(98, 74) is None
+        assert decoder.feed(6, 100) == (NRPN, 74, 100 << 7)
+        assert decoder.feed(38, 3) == (NRPN, 74, (100 << 7) | 3)
+        assert decoder.feed(96, 0) == (NRPN, 74, (100 << 7) | 4)
+        assert decoder.feed(97, 0) == (NRPN, 74, (100 << 7) | 3)
+
+    def test_rpn_and_null(self):
+        decoder = HighResDecoder()
+
+        decoder.feed(101, 0)
+        decoder.feed(100, 0)
+        assert decoder.feed(6, 2) == (RPN, 0, 2 << 7)
+
+        decoder.feed(101, 127)
+        decoder.feed(100, 127)
+        # Without a selected parameter CC 6 is an ordinary controller
+        assert decoder.feed(6, 2) == (CC, 6, expand_7bit(2))
+
+    def test_reset(self):
+        decoder = HighResDecoder(HIRES_PAIRS)
+        decoder.feed(16, 64)
+        decoder.feed(99, 0)
+
+        decoder.reset()
+
+        assert decoder.feed(48, 5) is None
+        assert decoder.feed(6, 1) == (CC, 6, expand_7bit(1))
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+from unittest.mock import Mock
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.murnau.utils.latency import (
+    Deferred,
+    LatencyHistogram,
+    LatencyMonitor,
+    current_origin,
+    origin,
+)
+
+
+class TestLatencyHistogram:
+    """Test log-bucketed latency histograms"""
+
+    def test_empty(self):
+        summary = LatencyHistogram().summary()
+        assert summary == {"count": 0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+
+    def test_percentiles_within_bucket_resolution(self):
+        histogram = LatencyHistogram()
+        for i in range(1, 1001):
+            histogram.record(i * 1e-6)  # 1 us to 1 ms
+
+        summary = histogram.summary()
+        assert summary["count"] == 1000
+        assert summary["p50"] == pytest.approx(500e-6, rel=0.1)
+        assert summary["p99"] == pytest.approx(990e-6, rel=0.1)
+        assert summary["max"] == 1000e-6
+
+    def test_extremes_are_clamped(self):
+        histogram = LatencyHistogram()
+        histogram.record(0.0)
+        histogram.record(1e6)
+
+        assert histogram.count == 2
+        assert histogram.percentile(100) == 1e6
+
+
+class TestLatencyMonitor:
+    """Test per message type latency statistics"""
+
+    def test_per_type_summary(self):
+        monitor = LatencyMonitor()
+        monitor.record("note_on", 0.001)
+        monitor.record("note_on", 0.002)
+        monitor.record("control_change", 0.0005)
+
+        summary = monitor.summary()
+        assert list(summary) == ["control_change", "note_on"]
+        assert summary["note_on"]["count"] == 2
+        assert summary["note_on"]["max"] == 0.002
+        assert "note_on p50" in monitor.format_status()
+
+        monitor.reset()
+        assert monitor.summary() == {}
+        assert monitor.format_status() == ""
+
+
+class TestOrigin:
+    """Test the per-thread MIDI origin"""
+
+    def test_origin_context(self):
+        assert current_origin() is None
+        with origin("note_on", 1.0):
+            with origin("control_change", 2.0):
+                assert current_origin() == ("control_change", 2.0)
+            assert current_origin() == ("note_on", 1.0)
+        assert current_origin() is None
+
+    def test_deferred_carries_origin_once(self):
+        seen = []
+        func = Mock(side_effect=lambda value: seen.append(current_origin()))
+        with origin("control_change", 1.0):
+            call = Deferred(func)
+
+        call(0.5)
+        call(0.6)
+
+        assert seen == [("control_change", 1.0), None]
+        func.assert_called_with(0.6)
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+
+import os
+import socket
+import sys
+import threading
+
+from pythonosc.osc_message_builder import OscMessageBuilder
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.murnau.utils.listener import OSCListener
+from src.murnau.utils.osc_client import build_bundles
+
+
+class Collector:
+    """Handler that records messages and signals after count of them"""
+
+    def __init__(self, count):
+        self.messages = []
+        self.count = count
+        self.done = threading.Event()
+
+    def __call__(self, address, args):
+        self.messages.append((address, args))
+        if len(self.messages) >= self.count:
+            self.done.set()
+
+
+def send(port, data):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.sendto(data, ("127.0.0.1", port))
+    sock.close()
+
+
+class TestOSCListener:
+    """Test the OSC receive thread"""
+
+    def test_dispatches_messages(self):
+        """Single messages reach the handler with all their arguments"""
+        collector = Collector(1)
+        listener = OSCListener(collector, "127.0.0.1", 0)
+        listener.start()
+
+        builder = OscMessageBuilder("/s/gain")
+        for arg in (0.5, 0.0, 1.0):
+            builder.add_arg(arg)
+        send(listener.port, builder.build().dgram)
+
+        assert collector.done.wait(1.0)
+        listener.stop()
+        assert collector.messages == [("/s/gain", [0.5, 0.0, 1.0])]
+        assert not listener.running
+
+    def test_unpacks_bundles(self):
+        """Every message of a bundle is dispatched"""
+        collector = Collector(2)
+        listener = OSCListener(collector, "127.0.0.1", 0)
+        listener.start()
+
+        [bundle] = build_bundles([("/s/a", 1.0), ("/s/b", 2.0)])
+        send(listener.port, bundle)
+
+        assert collector.done.wait(1.0)
+        listener.stop()
+        assert collector.messages == [("/s/a", [1.0]), ("/s/b", [2.0])]
+
+    def test_malformed_packets_are_skipped(self):
+        """Garbage is counted and does not stop the listener"""
+        collector = Collector(1)
+        listener = OSCListener(collector, "127.0.0.1", 0)
+        listener.start()
+
+        send(listener.port, b"garbage")
+        [bundle] = build_bundles([("/s/a", 1.0)])
+        send(listener.port, bundle)
+
+        assert collector.done.wait(1.0)
+        listener.stop()
+        assert listener.malformed == 1
+        assert collector.messages == [("/s/a", [1.0])]
@@ -1,23 +1,54 @@
 #!/usr/bin/env python3
 
+import gc
 import os
 import sys
+import threading
+import time
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from unittest.mock import Mock, patch  # noqa: E402
+from unittest.mock import ANY, Mock, patch  # noqa: E402
 
+import mido  # noqa: E402
 import pytest  # noqa: E402
 from PyQt6.QtGui import QCloseEvent  # noqa: E402
+from pythonosc.osc_bundle import OscBundle  # noqa: E402
+from pythonosc.osc_message import OscMessage  # noqa: E402
 
-from src.murnau.ui.main_window import MurnauUI  # noqa: E402
+from src.murnau.synth.midi_player import DEFAULT_CC_MAP  # noqa: E402
+from src.murnau.ui.main_window import ALL_MIDI_PORTS, MurnauUI  # noqa: E402
+from src.murnau.utils import tuning  # noqa: E402
+from src.murnau.utils.cc_routing import Binding, MidiMapStore  # noqa: E402
+from src.murnau.utils.session_log import SessionLog, diff_osc, replay  # noqa: E402
+
+
+def capture_sends(transport):
+    """Report messages written to a mocked transport as transport.sent calls
+
+    Packets are decoded as they are written, the client reuses its buffers.
+    """
+
+    def sendto(data, critical=False):
+        message = OscMessage(bytes(data))
+        transport.sent(message.address, *message.params)
+
+    transport.sendto.side_effect = sendto
+    return transport
 
 
 @pytest.fixture(autouse=True)
 def disable_qt_animations():
     """Disable Qt animations and timers that can cause segfaults in tests"""
-    # This fixture runs automatically for all tests in this module
-    pass
+    # This fixture runs automatically for all tests in this module.
+    # Windows only survive the test body through reference cycles, so a
+    # cyclic collection during pytest-qt's event processing could delete a
+    # window in the middle of its paintEvent. Collect only after the
+    # widgets have been closed and deleted.
+    gc.disable()
+    yield
+    gc.enable()
+    gc.collect()
 
 
 class TestMurnauUIInit:
@@ -27,12 +58,12 @@ class TestMurnauUIInit:
         "src.murnau.ui.main_window.QTimer"
     )  # Mock QTimer to prevent animation issues
     @patch("src.murnau.ui.main_window.mido.get_input_names")  # Mock MIDI
-    @patch("src.murnau.ui.main_window.udp_client.SimpleUDPClient")
+    @patch("src.murnau.ui.main_window.get_transport")
     def test_init_creates_osc_client(
         self, mock_udp_client, mock_midi, mock_timer, qtbot
     ):
         """Test that initialization creates OSC client with correct parameters"""
-        mock_client = Mock()
+        mock_client = capture_sends(Mock())
         mock_udp_client.return_value = mock_client
         mock_midi.return_value = []  # No MIDI ports
         mock_timer_instance = Mock()
@@ -52,7 +83,7 @@ class TestMurnauUIInit:
         assert window.osc_port == 5510
         assert window.synth_name == "legato_synth_stereo"
 
-    @patch("src.murnau.ui.main_window.udp_client.SimpleUDPClient")
+    @patch("src.murnau.ui.main_window.get_transport")
     def test_init_sets_default_values(self, mock_udp_client, qtbot):
         """Test that initialization sets correct default values"""
         window = MurnauUI()
@@ -60,14 +91,13 @@ class TestMurnauUIInit:
 
         # Check MIDI settings
         assert window.midi_input is None
-        assert window.midi_thread is None
         assert window.midi_running is False
 
         # Check note tracking
-        assert window.active_notes == {}
+        assert len(window.active_notes) == 0
         assert window.current_note is None
 
-    @patch("src.murnau.ui.main_window.udp_client.SimpleUDPClient")
+    @patch("src.murnau.ui.main_window.get_transport")
     def test_init_ui_components(self, mock_udp_client, qtbot):
         """Test that UI components are properly initialized"""
         window = MurnauUI()
@@ -83,7 +113,7 @@ class TestMurnauUIInit:
 class TestMurnauUIComponents:
     """Test UI component creation"""
 
-    @patch("src.murnau.ui.main_window.udp_client.SimpleUDPClient")
+    @patch("src.murnau.ui.main_window.get_transport")
     def test_midi_components_created(self, mock_udp_client, qtbot):
         """Test MIDI UI components are created"""
         window = MurnauUI()
@@ -93,7 +123,7 @@ class TestMurnauUIComponents:
         assert hasattr(window, "midi_port_combo")
         assert hasattr(window, "midi_toggle")
 
-    @patch("src.murnau.ui.main_window.udp_client.SimpleUDPClient")
+    @patch("src.murnau.ui.main_window.get_transport")
     def test_waveform_components_created(self, mock_udp_client, qtbot):
         """Test waveform components are created"""
         window = MurnauUI()
@@ -101,7 +131,7 @@ class TestMurnauUIComponents:
 
         assert hasattr(window, "waveform_selector")
 
-    @patch("src.murnau.ui.main_window.udp_client.SimpleUDPClient")
+    @patch("src.murnau.ui.main_window.get_transport")
     def test_pitch_components_created(self, mock_udp_client, qtbot):
         """Test pitch control components are created"""
         window = MurnauUI()
@@ -111,7 +141,7 @@ class TestMurnauUIComponents:
         assert hasattr(window, "fine_tune")
         assert hasattr(window, "stability")
 
-    @patch("src.murnau.ui.main_window.udp_client.SimpleUDPClient")
+    @patch("src.murnau.ui.main_window.get_transport")
     def test_filter_components_created(self, mock_udp_client, qtbot):
         """Test filter control components are created"""
         window = MurnauUI()
@@ -124,7 +154,7 @@ class TestMurnauUIComponents:
         assert hasattr(window, "cutoff_knob_R")
         assert hasattr(window, "resonance_knob_R")
 
-    @patch("src.murnau.ui.main_window.udp_client.SimpleUDPClient")
+    @patch("src.murnau.ui.main_window.get_transport")
     def test_adsr_components_created(self, mock_udp_client, qtbot):
         """Test ADSR control components are created"""
         window = MurnauUI()
@@ -142,7 +172,7 @@ class TestMurnauUIComponents:
         assert hasattr(window, "sustain_slider_R")
         assert hasattr(window, "release_slider_R")
 
-    @patch("src.murnau.ui.main_window.udp_client.SimpleUDPClient")
+    @patch("src.murnau.ui.main_window.get_transport")
     def test_output_components_created(self, mock_udp_client, qtbot):
         """Test output control components are created"""
         window = MurnauUI()
@@ -150,7 +180,7 @@ class TestMurnauUIComponents:
 
         assert hasattr(window, "gain_slider")
 
-    @patch("src.murnau.ui.main_window.udp_client.SimpleUDPClient")
+    @patch("src.murnau.ui.main_window.get_transport")
     def test_piano_component_created(self, mock_udp_client, qtbot):
         """Test piano keyboard component is created"""
         window = MurnauUI()
@@ -162,75 +192,756 @@ class TestMurnauUIComponents:
 class TestMurnauUIParameters:
     """Test parameter handling"""
 
-    @patch("src.murnau.ui.main_window.udp_client.SimpleUDPClient")
+    @patch("src.murnau.ui.main_window.get_transport")
     def test_init_parameters_sends_osc(self, mock_udp_client, qtbot):
         """Test that parameter initialization sends OSC messages"""
-        mock_client = Mock()
+        mock_client = capture_sends(Mock())
         mock_udp_client.return_value = mock_client
 
         window = MurnauUI()
         qtbot.addWidget(window)
 
-        # init_parameters is called during construction, check messages were sent
-        assert mock_client.send_message.call_count > 0
+        window.osc_sender.flush()
+        # init_parameters is called during construction and sends one bundle
+        assert mock_client.send.call_count == 1
+        bundle = OscBundle(mock_client.send.call_args[0][0].dgram)
+        addresses = [msg.address for msg in bundle]
+        assert "/legato_synth_stereo/gain" in addresses
+        assert "/legato_synth_stereo/ramp_time" in addresses
 
-    @patch("src.murnau.ui.main_window.udp_client.SimpleUDPClient")
+    @patch("src.murnau.ui.main_window.get_transport")
     def test_parameter_change_handlers(self, mock_udp_client, qtbot):
         """Test parameter change handler methods"""
-        mock_client = Mock()
+        mock_client = capture_sends(Mock())
         mock_udp_client.return_value = mock_client
 
         window = MurnauUI()
         qtbot.addWidget(window)
 
+        window.osc_sender.flush()
         # Clear init calls
         mock_client.reset_mock()
 
         # Test gain change
         window.on_gain_change(0.5)
-        mock_client.send_message.assert_called_with("/legato_synth_stereo/gain", 0.5)
+        window.osc_sender.flush()
+        mock_client.sent.assert_called_with("/legato_synth_stereo/gain", 0.5)
 
         # Test waveform change
         window.on_waveform_change(1)
-        mock_client.send_message.assert_called_with("/legato_synth_stereo/wave_type", 1)
+        window.osc_sender.flush()
+        mock_client.sent.assert_called_with("/legato_synth_stereo/wave_type", 1)
 
         # Test attack change
         window.on_attack_L_change(0.1)
-        mock_client.send_message.assert_called_with(
-            "/legato_synth_stereo/attack_L", 0.1
+        window.osc_sender.flush()
+        mock_client.sent.assert_called_with(
+            "/legato_synth_stereo/attack_L", pytest.approx(0.1)
         )
 
         # Test cutoff change
         window.on_cutoff_L_change(1000)
-        mock_client.send_message.assert_called_with(
-            "/legato_synth_stereo/cutoff_L", 1000
+        window.osc_sender.flush()
+        mock_client.sent.assert_called_with("/legato_synth_stereo/cutoff_L", 1000)
+
+
+class TestMurnauUICoalescing:
+    """Test control-rate coalescing of parameter updates"""
+
+    @patch("src.murnau.ui.main_window.get_transport")
+    def test_knob_drag_is_coalesced(self, mock_udp_client, qtbot):
+        """Only the first and latest values of a drag reach the wire"""
+        mock_client = capture_sends(Mock())
+        mock_udp_client.return_value = mock_client
+
+        window = MurnauUI()
+        qtbot.addWidget(window)
+        window.control_timer.stop()
+        window.osc_sender.flush()
+        mock_client.reset_mock()
+
+        for value in (1000, 1100, 1200, 1300):
+            window.on_cutoff_L_change(value)
+
+        window.osc_sender.flush()
+        mock_client.sent.assert_called_once_with(
+            "/legato_synth_stereo/cutoff_L", 1000.0
+        )
+
+        window.param_sender.flush()
+        window.osc_sender.flush()
+        mock_client.sent.assert_called_with("/legato_synth_stereo/cutoff_L", 1300.0)
+        assert mock_client.sent.call_count == 2
+        assert window.param_sender.coalesced == 2
+
+    @patch("src.murnau.ui.main_window.get_transport")
+    def test_notes_bypass_coalescing(self, mock_udp_client, qtbot):
+        """Gate and freq messages are never held back"""
+        mock_client = capture_sends(Mock())
+        mock_udp_client.return_value = mock_client
+
+        window = MurnauUI()
+        qtbot.addWidget(window)
+        window.control_timer.stop()
+        window.osc_sender.flush()
+        mock_client.reset_mock()
+
+        window.on_note_on(440.0)
+        window.on_note_off()
+        window.on_note_on(220.0)
+
+        window.osc_sender.flush()
+        assert mock_client.sent.call_count == 5
+        mock_client.sent.assert_called_with("/legato_synth_stereo/gate", 1.0)
+
+    @patch("src.murnau.ui.main_window.get_transport")
+    def test_close_flushes_pending_updates(self, mock_udp_client, qtbot):
+        """Closing the window sends values still held by the coalescer"""
+        mock_client = capture_sends(Mock())
+        mock_udp_client.return_value = mock_client
+
+        window = MurnauUI()
+        qtbot.addWidget(window)
+        window.control_timer.stop()
+
+        window.on_gain_change(0.2)
+        window.on_gain_change(0.4)
+        window.osc_sender.flush()
+        mock_client.reset_mock()
+
+        window.closeEvent(QCloseEvent())
+
+        mock_client.sent.assert_any_call(
+            "/legato_synth_stereo/gain", pytest.approx(0.4)
+        )
+
+
+class TestMurnauUIDeadband:
+    """Test dead-band suppression of redundant parameter updates"""
+
+    @patch("src.murnau.ui.main_window.get_transport")
+    def test_sub_step_changes_are_suppressed(self, mock_udp_client, qtbot):
+        """Moves smaller than the DSP step do not reach the wire"""
+        mock_client = capture_sends(Mock())
+        mock_udp_client.return_value = mock_client
+
+        window = MurnauUI()
+        qtbot.addWidget(window)
+        window.control_timer.stop()
+        window.osc_sender.flush()
+        mock_client.reset_mock()
+
+        for value in (0.501, 0.502, 0.503, 0.504):
+            window.on_sustain_L_change(value)
+        window.param_sender.flush()
+
+        window.osc_sender.flush()
+        mock_client.sent.assert_called_once_with("/legato_synth_stereo/sustain_L", 0.5)
+        assert window.param_filter.suppressed == 3
+
+
+class TestMurnauUIFrameUpdates:
+    """Test frame-batched display updates from the MIDI thread"""
+
+    @patch("src.murnau.ui.main_window.get_transport")
+    def test_cc_stream_updates_widget_once_per_frame(self, mock_udp_client, qtbot):
+        """A CC flood from another thread touches no widget and sends once"""
+        window = MurnauUI()
+        qtbot.addWidget(window)
+        window.frame_timer.stop()
+        window.control_timer.stop()
+        knob = window.sustain_slider_L
+        knob.show_value = Mock()
+
+        def midi_thread():
+            for value in range(128):
+                msg = Mock(type="control_change", control=knob.midi_cc, value=value)
+                window.handle_midi_message(msg)
+
+        thread = threading.Thread(target=midi_thread)
+        thread.start()
+        thread.join()
+
+        # The flood only set smoother targets, the widget is untouched
+        knob.show_value.assert_not_called()
+        assert window.cc_smoother.tick() == 1
+        assert window.param_filter.passed > 0
+
+        assert window.apply_ui_deltas() == 1
+        knob.show_value.assert_called_once_with(1.0)
+        assert window.apply_ui_deltas() == 0
+
+    @patch("src.murnau.ui.main_window.get_transport")
+    def test_midi_latency_readout(self, mock_udp_client, qtbot):
+        """MIDI to OSC latency is reported per message type"""
+        window = MurnauUI()
+        qtbot.addWidget(window)
+        window.latency_timer.stop()
+
+        window.handle_midi_message(
+            Mock(type="note_on", note=60, velocity=100), time.perf_counter()
+        )
+        window.handle_midi_message(Mock(type="note_on", note=60, velocity=0))
+        window.osc_sender.flush()
+
+        latency = window.midi_latency(reset=True)
+        assert latency["note_on"]["count"] == 2  # /freq and /gate
+        assert latency["note_off"]["count"] == 1
+        assert latency["note_on"]["max"] > 0
+
+        window._show_latency()
+        assert window.latency_label.text() == ""
+
+    @patch("src.murnau.ui.main_window.get_transport")
+    def test_midi_notes_update_piano_on_frame(self, mock_udp_client, qtbot):
+        """Piano keys follow MIDI notes only when the frame is applied"""
+        window = MurnauUI()
+        qtbot.addWidget(window)
+        window.frame_timer.stop()
+
+        window.handle_midi_message(Mock(type="note_on", note=62, velocity=100))
+        window.handle_midi_message(Mock(type="note_on", note=64, velocity=100))
+        window.handle_midi_message(Mock(type="note_off", note=62, velocity=0))
+        assert window.piano.active_keys == set()
+
+        window.apply_ui_deltas()
+        assert window.piano.active_keys == {4}
+
+    @patch("src.murnau.ui.main_window.get_transport")
+    def test_show_value_does_not_resend(self, mock_udp_client, qtbot):
+        """Applying a posted value moves the knob without another OSC send"""
+        window = MurnauUI()
+        qtbot.addWidget(window)
+        window.control_timer.stop()
+        window.param_sender.flush()
+        passed = window.param_filter.passed
+
+        window.cutoff_knob_R.show_value(5000.0)
+
+        assert window.param_filter.passed == passed
+        assert window.cutoff_knob_R.knob.value() == window.cutoff_knob_R.value_to_knob(
+            5000.0
+        )
+
+
+class TestMurnauUICCRouting:
+    """Test routing of MIDI CCs to controls"""
+
+    @patch("src.murnau.ui.main_window.get_transport")
+    def test_default_routes_have_no_collisions(self, mock_udp_client, qtbot):
+        """Every control has its own CC"""
+        window = MurnauUI()
+        qtbot.addWidget(window)
+
+        routes = window.cc_routes.routes()
+        assert window.cc_routes.collisions() == {}
+        assert routes[74] == ["cutoff_L"]
+        assert routes[7] == ["gain"]
+        assert len(routes) == 17
+
+    @patch("src.murnau.ui.main_window.get_transport")
+    def test_default_routes_match_file_player(self, mock_udp_client, qtbot):
+        """The controls and the MIDI file player share one CC table"""
+        window = MurnauUI()
+        qtbot.addWidget(window)
+
+        routes = window.cc_routes.routes()
+        assert {cc: names[0] for cc, names in routes.items()} == DEFAULT_CC_MAP
+
+    @patch("src.murnau.ui.main_window.get_transport")
+    def test_cc_dispatch_sends_parameter(self, mock_udp_client, qtbot):
+        """A CC reaches the parameter handler of its control"""
+        capture_sends(mock_udp_client.return_value)
+        window = MurnauUI()
+        qtbot.addWidget(window)
+        window.control_timer.stop()
+        window.osc_sender.flush()
+        mock_udp_client.return_value.reset_mock()
+
+        window.handle_midi_message(Mock(type="control_change", control=7, value=0))
+        window.cc_smoother.tick()
+        window.osc_sender.flush()
+
+        mock_udp_client.return_value.sent.assert_called_once_with(
+            "/legato_synth_stereo/gain", 0.0
+        )
+
+    @patch("src.murnau.ui.main_window.get_transport")
+    def test_14bit_cc_pair(self, mock_udp_client, qtbot):
+        """An MSB/LSB pair sets a knob at full resolution"""
+        window = MurnauUI()
+        qtbot.addWidget(window)
+        window.frame_timer.stop()
+        window.cc_routes.set_route(16, ["cutoff_L"])
+
+        window.handle_midi_message(
+            Mock(type="control_change", control=16, value=64, channel=0)
+        )
+        window.handle_midi_message(
+            Mock(type="control_change", control=48, value=100, channel=0)
+        )
+
+        knob = window.cutoff_knob_L
+        fine = ((64 << 7) | 100) * 127 / 16383
+        assert window.ui_deltas.take() == [
+            (knob, pytest.approx(knob.cc_to_value(fine)))
+        ]
+
+    @patch("src.murnau.ui.main_window.get_transport")
+    def test_cc32_is_plain_controller(self, mock_udp_client, qtbot):
+        """CC32 drives sustain_R by default, also after a bank select"""
+        capture_sends(mock_udp_client.return_value)
+        window = MurnauUI()
+        qtbot.addWidget(window)
+        window.control_timer.stop()
+        window.frame_timer.stop()
+        window.osc_sender.flush()
+        mock_udp_client.return_value.reset_mock()
+        assert window.cc_routes.routes()[32] == ["sustain_R"]
+
+        window.handle_midi_message(
+            Mock(type="control_change", control=0, value=1, channel=0)
+        )
+        window.handle_midi_message(
+            Mock(type="control_change", control=32, value=0, channel=0)
+        )
+        window.cc_smoother.tick()
+        window.osc_sender.flush()
+
+        knob = window.sustain_slider_R
+        assert window.ui_deltas.take() == [(knob, pytest.approx(0.0))]
+        mock_udp_client.return_value.sent.assert_called_once_with(
+            "/legato_synth_stereo/sustain_R", 0.0
+        )
+
+    @patch("src.murnau.ui.main_window.get_transport")
+    def test_nrpn_drives_cc_slot(self, mock_udp_client, qtbot):
+        """NRPN parameters below 128 drive the controls of the same CC"""
+        capture_sends(mock_udp_client.return_value)
+        window = MurnauUI()
+        qtbot.addWidget(window)
+        window.control_timer.stop()
+        window.osc_sender.flush()
+        mock_udp_client.return_value.reset_mock()
+
+        for control, value in ((99, 0), (98, 7), (6, 127), (38, 127)):
+            window.handle_midi_message(
+                Mock(type="control_change", control=control, value=value, channel=0)
+            )
+        window.cc_smoother.tick()
+        window.osc_sender.flush()
+
+        mock_udp_client.return_value.sent.assert_called_once_with(
+            "/legato_synth_stereo/gain", 1.0
+        )
+
+    @patch("src.murnau.ui.main_window.get_transport")
+    def test_load_cc_map(self, mock_udp_client, qtbot, tmp_path):
+        """A mapping file replaces the routes and relabels the controls"""
+        path = tmp_path / "map.json"
+        path.write_text('{"20": ["cutoff_L", "cutoff_R"]}')
+
+        window = MurnauUI()
+        qtbot.addWidget(window)
+        window.load_cc_map(str(path))
+
+        assert window.cc_routes.routes() == {20: ["cutoff_L", "cutoff_R"]}
+        assert window.cutoff_knob_R.midi_cc == 20
+        assert window.cutoff_knob_R.name_label.text() == "Cutoff\n(CC20)"
+        assert window.gain_slider.midi_cc is None
+        assert window.gain_slider.name_label.text() == "Gain"
+
+    @patch("src.murnau.ui.main_window.get_transport")
+    def test_midi_learn_binds_next_cc(self, mock_udp_client, qtbot, tmp_path):
+        """Clicking a knob in learn mode binds the next CC and saves the map"""
+        window = MurnauUI()
+        qtbot.addWidget(window)
+        window.midi_map_store = MidiMapStore(str(tmp_path))
+        window.use_device_map("Test Device")
+
+        window.learn_toggle.setChecked(True)
+        window.cutoff_knob_L.knob.sliderPressed.emit()
+        assert window._learn_target == "cutoff_L"
+
+        window.handle_midi_message(Mock(type="control_change", control=21, value=64))
+
+        assert window._learn_target is None
+        assert window.cc_routes.ccs_for("cutoff_L") == [21]
+        assert 74 not in window.cc_routes.routes()
+        assert window.cutoff_knob_L.midi_cc == 21
+        assert window.midi_map_store.load("Test Device")[21] == [Binding("cutoff_L")]
+
+    @patch("src.murnau.ui.main_window.get_transport")
+    def test_knob_click_without_learn_mode(self, mock_udp_client, qtbot):
+        """Knobs are not armed while learn mode is off"""
+        window = MurnauUI()
+        qtbot.addWidget(window)
+
+        window.cutoff_knob_L.knob.sliderPressed.emit()
+
+        assert window._learn_target is None
+
+    @patch("src.murnau.ui.main_window.get_transport")
+    def test_device_maps_swap(self, mock_udp_client, qtbot, tmp_path):
+        """Each device gets its own routes, switching back reuses the table"""
+        store = MidiMapStore(str(tmp_path))
+        store.save("Pads", {20: ["gain"]})
+
+        window = MurnauUI()
+        qtbot.addWidget(window)
+        window.midi_map_store = store
+
+        window.use_device_map("Keys")
+        keys = window.cc_routes
+        window.use_device_map("Pads")
+
+        assert window.cc_routes.routes() == {20: ["gain"]}
+        assert window.gain_slider.midi_cc == 20
+        assert keys.routes()[74] == ["cutoff_L"]
+
+        window.use_device_map("Keys")
+        assert window.cc_routes is keys
+        assert window.gain_slider.midi_cc == 7
+
+    @patch("src.murnau.ui.main_window.get_transport")
+    @patch("src.murnau.ui.main_window.mido.get_input_names")
+    @patch("src.murnau.ui.main_window.mido.open_input")
+    def test_all_ports_merge_with_own_maps(
+        self, mock_open_input, mock_get_input_names, mock_udp_client, qtbot, tmp_path
+    ):
+        """Every port is opened and routes its CCs through its own map"""
+        capture_sends(mock_udp_client.return_value)
+        mock_get_input_names.return_value = ["Keys", "Faders"]
+        store = MidiMapStore(str(tmp_path))
+        store.save("Faders", {20: ["gain"]})
+
+        window = MurnauUI()
+        qtbot.addWidget(window)
+        window.control_timer.stop()
+        window.midi_map_store = store
+        window.midi_channels["Keys"] = [0]
+        window.midi_port_combo.setCurrentText(ALL_MIDI_PORTS)
+        window.start_midi()
+
+        assert [c.args[0] for c in mock_open_input.call_args_list] == [
+            "Keys",
+            "Faders",
+        ]
+        assert window.midi_input.port_names == ["Keys", "Faders"]
+        assert window.midi_device == "Keys"
+        assert set(window.midi_stats()) == {"Keys", "Faders"}
+
+        window.osc_sender.flush()
+        mock_udp_client.return_value.reset_mock()
+        message = Mock(type="control_change", control=20, value=0, channel=0)
+        window.handle_midi_message(message, port="Keys")
+        window.handle_midi_message(message, port="Faders")
+        window.cc_smoother.tick()
+        window.osc_sender.flush()
+
+        # CC20 is only routed in the fader box's map
+        mock_udp_client.return_value.sent.assert_called_once_with(
+            "/legato_synth_stereo/gain", 0.0
+        )
+        window.stop_midi()
+
+    @patch("src.murnau.ui.main_window.get_transport")
+    def test_midi_learn_saves_source_port_map(self, mock_udp_client, qtbot, tmp_path):
+        """A CC learned from a merged port is bound in that port's map"""
+        window = MurnauUI()
+        qtbot.addWidget(window)
+        window.midi_map_store = MidiMapStore(str(tmp_path))
+        window._device_routes_for("Faders")
+        window.use_device_map("Keys")
+
+        window.learn_toggle.setChecked(True)
+        window.cutoff_knob_L.knob.sliderPressed.emit()
+        window.handle_midi_message(
+            Mock(type="control_change", control=21, value=64, channel=0),
+            port="Faders",
+        )
+
+        assert window._device_routes["Faders"].ccs_for("cutoff_L") == [21]
+        assert window.cc_routes.ccs_for("cutoff_L") == [74]
+        assert window.midi_map_store.load("Faders")[21] == [Binding("cutoff_L")]
+        assert window.midi_map_store.load("Keys") is None
+
+
+class TestMurnauUIPolyphony:
+    """Test MIDI notes played on a pool of synth instances"""
+
+    @patch("src.murnau.utils.osc_client.get_transport")
+    @patch("src.murnau.ui.main_window.get_transport")
+    def test_notes_spread_over_instances(self, mock_udp_client, mock_pool, qtbot):
+        """Each held note plays on its own instance, mono state is untouched"""
+        capture_sends(mock_udp_client.return_value)
+        window = MurnauUI()
+        qtbot.addWidget(window)
+        window.osc_sender.flush()
+        mock_udp_client.return_value.reset_mock()
+        window.set_polyphony(
+            [("127.0.0.1", 5520, "voice_a"), ("127.0.0.1", 5521, "voice_b")]
         )
+        assert mock_pool.call_args_list[-2:] == [
+            (("127.0.0.1", 5520),),
+            (("127.0.0.1", 5521),),
+        ]
+
+        window.handle_midi_message(mido.Message("note_on", note=60, velocity=100))
+        window.handle_midi_message(mido.Message("note_on", note=64, velocity=100))
+        window.osc_sender.flush()
+
+        assert window.poly.allocator.active == 2
+        assert window.current_note is None
+        mock_udp_client.return_value.sent.assert_not_called()
+        assert mock_pool.return_value.sendto.call_count == 4
+
+        window.set_polyphony(None)
+        window.osc_sender.flush()
+        assert window.poly is None
+        # Both voices were released
+        assert mock_pool.return_value.sendto.call_count == 6
+        # Voice traffic goes through the sender thread and its histograms
+        assert window.osc_sender.latency.summary()["note_on"]["count"] == 4
+
+    @patch("src.murnau.utils.osc_client.get_transport")
+    @patch("src.murnau.ui.main_window.get_transport")
+    def test_aftertouch_reaches_owning_instance(
+        self, mock_udp_client, mock_pool, qtbot
+    ):
+        """Pressure on a held note goes to its voice only, once per tick"""
+        window = MurnauUI()
+        qtbot.addWidget(window)
+        window.set_polyphony(
+            [("127.0.0.1", 5520, "voice_a"), ("127.0.0.1", 5521, "voice_b")]
+        )
+        window.handle_midi_message(mido.Message("note_on", note=60, velocity=100))
+        window.handle_midi_message(mido.Message("note_on", note=64, velocity=100))
+        window.osc_sender.flush()
+        sendto = mock_pool.return_value.sendto
+        sendto.reset_mock()
+
+        for value in (40, 80, 120):
+            window.handle_midi_message(mido.Message("polytouch", note=64, value=value))
+        window._flush_expression()
+        window.osc_sender.flush()
+
+        # The first value right away, the last one on the tick, as bundles
+        assert sendto.call_count == 2
+        for sent in sendto.call_args_list:
+            assert sent.args[0].startswith(b"#bundle")
+            assert b"/voice_b/gain" in sent.args[0]
+
+    @patch("src.murnau.utils.osc_client.get_transport")
+    @patch("src.murnau.ui.main_window.get_transport")
+    def test_voice_traffic_is_recorded(
+        self, mock_udp_client, mock_pool, qtbot, tmp_path
+    ):
+        """The session log holds every voice's messages by full address"""
+        window = MurnauUI()
+        qtbot.addWidget(window)
+        window.set_polyphony([("127.0.0.1", 5520, "voice_a")])
+        window.start_recording(str(tmp_path / "poly"))
+
+        window.handle_midi_message(mido.Message("note_on", note=60, velocity=100))
+        window.handle_midi_message(mido.Message("polytouch", note=60, value=127))
+        window.stop_recording()
+
+        with SessionLog(str(tmp_path / "poly")) as log:
+            addresses = [address for _, address, _ in log.osc()]
+        assert addresses == ["/voice_a/freq", "/voice_a/gate", "/voice_a/gain"]
+
+
+class TestMurnauUIPitchBend:
+    """Test the pitch wheel bending the sounding note"""
+
+    @patch("src.murnau.ui.main_window.get_transport")
+    def test_wheel_bends_on_control_tick(self, mock_udp_client, qtbot):
+        """Wheel messages only move the target, /freq goes out per tick"""
+        window = MurnauUI()
+        qtbot.addWidget(window)
+        window.control_timer.stop()
+        client = capture_sends(mock_udp_client.return_value)
+
+        # RPN 0 sets a 12 semitone bend range
+        for control, value in ((101, 0), (100, 0), (6, 12), (38, 0)):
+            window.handle_midi_message(
+                mido.Message("control_change", control=control, value=value)
+            )
+        window.handle_midi_message(mido.Message("note_on", note=69, velocity=100))
+        for pitch in range(0, 8192, 64):
+            window.handle_midi_message(mido.Message("pitchwheel", pitch=pitch))
+        window.osc_sender.flush()
+        client.reset_mock()
+
+        window.pitch_bend.tick()
+        window.osc_sender.flush()
+        assert client.sent.call_count == 1
+
+        while window.pitch_bend.tick():
+            pass
+        window.osc_sender.flush()
+        # 8128 of 8192 is just under an octave up
+        client.sent.assert_called_with(
+            "/legato_synth_stereo/freq",
+            pytest.approx(tuning.note_freq(69) * 2 ** (8128 / 8192), rel=1e-5),
+        )
+
+    @patch("src.murnau.ui.main_window.get_transport")
+    def test_wheel_is_silent_after_last_note_off(self, mock_udp_client, qtbot):
+        """Releasing the last note stops /freq from following the wheel"""
+        window = MurnauUI()
+        qtbot.addWidget(window)
+        window.control_timer.stop()
+        client = capture_sends(mock_udp_client.return_value)
+
+        window.handle_midi_message(mido.Message("note_on", note=69, velocity=100))
+        window.handle_midi_message(mido.Message("note_off", note=69))
+        window.osc_sender.flush()
+        client.reset_mock()
+
+        window.handle_midi_message(mido.Message("pitchwheel", pitch=4096))
+        while window.pitch_bend.tick():
+            pass
+        window.osc_sender.flush()
+
+        client.sent.assert_not_called()
+
+
+class TestMurnauUISession:
+    """Test session recording and replay"""
+
+    @patch("src.murnau.ui.main_window.get_transport")
+    def test_replayed_session_matches_recording(self, mock_udp_client, qtbot, tmp_path):
+        """Replaying the recorded MIDI reproduces the recorded OSC output"""
+        notes = [
+            mido.Message("note_on", note=60, velocity=100),
+            mido.Message("note_on", note=64, velocity=100),
+            mido.Message("note_off", note=64),
+            mido.Message("note_off", note=60),
+        ]
+        original = str(tmp_path / "original.log")
+        replayed = str(tmp_path / "replayed.log")
+
+        window = MurnauUI()
+        qtbot.addWidget(window)
+        window.start_recording(original)
+        for message in notes:
+            window.handle_midi_message(message, port="Keys")
+        assert window.stop_recording() == 10
+
+        # A second run starts from a fresh window, like a new performance
+        rerun = MurnauUI()
+        qtbot.addWidget(rerun)
+        with SessionLog(original) as log:
+            assert log.ports == ["Keys"]
+            rerun.start_recording(replayed)
+            replay(
+                log.midi(),
+                lambda message, port: rerun.handle_midi_message(message, port=port),
+                speed=None,
+            )
+            rerun.stop_recording()
+
+        with SessionLog(original) as a, SessionLog(replayed) as b:
+            assert [address for _, address, _ in a.osc()] == ["/freq", "/gate"] * 3
+            assert diff_osc(a, b) == {}
 
 
 class TestMurnauUIOSC:
     """Test OSC communication"""
 
-    @patch("src.murnau.ui.main_window.udp_client.SimpleUDPClient")
+    @patch("src.murnau.ui.main_window.get_transport")
     def test_send_osc_basic(self, mock_udp_client, qtbot):
         """Test basic OSC message sending"""
-        mock_client = Mock()
+        mock_client = capture_sends(Mock())
         mock_udp_client.return_value = mock_client
 
         window = MurnauUI()
         qtbot.addWidget(window)
 
+        window.osc_sender.flush()
         # Clear init calls
         mock_client.reset_mock()
 
         # Test sending OSC message
         window.send_osc("/test", 42)
-        mock_client.send_message.assert_called_with("/legato_synth_stereo/test", 42)
+        window.osc_sender.flush()
+        mock_client.sent.assert_called_with("/legato_synth_stereo/test", 42)
+
+    @patch("src.murnau.ui.main_window.get_transport")
+    def test_sends_reuse_cached_packets(self, mock_udp_client, qtbot):
+        """The sender thread writes the OSCClient's pre-encoded packets"""
+        window = MurnauUI()
+        qtbot.addWidget(window)
+        window.osc_sender.flush()
+        client = mock_udp_client.return_value
+        client.reset_mock()
+
+        window.send_osc("/gate", 1.0)
+        window.osc_sender.flush()
+        window.send_osc("/gate", 0.0)
+        window.osc_sender.flush()
+
+        first, second = client.sendto.call_args_list
+        assert first.args[0] is second.args[0]
+        assert window.osc.client is client
+        client.send_message.assert_not_called()
+
+    @patch("src.murnau.ui.main_window.get_transport")
+    def test_send_osc_batch(self, mock_udp_client, qtbot):
+        """Test sending several OSC messages as a bundle"""
+        mock_client = capture_sends(Mock())
+        mock_udp_client.return_value = mock_client
 
-    @patch("src.murnau.ui.main_window.udp_client.SimpleUDPClient")
+        window = MurnauUI()
+        qtbot.addWidget(window)
+        window.osc_sender.flush()
+        mock_client.reset_mock()
+
+        count = window.send_osc_batch([("/gain", 0.5), ("/cutoff_L", 1000)])
+        window.osc_sender.flush()
+
+        assert count == 1
+        bundle = OscBundle(mock_client.send.call_args[0][0].dgram)
+        assert [(msg.address, msg.params[0]) for msg in bundle] == [
+            ("/legato_synth_stereo/gain", 0.5),
+            ("/legato_synth_stereo/cutoff_L", 1000.0),
+        ]
+        mock_client.sent.assert_not_called()
+
+    @patch("src.murnau.utils.osc_client.get_transport")
+    @patch("src.murnau.ui.main_window.get_transport")
+    def test_reconnect_syncs_patch(self, mock_udp_client, mock_new_client, qtbot):
+        """Reconnecting hands the patch to the cache, which resends differences"""
+        window = MurnauUI()
+        qtbot.addWidget(window)
+        window.param_cache = Mock()
+        window.param_cache.sync.return_value = [("/cutoff_L", 1234)]
+        window.osc_listener = Mock(running=True)
+
+        window.queue_osc("/cutoff_L", 1234)
+        with qtbot.waitSignal(window.patchSynced) as synced:
+            worker = window.reconnect_osc("10.0.0.2", 5600)
+            assert worker is not threading.current_thread()
+
+        assert synced.args == [1]
+        assert "1 parameter(s) resent" in window.statusBar().currentMessage()
+        mock_new_client.assert_called_with("10.0.0.2", 5600)
+        new_client = mock_new_client.return_value
+        window.param_cache.reconnect.assert_called_once_with(new_client)
+        state = dict(window.param_cache.sync.call_args.args[0])
+        assert state["/cutoff_L"] == 1234
+        assert state["/gain"] == 1.0
+        assert (window.osc_ip, window.osc_port) == ("10.0.0.2", 5600)
+        assert window.osc_client is new_client
+        window.osc_listener.start.assert_not_called()
+
+    @patch("src.murnau.ui.main_window.get_transport")
     def test_send_osc_with_exception(self, mock_udp_client, qtbot):
         """Test OSC sending with exception handling"""
         mock_client = Mock()
-        mock_client.send_message.side_effect = Exception("Connection error")
+        mock_client.sendto.side_effect = Exception("Connection error")
         mock_udp_client.return_value = mock_client
 
         window = MurnauUI()
@@ -243,15 +954,16 @@ class TestMurnauUIOSC:
 class TestMurnauUINotes:
     """Test note handling"""
 
-    @patch("src.murnau.ui.main_window.udp_client.SimpleUDPClient")
+    @patch("src.murnau.ui.main_window.get_transport")
     def test_on_note_on(self, mock_udp_client, qtbot):
         """Test note on handling"""
-        mock_client = Mock()
+        mock_client = capture_sends(Mock())
         mock_udp_client.return_value = mock_client
 
         window = MurnauUI()
         qtbot.addWidget(window)
 
+        window.osc_sender.flush()
         # Clear init calls
         mock_client.reset_mock()
 
@@ -259,33 +971,36 @@ class TestMurnauUINotes:
         test_freq = 440.0
         window.on_note_on(test_freq)
 
+        window.osc_sender.flush()
         # Check OSC messages
-        mock_client.send_message.assert_any_call("/legato_synth_stereo/freq", test_freq)
-        mock_client.send_message.assert_any_call("/legato_synth_stereo/gate", 1.0)
+        mock_client.sent.assert_any_call("/legato_synth_stereo/freq", test_freq)
+        mock_client.sent.assert_any_call("/legato_synth_stereo/gate", 1.0)
 
-    @patch("src.murnau.ui.main_window.udp_client.SimpleUDPClient")
+    @patch("src.murnau.ui.main_window.get_transport")
     def test_on_note_off(self, mock_udp_client, qtbot):
         """Test note off handling"""
-        mock_client = Mock()
+        mock_client = capture_sends(Mock())
         mock_udp_client.return_value = mock_client
 
         window = MurnauUI()
         qtbot.addWidget(window)
 
+        window.osc_sender.flush()
         # Clear init calls
         mock_client.reset_mock()
 
         # Test note off
         window.on_note_off()
 
+        window.osc_sender.flush()
         # Check OSC message
-        mock_client.send_message.assert_called_with("/legato_synth_stereo/gate", 0.0)
+        mock_client.sent.assert_called_with("/legato_synth_stereo/gate", 0.0)
 
 
 class TestMurnauUIMIDI:
     """Test MIDI functionality"""
 
-    @patch("src.murnau.ui.main_window.udp_client.SimpleUDPClient")
+    @patch("src.murnau.ui.main_window.get_transport")
     @patch("src.murnau.ui.main_window.mido.get_input_names")
     def test_init_midi_with_ports(self, mock_get_input_names, mock_udp_client, qtbot):
         """Test MIDI initialization with available ports"""
@@ -297,7 +1012,7 @@ class TestMurnauUIMIDI:
         # Check that MIDI ports are loaded
         assert window.midi_port_combo.count() >= 2
 
-    @patch("src.murnau.ui.main_window.udp_client.SimpleUDPClient")
+    @patch("src.murnau.ui.main_window.get_transport")
     @patch("src.murnau.ui.main_window.mido.get_input_names")
     def test_init_midi_no_ports(self, mock_get_input_names, mock_udp_client, qtbot):
         """Test MIDI initialization with no available ports"""
@@ -309,7 +1024,7 @@ class TestMurnauUIMIDI:
         # Should handle gracefully
         assert window.midi_port_combo.count() >= 1
 
-    @patch("src.murnau.ui.main_window.udp_client.SimpleUDPClient")
+    @patch("src.murnau.ui.main_window.get_transport")
     @patch("src.murnau.ui.main_window.mido.get_input_names")
     def test_init_midi_exception(self, mock_get_input_names, mock_udp_client, qtbot):
         """Test MIDI initialization with exception"""
@@ -321,7 +1036,7 @@ class TestMurnauUIMIDI:
         # Should not raise exception and handle gracefully
         assert hasattr(window, "midi_port_combo")
 
-    @patch("src.murnau.ui.main_window.udp_client.SimpleUDPClient")
+    @patch("src.murnau.ui.main_window.get_transport")
     @patch("src.murnau.ui.main_window.mido.open_input")
     def test_start_midi_success(self, mock_open_input, mock_udp_client, qtbot):
         """Test successful MIDI start"""
@@ -337,12 +1052,12 @@ class TestMurnauUIMIDI:
 
         window.start_midi()
 
-        # Check MIDI setup
-        mock_open_input.assert_called_once_with("Test Port")
-        assert window.midi_input == mock_input
+        # Check MIDI setup, messages are delivered by the backend callback
+        mock_open_input.assert_called_once_with("Test Port", callback=ANY)
+        assert window.midi_input.port == mock_input
         assert window.midi_running is True
 
-    @patch("src.murnau.ui.main_window.udp_client.SimpleUDPClient")
+    @patch("src.murnau.ui.main_window.get_transport")
     @patch("src.murnau.ui.main_window.mido.open_input")
     def test_start_midi_failure(self, mock_open_input, mock_udp_client, qtbot):
         """Test MIDI start failure"""
@@ -362,7 +1077,7 @@ class TestMurnauUIMIDI:
         assert window.midi_input is None
         assert window.midi_running is False
 
-    @patch("src.murnau.ui.main_window.udp_client.SimpleUDPClient")
+    @patch("src.murnau.ui.main_window.get_transport")
     def test_stop_midi(self, mock_udp_client, qtbot):
         """Test MIDI stop"""
         window = MurnauUI()
@@ -379,15 +1094,16 @@ class TestMurnauUIMIDI:
         assert window.midi_running is False
         mock_input.close.assert_called_once()
 
-    @patch("src.murnau.ui.main_window.udp_client.SimpleUDPClient")
+    @patch("src.murnau.ui.main_window.get_transport")
     def test_handle_midi_note_on(self, mock_udp_client, qtbot):
         """Test MIDI note on message handling"""
-        mock_client = Mock()
+        mock_client = capture_sends(Mock())
         mock_udp_client.return_value = mock_client
 
         window = MurnauUI()
         qtbot.addWidget(window)
 
+        window.osc_sender.flush()
         # Clear init calls
         mock_client.reset_mock()
 
@@ -399,18 +1115,20 @@ class TestMurnauUIMIDI:
 
         window.handle_midi_message(mock_msg)
 
+        window.osc_sender.flush()
         # Check that note was processed
-        assert mock_client.send_message.call_count > 0
+        assert mock_client.sent.call_count > 0
 
-    @patch("src.murnau.ui.main_window.udp_client.SimpleUDPClient")
+    @patch("src.murnau.ui.main_window.get_transport")
     def test_handle_midi_note_off(self, mock_udp_client, qtbot):
         """Test MIDI note off message handling"""
-        mock_client = Mock()
+        mock_client = capture_sends(Mock())
         mock_udp_client.return_value = mock_client
 
         window = MurnauUI()
         qtbot.addWidget(window)
 
+        window.osc_sender.flush()
         # Clear init calls
         mock_client.reset_mock()
 
@@ -425,11 +1143,100 @@ class TestMurnauUIMIDI:
         # Check that message was processed
         # Note: the actual behavior depends on implementation
 
+    @patch("src.murnau.ui.main_window.get_transport")
+    def test_midi_note_off_falls_back_to_last_pressed(self, mock_udp_client, qtbot):
+        """Releasing the sounding note returns to the most recent held note"""
+        window = MurnauUI()
+        qtbot.addWidget(window)
+        client = capture_sends(mock_udp_client.return_value)
+
+        for note in (60, 72, 64):
+            window.handle_midi_message(Mock(type="note_on", note=note, velocity=100))
+        window.osc_sender.flush()
+        client.reset_mock()
+
+        window.handle_midi_message(Mock(type="note_off", note=64, velocity=0))
+        window.osc_sender.flush()
+
+        assert window.current_note == 72
+        client.sent.assert_called_once_with(
+            "/legato_synth_stereo/freq", pytest.approx(523.2511, rel=1e-5)
+        )
+
+    @patch("src.murnau.ui.main_window.get_transport")
+    def test_high_priority_ignores_lower_notes(self, mock_udp_client, qtbot):
+        """With high-note priority a lower note does not take over"""
+        window = MurnauUI()
+        qtbot.addWidget(window)
+        window.set_note_priority("high")
+        client = capture_sends(mock_udp_client.return_value)
+
+        window.handle_midi_message(Mock(type="note_on", note=72, velocity=100))
+        window.osc_sender.flush()
+        client.reset_mock()
+        window.handle_midi_message(Mock(type="note_on", note=60, velocity=100))
+        window.osc_sender.flush()
+
+        assert window.current_note == 72
+        client.sent.assert_not_called()
+        assert window.piano.held_keys.priority == "high"
+
+    @patch("src.murnau.ui.main_window.get_transport")
+    def test_piano_keys_follow_note_priority(self, mock_udp_client, qtbot):
+        """Key release falls back to the last pressed key, not the highest"""
+        window = MurnauUI()
+        qtbot.addWidget(window)
+        piano = window.piano
+        note_on = Mock()
+        note_off = Mock()
+        piano.noteOn.connect(note_on)
+        piano.noteOff.connect(note_off)
+
+        for index in (0, 12, 4):
+            piano.press_key(index)
+        piano.release_key(12)
+        note_on.assert_called_with(piano.notes[4])
+        assert note_on.call_count == 3
+
+        piano.release_key(4)
+        note_on.assert_called_with(piano.notes[0])
+        piano.release_key(0)
+        note_off.assert_called_once()
+        assert piano.active_keys == set()
+
+    @patch("src.murnau.ui.main_window.get_transport")
+    def test_load_tuning_retunes_midi_and_keys(self, mock_udp_client, qtbot, tmp_path):
+        """A Scala tuning changes MIDI note and on-screen key frequencies"""
+        path = tmp_path / "quarter.scl"
+        path.write_text(
+            "24-TET\n 24\n" + "".join(f" {50.0 * i}\n" for i in range(1, 25))
+        )
+        window = MurnauUI()
+        qtbot.addWidget(window)
+        client = capture_sends(mock_udp_client.return_value)
+        previous = tuning.current()
+        try:
+            window.load_tuning(str(path))
+            window.osc_sender.flush()
+            client.reset_mock()
+
+            window.handle_midi_message(Mock(type="note_on", note=61, velocity=100))
+            window.osc_sender.flush()
+
+            # Note 61 is one 50-cent step above C4, 400 cents below A4
+            quarter_tone = 440.0 * 2 ** (-400 / 1200)
+            client.sent.assert_any_call(
+                "/legato_synth_stereo/freq", pytest.approx(quarter_tone)
+            )
+            assert window.piano.notes[1] == pytest.approx(quarter_tone)
+        finally:
+            tuning.retune(previous)
+
 
 class TestMurnauUIStyles:
     """Test UI styling methods"""
 
-    @patch("src.murnau.ui.main_window.udp_client.SimpleUDPClient")
+    @patch("src.murnau.ui.main_window.get_transport")
     def test_get_combo_style(self, mock_udp_client, qtbot):
         """Test combo box style generation"""
         window = MurnauUI()
@@ -441,7 +1248,7 @@ class TestMurnauUIStyles:
         assert isinstance(style, str)
         assert len(style) > 0
 
-    @patch("src.murnau.ui.main_window.udp_client.SimpleUDPClient")
+    @patch("src.murnau.ui.main_window.get_transport")
     def test_get_button_style(self, mock_udp_client, qtbot):
         """Test button style generation"""
         window = MurnauUI()
@@ -457,7 +1264,7 @@ class TestMurnauUIStyles:
 class TestMurnauUIEvents:
     """Test event handling"""
 
-    @patch("src.murnau.ui.main_window.udp_client.SimpleUDPClient")
+    @patch("src.murnau.ui.main_window.get_transport")
     def test_close_event_stops_midi(self, mock_udp_client, qtbot):
         """Test that closing window stops MIDI"""
         window = MurnauUI()
@@ -476,7 +1283,7 @@ class TestMurnauUIEvents:
         assert window.midi_running is False
         mock_input.close.assert_called_once()
 
-    @patch("src.murnau.ui.main_window.udp_client.SimpleUDPClient")
+    @patch("src.murnau.ui.main_window.get_transport")
     def test_toggle_midi_button(self, mock_udp_client, qtbot):
         """Test MIDI toggle button functionality"""
         window = MurnauUI()
@@ -492,7 +1299,7 @@ class TestMurnauUIEvents:
 class TestMurnauUIIntegration:
     """Integration tests for MurnauUI"""
 
-    @patch("src.murnau.ui.main_window.udp_client.SimpleUDPClient")
+    @patch("src.murnau.ui.main_window.get_transport")
     def test_full_ui_creation(self, mock_udp_client, qtbot):
         """Test complete UI creation without errors"""
         window = MurnauUI()
@@ -504,7 +1311,7 @@ class TestMurnauUIIntegration:
         # The window shows itself in __init__, so it should be visible
         assert window.isVisible() is True
 
-    @patch("src.murnau.ui.main_window.udp_client.SimpleUDPClient")
+    @patch("src.murnau.ui.main_window.get_transport")
     @patch("src.murnau.ui.main_window.mido.get_input_names")
     def test_ui_with_midi_initialization(
         self, mock_get_input_names, mock_udp_client, qtbot
@@ -518,14 +1325,15 @@ class TestMurnauUIIntegration:
         # MIDI should be initialized
         assert hasattr(window, "midi_port_combo")
 
-    @patch("src.murnau.ui.main_window.udp_client.SimpleUDPClient")
+    @patch("src.murnau.ui.main_window.get_transport")
     def test_parameter_initialization(self, mock_udp_client, qtbot):
         """Test that parameters are initialized"""
-        mock_client = Mock()
+        mock_client = capture_sends(Mock())
         mock_udp_client.return_value = mock_client
 
         window = MurnauUI()
         qtbot.addWidget(window)
 
+        window.osc_sender.flush()
         # Parameters should be initialized during construction
-        assert mock_client.send_message.call_count > 0
+        assert mock_client.send.call_count > 0
@@ -11,7 +11,7 @@ from unittest.mock import Mock, patch  # noqa: E402
 class TestMurnauUICore:
     """Test core MurnauUI functionality without creating widgets"""
 
-    @patch("src.murnau.ui.main_window.udp_client.SimpleUDPClient")
+    @patch("src.murnau.ui.main_window.get_transport")
     @patch("src.murnau.ui.main_window.mido.get_input_names")
     @patch("src.murnau.ui.main_window.QTimer")
     @patch("src.murnau.ui.main_window.QMainWindow.__init__")
@@ -63,10 +63,14 @@ class TestMurnauUICore:
 
         assert expected == "/test_synth/freq"
 
-    @patch("src.murnau.ui.main_window.udp_client.SimpleUDPClient")
+    @patch("src.murnau.ui.main_window.get_transport")
     def test_send_osc_method(self, mock_udp_client):
         """Test send_osc method without widget creation"""
+        from pythonosc.osc_message import OscMessage
+
         from src.murnau.ui.main_window import MurnauUI
+        from src.murnau.utils.osc_client import OSCClient
+        from src.murnau.utils.sender import OSCSenderThread
 
         mock_client = Mock()
         mock_udp_client.return_value = mock_client
@@ -75,29 +79,51 @@ class TestMurnauUICore:
         window = MurnauUI.__new__(MurnauUI)
         window.synth_name = "test_synth"
         window.osc_client = mock_client
+        window.osc = OSCClient(synth_name="test_synth", transport=mock_client)
+        window.recorder = None
+
+        window.osc_sender = OSCSenderThread(window._send_message)
 
         # Test the send_osc method
         window.send_osc = MurnauUI.send_osc.__get__(window)
         window.send_osc("/test", 42)
+        window.osc_sender.flush()
 
-        mock_client.send_message.assert_called_once_with("/test_synth/test", 42.0)
+        packet = mock_client.sendto.call_args.args[0]
+        message = OscMessage(bytes(packet))
+        assert (message.address, message.params) == ("/test_synth/test", [42.0])
 
     def test_parameter_change_methods(self):
         """Test parameter change method logic without widgets"""
+        from pythonosc.osc_message import OscMessage
+
         from src.murnau.ui.main_window import MurnauUI
+        from src.murnau.utils.coalescer import CoalescingSender
+        from src.murnau.utils.deadband import DeadbandFilter
+        from src.murnau.utils.osc_client import OSCClient
+        from src.murnau.utils.sender import OSCSenderThread
 
         # Create minimal instance
         window = MurnauUI.__new__(MurnauUI)
         window.synth_name = "test_synth"
         window.osc_client = Mock()
+        window.osc = OSCClient(synth_name="test_synth", transport=window.osc_client)
+        window.recorder = None
+        window.osc_sender = OSCSenderThread(window._send_message)
 
         # Bind methods
         window.send_osc = MurnauUI.send_osc.__get__(window)
         window.on_gain_change = MurnauUI.on_gain_change.__get__(window)
+        window.param_sender = CoalescingSender(window.send_osc)
+        window.param_filter = DeadbandFilter(window.param_sender.submit, {})
+        window.patch = {}
 
         # Test parameter change
         window.on_gain_change(0.5)
-        window.osc_client.send_message.assert_called_with("/test_synth/gain", 0.5)
+        window.osc_sender.flush()
+        packet = window.osc_client.sendto.call_args.args[0]
+        message = OscMessage(bytes(packet))
+        assert (message.address, message.params) == ("/test_synth/gain", [0.5])
 
     def test_midi_note_frequency_calculation(self):
         """Test MIDI note to frequency calculation"""
@@ -184,7 +210,7 @@ class TestMurnauUIMethodsIsolated:
         assert hasattr(MurnauUI, "handle_midi_message")
         assert hasattr(MurnauUI, "toggle_midi")
 
-    @patch("src.murnau.ui.main_window.udp_client.SimpleUDPClient")
+    @patch("src.murnau.ui.main_window.get_transport")
     def test_close_event_handler(self, mock_udp_client):
         """Test close event handler logic"""
         from PyQt6.QtGui import QCloseEvent
@@ -211,7 +237,7 @@ class TestMurnauUIMethodsIsolated:
 class TestMurnauUIIntegrationSafe:
     """Safe integration tests that don't create complex widgets"""
 
-    @patch("src.murnau.ui.main_window.udp_client.SimpleUDPClient")
+    @patch("src.murnau.ui.main_window.get_transport")
     @patch("src.murnau.ui.main_window.mido.get_input_names")
     def test_initialization_flow(self, mock_midi, mock_udp_client):
         """Test initialization flow without widget creation"""
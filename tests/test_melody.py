@@ -1,18 +1,29 @@
 #!/usr/bin/env python3
 
+import asyncio
 import math
 import os
 
 # Import the module under test
 import sys
 import time
-from unittest.mock import Mock, call, patch
+from unittest.mock import AsyncMock, Mock, call, patch
 
 import pytest
 from pythonosc import udp_client
+from pythonosc.osc_bundle import OscBundle
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from src.murnau.synth import melody
+from tests.helpers import ManualClock
+
+
+@pytest.fixture(autouse=True)
+def fake_clock():
+    """Run scheduled playback on a clock that does not wait"""
+    clock = ManualClock()
+    with patch("src.murnau.synth.scheduler.SessionClock", return_value=clock):
+        yield clock
 
 
 class TestMidiToFreq:
@@ -105,35 +116,49 @@ class TestPlayNote:
             melody.play_note(mock_client, 440.0, 1.0)
 
 
+def bundled_messages(mock_client):
+    """Decode (address, value) pairs from bundles passed to client.send"""
+    return [
+        (msg.address, msg.params[0])
+        for sent in mock_client.send.call_args_list
+        for msg in OscBundle(sent[0][0].dgram)
+    ]
+
+
 class TestInitSynth:
     """Test synth initialization"""
 
     def test_init_synth_sends_all_parameters(self):
-        """Test that init_synth sends all required parameter messages"""
+        """Test that init_synth sends all required parameters in one bundle"""
         mock_client = Mock()
         synth_name = "test_synth"
 
         melody.init_synth(mock_client, synth_name)
 
-        # Verify all parameter messages are sent
-        expected_calls = [
-            call(f"/{synth_name}/wave_type", 2),
-            call(f"/{synth_name}/attack_L", 0.01),
-            call(f"/{synth_name}/decay_L", 0.1),
-            call(f"/{synth_name}/sustain_L", 0.7),
-            call(f"/{synth_name}/release_L", 0.3),
-            call(f"/{synth_name}/attack_R", 0.01),
-            call(f"/{synth_name}/decay_R", 0.1),
-            call(f"/{synth_name}/sustain_R", 0.7),
-            call(f"/{synth_name}/release_R", 0.3),
-            call(f"/{synth_name}/cutoff_L", 5000),
-            call(f"/{synth_name}/cutoff_R", 5000),
-            call(f"/{synth_name}/resonance_L", 0.5),
-            call(f"/{synth_name}/resonance_R", 0.5),
-            call(f"/{synth_name}/gain", 0.7),
+        # The whole patch fits into a single datagram
+        assert mock_client.send.call_count == 1
+        mock_client.send_message.assert_not_called()
+
+        expected = [
+            (f"/{synth_name}/wave_type", 2),
+            (f"/{synth_name}/attack_L", 0.01),
+            (f"/{synth_name}/decay_L", 0.1),
+            (f"/{synth_name}/sustain_L", 0.7),
+            (f"/{synth_name}/release_L", 0.3),
+            (f"/{synth_name}/attack_R", 0.01),
+            (f"/{synth_name}/decay_R", 0.1),
+            (f"/{synth_name}/sustain_R", 0.7),
+            (f"/{synth_name}/release_R", 0.3),
+            (f"/{synth_name}/cutoff_L", 5000),
+            (f"/{synth_name}/cutoff_R", 5000),
+            (f"/{synth_name}/resonance_L", 0.5),
+            (f"/{synth_name}/resonance_R", 0.5),
+            (f"/{synth_name}/gain", 0.7),
         ]
-        mock_client.send_message.assert_has_calls(expected_calls, any_order=True)
-        assert mock_client.send_message.call_count == 14
+        sent = bundled_messages(mock_client)
+        assert [address for address, _ in sent] == [a for a, _ in expected]
+        for (_, value), (_, expected_value) in zip(sent, expected):
+            assert value == pytest.approx(expected_value)
 
     def test_init_synth_default_name(self):
         """Test init_synth with default synth name"""
@@ -141,12 +166,13 @@ class TestInitSynth:
         melody.init_synth(mock_client)
 
         # Should use default synth name
-        mock_client.send_message.assert_any_call("/legato_synth_stereo/wave_type", 2)
+        addresses = [address for address, _ in bundled_messages(mock_client)]
+        assert "/legato_synth_stereo/wave_type" in addresses
 
     def test_init_synth_with_exception(self):
         """Test init_synth when client raises exception"""
         mock_client = Mock()
-        mock_client.send_message.side_effect = Exception("OSC Error")
+        mock_client.send.side_effect = Exception("OSC Error")
 
         # Should raise the exception
         with pytest.raises(Exception, match="OSC Error"):
@@ -157,19 +183,16 @@ class TestPlayMelody:
     """Test play_melody function"""
 
     @patch("src.murnau.synth.melody.init_synth")
-    @patch("src.murnau.synth.melody.play_note")
     @patch("src.murnau.synth.melody.midi_to_freq")
-    @patch("time.sleep")
-    @patch("pythonosc.udp_client.SimpleUDPClient")
+    @patch("src.murnau.synth.melody.get_transport")
     @patch("builtins.print")
     def test_play_melody_complete_flow(
         self,
         mock_print,
         mock_client_class,
-        mock_sleep,
         mock_midi_to_freq,
-        mock_play_note,
         mock_init_synth,
+        fake_clock,
     ):
         """Test the complete play_melody function flow"""
         mock_client = Mock()
@@ -183,6 +206,10 @@ class TestPlayMelody:
             329.63,
             261.63,
         ]
+        onsets = []
+        mock_client.send_message.side_effect = lambda address, value: onsets.append(
+            (fake_clock.t, address, value)
+        )
 
         melody.play_melody()
 
@@ -192,9 +219,6 @@ class TestPlayMelody:
         # Verify init_synth was called
         mock_init_synth.assert_called_once_with(mock_client, "legato_synth_stereo")
 
-        # Verify sleep after init
-        mock_sleep.assert_called_with(0.5)
-
         # Verify midi_to_freq calls for each note in melody
         assert mock_midi_to_freq.call_count == 7
         expected_midi_calls = [
@@ -208,8 +232,12 @@ class TestPlayMelody:
         ]
         mock_midi_to_freq.assert_has_calls(expected_midi_calls)
 
-        # Verify play_note calls
-        assert mock_play_note.call_count == 7
+        # The first note waits for the parameters to settle
+        assert onsets[:2] == [
+            (0.5, "/legato_synth_stereo/freq", 261.63),
+            (0.5, "/legato_synth_stereo/gate", 1.0),
+        ]
+        assert len(onsets) == 21
 
         # Verify print statements
         mock_print.assert_any_call("Initializing synth parameters...")
@@ -217,11 +245,8 @@ class TestPlayMelody:
         mock_print.assert_any_call("Melody finished!")
 
     @patch("src.murnau.synth.melody.init_synth")
-    @patch("src.murnau.synth.melody.play_note")
-    @patch("pythonosc.udp_client.SimpleUDPClient")
-    def test_play_melody_with_custom_data(
-        self, mock_client_class, mock_play_note, mock_init_synth
-    ):
+    @patch("src.murnau.synth.melody.get_transport")
+    def test_play_melody_with_custom_data(self, mock_client_class, mock_init_synth):
         """Test play_melody with custom melody data"""
         mock_client = Mock()
         mock_client_class.return_value = mock_client
@@ -229,14 +254,37 @@ class TestPlayMelody:
         custom_melody = [(60, 1.0), (62, 1.0)]
         melody.play_melody(melody_data=custom_melody)
 
-        # Verify play_note was called with custom melody
-        assert mock_play_note.call_count == 2
+        # Two notes, each freq, gate on and gate off
+        assert mock_client.send_message.call_count == 6
 
+    @patch("src.murnau.synth.melody.midi_to_freq")
     @patch("src.murnau.synth.melody.init_synth")
-    @patch("src.murnau.synth.melody.play_note")
-    @patch("pythonosc.udp_client.SimpleUDPClient")
+    @patch("src.murnau.synth.melody.get_transport")
+    def test_play_melody_skips_unmapped_notes(
+        self, mock_client_class, mock_init_synth, mock_midi_to_freq, fake_clock
+    ):
+        """A key the tuning leaves unmapped rests instead of sending None"""
+        mock_client = mock_client_class.return_value
+        mock_midi_to_freq.side_effect = [261.63, None, 293.66]
+        onsets = []
+        mock_client.send_message.side_effect = lambda address, value: onsets.append(
+            (fake_clock.t, address, value)
+        )
+
+        melody.play_melody(melody_data=[(60, 1.0), (61, 1.0), (62, 1.0)])
+
+        freqs = [(t, value) for t, address, value in onsets if address.endswith("freq")]
+        start = freqs[0][0]
+        assert freqs == [
+            (start, 261.63),
+            (pytest.approx(start + 2 * (1.0 + melody.NOTE_GAP)), 293.66),
+        ]
+        assert mock_client.send_message.call_count == 6
+
+    @patch("src.murnau.synth.melody.init_synth")
+    @patch("src.murnau.synth.melody.get_transport")
     def test_play_melody_with_init_synth_exception(
-        self, mock_client_class, mock_play_note, mock_init_synth
+        self, mock_client_class, mock_init_synth
     ):
         """Test play_melody when init_synth raises exception"""
         mock_client = Mock()
@@ -247,21 +295,20 @@ class TestPlayMelody:
         with pytest.raises(Exception, match="Init error"):
             melody.play_melody()
 
-        # play_note should not be called
-        mock_play_note.assert_not_called()
+        # No note should be sent
+        mock_client.send_message.assert_not_called()
 
     @patch("src.murnau.synth.melody.init_synth")
-    @patch("src.murnau.synth.melody.play_note")
     @patch("src.murnau.synth.melody.midi_to_freq")
-    @patch("pythonosc.udp_client.SimpleUDPClient")
-    def test_play_melody_with_play_note_exception(
-        self, mock_client_class, mock_midi_to_freq, mock_play_note, mock_init_synth
+    @patch("src.murnau.synth.melody.get_transport")
+    def test_play_melody_with_send_exception(
+        self, mock_client_class, mock_midi_to_freq, mock_init_synth
     ):
-        """Test play_melody when play_note raises exception"""
+        """Test play_melody when sending a note raises exception"""
         mock_client = Mock()
         mock_client_class.return_value = mock_client
         mock_midi_to_freq.return_value = 440.0
-        mock_play_note.side_effect = Exception("Play error")
+        mock_client.send_message.side_effect = Exception("Play error")
 
         # Should raise the exception on first note
         with pytest.raises(Exception, match="Play error"):
@@ -274,50 +321,38 @@ class TestPlayMelody:
 class TestMelodyData:
     """Test the melody data structure"""
 
-    def test_melody_structure(self):
-        """Test that the melody data has the expected structure"""
-        # Access the melody data by running the relevant part
-        expected_melody = [
-            (60, 0.5),  # C4
-            (64, 0.5),  # E4
-            (67, 0.5),  # G4
-            (72, 1.0),  # C5
-            (67, 0.5),  # G4
-            (64, 0.5),  # E4
-            (60, 1.0),  # C4
-        ]
+    def test_melody_structure(self, fake_clock):
+        """Notes are scheduled with the default melody's durations"""
+        with patch("src.murnau.synth.melody.init_synth"), patch(
+            "src.murnau.synth.melody.get_transport"
+        ) as mock_client_class:
+            gates = []
+
+            def record(address, value):
+                if address.endswith("/gate"):
+                    gates.append((fake_clock.t, value))
+
+            mock_client_class.return_value.send_message.side_effect = record
 
-        # We need to access the melody from the play_melody function context
-        # Since it's defined within play_melody(), we test it indirectly through calls
-        with patch("src.murnau.synth.melody.play_note") as mock_play_note, patch(
-            "src.murnau.synth.melody.init_synth"
-        ), patch("src.murnau.synth.melody.midi_to_freq") as mock_midi_to_freq, patch(
-            "time.sleep"
-        ), patch(
-            "pythonosc.udp_client.SimpleUDPClient"
-        ):
-
-            mock_midi_to_freq.return_value = 440.0
             melody.play_melody()
 
-            # Verify the melody notes are processed in the right order
-            play_note_calls = mock_play_note.call_args_list
-            assert len(play_note_calls) == 7
+        # Gate on and off times give each note's duration
+        durations = [
+            round(off - on, 9) for (on, _), (off, _) in zip(gates[::2], gates[1::2])
+        ]
+        assert durations == [0.5, 0.5, 0.5, 1.0, 0.5, 0.5, 1.0]
 
-            # Extract durations from the calls to verify melody structure
-            durations = [
-                call[0][2] for call in play_note_calls
-            ]  # Third argument is duration
-            expected_durations = [0.5, 0.5, 0.5, 1.0, 0.5, 0.5, 1.0]
-            assert durations == expected_durations
+        # Each note starts after the previous one and the gap
+        starts = [on for on, _ in gates[::2]]
+        for previous, duration, start in zip(starts, durations, starts[1:]):
+            assert start == pytest.approx(previous + duration + melody.NOTE_GAP)
 
 
 class TestIntegration:
     """Integration tests"""
 
-    @patch("time.sleep")
-    @patch("pythonosc.udp_client.SimpleUDPClient")
-    def test_full_melody_integration(self, mock_client_class, mock_sleep):
+    @patch("src.murnau.synth.melody.get_transport")
+    def test_full_melody_integration(self, mock_client_class):
         """Test full melody playing without mocking internal functions"""
         mock_client = Mock()
         mock_client_class.return_value = mock_client
@@ -328,11 +363,94 @@ class TestIntegration:
         # Verify client was created correctly
         mock_client_class.assert_called_once_with("127.0.0.1", 5510)
 
-        # Verify that OSC messages were sent (init + melody)
-        # Actual count is 35 based on test output
-        expected_message_count = 35  # Adjusted based on actual implementation
-        assert mock_client.send_message.call_count == expected_message_count
+        # Init is one bundle, each of the 7 notes sends freq + gate on/off
+        assert mock_client.send.call_count == 1
+        assert mock_client.send_message.call_count == 21
 
         # Verify some key messages were sent
-        mock_client.send_message.assert_any_call("/legato_synth_stereo/wave_type", 2)
-        mock_client.send_message.assert_any_call("/legato_synth_stereo/gain", 0.7)
+        sent = dict(bundled_messages(mock_client))
+        assert sent["/legato_synth_stereo/wave_type"] == 2
+        assert sent["/legato_synth_stereo/gain"] == pytest.approx(0.7)
+
+
+class TestAsyncMelody:
+    """Test the asyncio melody helpers"""
+
+    @staticmethod
+    def async_client():
+        """Mock AsyncOSCClient recording sends"""
+        client = Mock()
+        client.connect = AsyncMock(return_value=client)
+        client.close = AsyncMock()
+        return client
+
+    @patch("src.murnau.synth.melody.asyncio.sleep", new_callable=AsyncMock)
+    def test_play_note_async(self, mock_sleep):
+        """Notes send freq and gate and await instead of sleeping"""
+        client = self.async_client()
+
+        asyncio.run(melody.play_note_async(client, 440.0, 0.25))
+
+        assert client.send.call_args_list == [
+            call("/freq", 440.0),
+            call("/gate", 1.0),
+            call("/gate", 0.0),
+        ]
+        assert mock_sleep.await_args_list == [call(0.25), call(melody.NOTE_GAP)]
+
+    @patch("src.murnau.synth.melody.asyncio.sleep", new_callable=AsyncMock)
+    def test_init_synth_async(self, mock_sleep):
+        """The init patch goes out as one batch"""
+        client = self.async_client()
+
+        asyncio.run(melody.init_synth_async(client))
+
+        client.send_batch.assert_called_once_with(melody.INIT_PARAMS)
+        mock_sleep.assert_awaited_once_with(melody.SETTLE_TIME)
+
+    @patch("src.murnau.synth.melody.asyncio.sleep", new_callable=AsyncMock)
+    @patch("src.murnau.synth.melody.AsyncOSCClient")
+    def test_play_melody_async_owns_client(self, mock_client_class, mock_sleep):
+        """A client created by play_melody_async is closed afterwards"""
+        client = self.async_client()
+        mock_client_class.return_value = client
+
+        asyncio.run(melody.play_melody_async([(69, 0.1)], "10.0.0.1", 7000, "s"))
+
+        mock_client_class.assert_called_once_with("10.0.0.1", 7000, "s")
+        client.send.assert_any_call("/freq", 440.0)
+        client.close.assert_awaited_once()
+
+    @patch("src.murnau.synth.melody.asyncio.sleep", new_callable=AsyncMock)
+    def test_play_melody_async_default_melody(self, mock_sleep):
+        """The default melody is played on a given client, left open"""
+        client = self.async_client()
+
+        asyncio.run(melody.play_melody_async(client=client))
+
+        gates = [c for c in client.send.call_args_list if c == call("/gate", 1.0)]
+        assert len(gates) == len(melody.DEFAULT_MELODY)
+        client.close.assert_not_called()
+
+    def test_many_melodies_run_concurrently(self):
+        """Dozens of sequences share one event loop without serializing"""
+        clients = [self.async_client() for _ in range(32)]
+        notes = [(60, 0.05), (64, 0.05)]
+
+        async def run():
+            with patch.object(melody, "SETTLE_TIME", 0.05), patch.object(
+                melody, "NOTE_GAP", 0.0
+            ):
+                loop = asyncio.get_running_loop()
+                start = loop.time()
+                await asyncio.gather(
+                    *(melody.play_melody_async(notes, client=c) for c in clients)
+                )
+                return loop.time() - start
+
+        elapsed = asyncio.run(run())
+
+        # One sequence takes ~0.15s; run serially 32 would take ~4.8s
+        assert elapsed < 1.0
+        for client in clients:
+            assert client.send.call_count == 6
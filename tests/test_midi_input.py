@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import mido
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.murnau.utils.midi_input import CALLBACK, POLL, MidiInput
+
+
+class FakeInput(mido.ports.BaseInput):
+    """mido input port fed by the test instead of a device"""
+
+    def _open(self, callback=None):
+        self.callback = callback
+
+    def _receive(self, block=True):
+        return None
+
+    def feed(self, message):
+        """Deliver a message the way a backend would"""
+        if self.callback is not None:
+            self.callback(message)
+        else:
+            with self._lock:
+                self._messages.append(message)
+
+
+class Collector:
+    def __init__(self, count):
+        self.messages = []
+        self.count = count
+        self.done = threading.Event()
+
+    def __call__(self, message):
+        self.messages.append(message)
+        if len(self.messages) >= self.count:
+            self.done.set()
+
+
+class TestMidiInput:
+    """Test the MIDI ingestion modes"""
+
+    def test_unknown_mode_rejected(self):
+        with pytest.raises(ValueError, match="Unknown MIDI input mode"):
+            MidiInput(Mock(), mode="spin")
+
+    @patch("src.murnau.utils.midi_input.mido.open_input", side_effect=FakeInput)
+    def test_callback_mode_delivers_on_arrival(self, mock_open_input):
+        """Callback mode hands messages over without any thread of its own"""
+        collector = Collector(2)
+        midi_input = MidiInput(collector, CALLBACK)
+        midi_input.open("Test Port")
+
+        midi_input.port.feed(mido.Message("note_on", note=60))
+        midi_input.port.feed(mido.Message("note_off", note=60))
+
+        # Delivered synchronously by the "backend" thread
+        assert [m.type for m in collector.messages] == ["note_on", "note_off"]
+        assert midi_input._thread is None
+        assert midi_input.received == 2
+        midi_input.close()
+        assert not midi_input.is_open
+
+    @patch("src.murnau.utils.midi_input.mido.open_input", side_effect=FakeInput)
+    def test_stamped_handler_gets_arrival_time(self, mock_open_input):
+        """A stamped input passes the ingestion time with each message"""
+        handler = Mock()
+        midi_input = MidiInput(handler, CALLBACK, stamped=True)
+        midi_input.open("Test Port")
+
+        before = time.perf_counter()
+        midi_input.port.feed(mido.Message("note_on", note=60))
+
+        message, stamp = handler.call_args.args
+        assert message.type == "note_on"
+        assert before <= stamp <= time.perf_counter()
+        midi_input.close()
+
+    @patch("src.murnau.utils.midi_input.mido.open_input", side_effect=FakeInput)
+    def test_poll_mode_delivers_pending(self, mock_open_input):
+        """Poll mode drains iter_pending() on its own thread"""
+        collector = Collector(3)
+        midi_input = MidiInput(collector, POLL)
+        midi_input.open("Test Port")
+
+        for note in (60, 62, 64):
+            midi_input.port.feed(mido.Message("note_on", note=note))
+
+        assert collector.done.wait(1.0)
+        assert [m.note for m in collector.messages] == [60, 62, 64]
+        midi_input.close()
+        assert midi_input._thread is None
+
+    @patch("src.murnau.utils.midi_input.mido.open_input", side_effect=FakeInput)
+    def test_handler_errors_are_counted(self, mock_open_input, capsys):
+        """A failing handler does not stop delivery"""
+        handler = Mock(side_effect=[Exception("boom"), None])
+        midi_input = MidiInput(handler)
+        midi_input.open("Test Port")
+
+        midi_input.port.feed(mido.Message("note_on", note=60))
+        midi_input.port.feed(mido.Message("note_on", note=61))
+
+        assert handler.call_count == 2
+        assert midi_input.errors == 1
+        assert "MIDI processing error: boom" in capsys.readouterr().out
+        midi_input.close()
+
+    @patch("src.murnau.utils.midi_input.mido.open_input")
+    def test_open_failure_leaves_input_closed(self, mock_open_input):
+        mock_open_input.side_effect = IOError("no such port")
+        midi_input = MidiInput(Mock())
+
+        with pytest.raises(IOError):
+            midi_input.open("Missing")
+        assert not midi_input.is_open
+
+
+class TestMidiInputMerge:
+    """Test several ports merged into one stream"""
+
+    @patch("src.murnau.utils.midi_input.mido.open_input", side_effect=FakeInput)
+    def test_ports_merge_in_stamp_order(self, mock_open_input):
+        """Messages of every port reach one handler with their port name"""
+        handler = Mock()
+        midi_input = MidiInput(handler, CALLBACK, named=True)
+        midi_input.open("Keys")
+        midi_input.open("Faders")
+        keys, faders = (s.port for s in midi_input._ports.values())
+
+        keys.feed(mido.Message("note_on", note=60))
+        faders.feed(mido.Message("control_change", control=7, value=10))
+        keys.feed(mido.Message("note_off", note=60))
+
+        calls = [c.args for c in handler.call_args_list]
+        assert [(m.type, port) for m, _, port in calls] == [
+            ("note_on", "Keys"),
+            ("control_change", "Faders"),
+            ("note_off", "Keys"),
+        ]
+        stamps = [stamp for _, stamp, _ in calls]
+        assert stamps == sorted(stamps)
+        assert midi_input.port_names == ["Keys", "Faders"]
+        midi_input.close()
+        assert keys.closed and faders.closed
+        assert not midi_input.is_open
+
+    @patch("src.murnau.utils.midi_input.mido.open_input", side_effect=FakeInput)
+    def test_channel_filter(self, mock_open_input):
+        """Only the port's channels pass, channel-less messages always do"""
+        handler = Mock()
+        midi_input = MidiInput(handler)
+        midi_input.open("Pedals", channels=[9])
+
+        midi_input.port.feed(mido.Message("note_on", note=36, channel=9))
+        midi_input.port.feed(mido.Message("note_on", note=36, channel=0))
+        midi_input.port.feed(mido.Message("sysex", data=[1, 2]))
+
+        assert [m.type for (m,), _ in handler.call_args_list] == ["note_on", "sysex"]
+        stats = midi_input.stats()["Pedals"]
+        assert stats["received"] == 3
+        assert stats["filtered"] == 1
+
+        midi_input.set_channels("Pedals", None)
+        midi_input.port.feed(mido.Message("note_on", note=36, channel=0))
+        assert handler.call_count == 3
+        midi_input.close()
+
+    def test_invalid_channel_rejected(self):
+        with pytest.raises(ValueError, match="Invalid MIDI channel"):
+            MidiInput(Mock()).open("Keys", channels=[16])
+
+    @patch("src.murnau.utils.midi_input.mido.open_input", side_effect=FakeInput)
+    def test_port_opened_twice_rejected(self, mock_open_input):
+        midi_input = MidiInput(Mock())
+        midi_input.open("Keys")
+        with pytest.raises(ValueError, match="already open"):
+            midi_input.open("Keys")
+        assert mock_open_input.call_count == 1
+        midi_input.close()
+
+    @patch("src.murnau.utils.midi_input.mido.open_input", side_effect=FakeInput)
+    def test_poll_mode_uses_one_thread(self, mock_open_input):
+        """Poll mode drains every port from a single thread"""
+        collector = Collector(2)
+        midi_input = MidiInput(collector, POLL)
+        midi_input.open("Keys")
+        thread = midi_input._thread
+        midi_input.open("Faders")
+        assert midi_input._thread is thread
+
+        for state in list(midi_input._ports.values()):
+            state.port.feed(mido.Message("note_on", note=60))
+
+        assert collector.done.wait(1.0)
+        assert len(collector.messages) == 2
+        midi_input.close()
+        assert not thread.is_alive()
+
+    @patch("src.murnau.utils.midi_input.mido.open_input", side_effect=FakeInput)
+    def test_event_rate(self, mock_open_input):
+        """Rates are events per second of the last window, idle ports decay"""
+        midi_input = MidiInput(Mock())
+        midi_input.open("Keys")
+        state = midi_input._ports["Keys"]
+
+        for _ in range(10):
+            midi_input.port.feed(mido.Message("clock"))
+        state.window_start -= 2.0
+
+        assert midi_input.stats()["Keys"]["rate"] == pytest.approx(5.0, rel=0.01)
+        midi_input.close()
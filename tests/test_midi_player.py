@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import tracemalloc
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import mido
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.murnau.synth import midi_player
+from src.murnau.synth.midi_player import MidiFilePlayer, file_messages, parameter_map
+from src.murnau.utils.cc_routing import Binding
+from src.murnau.utils.tuning import note_freq
+from tests.helpers import ManualClock
+
+
+def make_file(*tracks, ticks_per_beat=480):
+    """Type 1 MIDI file with the given tracks of messages"""
+    midi_file = mido.MidiFile(type=1, ticks_per_beat=ticks_per_beat)
+    for messages in tracks:
+        midi_file.tracks.append(mido.MidiTrack(messages))
+    return midi_file
+
+
+class TestFileMessages:
+    """Test merging tracks and converting ticks through the tempo map"""
+
+    def test_tracks_merge_in_time_order(self):
+        midi_file = make_file(
+            [
+                mido.Message("note_on", note=60, time=0),
+                mido.Message("note_off", note=60, time=960),
+            ],
+            [
+                mido.Message("control_change", control=74, value=10, time=480),
+                mido.Message("control_change", control=74, value=20, time=480),
+            ],
+        )
+
+        events = [(t, m.type) for t, m in file_messages(midi_file)]
+
+        # 120 bpm by default, a beat of 480 ticks is half a second; the note
+        # off and the second CC share a tick and keep track order
+        assert events == [
+            (0.0, "note_on"),
+            (0.5, "control_change"),
+            (1.0, "note_off"),
+            (1.0, "control_change"),
+        ]
+
+    def test_tempo_changes_apply_from_their_tick(self):
+        midi_file = make_file(
+            [
+                mido.MetaMessage("set_tempo", tempo=1000000, time=480),
+                mido.MetaMessage("set_tempo", tempo=250000, time=480),
+            ],
+            [mido.Message("note_on", note=60, time=i and 480) for i in range(4)],
+        )
+
+        times = [t for t, _ in file_messages(midi_file)]
+
+        # Beats at 0.5 s (120 bpm), then 1 s (60 bpm), then 0.25 s (240 bpm)
+        assert times == pytest.approx([0.0, 0.5, 1.5, 1.75])
+
+    def test_type_2_rejected(self):
+        with pytest.raises(ValueError, match="Type 2"):
+            list(file_messages(mido.MidiFile(type=2)))
+
+    def test_constant_memory(self):
+        """Tracks are consumed lazily, nothing grows with the file length"""
+
+        def track(count):
+            for i in range(count):
+                yield mido.Message("note_on", note=60, velocity=i % 2 * 100, time=1)
+
+        def peak(count):
+            midi_file = SimpleNamespace(
+                type=1, ticks_per_beat=480, tracks=[track(count), track(count)]
+            )
+            player = MidiFilePlayer(Mock())
+            tracemalloc.start()
+            for _ in player.events(midi_file):
+                pass
+            result = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            return result
+
+        assert peak(40000) < peak(4000) + 16384
+
+
+class TestParameterMap:
+    """Test CC automation scaling"""
+
+    def test_default_map_scales_to_control_range(self):
+        parameters = parameter_map()
+
+        ((address, values),) = parameters[74]
+        assert address == "/cutoff_L"
+        assert values[0] == 20.0
+        assert values[127] == 20000.0
+
+    def test_stepped_controls_are_quantized(self):
+        ((_, values),) = parameter_map({1: "wave_type"})[1]
+        assert set(values) == {0.0, 1.0, 2.0, 3.0}
+
+    def test_bindings_with_curves(self):
+        parameters = parameter_map(
+            {20: [Binding("gain", "linear", 0.0, 0.5), Binding("sustain_L")]}
+        )
+
+        (gain, gain_values), (sustain, _) = parameters[20]
+        assert (gain, sustain) == ("/gain", "/sustain_L")
+        assert gain_values[127] == pytest.approx(0.5)
+
+    def test_unknown_target_rejected(self):
+        with pytest.raises(ValueError, match="Unknown CC automation target"):
+            parameter_map({20: "warp_drive"})
+
+
+class TestMidiFilePlayer:
+    """Test note handling and playback at deadlines"""
+
+    def test_notes_follow_last_priority(self):
+        player = MidiFilePlayer(Mock())
+        messages = [
+            mido.Message("note_on", note=60, velocity=100),
+            mido.Message("note_on", note=64, velocity=100),
+            mido.Message("note_off", note=64),
+            mido.Message("note_on", note=60, velocity=0),
+        ]
+
+        result = [player.translate(message) for message in messages]
+
+        assert result == [
+            [("/freq", note_freq(60)), ("/gate", 1.0)],
+            [("/freq", note_freq(64))],
+            [("/freq", note_freq(60))],
+            [("/gate", 0.0)],
+        ]
+
+    def test_velocity_address(self):
+        player = MidiFilePlayer(Mock(), velocity_address="/gain")
+
+        messages = player.translate(mido.Message("note_on", note=60, velocity=127))
+
+        assert ("/gain", 1.0) in messages
+        assert messages[-1] == ("/gate", 1.0)
+
+    def test_all_notes_off_closes_gate(self):
+        player = MidiFilePlayer(Mock())
+        player.translate(mido.Message("note_on", note=60, velocity=100))
+
+        result = player.translate(mido.Message("control_change", control=123))
+
+        assert result == [("/gate", 0.0)]
+        assert len(player._notes) == 0
+
+    def test_play_sends_batches_at_deadlines(self):
+        client = Mock()
+        player = MidiFilePlayer(client)
+        player.clock = ManualClock(late=0.001)
+        midi_file = make_file(
+            [
+                mido.Message("note_on", note=60, velocity=100, time=0),
+                mido.Message("control_change", control=7, value=127, time=0),
+                mido.Message("note_off", note=60, time=480),
+            ]
+        )
+
+        report = player.play(midi_file, start=1.0)
+
+        assert [c.args[0] for c in client.send_batch.call_args_list] == [
+            [("/freq", note_freq(60)), ("/gate", 1.0), ("/gain", 1.0)],
+            [("/gate", 0.0)],
+        ]
+        assert report["events"] == 2
+        assert report["max_ms"] == pytest.approx(1.0)
+        assert report["drift_ms"] == pytest.approx(0.0)
+
+    def test_stop_releases_the_gate(self):
+        client = Mock()
+        player = MidiFilePlayer(client)
+        player.clock = ManualClock()
+        midi_file = make_file(
+            [
+                mido.Message("note_on", note=60, velocity=100, time=0),
+                mido.Message("note_off", note=60, time=480 * 60),
+            ]
+        )
+        client.send_batch.side_effect = lambda messages: player.stop()
+
+        report = player.play(midi_file, start=0.0)
+
+        assert report["events"] == 1
+        assert client.send_batch.call_args.args[0] == [("/gate", 0.0)]
+        # Waited in short steps and gave up at the first check
+        assert player.clock.t == pytest.approx(midi_player.STOP_CHECK_INTERVAL)
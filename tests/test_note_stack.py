@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.murnau.utils.note_stack import HIGH, LAST, LOW, PRIORITIES, NoteStack
+
+
+class TestNoteStack:
+    """Test the held-note priority stack"""
+
+    def test_empty(self):
+        stack = NoteStack()
+        assert stack.current() is None
+        assert len(stack) == 0
+        assert not stack.remove(60)
+
+    @pytest.mark.parametrize("priority,expected", [(LAST, 64), (HIGH, 67), (LOW, 60)])
+    def test_priorities(self, priority, expected):
+        stack = NoteStack(priority)
+        for note in (60, 67, 64):
+            stack.push(note, note * 10)
+
+        assert stack.current() == expected
+        assert stack.value(expected) == expected * 10
+
+    def test_fallback_after_release(self):
+        stack = NoteStack(LAST)
+        for note in (60, 67, 64):
+            stack.push(note)
+
+        stack.remove(64)
+        assert stack.current() == 67
+        stack.remove(67)
+        assert stack.current() == 60
+        stack.remove(60)
+        assert stack.current() is None
+
+    def test_repress_moves_to_top(self):
+        stack = NoteStack(LAST)
+        stack.push(60, 1.0)
+        stack.push(64, 2.0)
+
+        assert not stack.push(60, 3.0)
+        assert stack.current() == 60
+        assert stack.value(60) == 3.0
+        assert list(stack) == [64, 60]
+
+    def test_priority_can_change(self):
+        stack = NoteStack(LAST)
+        stack.push(72)
+        stack.push(48)
+
+        stack.priority = HIGH
+        assert stack.current() == 72
+        with pytest.raises(ValueError, match="Unknown note priority"):
+            stack.priority = "loudest"
+
+    def test_clear(self):
+        stack = NoteStack(HIGH)
+        stack.push(60)
+        stack.clear()
+
+        assert stack.current() is None
+        stack.push(40)
+        assert stack.current() == 40
+
+    @pytest.mark.parametrize("priority", PRIORITIES)
+    def test_stress_against_reference(self, priority):
+        """Thousands of overlapping notes agree with a naive model"""
+        rng = random.Random(1234)
+        stack = NoteStack(priority)
+        held = []  # press order
+
+        for _ in range(20000):
+            note = rng.randrange(128)
+            if note in held and rng.random() < 0.5:
+                held.remove(note)
+                assert stack.remove(note)
+            else:
+                if note in held:
+                    held.remove(note)
+                held.append(note)
+                stack.push(note)
+
+            if not held:
+                expected = None
+            elif priority == LAST:
+                expected = held[-1]
+            elif priority == HIGH:
+                expected = max(held)
+            else:
+                expected = min(held)
+            assert stack.current() == expected
+            assert len(stack) == len(held)
@@ -5,113 +5,321 @@ import sys
 from unittest.mock import Mock, patch
 
 import pytest
+from pythonosc.osc_bundle import OscBundle
+from pythonosc.osc_message import OscMessage
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from src.murnau.utils.osc_client import OSCClient
+from src.murnau.utils.osc_client import (
+    BUNDLE_HEADER_SIZE,
+    IMMEDIATELY,
+    MAX_DATAGRAM_SIZE,
+    NTP_EPOCH_OFFSET,
+    OSCClient,
+    build_bundles,
+    encode_message,
+    message_template,
+    ntp_timetag,
+    send_batch,
+)
+
+
+def sent_packets(mock_transport):
+    """Decode the OSC messages written to a mocked transport"""
+    return [
+        OscMessage(bytes(args[0])) for args, _ in mock_transport.sendto.call_args_list
+    ]
 
 
 class TestOSCClient:
     """Test OSCClient utility class"""
 
-    @patch("src.murnau.utils.osc_client.udp_client.SimpleUDPClient")
-    def test_init_creates_client(self, mock_udp_client):
+    @patch("src.murnau.utils.osc_client.get_transport")
+    def test_init_creates_client(self, mock_get_transport):
         """Test OSCClient initialization"""
         mock_client = Mock()
-        mock_udp_client.return_value = mock_client
+        mock_get_transport.return_value = mock_client
 
         osc = OSCClient("192.168.1.1", 5511, "test_synth")
 
-        mock_udp_client.assert_called_once_with("192.168.1.1", 5511)
+        mock_get_transport.assert_called_once_with("192.168.1.1", 5511)
         assert osc.client == mock_client
         assert osc.synth_name == "test_synth"
 
-    @patch("src.murnau.utils.osc_client.udp_client.SimpleUDPClient")
-    def test_init_default_values(self, mock_udp_client):
+    @patch("src.murnau.utils.osc_client.get_transport")
+    def test_init_default_values(self, mock_get_transport):
         """Test OSCClient with default values"""
-        mock_client = Mock()
-        mock_udp_client.return_value = mock_client
-
         osc = OSCClient()
 
-        mock_udp_client.assert_called_once_with("127.0.0.1", 5510)
+        mock_get_transport.assert_called_once_with("127.0.0.1", 5510)
         assert osc.synth_name == "legato_synth_stereo"
 
-    @patch("src.murnau.utils.osc_client.udp_client.SimpleUDPClient")
-    def test_send_message(self, mock_udp_client):
+    @patch("src.murnau.utils.osc_client.get_transport")
+    def test_init_with_transport(self, mock_get_transport):
+        """A given transport is used instead of the shared one"""
+        transport = Mock()
+
+        osc = OSCClient(transport=transport)
+
+        mock_get_transport.assert_not_called()
+        assert osc.client is transport
+
+    @patch("src.murnau.utils.osc_client.get_transport")
+    def test_send_message(self, mock_get_transport):
         """Test sending OSC message with synth name prefix"""
         mock_client = Mock()
-        mock_udp_client.return_value = mock_client
+        mock_get_transport.return_value = mock_client
 
         osc = OSCClient(synth_name="test_synth")
         osc.send("/freq", 440.0)
 
-        mock_client.send_message.assert_called_once_with("/test_synth/freq", 440.0)
+        [msg] = sent_packets(mock_client)
+        assert msg.address == "/test_synth/freq"
+        assert msg.params == [440.0]
+        mock_client.send_message.assert_not_called()
+
+    @patch("src.murnau.utils.osc_client.get_transport")
+    def test_send_reuses_cached_packet(self, mock_get_transport):
+        """Repeated sends to an address reuse one pre-encoded buffer"""
+        osc = OSCClient(synth_name="test_synth")
+        osc.send("/cutoff_L", 1000.0)
+        osc.send("/cutoff_L", 2000.0)
+
+        calls = mock_get_transport.return_value.sendto.call_args_list
+        assert calls[0][0][0] is calls[1][0][0]
+        assert len(osc._templates) == 1
+        assert OscMessage(bytes(calls[1][0][0])).params == [2000.0]
+
+    @patch("src.murnau.utils.osc_client.get_transport")
+    def test_send_coerces_numbers_to_float(self, mock_get_transport):
+        """Ints and bools go out as floats, strings keep their OSC type"""
+        mock_client = Mock()
+        mock_get_transport.return_value = mock_client
 
-    @patch("src.murnau.utils.osc_client.udp_client.SimpleUDPClient")
-    def test_send_raw_message(self, mock_udp_client):
+        osc = OSCClient(synth_name="test_synth")
+        osc.send("/gate", 1)
+        packet = bytes(mock_client.sendto.call_args.args[0])
+        osc.send("/gate", True)
+        osc.send("/preset", "warm")
+
+        assert packet == encode_message("/test_synth/gate", 1.0)
+        assert bytes(mock_client.sendto.call_args.args[0]) == packet
+        mock_client.send_message.assert_called_once_with(
+            "/test_synth/preset", "warm", critical=False
+        )
+
+    @patch("src.murnau.utils.osc_client.get_transport")
+    def test_note_messages_are_critical(self, mock_get_transport):
+        """Gates wait for buffer space, parameters may be dropped"""
+        transport = mock_get_transport.return_value
+        osc = OSCClient(synth_name="test_synth")
+
+        osc.send("/gate", 1.0)
+        osc.send("/gain", 0.5)
+        osc.send("/gate", 0)
+
+        assert [c.args[1] for c in transport.sendto.call_args_list] == [
+            True,
+            False,
+            True,
+        ]
+
+    def test_message_template_layout(self):
+        """Templates hold the encoded prefix and a float slot at the end"""
+        packet, offset = message_template("/synth/gain")
+
+        assert offset == len(packet) - 4
+        assert bytes(packet[:offset]) == encode_message("/synth/gain", 0)[:offset]
+
+    @patch("src.murnau.utils.osc_client.get_transport")
+    def test_send_raw_message(self, mock_get_transport):
         """Test sending raw OSC message without synth name prefix"""
         mock_client = Mock()
-        mock_udp_client.return_value = mock_client
+        mock_get_transport.return_value = mock_client
 
         osc = OSCClient(synth_name="test_synth")
         osc.send_raw("/raw/message", 123)
 
         mock_client.send_message.assert_called_once_with("/raw/message", 123)
 
-    @patch("src.murnau.utils.osc_client.udp_client.SimpleUDPClient")
-    def test_set_synth_name(self, mock_udp_client):
+    @patch("src.murnau.utils.osc_client.get_transport")
+    def test_set_synth_name(self, mock_get_transport):
         """Test changing synth name"""
         mock_client = Mock()
-        mock_udp_client.return_value = mock_client
+        mock_get_transport.return_value = mock_client
 
         osc = OSCClient(synth_name="old_synth")
+        osc.send("/test", 1.0)
         osc.set_synth_name("new_synth")
 
         assert osc.synth_name == "new_synth"
 
-        # Test that new name is used
-        osc.send("/test", 42)
-        mock_client.send_message.assert_called_with("/new_synth/test", 42)
+        # Test that new name is used, cached packets are rebuilt
+        osc.send("/test", 42.0)
+        msg = sent_packets(mock_client)[-1]
+        assert msg.address == "/new_synth/test"
+        assert msg.params == [42.0]
 
-    @patch("src.murnau.utils.osc_client.udp_client.SimpleUDPClient")
-    def test_reconnect(self, mock_udp_client):
+    @patch("src.murnau.utils.osc_client.get_transport")
+    def test_reconnect(self, mock_get_transport):
         """Test reconnecting with new IP and port"""
         mock_client1 = Mock()
         mock_client2 = Mock()
-        mock_udp_client.side_effect = [mock_client1, mock_client2]
+        mock_get_transport.side_effect = [mock_client1, mock_client2]
 
         osc = OSCClient("127.0.0.1", 5510)
         assert osc.client == mock_client1
 
         osc.reconnect("192.168.1.100", 5511)
 
-        # Should create new client
-        assert mock_udp_client.call_count == 2
-        mock_udp_client.assert_any_call("192.168.1.100", 5511)
+        # Should switch to the transport of the new destination
+        assert mock_get_transport.call_count == 2
+        mock_get_transport.assert_any_call("192.168.1.100", 5511)
         assert osc.client == mock_client2
 
-    @patch("src.murnau.utils.osc_client.udp_client.SimpleUDPClient")
-    def test_send_with_exception(self, mock_udp_client):
-        """Test send message with client exception"""
-        mock_client = Mock()
-        mock_client.send_message.side_effect = Exception("Connection error")
-        mock_udp_client.return_value = mock_client
+    @patch("src.murnau.utils.osc_client.get_transport")
+    def test_send_with_exception(self, mock_get_transport):
+        """Test send message with socket exception"""
+        mock_get_transport.return_value.sendto.side_effect = Exception(
+            "Connection error"
+        )
 
         osc = OSCClient()
 
         # Should raise exception (OSC client doesn't handle exceptions)
         with pytest.raises(Exception, match="Connection error"):
-            osc.send("/test", 42)
+            osc.send("/test", 42.0)
 
-    @patch("src.murnau.utils.osc_client.udp_client.SimpleUDPClient")
-    def test_send_raw_with_exception(self, mock_udp_client):
+    @patch("src.murnau.utils.osc_client.get_transport")
+    def test_send_raw_with_exception(self, mock_get_transport):
         """Test send raw message with client exception"""
         mock_client = Mock()
         mock_client.send_message.side_effect = Exception("Connection error")
-        mock_udp_client.return_value = mock_client
+        mock_get_transport.return_value = mock_client
 
         osc = OSCClient()
 
         # Should raise exception (OSC client doesn't handle exceptions)
         with pytest.raises(Exception, match="Connection error"):
             osc.send_raw("/test", 42)
+
+    def test_clients_share_transport(self):
+        """Clients for the same destination share one pooled transport"""
+        first = OSCClient("127.0.0.1", 5510, "a")
+        second = OSCClient("127.0.0.1", 5510, "b")
+
+        assert first.client is second.client
+
+
+class TestBundleBatching:
+    """Test OSC bundle batching helpers"""
+
+    def test_encode_message_matches_python_osc(self):
+        """Encoded messages decode as single-float OSC messages"""
+        msg = OscMessage(encode_message("/synth/cutoff_L", 1000))
+
+        assert msg.address == "/synth/cutoff_L"
+        assert msg.params == [1000.0]
+        assert len(encode_message("/abc", 1.0)) == 16
+
+    def test_build_bundles_single_datagram(self):
+        """Small batches fit into one bundle in order"""
+        bundles = build_bundles([("/a", 1), ("/b", 2.5)])
+
+        assert len(bundles) == 1
+        messages = [(msg.address, msg.params[0]) for msg in OscBundle(bundles[0])]
+        assert messages == [("/a", 1.0), ("/b", 2.5)]
+
+    def test_build_bundles_empty(self):
+        """No messages means no datagrams"""
+        assert build_bundles([]) == []
+
+    def test_build_bundles_splits_at_max_size(self):
+        """Batches larger than the MTU are split across bundles"""
+        messages = [(f"/legato_synth_stereo/param_{i:03d}", i) for i in range(200)]
+
+        bundles = build_bundles(messages)
+
+        assert len(bundles) > 1
+        assert all(len(bundle) <= MAX_DATAGRAM_SIZE for bundle in bundles)
+        flattened = [msg.address for bundle in bundles for msg in OscBundle(bundle)]
+        assert flattened == [address for address, _ in messages]
+
+    def test_build_bundles_custom_max_size(self):
+        """Each datagram honours a custom size limit"""
+        # "/abc" + type tags + float = 16 bytes, plus the 4-byte element size
+        max_size = BUNDLE_HEADER_SIZE + 2 * 20
+
+        bundles = build_bundles([("/abc", i) for i in range(5)], max_size=max_size)
+
+        assert [OscBundle(bundle).num_contents for bundle in bundles] == [2, 2, 1]
+
+    def test_send_batch_returns_datagram_count(self):
+        """send_batch pushes every bundle through client.send"""
+        client = Mock()
+
+        count = send_batch(client, [("/a", 1), ("/b", 2)])
+
+        assert count == 1
+        assert client.send.call_count == 1
+
+    @patch("src.murnau.utils.osc_client.get_transport")
+    def test_client_send_batch_prefixes_synth_name(self, mock_get_transport):
+        """OSCClient.send_batch prefixes addresses with the synth name"""
+        mock_client = Mock()
+        mock_get_transport.return_value = mock_client
+
+        osc = OSCClient(synth_name="test_synth")
+        count = osc.send_batch([("/gain", 0.5), ("/gate", 1)])
+
+        assert count == 1
+        bundle = OscBundle(mock_client.send.call_args[0][0].dgram)
+        assert [msg.address for msg in bundle] == [
+            "/test_synth/gain",
+            "/test_synth/gate",
+        ]
+        mock_client.send_message.assert_not_called()
+
+    @patch("src.murnau.utils.osc_client.get_transport")
+    def test_client_bundles_are_not_sent(self, mock_get_transport):
+        """OSCClient.bundles encodes with the synth prefix for a later send"""
+        osc = OSCClient(synth_name="test_synth")
+
+        [data] = osc.bundles([("/gain", 0.5)], timetag=ntp_timetag(10.0))
+
+        bundle = OscBundle(data)
+        assert [msg.address for msg in bundle] == ["/test_synth/gain"]
+        assert bundle.timestamp == pytest.approx(10.0)
+        mock_get_transport.return_value.send.assert_not_called()
+
+
+class TestTimetags:
+    """Test NTP timetags on bundles"""
+
+    def test_ntp_timetag_fixed_point(self):
+        """Whole seconds go in the high word, fractions in the low word"""
+        timetag = ntp_timetag(1.5)
+
+        assert timetag >> 32 == NTP_EPOCH_OFFSET + 1
+        assert timetag & 0xFFFFFFFF == 1 << 31
+
+    def test_bundles_carry_timetag(self):
+        """build_bundles() writes the timetag into every bundle header"""
+        unix_time = 1700000000.25
+        bundles = build_bundles([("/a", 1)], timetag=ntp_timetag(unix_time))
+
+        assert OscBundle(bundles[0]).timestamp == pytest.approx(unix_time)
+
+    def test_default_timetag_is_immediate(self):
+        """Without a timetag bundles are applied on arrival"""
+        bundle = build_bundles([("/a", 1)])[0]
+
+        assert int.from_bytes(bundle[8:16], "big") == IMMEDIATELY
+
+    def test_send_batch_timetag(self):
+        """send_batch() passes the timetag through"""
+        client = Mock()
+
+        send_batch(client, [("/a", 1)], timetag=ntp_timetag(1700000000.0))
+
+        bundle = OscBundle(client.send.call_args[0][0].dgram)
+        assert bundle.timestamp == pytest.approx(1700000000.0)
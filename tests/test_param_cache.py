@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+
+import os
+import socket
+import sys
+import threading
+from unittest.mock import Mock
+
+import pytest
+from pythonosc.osc_message_builder import OscMessageBuilder
+from pythonosc.osc_packet import OscPacket
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.murnau.utils.listener import OSCListener
+from src.murnau.utils.osc_client import OSCClient
+from src.murnau.utils.param_cache import ParameterCache
+from src.murnau.utils.transport import TransportRegistry
+
+SYNTH = "legato_synth_stereo"
+
+
+class FakeSynth(threading.Thread):
+    """Stand-in for the Faust OSC server
+
+    Stores float messages as parameter values and answers "get" queries
+    with (value, min, max) on the reply port, like Faust's output port.
+    """
+
+    def __init__(self, values, reply_port):
+        super().__init__(daemon=True)
+        self.values = dict(values)
+        self.reply_port = reply_port
+        self.received = []
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.bind(("127.0.0.1", 0))
+        self.sock.settimeout(0.05)
+        self.port = self.sock.getsockname()[1]
+        self.running = True
+
+    def run(self):
+        # Keep reading after stop() until the socket is drained
+        while True:
+            try:
+                data = self.sock.recv(65536)
+            except socket.timeout:
+                if not self.running:
+                    break
+                continue
+            for timed in OscPacket(data).messages:
+                msg = timed.message
+                if msg.params == ["get"]:
+                    if msg.address in self.values:
+                        self.reply(msg.address, self.values[msg.address])
+                else:
+                    self.received.append((msg.address, msg.params[0]))
+                    self.values[msg.address] = msg.params[0]
+
+    def reply(self, address, value):
+        builder = OscMessageBuilder(address)
+        for arg in (float(value), 0.0, 10000.0):
+            builder.add_arg(arg)
+        self.sock.sendto(builder.build().dgram, ("127.0.0.1", self.reply_port))
+
+    def stop(self):
+        self.running = False
+        self.join()
+        self.sock.close()
+
+
+@pytest.fixture
+def rig():
+    """Fake synth, listener and cache wired together over loopback"""
+    registry = TransportRegistry()
+    listener = OSCListener(lambda a, args: cache.handle_reply(a, args), "127.0.0.1", 0)
+    listener.start()
+    synth = FakeSynth(
+        {
+            f"/{SYNTH}/gain": 0.7,
+            f"/{SYNTH}/cutoff_L": 2000.0,
+            f"/{SYNTH}/resonance_L": 0.25,
+        },
+        listener.port,
+    )
+    synth.start()
+    cache = ParameterCache(registry.get("127.0.0.1", synth.port), SYNTH)
+    yield cache, synth
+    synth.stop()
+    listener.stop()
+    registry.close()
+
+
+class FakeClock:
+    def __init__(self):
+        self.t = 0.0
+
+    def __call__(self):
+        return self.t
+
+
+class TestParameterCache:
+    """Test the read-back parameter mirror"""
+
+    def test_handle_reply_strips_synth_prefix(self):
+        """Replies are stored by address without the synth name"""
+        cache = ParameterCache(Mock(), "s")
+        cache.handle_reply("/s/gain", [0.5, 0.0, 1.0])
+        cache.handle_reply("/other/gain", [0.9])
+        cache.handle_reply("/s/gate", [])
+
+        assert cache.snapshot() == {"/gain": 0.5}
+
+    def test_values_expire_after_ttl(self):
+        """get() only returns values younger than the TTL"""
+        clock = FakeClock()
+        cache = ParameterCache(Mock(), "s", ttl=1.0, clock=clock)
+        cache.set("/gain", 0.5)
+
+        clock.t = 0.9
+        assert cache.get("/gain") == 0.5
+        clock.t = 1.5
+        assert cache.get("/gain") is None
+        assert cache.snapshot() == {}
+
+    def test_query_sends_get(self):
+        """query() sends a "get" message per address and does not wait"""
+        client = Mock()
+        cache = ParameterCache(client, "s")
+
+        assert cache.query(["/gain", "/cutoff_L"]) == 2
+        client.send_message.assert_any_call("/s/gain", "get")
+        client.send_message.assert_any_call("/s/cutoff_L", "get")
+
+    def test_submit_carries_queries_and_resends(self):
+        """With a submit hook no packet is written to the client"""
+        client = Mock()
+        submit = Mock()
+        cache = ParameterCache(client, "s", submit=submit)
+        cache.set("/gain", 0.7)
+
+        sent = cache.sync([("/gain", 0.7), ("/cutoff_L", 1500.0)], timeout=0.01)
+
+        assert sent == [("/cutoff_L", 1500.0)]
+        messages = [
+            (timed.message.address, timed.message.params)
+            for call in submit.call_args_list
+            for timed in OscPacket(call.args[0]).messages
+        ]
+        assert messages == [("/s/cutoff_L", ["get"]), ("/s/cutoff_L", [1500.0])]
+        assert client.method_calls == []
+
+    def test_diff_treats_unknown_as_changed(self):
+        """Unknown values and values outside the tolerance are reported"""
+        cache = ParameterCache(Mock(), "s")
+        cache.set("/gain", 0.7)
+        cache.set("/cutoff_L", 2000.0)
+
+        changed = cache.diff([("/gain", 0.70000001), ("/cutoff_L", 1500), ("/x", 1)])
+
+        assert changed == [("/cutoff_L", 1500), ("/x", 1)]
+
+    def test_refresh_reads_back_from_synth(self, rig):
+        """refresh() returns the values the stand-in server reports"""
+        cache, _ = rig
+
+        values = cache.refresh(["/gain", "/cutoff_L"], timeout=1.0)
+
+        assert values == {"/gain": pytest.approx(0.7), "/cutoff_L": 2000.0}
+
+    def test_wait_times_out_for_unknown_parameter(self, rig):
+        """A parameter the synth does not answer for is missing"""
+        cache, _ = rig
+
+        values = cache.refresh(["/gain", "/missing"], timeout=0.1)
+
+        assert set(values) == {"/gain"}
+
+    def test_sync_sends_only_differences(self, rig):
+        """After a restart only parameters that differ are sent"""
+        cache, synth = rig
+
+        sent = cache.sync(
+            [("/gain", 0.7), ("/cutoff_L", 1500.0), ("/resonance_L", 0.25)],
+            timeout=1.0,
+        )
+
+        assert sent == [("/cutoff_L", 1500.0)]
+        synth.stop()
+        assert synth.received == [(f"/{SYNTH}/cutoff_L", 1500.0)]
+        assert cache.get("/cutoff_L") == 1500.0
+
+    def test_sync_uses_fresh_cache(self, rig):
+        """Values read back within the TTL are not queried again"""
+        cache, _ = rig
+        cache.refresh(["/gain"], timeout=1.0)
+        queries = cache.queries
+
+        cache.sync([("/gain", 0.7)], timeout=1.0)
+
+        assert cache.queries == queries
+
+
+class TestReconnect:
+    def test_reconnect_resends_only_changed(self, rig):
+        """An unchanged parameter is not resent to the new destination"""
+        cache, synth = rig
+        client = OSCClient("127.0.0.1", 9, SYNTH)
+        # Left over from the old destination, the new synth has 2000
+        cache.set("/cutoff_L", 1500.0)
+
+        sent = client.reconnect(
+            port=synth.port,
+            state=[("/gain", 0.7), ("/cutoff_L", 1500.0), ("/resonance_L", 0.25)],
+            cache=cache,
+        )
+
+        assert sent == [("/cutoff_L", 1500.0)]
+        assert cache.get("/gain") == pytest.approx(0.7)
+        synth.stop()
+        assert synth.received == [(f"/{SYNTH}/cutoff_L", 1500.0)]
+
+    def test_reconnect_without_cache_sends_state(self, rig):
+        """Without a cache the whole state is sent"""
+        _, synth = rig
+        client = OSCClient("127.0.0.1", 9, SYNTH)
+        state = [("/gain", 0.7), ("/cutoff_L", 1500.0)]
+
+        sent = client.reconnect(port=synth.port, state=state)
+
+        assert sent == state
+        synth.stop()
+        assert synth.received == [
+            (f"/{SYNTH}/gain", pytest.approx(0.7)),
+            (f"/{SYNTH}/cutoff_L", 1500.0),
+        ]
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+
+import math
+import os
+import sys
+import threading
+import time
+from unittest.mock import Mock
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.murnau.utils.pitch_bend import PitchBendEngine, rpn_bend_range
+
+
+def semitones(freq, base=440.0):
+    """Interval of a frequency above base"""
+    return 12 * math.log2(freq / base)
+
+
+class TestPitchBendEngine:
+    """Test bend math and control-rate resampling"""
+
+    def test_full_deflection_bends_by_range(self):
+        emit = Mock()
+        engine = PitchBendEngine(emit, rate=100, glide=0.0)
+        engine.note(440.0)
+
+        engine.bend(8191)
+        engine.tick()
+        assert semitones(emit.call_args.args[0]) == pytest.approx(2.0, abs=0.001)
+
+        engine.bend(-8192)
+        engine.tick()
+        assert semitones(emit.call_args.args[0]) == pytest.approx(-2.0)
+
+    def test_note_carries_current_bend(self):
+        engine = PitchBendEngine(Mock(), glide=0.0, bend_range=12.0)
+        engine.bend(-4096)
+        engine.tick()
+
+        # Half a downward deflection of an octave range is six semitones
+        assert semitones(engine.note(440.0)) == pytest.approx(-6.0)
+        assert engine.note(None) is None
+
+    def test_fine_tune_and_range_changes_emit_once(self):
+        emit = Mock()
+        engine = PitchBendEngine(emit, fine_tune=50.0)
+        assert semitones(engine.note(440.0)) == pytest.approx(0.5)
+
+        engine.bend_range = 7.0
+        engine.fine_tune = 0.0
+        assert engine.tick() == 1
+        assert engine.tick() == 0
+        assert emit.call_args.args[0] == pytest.approx(440.0)
+
+    def test_sweep_is_resampled_and_smooth(self):
+        """A fast sweep emits once per tick in small steps"""
+        emit = Mock()
+        engine = PitchBendEngine(emit, rate=200, glide=0.02)
+        engine.note(440.0)
+
+        # One wheel message every 100 us, a full sweep in 50 ms
+        positions = [round(-8192 + i * 16383 / 500) for i in range(501)]
+        for tick in range(10):
+            for pitch in positions[tick * 50 : (tick + 1) * 50]:
+                engine.bend(pitch)
+            engine.tick()
+        engine.bend(positions[-1])
+        while engine.tick():
+            pass
+
+        stats = engine.stats()
+        assert stats["received"] == 501
+        assert stats["emitted"] <= 10 + engine.ticks
+        # Four semitones over at least ten ticks, never one big jump
+        assert stats["max_step_cents"] < 100
+        assert semitones(emit.call_args.args[0]) == pytest.approx(2.0, abs=0.001)
+
+    def test_silent_without_note(self):
+        emit = Mock()
+        engine = PitchBendEngine(emit)
+        engine.bend(4000)
+
+        assert engine.tick() == 0
+        emit.assert_not_called()
+
+    def test_note_emits_its_frequency(self):
+        emit = Mock()
+        engine = PitchBendEngine(emit, glide=0.0)
+
+        freq = engine.note(440.0)
+
+        emit.assert_called_once_with(freq)
+        assert engine.stats()["emitted"] == 0
+
+    def test_tick_cannot_follow_note_with_stale_freq(self):
+        """A tick racing note() never leaves the old note's /freq last"""
+        sent = []
+        new_note = threading.Thread(target=lambda: engine.note(880.0))
+
+        def emit(freq):
+            # A new note arrives while the tick is mid-send
+            sent.append(freq)
+            if len(sent) == 2:
+                new_note.start()
+                time.sleep(0.05)
+
+        engine = PitchBendEngine(emit, glide=0.0)
+        engine.note(440.0)
+        engine.bend(8191)
+        engine.tick()
+        new_note.join()
+
+        assert semitones(sent[-1], 880.0) == pytest.approx(2.0, abs=0.001)
+
+    def test_release_stops_bending(self):
+        emit = Mock()
+        engine = PitchBendEngine(emit, glide=0.0)
+        engine.note(440.0)
+        engine.note(None)
+        emit.reset_mock()
+
+        engine.bend(8191)
+
+        assert engine.tick() == 0
+        emit.assert_not_called()
+
+    def test_reset_centres_at_once(self):
+        emit = Mock()
+        engine = PitchBendEngine(emit, glide=0.0)
+        engine.note(440.0)
+        engine.bend(8191)
+        engine.tick()
+
+        engine.reset()
+        engine.tick()
+
+        assert emit.call_args.args[0] == pytest.approx(440.0)
+
+    def test_rpn_bend_range(self):
+        assert rpn_bend_range(12 << 7) == 12.0
+        assert rpn_bend_range(2 << 7 | 50) == 2.5
@@ -9,16 +9,41 @@ from unittest.mock import Mock, call, patch
 
 import pytest
 from pythonosc import udp_client
+from pythonosc.osc_bundle import OscBundle
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from src.murnau.synth import ramp_test
+from tests.helpers import ManualClock
+
+
+@pytest.fixture(autouse=True)
+def fake_clock():
+    """Run the ramps on a clock that does not wait"""
+    clock = ManualClock()
+    with patch("src.murnau.synth.scheduler.SessionClock", return_value=clock):
+        yield clock
+
+
+def sent_messages(mock_client):
+    """Flatten send_message calls and bundles into ordered (address, value)"""
+    messages = []
+    for name, args, _ in mock_client.mock_calls:
+        if name == "send_message":
+            messages.append(args)
+        elif name == "send":
+            # Bundled values travel as float32, round off the encoding error
+            messages.extend(
+                (msg.address, round(msg.params[0], 6))
+                for msg in OscBundle(args[0].dgram)
+            )
+    return messages
 
 
 class TestTestRamp:
     """Test the test_ramp function"""
 
     @patch("time.sleep")
-    @patch("pythonosc.udp_client.SimpleUDPClient")
+    @patch("src.murnau.synth.ramp_test.get_transport")
     @patch("builtins.print")
     def test_test_ramp_complete_flow(self, mock_print, mock_client_class, mock_sleep):
         """Test the complete test_ramp function flow"""
@@ -41,7 +66,7 @@ class TestTestRamp:
 
         # Check that init calls were made
         for init_call in init_calls:
-            mock_client.send_message.assert_any_call(*init_call.args)
+            assert init_call.args in sent_messages(mock_client)
 
         # Verify test scenarios were processed
         # Should have 4 test scenarios based on the tests list
@@ -54,14 +79,14 @@ class TestTestRamp:
 
         # Count gate on/off calls (should be 4 pairs)
         gate_on_calls = [
-            call
-            for call in mock_client.send_message.call_args_list
-            if f"/{synth_name}/gate" in call[0] and call[0][1] == 1.0
+            msg
+            for msg in sent_messages(mock_client)
+            if msg == (f"/{synth_name}/gate", 1.0)
         ]
         gate_off_calls = [
-            call
-            for call in mock_client.send_message.call_args_list
-            if f"/{synth_name}/gate" in call[0] and call[0][1] == 0.0
+            msg
+            for msg in sent_messages(mock_client)
+            if msg == (f"/{synth_name}/gate", 0.0)
         ]
 
         assert len(gate_on_calls) == 4, "Should have 4 gate on calls"
@@ -75,7 +100,7 @@ class TestTestRamp:
         mock_print.assert_any_call("\nTesting ramp from 880Hz to 440Hz over 0.5s")
 
     @patch("time.sleep")
-    @patch("pythonosc.udp_client.SimpleUDPClient")
+    @patch("src.murnau.synth.ramp_test.get_transport")
     def test_ramp_parameter_messages(self, mock_client_class, mock_sleep):
         """Test that ramp parameters are set correctly for each test"""
         mock_client = Mock()
@@ -86,52 +111,45 @@ class TestTestRamp:
         synth_name = "legato_synth_stereo"
 
         # Check that ramp parameters were set for each test scenario
-        # First test: 220 -> 880
-        mock_client.send_message.assert_any_call(f"/{synth_name}/start_freq", 220)
-        mock_client.send_message.assert_any_call(f"/{synth_name}/end_freq", 880)
-        mock_client.send_message.assert_any_call(f"/{synth_name}/ramp_time", 2.0)
-
-        # Second test: 880 -> 220
-        mock_client.send_message.assert_any_call(f"/{synth_name}/start_freq", 880)
-        mock_client.send_message.assert_any_call(f"/{synth_name}/end_freq", 220)
-        mock_client.send_message.assert_any_call(f"/{synth_name}/ramp_time", 2.0)
-
-        # Third test: 440 -> 880
-        mock_client.send_message.assert_any_call(f"/{synth_name}/start_freq", 440)
-        mock_client.send_message.assert_any_call(f"/{synth_name}/end_freq", 880)
-        mock_client.send_message.assert_any_call(f"/{synth_name}/ramp_time", 0.5)
-
-        # Fourth test: 880 -> 440
-        mock_client.send_message.assert_any_call(f"/{synth_name}/start_freq", 880)
-        mock_client.send_message.assert_any_call(f"/{synth_name}/end_freq", 440)
-        mock_client.send_message.assert_any_call(f"/{synth_name}/ramp_time", 0.5)
-
-    @patch("time.sleep")
-    @patch("pythonosc.udp_client.SimpleUDPClient")
-    def test_timing_calls(self, mock_client_class, mock_sleep):
-        """Test that sleep calls happen with correct timing"""
+        sent = sent_messages(mock_client)
+        for start_freq, end_freq, ramp_time in [
+            (220, 880, 2.0),  # First test: 220 -> 880
+            (880, 220, 2.0),  # Second test: 880 -> 220
+            (440, 880, 0.5),  # Third test: 440 -> 880
+            (880, 440, 0.5),  # Fourth test: 880 -> 440
+        ]:
+            assert (f"/{synth_name}/start_freq", start_freq) in sent
+            assert (f"/{synth_name}/end_freq", end_freq) in sent
+            assert (f"/{synth_name}/ramp_time", ramp_time) in sent
+
+    @patch("src.murnau.synth.ramp_test.get_transport")
+    def test_timing_calls(self, mock_client_class, fake_clock):
+        """Gates open and close at absolute deadlines"""
         mock_client = Mock()
         mock_client_class.return_value = mock_client
+        gates = []
+        mock_client.send_message.side_effect = lambda address, value: gates.append(
+            (fake_clock.t, value)
+        )
 
         ramp_test.test_ramp()
 
-        # Verify sleep calls for each test scenario
-        # Each test should sleep for (ramp_time + hold_time) + 0.5 for release
-        expected_sleep_calls = [
-            call(2.0 + 0.5),  # First test: 2.0s ramp + 0.5s hold
-            call(0.5),  # 0.5s release
-            call(2.0 + 0.5),  # Second test: 2.0s ramp + 0.5s hold
-            call(0.5),  # 0.5s release
-            call(0.5 + 0.5),  # Third test: 0.5s ramp + 0.5s hold
-            call(0.5),  # 0.5s release
-            call(0.5 + 0.5),  # Fourth test: 0.5s ramp + 0.5s hold
-            call(0.5),  # 0.5s release
+        # Each test runs for ramp_time + hold_time, then 0.5s of release
+        assert gates == [
+            (0.0, 1.0),
+            (2.5, 0.0),  # First test: 2.0s ramp + 0.5s hold
+            (3.0, 1.0),
+            (5.5, 0.0),  # Second test: 2.0s ramp + 0.5s hold
+            (6.0, 1.0),
+            (7.0, 0.0),  # Third test: 0.5s ramp + 0.5s hold
+            (7.5, 1.0),
+            (8.5, 0.0),  # Fourth test: 0.5s ramp + 0.5s hold
         ]
-
-        mock_sleep.assert_has_calls(expected_sleep_calls)
+        # The last release is waited out too
+        assert fake_clock.t == 9.0
 
     @patch("time.sleep")
-    @patch("pythonosc.udp_client.SimpleUDPClient")
+    @patch("src.murnau.synth.ramp_test.get_transport")
     def test_message_order(self, mock_client_class, mock_sleep):
         """Test that OSC messages are sent in the correct order"""
         mock_client = Mock()
@@ -140,7 +158,7 @@ class TestTestRamp:
         ramp_test.test_ramp()
 
         synth_name = "legato_synth_stereo"
-        all_calls = mock_client.send_message.call_args_list
+        all_calls = sent_messages(mock_client)
 
         # Find indices of key messages for first test
         init_done_idx = None
@@ -149,15 +167,15 @@ class TestTestRamp:
         first_gate_off_idx = None
 
         for i, call_info in enumerate(all_calls):
-            if call_info[0] == (f"/{synth_name}/cutoff_R", 5000):  # Last init message
+            if call_info == (f"/{synth_name}/cutoff_R", 5000):  # Last init message
                 init_done_idx = i
-            elif call_info[0] == (f"/{synth_name}/start_freq", 220):  # First test
+            elif call_info == (f"/{synth_name}/start_freq", 220):  # First test
                 if first_start_freq_idx is None:
                     first_start_freq_idx = i
-            elif call_info[0] == (f"/{synth_name}/gate", 1.0):  # First gate on
+            elif call_info == (f"/{synth_name}/gate", 1.0):  # First gate on
                 if first_gate_on_idx is None:
                     first_gate_on_idx = i
-            elif call_info[0] == (f"/{synth_name}/gate", 0.0):  # First gate off
+            elif call_info == (f"/{synth_name}/gate", 0.0):  # First gate off
                 if first_gate_off_idx is None:
                     first_gate_off_idx = i
 
@@ -167,7 +185,7 @@ class TestTestRamp:
         assert first_gate_on_idx < first_gate_off_idx
 
     @patch("time.sleep")
-    @patch("pythonosc.udp_client.SimpleUDPClient")
+    @patch("src.murnau.synth.ramp_test.get_transport")
     def test_with_custom_tests(self, mock_client_class, mock_sleep):
         """Test with custom test scenarios"""
         mock_client = Mock()
@@ -178,24 +196,21 @@ class TestTestRamp:
 
         # Verify custom test was executed
         synth_name = "legato_synth_stereo"
-        mock_client.send_message.assert_any_call(f"/{synth_name}/start_freq", 100)
-        mock_client.send_message.assert_any_call(f"/{synth_name}/end_freq", 200)
-        mock_client.send_message.assert_any_call(f"/{synth_name}/ramp_time", 1.0)
+        sent = sent_messages(mock_client)
+        assert (f"/{synth_name}/start_freq", 100) in sent
+        assert (f"/{synth_name}/end_freq", 200) in sent
+        assert (f"/{synth_name}/ramp_time", 1.0) in sent
 
         # Verify only one test was run
-        gate_on_calls = [
-            call
-            for call in mock_client.send_message.call_args_list
-            if f"/{synth_name}/gate" in call[0] and call[0][1] == 1.0
-        ]
+        gate_on_calls = [msg for msg in sent if msg == (f"/{synth_name}/gate", 1.0)]
         assert len(gate_on_calls) == 1
 
     @patch("time.sleep")
-    @patch("pythonosc.udp_client.SimpleUDPClient")
+    @patch("src.murnau.synth.ramp_test.get_transport")
     def test_with_osc_client_exception(self, mock_client_class, mock_sleep):
         """Test behavior when OSC client raises exception"""
         mock_client = Mock()
-        mock_client.send_message.side_effect = Exception("OSC Error")
+        mock_client.send.side_effect = Exception("OSC Error")
         mock_client_class.return_value = mock_client
 
         # Should raise the exception
@@ -203,7 +218,7 @@ class TestTestRamp:
             ramp_test.test_ramp()
 
     @patch("time.sleep")
-    @patch("pythonosc.udp_client.SimpleUDPClient")
+    @patch("src.murnau.synth.ramp_test.get_transport")
     def test_client_creation_parameters(self, mock_client_class, mock_sleep):
         """Test that UDP client is created with correct parameters"""
         mock_client = Mock()
@@ -219,7 +234,7 @@ class TestTestScenarios:
     """Test the test scenarios data structure"""
 
     @patch("time.sleep")
-    @patch("pythonosc.udp_client.SimpleUDPClient")
+    @patch("src.murnau.synth.ramp_test.get_transport")
     def test_all_test_scenarios_executed(self, mock_client_class, mock_sleep):
         """Test that all expected test scenarios are executed"""
         mock_client = Mock()
@@ -228,23 +243,14 @@ class TestTestScenarios:
         ramp_test.test_ramp()
 
         synth_name = "legato_synth_stereo"
+        sent = sent_messages(mock_client)
 
         # Collect all start_freq, end_freq, ramp_time combinations
         start_freq_calls = [
-            call
-            for call in mock_client.send_message.call_args_list
-            if f"/{synth_name}/start_freq" in call[0]
-        ]
-        end_freq_calls = [
-            call
-            for call in mock_client.send_message.call_args_list
-            if f"/{synth_name}/end_freq" in call[0]
-        ]
-        ramp_time_calls = [
-            call
-            for call in mock_client.send_message.call_args_list
-            if f"/{synth_name}/ramp_time" in call[0]
+            msg for msg in sent if msg[0] == f"/{synth_name}/start_freq"
         ]
+        end_freq_calls = [msg for msg in sent if msg[0] == f"/{synth_name}/end_freq"]
+        ramp_time_calls = [msg for msg in sent if msg[0] == f"/{synth_name}/ramp_time"]
 
         # Should have 4 of each parameter type
         assert len(start_freq_calls) == 4
@@ -252,9 +258,9 @@ class TestTestScenarios:
         assert len(ramp_time_calls) == 4
 
         # Extract the parameter values
-        start_freqs = [call[0][1] for call in start_freq_calls]
-        end_freqs = [call[0][1] for call in end_freq_calls]
-        ramp_times = [call[0][1] for call in ramp_time_calls]
+        start_freqs = [msg[1] for msg in start_freq_calls]
+        end_freqs = [msg[1] for msg in end_freq_calls]
+        ramp_times = [msg[1] for msg in ramp_time_calls]
 
         # Verify expected test scenarios
         expected_start_freqs = [220, 880, 440, 880]
@@ -269,7 +275,7 @@ class TestTestScenarios:
         """Test that scenario data has correct types"""
         # Since test scenarios are defined in test_ramp(), verify through execution
         with patch("time.sleep"), patch(
-            "pythonosc.udp_client.SimpleUDPClient"
+            "src.murnau.synth.ramp_test.get_transport"
         ) as mock_client_class:
 
             mock_client = Mock()
@@ -280,21 +286,21 @@ class TestTestScenarios:
             # Check that all frequency values are numeric
             synth_name = "legato_synth_stereo"
             start_freq_calls = [
-                call
-                for call in mock_client.send_message.call_args_list
-                if f"/{synth_name}/start_freq" in call[0]
+                msg
+                for msg in sent_messages(mock_client)
+                if msg[0] == f"/{synth_name}/start_freq"
             ]
 
             for call_info in start_freq_calls:
-                assert isinstance(call_info[0][1], (int, float))
-                assert call_info[0][1] > 0
+                assert isinstance(call_info[1], (int, float))
+                assert call_info[1] > 0
 
 
 class TestIntegration:
     """Integration tests for ramp_test"""
 
     @patch("time.sleep")
-    @patch("pythonosc.udp_client.SimpleUDPClient")
+    @patch("src.murnau.synth.ramp_test.get_transport")
     def test_complete_test_cycle(self, mock_client_class, mock_sleep):
         """Test complete test cycle without internal mocking"""
         mock_client = Mock()
@@ -303,29 +309,29 @@ class TestIntegration:
         # Run the actual test_ramp function
         ramp_test.test_ramp()
 
-        # Verify comprehensive message count
-        # Actual count is 24 based on test output
-        expected_message_count = 24  # Adjusted based on actual implementation
-        assert mock_client.send_message.call_count == expected_message_count
+        # Verify comprehensive message count: 24 messages, of which the init
+        # and each scenario's ramp parameters travel as one bundle apiece
+        assert len(sent_messages(mock_client)) == 24
+        assert mock_client.send.call_count == 5
+        assert mock_client.send_message.call_count == 8
 
         # Verify some key initialization messages
         synth_name = "legato_synth_stereo"
-        mock_client.send_message.assert_any_call(f"/{synth_name}/wave_type", 2)
-        mock_client.send_message.assert_any_call(f"/{synth_name}/gain", 0.7)
+        sent = dict(sent_messages(mock_client))
+        assert sent[f"/{synth_name}/wave_type"] == 2
+        assert sent[f"/{synth_name}/gain"] == 0.7
 
         # Verify first and last gate operations
         gate_calls = [
-            call
-            for call in mock_client.send_message.call_args_list
-            if f"/{synth_name}/gate" in call[0]
+            msg for msg in sent_messages(mock_client) if msg[0] == f"/{synth_name}/gate"
         ]
         assert len(gate_calls) == 8  # 4 on + 4 off
 
         # First and last should be gate operations
-        assert gate_calls[0][0][1] == 1.0  # First gate on
-        assert gate_calls[-1][0][1] == 0.0  # Last gate off
+        assert gate_calls[0][1] == 1.0  # First gate on
+        assert gate_calls[-1][1] == 0.0  # Last gate off
 
-    @patch("pythonosc.udp_client.SimpleUDPClient")
+    @patch("src.murnau.synth.ramp_test.get_transport")
     def test_real_timing_simulation(self, mock_client_class):
         """Test with real timing (but very short durations)"""
         mock_client = Mock()
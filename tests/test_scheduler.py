@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import threading
+from unittest.mock import Mock, call
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.murnau.synth import scheduler
+from src.murnau.synth.scheduler import Scheduler
+from tests.helpers import ManualClock
+
+
+class TestScheduler:
+    """Test ordering, cancellation and deadlines"""
+
+    def test_events_run_in_time_order(self):
+        clock = ManualClock()
+        sched = Scheduler(clock)
+        callback = Mock()
+        for t, name in ((0.3, "c"), (0.1, "a"), (0.2, "b"), (0.1, "a2")):
+            sched.at(t, callback, name)
+
+        report = sched.run()
+
+        # Ties keep submission order
+        assert callback.call_args_list == [call("a"), call("a2"), call("b"), call("c")]
+        assert report["events"] == 4
+        assert report["max_ms"] == 0.0
+        assert len(sched) == 0
+
+    def test_waits_target_absolute_deadlines(self):
+        """A late wake-up does not shift the events after it"""
+        clock = ManualClock(late=0.001)
+        sched = Scheduler(clock)
+        times = []
+        for t in (0.01, 0.02, 0.03):
+            sched.at(t, lambda: times.append(clock.t))
+
+        report = sched.run()
+
+        assert times == pytest.approx([0.011, 0.021, 0.031])
+        assert report["drift_ms"] == pytest.approx(0.0)
+
+    def test_lead_dispatches_early(self):
+        clock = ManualClock()
+        sched = Scheduler(clock, lead=0.05)
+        times = []
+        sched.at(1.0, lambda: times.append(clock.t))
+
+        sched.run()
+
+        assert times == [pytest.approx(0.95)]
+
+    def test_long_waits_are_sliced(self):
+        """The queue is checked again at least every CHECK_INTERVAL"""
+        clock = ManualClock()
+        sched = Scheduler(clock)
+        sched.at(1.0, Mock())
+
+        sched.run()
+
+        steps = [b - a for a, b in zip([0.0] + clock.waits, clock.waits)]
+        assert max(steps) <= scheduler.CHECK_INTERVAL + 1e-9
+        assert clock.waits[-1] == 1.0
+
+    def test_cancel(self):
+        sched = Scheduler(ManualClock())
+        callback = Mock()
+        event = sched.at(0.1, callback, "dropped")
+        sched.at(0.2, callback, "kept")
+
+        sched.cancel(event)
+
+        assert len(sched) == 1
+        sched.run()
+        callback.assert_called_once_with("kept")
+
+    def test_callbacks_can_schedule_more(self):
+        """A sequencer step submits the next one"""
+        clock = ManualClock()
+        sched = Scheduler(clock)
+        steps = []
+
+        def step(n):
+            steps.append(clock.t)
+            if n < 3:
+                sched.at(clock.t + 0.25, step, n + 1)
+
+        sched.at(0.0, step, 0)
+        sched.run()
+
+        assert steps == [0.0, 0.25, 0.5, 0.75]
+
+    def test_until_leaves_later_events(self):
+        clock = ManualClock()
+        sched = Scheduler(clock)
+        callback = Mock()
+        sched.at(0.5, callback, "now")
+        sched.at(2.0, callback, "later")
+
+        sched.run(until=1.0)
+
+        callback.assert_called_once_with("now")
+        assert clock.t == 1.0
+        assert len(sched) == 1
+
+    def test_stop_from_callback(self):
+        sched = Scheduler(ManualClock())
+        callback = Mock()
+        sched.at(0.1, sched.stop)
+        sched.at(0.2, callback)
+
+        sched.run()
+
+        callback.assert_not_called()
+        assert len(sched) == 1
+
+    def test_exception_propagates(self):
+        sched = Scheduler(ManualClock())
+        sched.at(0.1, Mock(side_effect=RuntimeError("send failed")))
+
+        with pytest.raises(RuntimeError, match="send failed"):
+            sched.run()
+
+    def test_submission_from_another_thread(self):
+        """An event submitted while run() waits is picked up in time"""
+        sched = Scheduler()
+        done = threading.Event()
+        times = []
+        start = sched.clock.now()
+        sched.at(start + 0.3, done.set)
+
+        def submit():
+            sched.at(start + 0.1, lambda: times.append(sched.clock.now()))
+
+        threading.Timer(0.02, submit).start()
+        sched.run()
+
+        assert done.is_set()
+        assert times[0] >= start + 0.1
+        assert times[0] < start + 0.15
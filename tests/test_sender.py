@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import threading
+import time
+from unittest.mock import Mock, call
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.murnau.utils.latency import origin
+from src.murnau.utils.sender import DATAGRAM, MESSAGE, OSCSenderThread, RingQueue
+
+
+class TestRingQueue:
+    """Test the bounded ring of send events"""
+
+    def test_fifo_order_and_wraparound(self):
+        """Events come out in order across several laps of the ring"""
+        queue = RingQueue(capacity=4, reserve=1)
+
+        received = []
+        for i in range(10):
+            queue.put(MESSAGE, "/a", i)
+            received.append(queue.get(timeout=0)[2])
+
+        assert received == list(range(10))
+        assert len(queue) == 0
+
+    def test_slots_are_preallocated(self):
+        """Puts reuse the same slot objects"""
+        queue = RingQueue(capacity=4, reserve=1)
+        slots = list(queue._slots)
+
+        for i in range(8):
+            queue.put(MESSAGE, "/a", i)
+            queue.get(timeout=0)
+
+        assert all(a is b for a, b in zip(slots, queue._slots))
+
+    def test_droppable_events_respect_reserve(self):
+        """Parameter updates are dropped once only the reserve is left"""
+        queue = RingQueue(capacity=4, reserve=1)
+
+        results = [queue.put(MESSAGE, "/cutoff_L", i) for i in range(5)]
+
+        assert results == [True, True, True, False, False]
+        assert queue.dropped == 2
+        assert queue.put(MESSAGE, "/gate", 1.0, critical=True) is True
+        assert len(queue) == 4
+
+    def test_critical_put_times_out_on_full_ring(self):
+        """A critical event is dropped if no slot frees up in time"""
+        queue = RingQueue(capacity=2, reserve=1)
+        queue.put(MESSAGE, "/gate", 1.0, critical=True)
+        queue.put(MESSAGE, "/gate", 0.0, critical=True)
+
+        assert queue.put(MESSAGE, "/gate", 1.0, critical=True, timeout=0.01) is False
+        assert queue.dropped == 1
+
+    def test_get_timeout_on_empty_queue(self):
+        """An empty queue returns None after the timeout"""
+        assert RingQueue(capacity=4).get(timeout=0.01) is None
+
+    def test_max_depth(self):
+        """The deepest fill level is recorded"""
+        queue = RingQueue(capacity=8)
+        for i in range(3):
+            queue.put(MESSAGE, "/a", i)
+        queue.get(timeout=0)
+
+        assert queue.max_depth == 3
+
+    def test_capacity_too_small(self):
+        """A ring needs at least two slots"""
+        with pytest.raises(ValueError):
+            RingQueue(capacity=1)
+
+
+class TestOSCSenderThread:
+    """Test the dedicated OSC sender thread"""
+
+    def test_flush_without_thread_drains_inline(self):
+        """Without a running thread flush() delivers on the caller"""
+        send = Mock()
+        sender = OSCSenderThread(send)
+
+        sender.submit("/gain", 0.5)
+        send.assert_not_called()
+
+        assert sender.flush() is True
+        send.assert_called_once_with("/gain", 0.5)
+
+    def test_midi_origin_latency_is_recorded(self):
+        """Messages sent while handling MIDI record ingestion to wire time"""
+        sender = OSCSenderThread(Mock())
+
+        with origin("note_on", time.perf_counter() - 0.01):
+            sender.submit("/freq", 440.0)
+        sender.submit("/gain", 0.5)
+        sender.flush()
+
+        summary = sender.latency.summary()
+        assert list(summary) == ["note_on"]
+        assert summary["note_on"]["count"] == 1
+        assert summary["note_on"]["max"] >= 0.01
+
+    def test_thread_delivers_in_order(self):
+        """The sender thread puts messages and datagrams on the wire in order"""
+        delivered = []
+        sender = OSCSenderThread(
+            lambda address, value: delivered.append((address, value)),
+            lambda data: delivered.append(data),
+        )
+        sender.start()
+        try:
+            sender.submit("/freq", 440.0)
+            sender.submit_datagram(b"bundle")
+            sender.submit("/gate", 1.0)
+            assert sender.flush() is True
+        finally:
+            sender.stop()
+
+        assert delivered == [("/freq", 440.0), b"bundle", ("/gate", 1.0)]
+
+    def test_events_can_target_another_destination(self):
+        """A per-event send callable replaces the sender's own, in order"""
+        delivered = []
+        sender = OSCSenderThread(
+            lambda address, value: delivered.append(("main", address)),
+            lambda data: delivered.append(("main", data)),
+        )
+        sender.start()
+        try:
+            sender.submit("/freq", 440.0)
+            sender.submit(
+                "/freq",
+                220.0,
+                send=lambda address, value: delivered.append(("voice", address)),
+            )
+            sender.submit_datagram(
+                b"bundle", send=lambda data: delivered.append(("voice", data))
+            )
+            sender.submit_datagram(b"bundle")
+            assert sender.flush() is True
+        finally:
+            sender.stop()
+
+        assert delivered == [
+            ("main", "/freq"),
+            ("voice", "/freq"),
+            ("voice", b"bundle"),
+            ("main", b"bundle"),
+        ]
+
+    def test_sends_happen_on_sender_thread(self):
+        """Producers never call the send function themselves"""
+        threads = []
+        sender = OSCSenderThread(lambda *args: threads.append(threading.get_ident()))
+        sender.start()
+        try:
+            sender.submit("/gain", 0.5)
+            sender.flush()
+        finally:
+            sender.stop()
+
+        assert threads and threading.get_ident() not in threads
+
+    def test_stop_delivers_pending_events(self):
+        """Stopping the thread sends what is already queued"""
+        send = Mock()
+        sender = OSCSenderThread(send)
+        sender.start()
+
+        for i in range(100):
+            sender.submit("/cutoff_L", i)
+        sender.stop()
+
+        assert send.call_count == 100
+        assert not sender.running
+
+    def test_gates_are_never_dropped(self):
+        """When the ring is full gates wait for space while params are dropped"""
+        release = threading.Event()
+        delivered = []
+
+        def send(address, value):
+            release.wait(1.0)
+            delivered.append(address)
+
+        sender = OSCSenderThread(send, capacity=8)
+        sender.start()
+        try:
+            for i in range(20):
+                sender.submit("/cutoff_L", i)
+            producer = threading.Thread(
+                target=lambda: [sender.submit("/gate", 1.0) for _ in range(8)]
+            )
+            producer.start()
+            release.set()
+            producer.join(2.0)
+            assert sender.flush(2.0) is True
+        finally:
+            sender.stop()
+
+        assert delivered.count("/gate") == 8
+        assert sender.stats()["dropped"] > 0
+
+    def test_multiple_producers(self):
+        """Messages from several threads all arrive, each producer in order"""
+        delivered = []
+        sender = OSCSenderThread(
+            lambda address, value: delivered.append((address, value))
+        )
+        sender.start()
+
+        def produce(name):
+            for i in range(200):
+                sender.submit(name, i)
+
+        producers = [
+            threading.Thread(target=produce, args=(f"/p{n}",)) for n in range(4)
+        ]
+        try:
+            for producer in producers:
+                producer.start()
+            for producer in producers:
+                producer.join()
+            sender.flush()
+        finally:
+            sender.stop()
+
+        for n in range(4):
+            values = [value for address, value in delivered if address == f"/p{n}"]
+            assert values == list(range(200))
+
+    def test_send_errors_are_counted(self):
+        """A failing send is reported and does not stop the sender"""
+        send = Mock(side_effect=[Exception("Connection error"), None])
+        sender = OSCSenderThread(send)
+
+        sender.submit("/a", 1)
+        sender.submit("/b", 2)
+        sender.flush()
+
+        assert send.call_args_list == [call("/a", 1), call("/b", 2)]
+        stats = sender.stats()
+        assert stats["errors"] == 1
+        assert stats["sent"] == 1
+
+    def test_transport_drops_are_not_counted_as_sent(self):
+        """A send returning False is a failed delivery, None is a success"""
+        send = Mock(side_effect=[False, None, True])
+        sender = OSCSenderThread(send)
+
+        for address in ("/a", "/b", "/c"):
+            sender.submit(address, 1)
+        sender.flush()
+
+        stats = sender.stats()
+        assert stats["sent"] == 2
+        assert stats["errors"] == 1
+
+    def test_full_ring_without_thread_is_drained(self):
+        """Gates queued while no thread runs drain instead of waiting forever"""
+        delivered = []
+        sender = OSCSenderThread(
+            lambda address, value: delivered.append(value), capacity=4
+        )
+
+        for i in range(6):
+            assert sender.submit("/gate", i) is True
+        sender.flush()
+
+        assert delivered == list(range(6))
+
+    def test_sender_thread_can_submit_to_a_full_ring(self):
+        """A send callback queueing gates does not wait for its own thread"""
+        delivered = []
+
+        def send(address, value):
+            delivered.append(address)
+            if address == "/trigger":
+                for _ in range(6):
+                    sender.submit("/gate", 1.0)
+
+        sender = OSCSenderThread(send, capacity=4)
+        sender.start()
+        try:
+            sender.submit("/trigger", 1.0)
+            time.sleep(0.1)
+            assert sender.flush(1.0) is True
+        finally:
+            sender.stop()
+
+        assert delivered == ["/trigger"] + ["/gate"] * 6
+
+    def test_stats(self):
+        """Queue depth and latency are reported"""
+        sender = OSCSenderThread(Mock())
+        sender.submit("/a", 1)
+        sender.submit("/b", 2)
+
+        assert sender.stats()["depth"] == 2
+        sender.flush()
+
+        stats = sender.stats()
+        assert stats["depth"] == 0
+        assert stats["max_depth"] == 2
+        assert stats["enqueued"] == 2
+        assert stats["sent"] == 2
+        assert stats["latency_max_us"] >= stats["latency_avg_us"] > 0
+
+    def test_datagram_kind(self):
+        """Datagrams go to the datagram send function"""
+        send, send_datagram = Mock(), Mock()
+        sender = OSCSenderThread(send, send_datagram)
+
+        assert sender.queue.put(DATAGRAM, None, b"x", critical=True)
+        sender.flush()
+
+        send_datagram.assert_called_once_with(b"x")
+        send.assert_not_called()
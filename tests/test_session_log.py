@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+import threading
+from unittest.mock import Mock
+
+import mido
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.murnau.utils.session_log import (
+    HEADER,
+    RECORD_MIDI,
+    RECORD_OSC,
+    RECORD_SIZE,
+    SessionLog,
+    SessionRecorder,
+    diff_osc,
+    replay,
+)
+from tests.helpers import ManualClock
+
+
+def record(path, osc, midi=()):
+    """Write a log of OSC (stamp, address, value) and MIDI records"""
+    with SessionRecorder(str(path), clock=lambda: 0.0) as recorder:
+        for stamp, message, port in midi:
+            recorder.record_midi(message, stamp, port)
+        for stamp, address, value in osc:
+            recorder.record_osc(address, value, stamp)
+    return str(path)
+
+
+class TestSessionRecorder:
+    """Test the record format"""
+
+    def test_fixed_size_records(self, tmp_path):
+        path = record(
+            tmp_path / "session.log",
+            [(0.5, "/gain", 0.25), (0.75, "/cutoff_L", 1000.0), (1.0, "/gain", 1.0)],
+        )
+
+        assert os.path.getsize(path) == HEADER.size + 3 * RECORD_SIZE
+        with SessionLog(path) as log:
+            assert len(log) == 3
+            assert log.addresses == ["/gain", "/cutoff_L"]
+            assert log[1].kind == RECORD_OSC
+            assert log[-1].time == 1.0
+            assert list(log.osc()) == [
+                (0.5, "/gain", 0.25),
+                (0.75, "/cutoff_L", 1000.0),
+                (1.0, "/gain", 1.0),
+            ]
+
+    def test_midi_round_trip(self, tmp_path):
+        messages = [
+            mido.Message("note_on", note=60, velocity=100, channel=3),
+            mido.Message("control_change", control=74, value=127),
+            mido.Message("pitchwheel", pitch=-8192),
+            mido.Message("program_change", program=5),
+            mido.Message("clock"),
+        ]
+        path = record(
+            tmp_path / "session.log",
+            [],
+            [(i * 0.1, m, "Keys" if i % 2 else None) for i, m in enumerate(messages)],
+        )
+
+        with SessionLog(path) as log:
+            assert {r.kind for r in log} == {RECORD_MIDI}
+            replayed = list(log.midi())
+        assert [m for _, m, _ in replayed] == messages
+        assert [port for _, _, port in replayed] == [None, "Keys"] * 2 + [None]
+
+    def test_sysex_is_skipped(self, tmp_path):
+        with SessionRecorder(str(tmp_path / "session.log")) as recorder:
+            recorder.record_midi(mido.Message("sysex", data=[1, 2, 3]))
+        assert recorder.skipped == 1
+        assert recorder.records == 0
+
+    def test_concurrent_writers(self, tmp_path):
+        path = str(tmp_path / "session.log")
+        recorder = SessionRecorder(path)
+
+        def writer(address):
+            for i in range(1000):
+                recorder.record_osc(address, i)
+
+        threads = [threading.Thread(target=writer, args=(f"/p{n}",)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        recorder.close()
+        recorder.record_osc("/late", 1.0)
+
+        with SessionLog(path) as log:
+            assert len(log) == 4000
+            values = {}
+            for _, address, value in log.osc():
+                values.setdefault(address, []).append(value)
+        assert sorted(values) == ["/p0", "/p1", "/p2", "/p3"]
+        assert all(v == list(range(1000)) for v in values.values())
+
+    def test_not_a_session_log(self, tmp_path):
+        path = tmp_path / "other.bin"
+        path.write_bytes(b"x" * 64)
+        with pytest.raises(ValueError, match="Not a session log"):
+            SessionLog(str(path))
+
+
+class TestReplay:
+    """Test pacing and diffing"""
+
+    def test_paced_replay_hits_scaled_deadlines(self):
+        clock = ManualClock()
+        handler = Mock()
+        events = [(0.0, "/gate", 1.0), (0.5, "/gate", 0.0), (2.0, "/gate", 1.0)]
+
+        report = replay(events, handler, speed=2.0, clock=clock)
+
+        assert clock.waits == [0.0, 0.25, 1.0]
+        assert [c.args for c in handler.call_args_list] == [
+            ("/gate", 1.0),
+            ("/gate", 0.0),
+            ("/gate", 1.0),
+        ]
+        assert report["events"] == 3
+        assert report["max_ms"] == 0.0
+
+    def test_max_speed_never_waits(self):
+        clock = ManualClock()
+
+        report = replay([(t, t) for t in range(100)], Mock(), speed=None, clock=clock)
+
+        assert clock.waits == []
+        assert report["events"] == 100
+        assert "max_ms" not in report
+
+    def test_diff_osc(self, tmp_path):
+        base = [(0.0, "/gain", 0.5), (0.1, "/cutoff_L", 200.0), (0.2, "/gain", 0.6)]
+        a = record(tmp_path / "a.log", base)
+        same = record(tmp_path / "same.log", [base[1], base[0], base[2]])
+        changed = record(
+            tmp_path / "changed.log",
+            base[:2] + [(0.2, "/gain", 0.7), (0.3, "/gate", 0.0)],
+        )
+
+        with SessionLog(a) as log_a, SessionLog(same) as log_same:
+            # Interleaving across addresses is not a difference
+            assert diff_osc(log_a, log_same) == {}
+        with SessionLog(a) as log_a, SessionLog(changed) as log_changed:
+            differences = diff_osc(log_a, log_changed)
+            assert diff_osc(log_a, log_changed, tolerance=0.2).keys() == {"/gate"}
+
+        assert differences["/gain"] == {
+            "a": 2,
+            "b": 2,
+            "first": 1,
+            "max_error": pytest.approx(0.1),
+        }
+        assert differences["/gate"] == {"a": 0, "b": 1, "first": None, "max_error": 0}
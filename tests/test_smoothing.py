@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+from unittest.mock import Mock
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.murnau.utils.smoothing import ParamSmoother
+
+
+class TestParamSmoother:
+    """Test control-rate parameter smoothing"""
+
+    def test_first_target_is_a_jump(self):
+        smoother = ParamSmoother(rate=200.0, glide=0.02)
+        emit = Mock()
+
+        smoother.set("cutoff", 1000.0, emit)
+        assert smoother.tick() == 1
+
+        emit.assert_called_once_with(1000.0)
+        assert smoother.tick() == 0
+
+    def test_ramp_to_new_target(self):
+        smoother = ParamSmoother(rate=200.0, glide=0.02)
+        emit = Mock()
+        smoother.set("cutoff", 0.0, emit)
+        smoother.tick()
+        emit.reset_mock()
+
+        smoother.set("cutoff", 400.0, emit)
+        while smoother.tick():
+            pass
+
+        values = [c.args[0] for c in emit.call_args_list]
+        assert values == pytest.approx([100.0, 200.0, 300.0, 400.0])
+
+    def test_many_targets_emit_once_per_tick(self):
+        smoother = ParamSmoother(rate=200.0, glide=0.01)
+        emit = Mock()
+
+        for value in range(128):
+            smoother.set("gain", value / 127.0, emit)
+        smoother.tick()
+
+        emit.assert_called_once_with(1.0)
+        assert smoother.stats() == {"received": 128, "emitted": 1, "active": 0}
+
+    def test_retarget_starts_from_current_value(self):
+        smoother = ParamSmoother(rate=100.0, glide=0.02)
+        emit = Mock()
+        smoother.set("x", 0.0, emit)
+        smoother.tick()
+
+        smoother.set("x", 10.0, emit)
+        smoother.tick()  # halfway, 5.0
+        smoother.set("x", 5.0, emit)
+        smoother.tick()
+        smoother.tick()
+
+        assert emit.call_args.args[0] == 5.0
+        assert [c.args[0] for c in emit.call_args_list] == [0.0, 5.0, 5.0, 5.0]
+
+    def test_reset(self):
+        smoother = ParamSmoother(rate=200.0, glide=0.02)
+        emit = Mock()
+        smoother.set("x", 0.0, emit)
+        smoother.tick()
+
+        smoother.reset("x")
+        smoother.set("x", 1.0, emit)
+        smoother.tick()
+
+        assert emit.call_args.args[0] == 1.0
+        assert len(smoother) == 0
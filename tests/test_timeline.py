@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+
+import os
+import sys
+from unittest.mock import Mock, patch
+
+import pytest
+from pythonosc.osc_bundle import OscBundle
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.murnau.synth import melody, timeline
+from src.murnau.utils.clock import SessionClock, onset_report
+from tests.helpers import ManualClock
+
+
+def sent_bundles(mock_client):
+    """Decode the bundles sent through a mocked python-osc client"""
+    return [OscBundle(args[0].dgram) for args, _ in mock_client.send.call_args_list]
+
+
+EVENTS = [
+    (0.0, [("/freq", 440.0), ("/gate", 1.0)]),
+    (0.5, [("/gate", 0.0)]),
+]
+
+
+class TestPlayback:
+    """Test timetagged and deadline playback"""
+
+    def test_play_timetagged(self):
+        """Events are sent lead seconds early, timetagged with their onset"""
+        client = Mock()
+        clock = ManualClock(wall_origin=1700000000.0)
+
+        sent = timeline.play_timetagged(client, EVENTS, "s", clock, 1.0, lead=0.1)
+
+        assert clock.waits == [pytest.approx(0.9), pytest.approx(1.4)]
+        assert sent == [pytest.approx(0.9), pytest.approx(1.4)]
+        bundles = sent_bundles(client)
+        assert [b.timestamp for b in bundles] == [
+            pytest.approx(clock.wall_origin + 1.0),
+            pytest.approx(clock.wall_origin + 1.5),
+        ]
+        assert [(m.address, m.params[0]) for m in bundles[0]] == [
+            ("/s/freq", 440.0),
+            ("/s/gate", 1.0),
+        ]
+
+    def test_play_deadlines(self):
+        """The fallback sends immediate bundles at each deadline"""
+        client = Mock()
+        clock = ManualClock()
+
+        sent = timeline.play_deadlines(client, EVENTS, "s", clock, 2.0)
+
+        assert sent == [2.0, 2.5]
+        assert [b.timestamp for b in sent_bundles(client)] == [0.0, 0.0]
+
+    def test_play_deadlines_real_clock(self):
+        """Real-time deadline playback stays within a few milliseconds"""
+        clock = SessionClock()
+        events = [(i * 0.01, [("/gate", float(i % 2))]) for i in range(10)]
+        start = clock.now() + 0.01
+
+        sent = timeline.play_deadlines(Mock(), events, "s", clock, start)
+
+        report = onset_report([start + t for t, _ in events], sent)
+        assert report["events"] == 10
+        assert report["max_ms"] < 20
+
+
+class TestScheduledMelody:
+    """Test scheduled melody playback"""
+
+    def test_melody_timeline(self):
+        """Notes map to gate on/off events with play_note's gap"""
+        events = melody.melody_timeline([(69, 0.5), (57, 0.25)])
+
+        assert events == [
+            (0.0, [("/freq", 440.0), ("/gate", 1.0)]),
+            (0.5, [("/gate", 0.0)]),
+            (pytest.approx(0.55), [("/freq", 220.0), ("/gate", 1.0)]),
+            (pytest.approx(0.8), [("/gate", 0.0)]),
+        ]
+
+    @patch("src.murnau.synth.melody.SessionClock", ManualClock)
+    @patch("src.murnau.synth.melody.get_transport")
+    def test_play_melody_scheduled_timetags(self, mock_client_class):
+        """Timetagged playback reports no onset error when sent in time"""
+        mock_client = Mock()
+        mock_client_class.return_value = mock_client
+
+        report = melody.play_melody_scheduled([(60, 0.5)], synth_name="s")
+
+        # Init patch plus one bundle per event
+        assert mock_client.send.call_count == 3
+        assert report["events"] == 2
+        assert report["max_ms"] == 0.0
+
+    @patch("src.murnau.synth.melody.SessionClock", ManualClock)
+    @patch("src.murnau.synth.melody.get_transport")
+    def test_play_melody_scheduled_deadlines(self, mock_client_class):
+        """The deadline fallback sends immediate bundles"""
+        mock_client = Mock()
+        mock_client_class.return_value = mock_client
+
+        report = melody.play_melody_scheduled(
+            [(60, 0.5), (62, 0.5)], synth_name="s", timetags=False
+        )
+
+        bundles = sent_bundles(mock_client)
+        assert all(b.timestamp == 0.0 for b in bundles)
+        assert report["events"] == 4
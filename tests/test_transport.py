@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+
+import os
+import socket
+import sys
+import threading
+from unittest.mock import Mock
+
+import pytest
+from pythonosc.osc_message import OscMessage
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.murnau.synth import melody
+from src.murnau.utils import transport as transport_module
+from src.murnau.utils.fanout import FanoutOSCClient
+from src.murnau.utils.osc_client import (
+    OSCClient,
+    OscDatagram,
+    build_bundles,
+    encode_message,
+    send_batch,
+)
+from src.murnau.utils.transport import Transport, TransportRegistry, is_critical
+
+
+@pytest.fixture
+def registry():
+    registry = TransportRegistry()
+    yield registry
+    registry.close()
+
+
+@pytest.fixture
+def receiver():
+    """Local UDP socket standing in for the synth"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.settimeout(1.0)
+    yield sock
+    sock.close()
+
+
+class TestTransportRegistry:
+    """Test the pooled transport registry"""
+
+    def test_same_destination_shares_transport(self, registry):
+        """get() returns one transport per destination"""
+        first = registry.get("127.0.0.1", 5510)
+        second = registry.get("127.0.0.1", 5510)
+        other = registry.get("127.0.0.1", 5511)
+
+        assert first is second
+        assert other is not first
+        assert registry.destinations() == [("127.0.0.1", 5510), ("127.0.0.1", 5511)]
+
+    def test_destinations_share_one_socket(self, registry):
+        """Transports of one address family write through the same socket"""
+        first = registry.get("127.0.0.1", 5510)
+        second = registry.get("127.0.0.1", 5511)
+
+        assert first._sock is second._sock
+
+    def test_socket_options(self):
+        """Pooled sockets get the registry's buffer size and blocking mode"""
+        registry = TransportRegistry(sndbuf=1 << 16, blocking=False)
+        sock = registry.get("127.0.0.1", 5510)._sock
+
+        assert not sock.getblocking()
+        # Linux reports twice the requested size
+        assert sock.getsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF) >= 1 << 16
+        registry.close()
+
+    def test_stats_per_destination(self, registry, receiver):
+        """Every transport counts datagrams and bytes"""
+        port = receiver.getsockname()[1]
+        transport = registry.get("127.0.0.1", port)
+        packet = encode_message("/s/gain", 0.5)
+
+        transport.sendto(packet)
+        transport.sendto(packet)
+
+        assert registry.stats() == {
+            f"127.0.0.1:{port}": {
+                "datagrams": 2,
+                "bytes": 2 * len(packet),
+                "dropped": 0,
+                "stalls": 0,
+                "errors": 0,
+            }
+        }
+
+
+class TestTransport:
+    """Test sending through a transport"""
+
+    def test_send_message_like_simple_udp_client(self, registry, receiver):
+        """send_message() keeps python-osc's argument typing"""
+        transport = registry.get("127.0.0.1", receiver.getsockname()[1])
+
+        transport.send_message("/s/wave_type", 2)
+        transport.send_message("/s/freq", 440.0)
+
+        assert OscMessage(receiver.recv(65536)).params == [2]
+        msg = OscMessage(receiver.recv(65536))
+        assert (msg.address, msg.params) == ("/s/freq", [440.0])
+
+    def test_send_batch_through_transport(self, registry, receiver):
+        """The module-level send_batch() accepts a transport"""
+        transport = registry.get("127.0.0.1", receiver.getsockname()[1])
+
+        assert send_batch(transport, [("/s/gain", 0.5)]) == 1
+        assert receiver.recv(65536).startswith(b"#bundle")
+
+    def test_full_buffer_drops(self):
+        """A non-blocking socket with a full buffer drops instead of raising"""
+        sock = Mock()
+        sock.sendto.side_effect = BlockingIOError()
+        transport = Transport(sock, ("127.0.0.1", 5510), "127.0.0.1", 5510)
+
+        assert transport.send(OscDatagram(b"x")) is False
+        assert transport.stats()["dropped"] == 1
+
+    def test_critical_packets_wait_for_a_full_buffer(self, tmp_path):
+        """A gate waits for buffer space where a parameter is dropped"""
+        path = str(tmp_path / "synth.sock")
+        synth = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        synth.bind(path)
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        sock.setblocking(False)
+        transport = Transport(sock, path, "localhost", 0)
+        try:
+            # Fill the synth's queue until the socket refuses more
+            while transport.sendto(b"param"):
+                pass
+            assert transport.stats()["dropped"] == 1
+            queued = transport.stats()["datagrams"]
+
+            # The synth reads again a little later
+            threading.Timer(0.05, synth.recv, (64,)).start()
+            assert transport.sendto(b"gate", critical=True) is True
+
+            stats = transport.stats()
+            assert stats["datagrams"] == queued + 1
+            assert stats["stalls"] == 1
+            assert stats["dropped"] == 1
+        finally:
+            sock.close()
+            synth.close()
+
+    def test_critical_packet_dropped_after_timeout(self, monkeypatch):
+        """A buffer that never drains drops the critical packet in the end"""
+        monkeypatch.setattr(transport_module, "CRITICAL_TIMEOUT", 0.01)
+        sock = Mock()
+        sock.sendto.side_effect = BlockingIOError()
+        transport = Transport(sock, ("127.0.0.1", 5510), "127.0.0.1", 5510)
+
+        assert transport.sendto(b"gate", critical=True) is False
+        assert transport.stats()["dropped"] == 1
+        assert sock.sendto.call_count > 1
+
+    def test_socket_error_is_counted_and_raised(self):
+        """Other socket errors are counted and reach the caller"""
+        sock = Mock()
+        sock.sendto.side_effect = OSError("unreachable")
+        transport = Transport(sock, ("127.0.0.1", 5510), "127.0.0.1", 5510)
+
+        with pytest.raises(OSError, match="unreachable"):
+            transport.sendto(b"x")
+        assert transport.stats()["errors"] == 1
+
+
+def stalling_transport():
+    """Transport whose socket is full for the first write of each packet"""
+    sock = Mock()
+    sock.sendto.side_effect = [BlockingIOError(), None] * 4
+    return Transport(sock, ("127.0.0.1", 5510), "127.0.0.1", 5510)
+
+
+class TestCriticalPaths:
+    """Test that note messages survive a full buffer on every send path"""
+
+    def test_is_critical(self):
+        """Gates and frequencies are critical, in messages and bundles"""
+        assert is_critical(encode_message("/s/gate", 0.0))
+        assert is_critical(encode_message("/freq", 440.0))
+        assert not is_critical(encode_message("/s/gain", 0.5))
+        (bundle,) = build_bundles([("/s/gain", 0.5), ("/s/gate", 1.0)])
+        assert is_critical(bundle)
+        (bundle,) = build_bundles([("/s/gain", 0.5)])
+        assert not is_critical(bundle)
+
+    @pytest.mark.parametrize(
+        "send",
+        [
+            lambda t: t.send_message("/s/gate", 0.0),
+            lambda t: send_batch(t, [("/s/gain", 0.5), ("/s/gate", 0.0)]),
+            lambda t: OSCClient(synth_name="s", transport=t).send_batch(
+                [("/gate", 0.0)]
+            ),
+            lambda t: OSCClient(transport=t).send_raw("/s/gate", 0.0),
+            lambda t: melody.play_note(t, 440.0, 0.0, "s"),
+            lambda t: FanoutOSCClient(
+                [("127.0.0.1", 5510)], "s", registry=Mock(get=Mock(return_value=t))
+            ).send_batch([("/gate", 0.0)]),
+            lambda t: FanoutOSCClient(
+                [("127.0.0.1", 5510)], "s", registry=Mock(get=Mock(return_value=t))
+            ).send("/gate", 0.0),
+        ],
+        ids=[
+            "send_message",
+            "send_batch",
+            "client_batch",
+            "client_raw",
+            "play_note",
+            "fanout_batch",
+            "fanout_send",
+        ],
+    )
+    def test_gate_survives_full_buffer(self, send, monkeypatch):
+        monkeypatch.setattr(melody, "NOTE_GAP", 0.0)
+        transport = stalling_transport()
+
+        send(transport)
+
+        stats = transport.stats()
+        assert stats["dropped"] == 0
+        assert stats["stalls"] == stats["datagrams"]
+
+    def test_parameters_are_still_dropped(self):
+        """Without a note message a full buffer drops the packet"""
+        transport = stalling_transport()
+        transport._sock.sendto.side_effect = BlockingIOError()
+
+        send_batch(transport, [("/s/gain", 0.5)])
+        transport.send_message("/s/cutoff_L", 1000.0)
+
+        assert transport.stats()["dropped"] == 2
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+
+import math
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.murnau.synth import melody
+from src.murnau.utils import tuning
+from src.murnau.utils.tuning import (
+    NOTE_COUNT,
+    Tuning,
+    note_freq,
+    parse_kbm,
+    parse_scl,
+    retune,
+)
+
+# 5-limit just major scale
+JUST_SCL = """! just.scl
+!
+Just major
+ 7
+!
+ 9/8
+ 5/4
+ 4/3
+ 3/2
+ 5/3
+ 15/8
+ 2/1
+"""
+
+# White keys only, A4 at 432 Hz, black keys unmapped
+WHITE_KBM = """! white.kbm
+12
+0
+127
+60
+69
+432.0
+7
+! mapping
+0
+x
+1
+x
+2
+3
+x
+4
+x
+5
+x
+6
+"""
+
+
+@pytest.fixture
+def restore_tuning():
+    previous = tuning.current()
+    yield
+    retune(previous)
+
+
+class TestTuning:
+    """Test precomputed tuning tables"""
+
+    def test_equal_temperament_matches_formula(self):
+        table = Tuning.equal().freqs
+
+        assert len(table) == NOTE_COUNT
+        assert table[69] == 440.0
+        for note in range(NOTE_COUNT):
+            expected = 440.0 * math.pow(2.0, (note - 69) / 12.0)
+            assert table[note] == pytest.approx(expected, rel=1e-12)
+
+    def test_reference_pitch(self):
+        table = Tuning.equal().with_reference(432.0).freqs
+
+        assert table[69] == 432.0
+        assert table[81] == pytest.approx(864.0)
+
+    def test_scala_scale(self, tmp_path):
+        path = tmp_path / "just.scl"
+        path.write_text(JUST_SCL)
+
+        scale = parse_scl(str(path))
+        table = Tuning.from_files(str(path)).freqs
+
+        assert scale.description == "Just major"
+        assert scale.cents[-1] == pytest.approx(1200.0)
+        # Degree 0 on C4, seven degrees per octave, A4 = 440 Hz
+        assert table[60 + 7] == pytest.approx(2 * table[60])
+        assert table[60 + 4] == pytest.approx(1.5 * table[60])
+
+    def test_scala_keyboard_mapping(self, tmp_path):
+        scl = tmp_path / "just.scl"
+        scl.write_text(JUST_SCL)
+        kbm = tmp_path / "white.kbm"
+        kbm.write_text(WHITE_KBM)
+
+        keymap = parse_kbm(str(kbm))
+        table = Tuning.from_files(str(scl), str(kbm)).freqs
+
+        assert keymap.mapping[1] is None
+        assert table[69] == 432.0
+        assert table[61] is None
+        assert table[67] == pytest.approx(1.5 * table[60])
+        assert table[72] == pytest.approx(2 * table[60])
+
+    def test_invalid_scale(self, tmp_path):
+        path = tmp_path / "bad.scl"
+        path.write_text("Broken\n 3\n 100.0\n")
+
+        with pytest.raises(ValueError, match="1 of 3 degrees"):
+            parse_scl(str(path))
+
+    def test_retune_swaps_every_note_path(self, restore_tuning):
+        retune(Tuning.equal(reference=415.0))
+
+        assert note_freq(69) == 415.0
+        assert melody.midi_to_freq(69) == 415.0
+        assert note_freq(-12) == pytest.approx(415.0 * 2 ** (-81 / 12))
+
+    def test_fractional_notes(self, restore_tuning):
+        """Notes between the keys are interpolated in pitch"""
+        assert melody.midi_to_freq(60.5) == pytest.approx(440.0 * 2 ** (-8.5 / 12))
+        assert note_freq(69.0) == 440.0
+        assert note_freq(127.5) == pytest.approx(440.0 * 2 ** (58.5 / 12))
+
+    def test_unmapped_notes_are_rests(self, tmp_path, restore_tuning):
+        """Melodies skip keys the mapping leaves silent but keep their time"""
+        scl = tmp_path / "just.scl"
+        scl.write_text(JUST_SCL)
+        kbm = tmp_path / "white.kbm"
+        kbm.write_text(WHITE_KBM)
+        retune(Tuning.from_files(str(scl), str(kbm)))
+
+        assert note_freq(61) is None
+        assert note_freq(60.5) is None
+        events = melody.melody_timeline([(60, 0.5), (61, 0.5), (62, 0.5)], gap=0.0)
+
+        assert [t for t, _ in events] == [0.0, 0.5, 1.0, 1.5]
+        assert all(value is not None for _, messages in events for _, value in messages)
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+
+import os
+import random
+import sys
+from unittest.mock import Mock, call
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.murnau.utils.tuning import note_freq
+from src.murnau.utils.voices import (
+    LRU,
+    POLICIES,
+    QUIETEST,
+    ROUND_ROBIN,
+    PolySynth,
+    VoiceAllocator,
+)
+
+
+class TestVoiceAllocator:
+    """Test voice assignment and stealing"""
+
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError, match="at least one voice"):
+            VoiceAllocator(0)
+        with pytest.raises(ValueError, match="Unknown voice allocation policy"):
+            VoiceAllocator(2, "loudest")
+
+    @pytest.mark.parametrize("policy", POLICIES)
+    def test_free_voices_first(self, policy):
+        allocator = VoiceAllocator(3, policy)
+
+        voices = [allocator.note_on(note)[0].index for note in (60, 64, 67)]
+
+        assert sorted(voices) == [0, 1, 2]
+        assert allocator.active == 3
+        assert allocator.steals == 0
+
+    def test_round_robin_steals_in_turn(self):
+        allocator = VoiceAllocator(2, ROUND_ROBIN)
+        allocator.note_on(60)
+        allocator.note_on(64)
+        allocator.note_off(60)
+
+        # Voice 0 is free, but it is voice 0's turn anyway; then voice 1's
+        assert allocator.note_on(67)[0].index == 0
+        voice, previous = allocator.note_on(72)
+        assert (voice.index, previous) == (1, 64)
+        assert allocator.voice_for(64) is None
+        assert allocator.steals == 1
+
+    def test_lru_reuses_longest_released_voice(self):
+        allocator = VoiceAllocator(3, LRU)
+        for note in (60, 64, 67):
+            allocator.note_on(note)
+        allocator.note_off(64)  # voice 1
+        allocator.note_off(60)  # voice 0
+
+        assert allocator.note_on(72)[0].index == 1
+        assert allocator.note_on(74)[0].index == 0
+
+    def test_lru_steals_oldest_note(self):
+        allocator = VoiceAllocator(2, LRU)
+        allocator.note_on(60)
+        allocator.note_on(64)
+        allocator.note_on(60)  # retrigger makes 60 the newest
+
+        voice, previous = allocator.note_on(67)
+
+        assert previous == 64
+        assert voice.index == 1
+
+    def test_quietest_steals_softest_note(self):
+        allocator = VoiceAllocator(3, QUIETEST)
+        allocator.note_on(60, 90)
+        allocator.note_on(64, 30)
+        allocator.note_on(67, 30)
+
+        # Of the two softest notes the older one goes
+        voice, previous = allocator.note_on(72, 100)
+        assert previous == 64
+        voice, previous = allocator.note_on(74, 100)
+        assert previous == 67
+        voice, previous = allocator.note_on(76, 100)
+        assert previous == 60
+
+    def test_retrigger_keeps_voice(self):
+        allocator = VoiceAllocator(2)
+        first, _ = allocator.note_on(60)
+
+        voice, previous = allocator.note_on(60, 50)
+
+        assert voice is first
+        assert previous == 60
+        assert allocator.active == 1
+        assert allocator.steals == 0
+
+    def test_note_off_unknown_note(self):
+        assert VoiceAllocator(2).note_off(60) is None
+
+    def test_release_all(self):
+        allocator = VoiceAllocator(4)
+        for note in (60, 64, 67):
+            allocator.note_on(note)
+
+        assert len(allocator.release_all()) == 3
+        assert allocator.active == 0
+        assert all(voice.note is None for voice in allocator.voices)
+
+    @pytest.mark.parametrize("policy", POLICIES)
+    def test_stress_against_reference(self, policy):
+        """Dense overlapping notes keep every voice and note consistent"""
+        rng = random.Random(4321)
+        allocator = VoiceAllocator(8, policy)
+        held = {}  # note -> voice index
+
+        for _ in range(20000):
+            note = rng.randrange(40, 90)
+            if note in held and rng.random() < 0.6:
+                assert allocator.note_off(note).index == held.pop(note)
+                continue
+            voice, previous = allocator.note_on(note, rng.randrange(1, 128))
+            if previous is not None and previous != note:
+                assert held.pop(previous) == voice.index
+            elif previous is None:
+                assert voice.index not in held.values()
+            held[note] = voice.index
+
+            assert allocator.active == len(held) <= 8
+            playing = {v.note: v.index for v in allocator.voices if v.note is not None}
+            assert playing == held
+
+
+class TestPolySynth:
+    """Test routing of each voice to its own synth instance"""
+
+    def test_notes_go_to_their_instance(self):
+        senders = [Mock(), Mock()]
+        poly = PolySynth(senders)
+
+        assert poly.note_on(60) == 0
+        assert poly.note_on(64) == 1
+        assert poly.note_off(60) == 0
+
+        assert senders[0].call_args_list == [
+            call("/freq", note_freq(60)),
+            call("/gate", 1.0),
+            call("/gate", 0.0),
+        ]
+        assert senders[1].call_args_list == [
+            call("/freq", note_freq(64)),
+            call("/gate", 1.0),
+        ]
+
+    def test_stolen_voice_retriggers(self):
+        sender = Mock()
+        poly = PolySynth([sender])
+        poly.note_on(60)
+        sender.reset_mock()
+
+        poly.note_on(64)
+
+        assert sender.call_args_list == [
+            call("/gate", 0.0),
+            call("/freq", note_freq(64)),
+            call("/gate", 1.0),
+        ]
+
+    def test_all_notes_off(self):
+        senders = [Mock(), Mock(), Mock()]
+        poly = PolySynth(senders)
+        poly.note_on(60)
+        poly.note_on(64)
+
+        poly.all_notes_off()
+
+        assert senders[0].call_args == call("/gate", 0.0)
+        assert senders[1].call_args == call("/gate", 0.0)
+        senders[2].assert_not_called()
+
+    def test_send_bundles_to_one_instance(self):
+        senders = [Mock(), Mock()]
+        batches = [Mock(), Mock()]
+        messages = [("/gain", 0.5), ("/cutoff_L", 800.0)]
+
+        PolySynth(senders, batch_senders=batches).send(1, messages)
+        PolySynth(senders).send(0, messages)
+
+        batches[1].assert_called_once_with(messages)
+        assert senders[0].call_args_list == [call(*m) for m in messages]
+        senders[1].assert_not_called()